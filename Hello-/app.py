@@ -20,6 +20,7 @@ import logging
 from datetime import datetime
 
 from planetary_health_query import GEEQueryEngine
+from planetary_health_query.core import get_engine as get_shared_engine, get_runtime_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,11 +55,11 @@ engine: Optional[GEEQueryEngine] = None
 
 
 def get_engine() -> GEEQueryEngine:
-    """Get or create GEE Query Engine singleton."""
+    """Get the process-wide GEE Query Engine."""
     global engine
     if engine is None:
         logger.info("Initializing GEE Query Engine...")
-        engine = GEEQueryEngine(auto_init=True)
+        engine = get_shared_engine(auto_init=True)
         logger.info("GEE Query Engine initialized successfully")
     return engine
 
@@ -128,6 +129,7 @@ class HealthResponse(BaseModel):
     message: str
     timestamp: str
     gee_initialized: bool
+    runtime: Optional[Dict[str, Any]] = None
 
 
 # API Endpoints
@@ -143,7 +145,8 @@ async def health_check():
         status="ok",
         message="Planetary Health Index API is running",
         timestamp=datetime.now().isoformat(),
-        gee_initialized=engine is not None and engine._initialized
+        gee_initialized=engine is not None and engine._initialized,
+        runtime=get_runtime_stats()
     )
 
 
@@ -181,9 +184,9 @@ async def query_phi(request: PHIQueryRequest):
 
         # Run query
         start_time = datetime.now()
-        result = query_engine.query(
-            lat=request.latitude,
-            lon=request.longitude,
+        result = await query_engine.aquery(
+            request.latitude,
+            request.longitude,
             mode=request.mode,
             temporal=request.temporal,
             buffer_radius=request.buffer_radius,
@@ -9,6 +9,7 @@ Endpoints:
 - /dashboard/satellite - Get satellite/PHI data (poll daily)
 - /dashboard/weather/history - Historical weather data
 - /dashboard/aqi/history - Historical air quality data
+- /dashboard/satellite/series - Monthly/annual satellite metric series
 - /dashboard/status - Service status
 """
 
@@ -333,6 +334,49 @@ async def get_satellite_history(
         )
 
 
+@router.get("/satellite/series", response_model=DashboardResponse)
+async def get_satellite_series(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    period: str = Query("month", pattern="^(month|year)$", description="Series period: month or year"),
+    years: int = Query(5, ge=1, le=20, description="Years of history"),
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names (default: all)"),
+    force_refresh: bool = Query(False, description="Re-fetch the trailing periods now")
+):
+    """
+    Get monthly or annual satellite metric series (NDVI, LST, AOD, ...).
+
+    Served from SQLite; Earth Engine is only queried for periods newer
+    than the stored ones (plus a few trailing periods that may have been
+    reprocessed), at most once per satellite cache TTL.
+    """
+    try:
+        service = get_dashboard_service()
+        data = await service.get_satellite_series(
+            lat,
+            lon,
+            period=period,
+            years=years,
+            metrics=[m.strip() for m in metrics.split(",") if m.strip()] if metrics else None,
+            force_refresh=force_refresh
+        )
+
+        return DashboardResponse(
+            success=True,
+            data=data,
+            sources=[data["source"]],
+            cached=data["source"] == "sqlite",
+            timestamp=datetime.now().isoformat()
+        )
+
+    except Exception as e:
+        return DashboardResponse(
+            success=False,
+            error=str(e),
+            timestamp=datetime.now().isoformat()
+        )
+
+
 # ==================== CONTROL ENDPOINTS ====================
 
 @router.post("/polling/start")
@@ -17,15 +17,142 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.graphics.shapes import Drawing, Circle, Wedge, String, Line, Polygon
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics import renderPDF
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+import copy
+import io
 import tempfile
+import threading
 import math
 
 from app.config import PDF_OUTPUT_DIR
 
 
-def generate_report_pdf(lat: float, lon: float, data: dict) -> str:
+# Pillar display names and table header colors
+PILLAR_INFO = {
+    "A": ("Atmospheric", "#3498db"),
+    "B": ("Biodiversity", "#27ae60"),
+    "C": ("Carbon", "#8e44ad"),
+    "D": ("Degradation", "#e74c3c"),
+    "E": ("Ecosystem", "#f39c12")
+}
+
+# Distinct gauges kept per thread (integer scores need 101)
+GAUGE_CACHE_SIZE = 512
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=1)
+def report_styles() -> Dict[str, ParagraphStyle]:
+    """Paragraph styles, built once per process."""
+    styles = getSampleStyleSheet()
+    return {
+        "normal": styles['Normal'],
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            textColor=colors.HexColor("#2c3e50"),
+            alignment=1  # Center
+        ),
+        "subtitle": ParagraphStyle(
+            'Subtitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor("#7f8c8d"),
+            alignment=1
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            spaceBefore=20,
+            spaceAfter=10,
+            textColor=colors.HexColor("#2c3e50")
+        ),
+    }
+
+
+@lru_cache(maxsize=1)
+def _furniture() -> Dict[str, Paragraph]:
+    """Parsed paragraphs that are the same in every report."""
+    styles = report_styles()
+    headings = ["Overall Health Score", "Pillar Scores", "Detailed Metrics", "Data Quality"]
+    furniture = {text: Paragraph(text, styles["heading"]) for text in headings}
+    furniture["title"] = Paragraph("Planetary Health Report", styles["title"])
+    furniture["footer"] = Paragraph(
+        "Generated by Planetary Health Monitor - Powered by Google Earth Engine",
+        styles["subtitle"]
+    )
+    for pid, (name, _) in PILLAR_INFO.items():
+        furniture[pid] = Paragraph(f"<b>{pid} - {name}</b>", styles["normal"])
+    return furniture
+
+
+def _static(name: str) -> Paragraph:
+    # Layout state lives on the flowable, so each report wraps its own copy
+    return copy.copy(_furniture()[name])
+
+
+@lru_cache(maxsize=1)
+def _pillar_table_style() -> TableStyle:
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#ecf0f1")),
+        ('GRID', (0, 0), (-1, -1), 1, colors.white),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _metric_table_style(color: str) -> TableStyle:
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
+        ('TOPPADDING', (0, 1), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+    ])
+
+
+def warm_up():
+    """
+    Build styles, page furniture and the integer-score gauges.
+
+    Called once per PDF worker process, so reports only lay out their
+    own data.
+    """
+    report_styles()
+    _furniture()
+    _pillar_table_style()
+    for _, color in PILLAR_INFO.values():
+        _metric_table_style(color)
+    for score in range(101):
+        create_score_gauge(score)
+
+
+def generate_report_pdf(
+    lat: float,
+    lon: float,
+    data: dict,
+    output_path: Optional[str] = None
+) -> str:
     """
     Generate a comprehensive PDF report.
 
@@ -33,18 +160,54 @@ def generate_report_pdf(lat: float, lon: float, data: dict) -> str:
         lat: Latitude
         lon: Longitude
         data: Query result data
+        output_path: Where to write the PDF (default: a timestamped file
+                     in PDF_OUTPUT_DIR)
 
     Returns:
         Path to generated PDF file
     """
     # Create output path
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"report_{lat:.4f}_{lon:.4f}_{timestamp}.pdf"
-    pdf_path = PDF_OUTPUT_DIR / filename
+    if output_path:
+        pdf_path = Path(output_path)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"report_{lat:.4f}_{lon:.4f}_{timestamp}.pdf"
+        pdf_path = PDF_OUTPUT_DIR / filename
 
+    write_report_pdf(lat, lon, data, str(pdf_path))
+    return str(pdf_path)
+
+
+def report_pdf_bytes(lat: float, lon: float, data: dict) -> bytes:
+    """
+    Render a report in memory.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        data: Query result data
+
+    Returns:
+        The PDF document
+    """
+    buffer = io.BytesIO()
+    write_report_pdf(lat, lon, data, buffer)
+    return buffer.getvalue()
+
+
+def write_report_pdf(lat: float, lon: float, data: dict, output: Union[str, BinaryIO]):
+    """
+    Render a report into a file path or a binary stream.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        data: Query result data
+        output: File path or writable binary file object
+    """
     # Create document
     doc = SimpleDocTemplate(
-        str(pdf_path),
+        output,
         pagesize=A4,
         rightMargin=72,
         leftMargin=72,
@@ -54,37 +217,11 @@ def generate_report_pdf(lat: float, lon: float, data: dict) -> str:
 
     # Build content
     elements = []
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        textColor=colors.HexColor("#2c3e50"),
-        alignment=1  # Center
-    )
-
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        textColor=colors.HexColor("#7f8c8d"),
-        alignment=1
-    )
-
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceBefore=20,
-        spaceAfter=10,
-        textColor=colors.HexColor("#2c3e50")
-    )
+    styles = report_styles()
+    subtitle_style = styles["subtitle"]
 
     # Title
-    elements.append(Paragraph("Planetary Health Report", title_style))
+    elements.append(_static("title"))
     elements.append(Paragraph(
         f"Location: {lat:.4f}, {lon:.4f}",
         subtitle_style
@@ -99,7 +236,7 @@ def generate_report_pdf(lat: float, lon: float, data: dict) -> str:
     summary = data.get("summary", {})
     overall_score = summary.get("overall_score", 0) or 0
 
-    elements.append(Paragraph("Overall Health Score", heading_style))
+    elements.append(_static("Overall Health Score"))
 
     # Score gauge drawing
     score_drawing = create_score_gauge(overall_score)
@@ -110,60 +247,40 @@ def generate_report_pdf(lat: float, lon: float, data: dict) -> str:
     interpretation = get_score_interpretation(overall_score)
     elements.append(Paragraph(
         f"<b>Status:</b> {interpretation}",
-        styles['Normal']
+        styles["normal"]
     ))
     elements.append(Spacer(1, 30))
 
     # Pillar Scores
-    elements.append(Paragraph("Pillar Scores", heading_style))
+    elements.append(_static("Pillar Scores"))
 
     pillar_scores = summary.get("pillar_scores", {})
     pillars_data = data.get("pillars", {})
 
-    pillar_info = {
-        "A": ("Atmospheric", "#3498db"),
-        "B": ("Biodiversity", "#27ae60"),
-        "C": ("Carbon", "#8e44ad"),
-        "D": ("Degradation", "#e74c3c"),
-        "E": ("Ecosystem", "#f39c12")
-    }
-
     # Pillar scores table
     table_data = [["Pillar", "Score", "Status"]]
     for pid in ["A", "B", "C", "D", "E"]:
-        name, color = pillar_info.get(pid, (pid, "#000000"))
+        name, color = PILLAR_INFO.get(pid, (pid, "#000000"))
         score = pillar_scores.get(pid, 0) or 0
         status = get_score_interpretation(score)
         table_data.append([f"{pid} - {name}", f"{score}/100", status])
 
     pillar_table = Table(table_data, colWidths=[200, 80, 100])
-    pillar_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#ecf0f1")),
-        ('GRID', (0, 0), (-1, -1), 1, colors.white),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('TOPPADDING', (0, 1), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-    ]))
+    pillar_table.setStyle(_pillar_table_style())
     elements.append(pillar_table)
     elements.append(Spacer(1, 30))
 
     # Detailed Metrics
-    elements.append(Paragraph("Detailed Metrics", heading_style))
+    elements.append(_static("Detailed Metrics"))
 
     for pillar_key, pillar_data in pillars_data.items():
         pillar_id = pillar_key[0] if pillar_key else ""
-        name, color = pillar_info.get(pillar_id, (pillar_key, "#000000"))
+        name, color = PILLAR_INFO.get(pillar_id, (pillar_key, "#000000"))
 
-        elements.append(Paragraph(
-            f"<b>{pillar_id} - {name}</b>",
-            styles['Normal']
-        ))
+        if pillar_id in PILLAR_INFO:
+            elements.append(_static(pillar_id))
+        else:
+            elements.append(Paragraph(f"<b>{pillar_id} - {name}</b>", styles["normal"]))
 
         metrics = pillar_data.get("metrics", {})
         if metrics:
@@ -185,49 +302,60 @@ def generate_report_pdf(lat: float, lon: float, data: dict) -> str:
                 ])
 
             metric_table = Table(metric_table_data, colWidths=[180, 120, 80])
-            metric_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(color)),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-            ]))
+            metric_table.setStyle(_metric_table_style(color))
             elements.append(metric_table)
             elements.append(Spacer(1, 15))
 
     # Data Quality
-    elements.append(Paragraph("Data Quality", heading_style))
+    elements.append(_static("Data Quality"))
     completeness = summary.get("data_completeness", 0) or 0
     elements.append(Paragraph(
         f"Data Completeness: {completeness*100:.0f}%",
-        styles['Normal']
+        styles["normal"]
     ))
 
     quality_flags = summary.get("quality_flags", [])
     if quality_flags:
         elements.append(Paragraph(
             f"Quality Issues: {', '.join(quality_flags[:5])}",
-            styles['Normal']
+            styles["normal"]
         ))
     elements.append(Spacer(1, 30))
 
     # Footer
-    elements.append(Paragraph(
-        "Generated by Planetary Health Monitor - Powered by Google Earth Engine",
-        subtitle_style
-    ))
+    elements.append(_static("footer"))
 
     # Build PDF
     doc.build(elements)
 
-    return str(pdf_path)
+
+def _gauge_cache() -> "OrderedDict[float, Drawing]":
+    cache = getattr(_local, "gauges", None)
+    if cache is None:
+        cache = _local.gauges = OrderedDict()
+    return cache
 
 
 def create_score_gauge(score: int) -> Drawing:
+    """
+    Score gauge visualization, memoized per score.
+
+    Reports with the same score share one drawing. Rendering annotates
+    a drawing's shapes while it draws, so the memo is per thread: worker
+    processes render one report at a time and hold a single copy.
+    """
+    cache = _gauge_cache()
+    drawing = cache.get(score)
+    if drawing is None:
+        drawing = cache[score] = _build_score_gauge(score)
+        if len(cache) > GAUGE_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(score)
+    return drawing
+
+
+def _build_score_gauge(score: int) -> Drawing:
     """Create a score gauge visualization."""
     drawing = Drawing(400, 120)
 
@@ -3,8 +3,13 @@ API Routes for Planetary Health Web Application.
 
 Endpoints:
     POST /api/query - Query satellite data for a location
-    POST /api/pdf - Generate and download PDF report
+    POST /api/query/batch - Query many locations, streamed as NDJSON
+    POST /api/query/raster - Score a polygon per pixel (statistics and heatmap tiles)
+    POST /api/pdf - Download the PDF report of a stored query result
+    POST /api/reports/batch - Many PDF reports, streamed as a ZIP
+    GET /api/reports/batch/{batch_id} - Progress of a report batch
     GET /api/health - Health check
+    GET /api/engine/stats - Earth Engine worker pool metrics
     GET /api/history - Get user's query history
     GET /api/external/air-quality - Get real-time air quality from external APIs
     GET /api/external/weather - Get weather forecast data
@@ -15,14 +20,27 @@ Endpoints:
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Query
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
+import asyncio
+import json
 import traceback
 
-from app.services.earth_engine import query_location, is_initialized
+from app.services.earth_engine import (
+    aquery_location,
+    aquery_many_locations,
+    aquery_polygon,
+    ascore_raster,
+    polygon_centroid,
+    rescore_result,
+    run_in_ee_executor,
+    is_initialized
+)
 from app.services.database import (
+    get_supabase,
     log_query,
+    reverse_geocode,
     get_user_query_history,
     get_query_by_id,
     update_pdf_status,
@@ -30,7 +48,10 @@ from app.services.database import (
     upload_pdf_to_storage,
     get_user_stats
 )
-from app.api.pdf_generator import generate_report_pdf
+from app.services.query_planner import external_metrics, plan_provided_metrics
+from app.services.reports import load_result, remember_result, render_report, report_location
+from app.services.report_batches import create_batch, get_batch
+from app.config import GEE_QUERY_TIMEOUT, QUERY_BATCH_MAX_SITES, QUERY_PLAN_EXTERNAL_WAIT, REPORT_BATCH_MAX_ITEMS
 
 router = APIRouter()
 
@@ -46,6 +67,40 @@ class QueryRequest(BaseModel):
     user_email: Optional[str] = Field(default=None, description="User email")
 
 
+class PdfRequest(BaseModel):
+    """Request model for PDF reports, by stored result or by location."""
+    query_id: Optional[str] = Field(default=None, description="Query id returned by /api/query")
+    result_hash: Optional[str] = Field(default=None, description="Result hash returned by /api/query")
+    lat: Optional[float] = Field(default=None, ge=-90, le=90, description="Latitude (queried when no stored result is found)")
+    lon: Optional[float] = Field(default=None, ge=-180, le=180, description="Longitude (queried when no stored result is found)")
+    # User tracking fields
+    user_id: str = Field(default="anonymous", description="Firebase user ID")
+    user_email: Optional[str] = Field(default=None, description="User email")
+
+    @model_validator(mode="after")
+    def check_source(self):
+        """A stored result or a location identifies the report."""
+        has_location = self.lat is not None and self.lon is not None
+        if not (self.query_id or self.result_hash or has_location):
+            raise ValueError("Provide query_id, result_hash, or lat and lon")
+        return self
+
+
+class BatchSite(BaseModel):
+    """One location in a batch query."""
+    lat: float = Field(..., ge=-90, le=90, description="Latitude")
+    lon: float = Field(..., ge=-180, le=180, description="Longitude")
+    id: Optional[str] = Field(default=None, description="Caller's site identifier, echoed back")
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for multi-location queries."""
+    sites: list[BatchSite] = Field(..., min_length=1, max_length=QUERY_BATCH_MAX_SITES, description="Locations to query")
+    mode: str = Field(default="simple", description="Query mode: 'simple' or 'comprehensive'")
+    include_scores: bool = Field(default=True, description="Include pillar scores")
+    buffer_radius: int = Field(default=500, ge=10, le=10000, description="Radius in meters for spatial averaging")
+
+
 class PolygonPoint(BaseModel):
     """Single point in a polygon."""
     lat: float = Field(..., ge=-90, le=90, description="Latitude")
@@ -53,15 +108,83 @@ class PolygonPoint(BaseModel):
     label: Optional[str] = Field(default=None, description="Point label (e.g., 'NW', 'NE', 'SE', 'SW')")
 
 
+def check_parcel_geometry(geometry: Optional[dict]):
+    """Reject GeoJSON that is not a Polygon or MultiPolygon (geometry or Feature)."""
+    if geometry is None:
+        return
+    if geometry.get("type") == "Feature":
+        geometry = geometry.get("geometry")
+    if not isinstance(geometry, dict) or geometry.get("type") not in ("Polygon", "MultiPolygon"):
+        raise ValueError("geometry must be a GeoJSON Polygon or MultiPolygon")
+
+
 class PolygonQueryRequest(BaseModel):
-    """Request model for polygon (4-point) land parcel queries."""
-    points: list[PolygonPoint] = Field(..., min_length=4, max_length=4, description="4 corner points of polygon")
+    """Request model for land parcel queries (vertices or GeoJSON)."""
+    points: Optional[list[PolygonPoint]] = Field(default=None, min_length=3, description="Polygon vertices, in order")
+    geometry: Optional[dict] = Field(default=None, description="GeoJSON Polygon or MultiPolygon (geometry or Feature), holes allowed")
     mode: str = Field(default="comprehensive", description="Query mode: 'simple' or 'comprehensive'")
     include_scores: bool = Field(default=True, description="Include pillar scores")
     # User tracking fields
     user_id: str = Field(default="anonymous", description="Firebase user ID")
     user_email: Optional[str] = Field(default=None, description="User email")
 
+    @model_validator(mode="after")
+    def check_region(self):
+        """Exactly one of points and geometry describes the parcel."""
+        if (self.points is None) == (self.geometry is None):
+            raise ValueError("Provide either points or a GeoJSON geometry")
+        check_parcel_geometry(self.geometry)
+        return self
+
+
+class ReportBatchItem(BaseModel):
+    """One report in a batch: a stored query result or a parcel to query."""
+    query_id: Optional[str] = Field(default=None, description="Query id returned by /api/query")
+    result_hash: Optional[str] = Field(default=None, description="Result hash returned by /api/query")
+    points: Optional[list[PolygonPoint]] = Field(default=None, min_length=3, description="Parcel vertices, in order")
+    geometry: Optional[dict] = Field(default=None, description="Parcel as GeoJSON Polygon or MultiPolygon")
+    mode: str = Field(default="comprehensive", description="Query mode for parcels: 'simple' or 'comprehensive'")
+    label: Optional[str] = Field(default=None, description="Report name in the ZIP (default: the query id)")
+
+    @model_validator(mode="after")
+    def check_source(self):
+        """Each item is either a stored result or exactly one parcel description."""
+        stored = bool(self.query_id or self.result_hash)
+        parcels = (self.points is not None) + (self.geometry is not None)
+        if stored == bool(parcels) or parcels > 1:
+            raise ValueError("Provide query_id/result_hash, or either points or a GeoJSON geometry")
+        if self.mode not in ("simple", "comprehensive"):
+            raise ValueError(f"Mode must be 'simple' or 'comprehensive', got {self.mode}")
+        check_parcel_geometry(self.geometry)
+        return self
+
+    def source(self) -> dict:
+        """Item as passed to report_batches.create_batch()."""
+        if self.points is not None:
+            region = [{"lat": p.lat, "lng": p.lng} for p in self.points]
+        else:
+            region = self.geometry
+        return {
+            "query_id": self.query_id,
+            "result_hash": self.result_hash,
+            "region": region,
+            "mode": self.mode,
+            "label": self.label
+        }
+
+
+class ReportBatchRequest(BaseModel):
+    """Request model for batch reports."""
+    items: list[ReportBatchItem] = Field(..., min_length=1, max_length=REPORT_BATCH_MAX_ITEMS, description="Reports to produce")
+
+
+class RasterQueryRequest(BaseModel):
+    """Request model for per-pixel scoring of a polygon."""
+    points: list[PolygonPoint] = Field(..., min_length=3, description="Polygon vertices, in order")
+    scale: int = Field(default=100, ge=10, le=5000, description="Pixel size in meters for the statistics")
+    mode: str = Field(default="comprehensive", description="Query mode: 'simple' or 'comprehensive'")
+    ecosystem_type: Optional[str] = Field(default=None, description="Fixed ecosystem weights (default: detected per pixel)")
+
 
 class QueryResponse(BaseModel):
     """Response model for location queries."""
@@ -70,6 +193,7 @@ class QueryResponse(BaseModel):
     error: Optional[str] = None
     query_id: Optional[str] = None
     location_name: Optional[str] = None
+    result_hash: Optional[str] = None
 
 
 class HistoryResponse(BaseModel):
@@ -90,6 +214,28 @@ async def health_check():
     }
 
 
+@router.get("/engine/stats")
+async def get_engine_stats():
+    """
+    Metrics for the shared Earth Engine runtime.
+
+    Reports saturation, queue depth and task latency for the query and
+    pillar worker pools, plus in-flight Earth Engine calls, the imagery
+    thumbnail cache and PDF rendering.
+    """
+    from planetary_health_query.core import get_runtime_stats
+    from app.services.imagery_cache import get_imagery_cache_stats
+    from app.services.pdf_renderer import get_render_stats
+    from app.services.pdf_store import get_pdf_store
+
+    return {
+        **get_runtime_stats(),
+        "imagery_cache": get_imagery_cache_stats(),
+        "pdf_renderer": get_render_stats(),
+        "pdf_cache": get_pdf_store().stats()
+    }
+
+
 @router.post("/query", response_model=QueryResponse)
 async def query_satellite_data(request: QueryRequest, http_request: Request, background_tasks: BackgroundTasks):
     """
@@ -110,33 +256,21 @@ async def query_satellite_data(request: QueryRequest, http_request: Request, bac
         if http_request.client:
             client_ip = http_request.client.host
 
-        # Query Earth Engine
-        result = query_location(
-            lat=request.lat,
-            lon=request.lon,
-            mode=request.mode,
-            include_scores=request.include_scores
+        # Earth Engine (off the event loop, with a deadline), external APIs
+        # and geocoding run concurrently; Earth Engine skips metrics the
+        # external APIs answer
+        result, location_name = await gather_query_sources(
+            lambda provided: aquery_location(
+                lat=request.lat,
+                lon=request.lon,
+                mode=request.mode,
+                include_scores=request.include_scores,
+                provided=provided
+            ),
+            request.lat,
+            request.lon
         )
 
-        # Fetch Open-Meteo data for fallbacks and weather info
-        try:
-            from app.services.external_apis.aggregator import get_aggregator
-            aggregator = get_aggregator()
-
-            # Get comprehensive external data (air quality + weather + soil)
-            external_data = await aggregator.get_comprehensive_data(request.lat, request.lon)
-
-            # Apply fallbacks for N/A metrics
-            result = apply_open_meteo_fallbacks(result, external_data)
-
-            # Add weather data to result
-            result["weather"] = external_data.get("weather", {})
-            result["external_sources"] = external_data.get("sources", [])
-
-        except Exception as ext_error:
-            print(f"External API fallback error: {ext_error}")
-            # Continue without external data - satellite data still available
-
         # Log query with user tracking (returns query_id)
         query_id = await log_query(
             lat=request.lat,
@@ -145,15 +279,27 @@ async def query_satellite_data(request: QueryRequest, http_request: Request, bac
             user_id=request.user_id,
             user_email=request.user_email,
             mode=request.mode,
-            ip_address=client_ip
+            ip_address=client_ip,
+            location_name=location_name,
+            lookup_location=False
         )
 
+        # Kept for /api/pdf, which renders it without re-querying
+        result_hash = await remember_result(result, query_id)
+
         return QueryResponse(
             success=True,
             data=result,
-            query_id=query_id
+            query_id=query_id,
+            location_name=location_name,
+            result_hash=result_hash
         )
 
+    except asyncio.TimeoutError:
+        return QueryResponse(
+            success=False,
+            error="Earth Engine query timed out"
+        )
     except Exception as e:
         traceback.print_exc()
         return QueryResponse(
@@ -162,18 +308,55 @@ async def query_satellite_data(request: QueryRequest, http_request: Request, bac
         )
 
 
+@router.post("/query/batch")
+async def query_batch_satellite_data(request: BatchQueryRequest):
+    """
+    Query satellite data for many locations at once.
+
+    Sites are grouped into batches that each cost one Earth Engine request
+    (one reduceRegions per dataset over all sites in the batch), so scoring
+    hundreds of sites does not repeat the per-location fan-out.
+
+    Results stream back as NDJSON, one line per site in completion order.
+    Each line is the same result as /api/query's data plus a "site" entry
+    with the site's index and id; failed sites carry an "error" instead.
+    """
+    if request.mode not in ("simple", "comprehensive"):
+        raise HTTPException(status_code=400, detail=f"Mode must be 'simple' or 'comprehensive', got {request.mode}")
+
+    sites = [site.model_dump() for site in request.sites]
+
+    async def stream():
+        try:
+            async for site_result in aquery_many_locations(
+                sites,
+                mode=request.mode,
+                include_scores=request.include_scores,
+                buffer_radius=request.buffer_radius
+            ):
+                yield json.dumps(site_result, default=str) + "\n"
+        except Exception as e:
+            traceback.print_exc()
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/query/polygon", response_model=QueryResponse)
 async def query_polygon_satellite_data(request: PolygonQueryRequest, http_request: Request, background_tasks: BackgroundTasks):
     """
-    Query satellite data for a polygon area defined by 4 corner points.
+    Query satellite data for a land parcel of any shape.
 
     This endpoint is for authenticated users who want to analyze a specific land parcel.
     It returns all 5 planetary health pillars plus:
-    - Exact polygon area in hectares
+    - Exact (ellipsoidal) parcel area in hectares
     - Carbon credits calculation
     - Ecosystem Service Value (ESV) estimation
 
-    Points should be provided in order: NW, NE, SE, SW (clockwise from northwest).
+    The parcel is either `points` (3 or more vertices, in order) or a GeoJSON
+    Polygon/MultiPolygon in `geometry`, holes allowed. Fixable problems
+    (duplicate vertices, ring orientation) are repaired and listed under
+    summary.geometry.repairs; self-intersecting rings are rejected.
     """
     try:
         # Get client IP for logging
@@ -181,47 +364,27 @@ async def query_polygon_satellite_data(request: PolygonQueryRequest, http_reques
         if http_request.client:
             client_ip = http_request.client.host
 
-        # Import the polygon query function
-        from app.services.earth_engine import query_polygon
-        import asyncio
-
         # Convert points to dict format expected by engine
-        points_dict = [{"lat": p.lat, "lng": p.lng} for p in request.points]
-
-        # Query Earth Engine with polygon (run in thread to avoid blocking event loop)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: query_polygon(
-                points=points_dict,
+        if request.geometry is not None:
+            region = request.geometry
+        else:
+            region = [{"lat": p.lat, "lng": p.lng} for p in request.points]
+
+        # Area-weighted centroid, computed locally so external APIs and
+        # geocoding can start alongside Earth Engine
+        centroid_lat, centroid_lng = polygon_centroid(region)
+
+        result, location_name = await gather_query_sources(
+            lambda provided: aquery_polygon(
+                points=region,
                 mode=request.mode,
-                include_scores=request.include_scores
-            )
+                include_scores=request.include_scores,
+                provided=provided
+            ),
+            centroid_lat,
+            centroid_lng
         )
 
-        # Calculate centroid for external API calls
-        centroid_lat = sum(p.lat for p in request.points) / 4
-        centroid_lng = sum(p.lng for p in request.points) / 4
-
-        # Fetch Open-Meteo data for the centroid
-        try:
-            from app.services.external_apis.aggregator import get_aggregator
-            aggregator = get_aggregator()
-
-            # Get comprehensive external data for centroid
-            external_data = await aggregator.get_comprehensive_data(centroid_lat, centroid_lng)
-
-            # Apply fallbacks for N/A metrics
-            result = apply_open_meteo_fallbacks(result, external_data)
-
-            # Add weather data to result
-            result["weather"] = external_data.get("weather", {})
-            result["external_sources"] = external_data.get("sources", [])
-
-        except Exception as ext_error:
-            print(f"External API fallback error for polygon: {ext_error}")
-            # Continue without external data
-
         # Log query with user tracking
         query_id = await log_query(
             lat=centroid_lat,
@@ -230,15 +393,27 @@ async def query_polygon_satellite_data(request: PolygonQueryRequest, http_reques
             user_id=request.user_id,
             user_email=request.user_email,
             mode=request.mode,
-            ip_address=client_ip
+            ip_address=client_ip,
+            location_name=location_name,
+            lookup_location=False
         )
 
+        # Kept for /api/pdf, which renders it without re-querying
+        result_hash = await remember_result(result, query_id)
+
         return QueryResponse(
             success=True,
             data=result,
-            query_id=query_id
+            query_id=query_id,
+            location_name=location_name,
+            result_hash=result_hash
         )
 
+    except asyncio.TimeoutError:
+        return QueryResponse(
+            success=False,
+            error="Earth Engine query timed out"
+        )
     except Exception as e:
         traceback.print_exc()
         return QueryResponse(
@@ -247,6 +422,122 @@ async def query_polygon_satellite_data(request: PolygonQueryRequest, http_reques
         )
 
 
+@router.post("/query/raster", response_model=QueryResponse)
+async def query_raster_scores(request: RasterQueryRequest):
+    """
+    Score a polygon per pixel on Earth Engine.
+
+    Returns zonal statistics (mean, min, max, p10/p50/p90, pixel count) for
+    the PHI band and every pillar band, the ecosystem mix of the region,
+    and XYZ tile URLs for a PHI heatmap.
+    """
+    try:
+        result = await ascore_raster(
+            points=[{"lat": p.lat, "lng": p.lng} for p in request.points],
+            scale=request.scale,
+            mode=request.mode,
+            ecosystem_type=request.ecosystem_type
+        )
+        return QueryResponse(success=True, data=result)
+
+    except asyncio.TimeoutError:
+        return QueryResponse(
+            success=False,
+            error="Earth Engine query timed out"
+        )
+    except Exception as e:
+        traceback.print_exc()
+        return QueryResponse(
+            success=False,
+            error=str(e)
+        )
+
+
+async def fetch_external_data(lat: float, lon: float) -> Optional[dict]:
+    """Open-Meteo/OpenAQ data (air quality + weather + soil), None on failure."""
+    try:
+        from app.services.external_apis.aggregator import get_aggregator
+        return await get_aggregator().get_comprehensive_data(lat, lon)
+    except Exception as ext_error:
+        print(f"External API fallback error: {ext_error}")
+        return None
+
+
+def cached_external_data(lat: float, lon: float) -> Optional[dict]:
+    """External data already in the aggregator cache, None if not cached."""
+    try:
+        from app.services.external_apis.aggregator import get_aggregator
+        return get_aggregator().get_cached_comprehensive_data(lat, lon)
+    except Exception:
+        return None
+
+
+async def gather_query_sources(satellite, lat: float, lon: float) -> tuple:
+    """
+    Run a satellite query, the external APIs and geocoding concurrently.
+
+    External APIs and geocoding start first, and the satellite query right
+    after them. Metrics answered by external data that is already cached
+    for the location are passed as provided, so Earth Engine only reduces
+    the rest (see query_planner.py). With QUERY_PLAN_EXTERNAL_WAIT set, the
+    satellite query also waits up to that long for fresh external data.
+    The external data is then merged into the satellite result
+    (apply_open_meteo_fallbacks) and the result rescored, so a request
+    takes about as long as its slowest source rather than the sum. Reverse
+    geocoding only runs when query logging is enabled.
+
+    Args:
+        satellite: Callable taking the provided metrics and returning the
+                   Earth Engine query awaitable (aquery_location/aquery_polygon)
+        lat: Latitude for external data and geocoding
+        lon: Longitude for external data and geocoding
+
+    Returns:
+        (result, location_name) tuple
+
+    Raises:
+        Whatever the satellite query raises; the other sources are cancelled
+    """
+    external_task = asyncio.ensure_future(fetch_external_data(lat, lon))
+    geocode_task = None
+    if get_supabase() is not None:
+        geocode_task = asyncio.ensure_future(reverse_geocode(lat, lon))
+
+    try:
+        # Plan with the external data in by the (opt-in) deadline, else
+        # with whatever is already cached for this location
+        if QUERY_PLAN_EXTERNAL_WAIT > 0:
+            await asyncio.wait({external_task}, timeout=QUERY_PLAN_EXTERNAL_WAIT)
+        if external_task.done():
+            provided = plan_provided_metrics(external_task.result())
+        else:
+            provided = plan_provided_metrics(cached_external_data(lat, lon))
+
+        result = await satellite(provided)
+    except BaseException:
+        external_task.cancel()
+        if geocode_task is not None:
+            geocode_task.cancel()
+        raise
+
+    external_data = await external_task
+    if external_data is not None:
+        try:
+            # Apply fallbacks for N/A metrics, then score what is returned
+            result = apply_open_meteo_fallbacks(result, external_data)
+            result = rescore_result(result)
+
+            # Add weather data to result
+            result["weather"] = external_data.get("weather", {})
+            result["external_sources"] = external_data.get("sources", [])
+        except Exception as ext_error:
+            print(f"External API fallback error: {ext_error}")
+            # Continue without external data - satellite data still available
+
+    location_name = await geocode_task if geocode_task is not None else None
+    return result, location_name
+
+
 def apply_open_meteo_fallbacks(result: dict, external_data: dict) -> dict:
     """
     Apply Open-Meteo data to supplement satellite metrics.
@@ -263,8 +554,6 @@ def apply_open_meteo_fallbacks(result: dict, external_data: dict) -> dict:
         Result with all metrics added to pillars
     """
     weather = external_data.get("weather", {})
-    air_quality = external_data.get("air_quality", {})
-    soil = external_data.get("soil", {})
 
     if not weather.get("available"):
         return result
@@ -273,6 +562,9 @@ def apply_open_meteo_fallbacks(result: dict, external_data: dict) -> dict:
     current = weather.get("current", {})
     hourly = weather.get("hourly", {})
 
+    # Satellite metrics Open-Meteo replaces (the planner's provided metrics)
+    satellite_overrides = external_metrics(external_data)
+
     # ========================================
     # PILLAR A: Atmospheric Quality (12 metrics)
     # ========================================
@@ -280,41 +572,10 @@ def apply_open_meteo_fallbacks(result: dict, external_data: dict) -> dict:
         if key.startswith("A_") or "atmospheric" in key.lower():
             metrics = pillar_data.get("metrics", {})
 
-            # AQI from Open-Meteo Air Quality
-            if air_quality.get("primary_aqi"):
-                metrics["aqi"] = {
-                    "value": air_quality.get("primary_aqi"),
-                    "unit": "US AQI",
-                    "description": "Air Quality Index",
-                    "source": "Open-Meteo",
-                    "quality": "good" if air_quality.get("confidence") == "high" else "moderate"
-                }
-
-            # UV Index
-            uv_data = air_quality.get("uv_index") or {}
-            if uv_data.get("value") is not None:
-                uv_val = uv_data.get("value")
-                uv_category = "Low" if uv_val < 3 else "Moderate" if uv_val < 6 else "High" if uv_val < 8 else "Very High" if uv_val < 11 else "Extreme"
-                metrics["uv_index"] = {
-                    "value": uv_val,
-                    "category": uv_category,
-                    "unit": "index",
-                    "description": f"UV Index ({uv_category})",
-                    "source": "Open-Meteo",
-                    "quality": "good"
-                }
-
-            # Visibility
-            if hourly.get("visibility") and len(hourly.get("visibility", [])) > 0:
-                vis_val = hourly["visibility"][0]
-                if vis_val is not None:
-                    metrics["visibility"] = {
-                        "value": vis_val / 1000,  # Convert m to km
-                        "unit": "km",
-                        "description": "Visibility Distance",
-                        "source": "Open-Meteo",
-                        "quality": "good"
-                    }
+            # AQI, UV index and visibility (shared with the query planner)
+            for name in ("aqi", "uv_index", "visibility"):
+                if name in satellite_overrides:
+                    metrics[name] = satellite_overrides[name]
 
             # Humidity
             humidity = current.get("humidity", {}).get("value")
@@ -423,16 +684,9 @@ def apply_open_meteo_fallbacks(result: dict, external_data: dict) -> dict:
                     "quality": "moderate"
                 }
 
-            # Soil Moisture - Average
-            soil_moisture = soil.get("soil_moisture", {}).get("value")
-            if soil_moisture is not None:
-                metrics["soil_moisture"] = {
-                    "value": round(soil_moisture * 100, 1),  # Convert to %
-                    "unit": "%",
-                    "description": "Soil Moisture (Average)",
-                    "source": "Open-Meteo",
-                    "quality": "good"
-                }
+            # Soil Moisture - Average (shared with the query planner)
+            if "soil_moisture" in satellite_overrides:
+                metrics["soil_moisture"] = satellite_overrides["soil_moisture"]
 
             # Soil Moisture at different depths
             if hourly.get("soil_moisture_0_to_1cm") and len(hourly.get("soil_moisture_0_to_1cm", [])) > 0:
@@ -524,15 +778,7 @@ def apply_open_meteo_fallbacks(result: dict, external_data: dict) -> dict:
                     }
 
                     # Also calculate evaporative stress from VPD
-                    esi = (vpd_current - 1.0) / 1.5
-                    esi = max(-2, min(2, esi))
-                    metrics["evaporative_stress"] = {
-                        "value": round(esi, 2),
-                        "unit": "index",
-                        "description": "Evaporative Stress Index",
-                        "source": "Calculated",
-                        "quality": "moderate"
-                    }
+                    metrics["evaporative_stress"] = satellite_overrides["evaporative_stress"]
 
             # Drought index calculation
             sm = metrics.get("soil_moisture", {}).get("value")
@@ -571,9 +817,15 @@ def interpret_drought(value: float) -> str:
 
 
 @router.post("/pdf")
-async def generate_pdf_report(request: QueryRequest, http_request: Request, background_tasks: BackgroundTasks):
+async def generate_pdf_report(request: PdfRequest, http_request: Request, background_tasks: BackgroundTasks):
     """
-    Generate a PDF report for a location.
+    Download the PDF report of a query result.
+
+    The report is built from the result /api/query (or /api/query/polygon)
+    returned, found by query_id or result_hash, so no Earth Engine query
+    runs. Reports render in the PDF worker pool and are cached per result,
+    making repeat downloads a file read. Only when no stored result is found and lat/lon are given
+    is the location queried (comprehensive mode) and logged, as before.
 
     Returns a downloadable PDF with:
     - Location map
@@ -583,56 +835,102 @@ async def generate_pdf_report(request: QueryRequest, http_request: Request, back
     - Recommendations
     """
     try:
-        # Get client IP
-        client_ip = None
-        if http_request.client:
-            client_ip = http_request.client.host
+        query_id = request.query_id
+        result = await load_result(query_id=query_id, digest=request.result_hash)
+
+        if result is None:
+            if request.lat is None or request.lon is None:
+                raise HTTPException(status_code=404, detail="Query result not found")
+
+            # Get client IP
+            client_ip = None
+            if http_request.client:
+                client_ip = http_request.client.host
+
+            # Query with comprehensive mode for full data
+            result = await aquery_location(
+                lat=request.lat,
+                lon=request.lon,
+                mode="comprehensive",
+                include_scores=True
+            )
 
-        # Query with comprehensive mode for full data
-        result = query_location(
-            lat=request.lat,
-            lon=request.lon,
-            mode="comprehensive",
-            include_scores=True
-        )
+            # Log query with user tracking
+            query_id = await log_query(
+                lat=request.lat,
+                lon=request.lon,
+                result=result,
+                user_id=request.user_id,
+                user_email=request.user_email,
+                report_generated=True,
+                mode="comprehensive",
+                ip_address=client_ip
+            )
 
-        # Generate PDF
-        pdf_path = generate_report_pdf(
-            lat=request.lat,
-            lon=request.lon,
-            data=result
-        )
+        digest = await remember_result(result, query_id)
+        pdf = await render_report(result, digest)
 
-        # Log query with user tracking
-        query_id = await log_query(
-            lat=request.lat,
-            lon=request.lon,
-            result=result,
-            user_id=request.user_id,
-            user_email=request.user_email,
-            report_generated=True,
-            mode="comprehensive",
-            ip_address=client_ip
-        )
+        lat, lon = report_location(result)
+        filename = f"planetary_health_{lat:.4f}_{lon:.4f}.pdf"
 
         # Upload PDF to storage and update record (if user is authenticated)
         if query_id and request.user_id != "anonymous":
-            filename = f"planetary_health_{request.lat:.4f}_{request.lon:.4f}.pdf"
-            pdf_url = await upload_pdf_to_storage(pdf_path, request.user_id, filename)
+            pdf_url = await upload_pdf_to_storage(pdf, request.user_id, filename)
             if pdf_url:
                 await update_pdf_status(query_id, pdf_url, filename)
 
-        return FileResponse(
-            path=pdf_path,
-            filename=f"planetary_health_{request.lat:.4f}_{request.lon:.4f}.pdf",
-            media_type="application/pdf"
+        return Response(
+            content=pdf,
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
 
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Earth Engine query timed out")
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/reports/batch")
+async def generate_report_batch(request: ReportBatchRequest):
+    """
+    Produce many PDF reports in one request, streamed as a ZIP.
+
+    Items are stored query results (query_id or result_hash, no Earth
+    Engine query) or parcels (points or GeoJSON geometry, queried once).
+    Reports are produced concurrently across the PDF worker pool and each
+    is added to the ZIP as soon as it is ready; manifest.json at the end
+    of the archive lists every item's outcome, including failures.
+
+    The X-Batch-Id response header identifies the batch for
+    GET /api/reports/batch/{batch_id} while the ZIP downloads.
+    """
+    batch = create_batch([item.source() for item in request.items])
+    return StreamingResponse(
+        batch.stream_zip(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="planetary_health_reports_{batch.batch_id[:8]}.zip"',
+            "X-Batch-Id": batch.batch_id
+        }
+    )
+
+
+@router.get("/reports/batch/{batch_id}")
+async def get_report_batch_progress(batch_id: str):
+    """
+    Progress of a report batch: counts per state, throughput, and every
+    item's status, ZIP filename or error.
+    """
+    batch = get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch.progress()
+
+
 @router.get("/history", response_model=HistoryResponse)
 async def get_query_history(
     user_id: str = Query(..., description="Firebase user ID"),
@@ -881,13 +1179,17 @@ async def get_imagery(
     """
     try:
         from app.services.imagery import get_imagery_urls
-        data = get_imagery_urls(
+        data = await run_in_ee_executor(
+            get_imagery_urls,
             lat=lat,
             lon=lon,
             buffer_km=buffer_km,
-            image_size=image_size
+            image_size=image_size,
+            timeout=GEE_QUERY_TIMEOUT
         )
         return data
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Imagery generation timed out")
     except ImportError as e:
         raise HTTPException(
             status_code=503,
@@ -11,6 +11,9 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 
+from app.config import GEE_QUERY_TIMEOUT
+from app.services.earth_engine import run_in_ee_executor
+
 router = APIRouter(prefix="/satellite", tags=["satellite"])
 
 
@@ -128,7 +131,9 @@ async def get_all_satellite_images(
     try:
         from app.services.satellite_imagery import get_satellite_images
 
-        images = get_satellite_images(lat, lon, buffer_km)
+        images = await run_in_ee_executor(
+            get_satellite_images, lat, lon, buffer_km, timeout=GEE_QUERY_TIMEOUT
+        )
 
         return AllImagesResponse(
             success=True,
@@ -180,19 +185,10 @@ async def get_satellite_image(
 
         generator = get_image_generator()
 
-        # Get the appropriate image URL
-        if image_type == 'true_color':
-            url = generator.get_true_color_url(lat, lon, buffer_km, dimensions)
-        elif image_type == 'ndvi':
-            url = generator.get_ndvi_url(lat, lon, buffer_km, dimensions)
-        elif image_type == 'lst':
-            url = generator.get_lst_url(lat, lon, buffer_km, dimensions)
-        elif image_type == 'land_cover':
-            url = generator.get_land_cover_url(lat, lon, buffer_km, dimensions)
-        elif image_type == 'forest':
-            url = generator.get_forest_cover_url(lat, lon, buffer_km, dimensions)
-        else:
-            url = None
+        url = await run_in_ee_executor(
+            generator.get_image_url, image_type, lat, lon, buffer_km, dimensions,
+            timeout=GEE_QUERY_TIMEOUT
+        )
 
         return ImageResponse(
             success=url is not None,
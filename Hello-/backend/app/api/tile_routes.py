@@ -0,0 +1,70 @@
+"""
+Raster Tile API Routes.
+
+Endpoints:
+    GET /api/tiles - List tile layers and tile store status
+    GET /api/tiles/{layer}/{z}/{x}/{y}.png - Get one XYZ map tile
+"""
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.config import GEE_QUERY_TIMEOUT, TILE_HTTP_MAX_AGE, TILE_SERVER_ENABLED
+from app.services.earth_engine import run_in_ee_executor
+from app.services.tiles import (
+    TILE_LAYERS,
+    get_cached_tile,
+    get_tile_layers,
+    get_tile_store,
+    is_valid_tile,
+    render_tile,
+)
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+
+def _require_enabled():
+    if not TILE_SERVER_ENABLED:
+        raise HTTPException(status_code=404, detail="Tile server is disabled")
+
+
+@router.get("")
+async def list_tile_layers():
+    """
+    List tile layers with their URL templates and the tile store status.
+    """
+    _require_enabled()
+    return {"layers": get_tile_layers(), "store": get_tile_store().stats()}
+
+
+@router.get("/{layer}/{z}/{x}/{y}.png")
+async def get_tile(layer: str, z: int, x: int, y: int, request: Request):
+    """
+    Get a PNG tile for a static base layer.
+
+    Tiles come from the local tile pyramid; missing tiles are rendered
+    from the layer's raster source once and stored. Responses carry an
+    ETag (If-None-Match is answered with 304) and long-lived
+    Cache-Control headers, since the layers never change.
+    """
+    _require_enabled()
+    if layer not in TILE_LAYERS:
+        raise HTTPException(status_code=404, detail=f"Unknown tile layer: {layer}")
+    if not is_valid_tile(z, x, y):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    tile = get_cached_tile(layer, z, x, y)
+    if tile is None:
+        try:
+            tile = await run_in_ee_executor(
+                render_tile, layer, z, x, y, timeout=GEE_QUERY_TIMEOUT
+            )
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Tile rendering failed: {e}")
+
+    headers = {
+        "ETag": tile.etag,
+        "Cache-Control": f"public, max-age={TILE_HTTP_MAX_AGE}"
+    }
+    if request.headers.get("if-none-match") == tile.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=tile.data, media_type="image/png", headers=headers)
@@ -1,5 +1,6 @@
 """Application configuration."""
 
+import json
 import os
 from pathlib import Path
 
@@ -10,6 +11,15 @@ BASE_DIR = Path(__file__).parent.parent
 EE_PROJECT_ID = os.environ.get("EE_PROJECT_ID")
 EE_SERVICE_ACCOUNT = os.environ.get("EE_SERVICE_ACCOUNT")
 EE_PRIVATE_KEY = os.environ.get("EE_PRIVATE_KEY")
+GEE_QUERY_TIMEOUT = float(os.environ.get("GEE_QUERY_TIMEOUT", 90))  # Deadline per async EE query (seconds)
+QUERY_BATCH_MAX_SITES = int(os.environ.get("QUERY_BATCH_MAX_SITES", 1000))  # Sites per /api/query/batch request
+# Metrics answered by cached external data are always skipped on Earth Engine
+# (see query_planner.py). Opt-in: how long a query also waits for fresh
+# external data before starting its Earth Engine work (0 = start immediately)
+QUERY_PLAN_EXTERNAL_WAIT = float(os.environ.get("QUERY_PLAN_EXTERNAL_WAIT", 0))  # seconds
+
+# Persistent GEE result store, shared by all uvicorn workers ("" disables)
+RESULT_STORE_PATH = os.environ.get("PHQ_RESULT_STORE", str(BASE_DIR / "results_cache.sqlite3"))
 
 # Supabase settings
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
@@ -27,9 +37,38 @@ SENSOR_CACHE_TTL = int(os.environ.get("SENSOR_CACHE_TTL", 1800))  # 30 minutes d
 OPENAQ_API_KEY = os.environ.get("OPENAQ_API_KEY")
 EXTERNAL_API_CACHE_TTL = int(os.environ.get("EXTERNAL_API_CACHE_TTL", 300))  # 5 minutes default
 
+# Shared outbound HTTP connection pool
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", 100))  # Total open connections
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 20))
+HTTP_DNS_CACHE_TTL = int(os.environ.get("HTTP_DNS_CACHE_TTL", 300))  # seconds
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", 30))  # Idle connection lifetime (seconds)
+
+# Imagery thumbnail URL cache. Earth Engine thumbnail ids stay valid for a
+# few hours, so cached URLs expire well before the server forgets them.
+IMAGERY_URL_TTL = int(os.environ.get("IMAGERY_URL_TTL", 7200))  # 2 hours
+IMAGERY_CACHE_MAX_ENTRIES = int(os.environ.get("IMAGERY_CACHE_MAX_ENTRIES", 5000))
+
+# Local tile pyramid for static base layers (/api/tiles)
+TILE_SERVER_ENABLED = os.environ.get("TILE_SERVER_ENABLED", "true").lower() == "true"
+TILE_CACHE_DIR = Path(os.environ.get("TILE_CACHE_DIR", str(BASE_DIR / "tile_cache")))
+TILE_CACHE_MAX_BYTES = int(os.environ.get("TILE_CACHE_MAX_BYTES", 512 * 1024 ** 2))  # Disk budget
+TILE_MAX_ZOOM = int(os.environ.get("TILE_MAX_ZOOM", 14))
+TILE_HTTP_MAX_AGE = int(os.environ.get("TILE_HTTP_MAX_AGE", 7 * 86400))  # Browser cache lifetime (seconds)
+# Optional local rasters per layer, as JSON: {"land_cover": "/data/worldcover.tif"}
+TILE_SOURCES = json.loads(os.environ.get("TILE_SOURCES", "{}"))
+
 # PDF settings
 PDF_OUTPUT_DIR = BASE_DIR / "temp_pdfs"
 PDF_OUTPUT_DIR.mkdir(exist_ok=True)
+PDF_OUTPUT_MAX_AGE = int(os.environ.get("PDF_OUTPUT_MAX_AGE", 86400))  # Loose files in PDF_OUTPUT_DIR (seconds)
+PDF_CACHE_DIR = Path(os.environ.get("PDF_CACHE_DIR", str(PDF_OUTPUT_DIR / "cache")))  # Rendered reports by result hash
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", 256 * 1024 ** 2))  # Disk budget
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", min(4, os.cpu_count() or 1)))  # Report rendering processes
+REPORT_RESULT_TTL = int(os.environ.get("REPORT_RESULT_TTL", 7 * 86400))  # Stored query results for /api/pdf (seconds)
+REPORT_RESULT_CACHE_ENTRIES = int(os.environ.get("REPORT_RESULT_CACHE_ENTRIES", 1000))  # In-memory, without a result store
+REPORT_BATCH_MAX_ITEMS = int(os.environ.get("REPORT_BATCH_MAX_ITEMS", 500))  # Reports per /api/reports/batch request
+REPORT_BATCH_CONCURRENCY = int(os.environ.get("REPORT_BATCH_CONCURRENCY", 2 * PDF_RENDER_WORKERS))  # Reports in progress per batch
+REPORT_BATCH_TTL = int(os.environ.get("REPORT_BATCH_TTL", 3600))  # Progress kept after a batch finishes (seconds)
 
 # Supabase Storage bucket for PDFs
 SUPABASE_STORAGE_BUCKET = os.environ.get("SUPABASE_STORAGE_BUCKET", "phi-reports")
@@ -42,3 +81,6 @@ DASHBOARD_DB_PATH = BASE_DIR / "dashboard.db"
 DASHBOARD_REALTIME_CACHE_TTL = int(os.environ.get("DASHBOARD_REALTIME_CACHE_TTL", 60))  # 1 minute
 DASHBOARD_SATELLITE_CACHE_TTL = int(os.environ.get("DASHBOARD_SATELLITE_CACHE_TTL", 86400))  # 24 hours
 DASHBOARD_POLL_INTERVAL = int(os.environ.get("DASHBOARD_POLL_INTERVAL", 300))  # 5 minutes
+SATELLITE_SERIES_YEARS = int(os.environ.get("SATELLITE_SERIES_YEARS", 5))  # Default series length
+SATELLITE_SERIES_REFETCH_PERIODS = int(os.environ.get("SATELLITE_SERIES_REFETCH_PERIODS", 3))  # Trailing periods re-fetched (MODIS reprocessing)
+SATELLITE_SERIES_COORD_PRECISION = int(os.environ.get("SATELLITE_SERIES_COORD_PRECISION", 3))  # Decimals of stored series locations
@@ -21,15 +21,40 @@ from app.api import sensor_routes
 from app.api import satellite_routes
 from app.api import dashboard_routes
 from app.api import admin_routes
+from app.api import tile_routes
 from app.services.earth_engine import initialize_ee
 from app.services.dashboard_service import get_dashboard_service
 from app.services.admin_service import get_admin_service
-from app.config import PDF_OUTPUT_DIR
+from app.services.http_pool import open_http_pools, close_http_pools
+from app.config import PDF_OUTPUT_DIR, PDF_OUTPUT_MAX_AGE, RESULT_STORE_PATH
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - initialize services on startup."""
+    # Open the persistent result store before any engine is created
+    from planetary_health_query.utils import configure_result_store
+    try:
+        result_store = configure_result_store(RESULT_STORE_PATH or None)
+        if result_store is not None:
+            print(f"Result store: {result_store.path}")
+    except Exception as e:
+        print(f"Warning: Result store unavailable, caching in memory only: {e}")
+        configure_result_store(None)
+
+    # Shared outbound HTTP pools (external APIs, geocoding)
+    await open_http_pools()
+
+    # Start the PDF workers now, and drop report files left by old runs
+    from app.services.pdf_renderer import warm_render_pool
+    from app.services.pdf_store import get_pdf_store, remove_stale_files
+    try:
+        warm_render_pool()
+        get_pdf_store()
+        remove_stale_files(PDF_OUTPUT_DIR, PDF_OUTPUT_MAX_AGE)
+    except Exception as e:
+        print(f"Warning: PDF renderer setup failed: {e}")
+
     print("Initializing Earth Engine...")
     try:
         # Run in thread with timeout to prevent blocking startup
@@ -77,6 +102,14 @@ async def lifespan(app: FastAPI):
     yield
     print("Shutting down...")
 
+    # Release the shared Earth Engine worker pools
+    from planetary_health_query.core import shutdown_runtime
+    shutdown_runtime(wait=False)
+    from app.services.pdf_renderer import shutdown_render_pool
+    shutdown_render_pool()
+    configure_result_store(None)
+    await close_http_pools()
+
 
 app = FastAPI(
     title="Planetary Health API",
@@ -92,6 +125,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Batch-Id"],  # Report batch progress (/api/reports/batch)
 )
 
 # Mount static files for PDF downloads
@@ -103,6 +137,7 @@ app.include_router(sensor_routes.router, prefix="/api", tags=["Sensor Data"])
 app.include_router(satellite_routes.router, prefix="/api", tags=["Satellite Imagery"])
 app.include_router(dashboard_routes.router, prefix="/api", tags=["Dashboard"])
 app.include_router(admin_routes.router, prefix="/api", tags=["Admin"])
+app.include_router(tile_routes.router, prefix="/api", tags=["Map Tiles"])
 
 
 @app.get("/")
@@ -122,6 +157,10 @@ async def root():
                 "legend": "/api/satellite/legend",
                 "types": "/api/satellite/types"
             },
+            "tiles": {
+                "layers": "/api/tiles",
+                "tile": "/api/tiles/{layer}/{z}/{x}/{y}.png"
+            },
             "sensors": {
                 "indoor_readings": "/api/sensors/indoor/readings",
                 "outdoor_readings": "/api/sensors/outdoor/readings",
@@ -141,6 +180,7 @@ async def root():
                 "weather_history": "/api/dashboard/weather/history",
                 "aqi_history": "/api/dashboard/aqi/history",
                 "satellite_history": "/api/dashboard/satellite/history",
+                "satellite_series": "/api/dashboard/satellite/series",
                 "status": "/api/dashboard/status"
             },
             "admin": {
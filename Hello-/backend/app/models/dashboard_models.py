@@ -5,6 +5,7 @@ Provides async database access for storing and retrieving:
 - Weather readings (from Open-Meteo)
 - Air quality readings (from Open-Meteo)
 - Satellite data snapshots (from GEE)
+- Per-period satellite metric series (from GEE, refreshed incrementally)
 - Historical trends
 """
 
@@ -117,6 +118,20 @@ class DashboardDatabase:
                 )
             """)
 
+            # Per-location, per-metric satellite series (one row per period)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS satellite_series (
+                    latitude REAL NOT NULL,
+                    longitude REAL NOT NULL,
+                    metric TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    period_start TEXT NOT NULL,
+                    value REAL,
+                    fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (latitude, longitude, period, metric, period_start)
+                )
+            """)
+
             # Create indexes for efficient time-based queries
             await db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_weather_timestamp
@@ -474,6 +489,131 @@ class DashboardDatabase:
             row = await cursor.fetchone()
             return dict(row) if row else None
 
+    # ==================== SATELLITE SERIES OPERATIONS ====================
+
+    async def store_series(
+        self,
+        lat: float,
+        lon: float,
+        period: str,
+        series: Dict[str, Any]
+    ) -> int:
+        """
+        Store per-period metric values, replacing periods already stored.
+
+        Args:
+            lat: Latitude (series location key)
+            lon: Longitude (series location key)
+            period: "month" or "year"
+            series: Columnar series from GEEQueryEngine.query_time_series()
+
+        Returns:
+            Number of values written
+        """
+        await self.ensure_initialized()
+
+        dates = series.get("dates", [])
+        rows = [
+            (lat, lon, metric, period, date, value)
+            for metric, values in series.get("metrics", {}).items()
+            for date, value in zip(dates, values)
+            if date
+        ]
+        if not rows:
+            return 0
+
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany("""
+                INSERT INTO satellite_series (
+                    latitude, longitude, metric, period, period_start, value
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (latitude, longitude, period, metric, period_start)
+                DO UPDATE SET value = excluded.value, fetched_at = CURRENT_TIMESTAMP
+            """, rows)
+            await db.commit()
+        return len(rows)
+
+    async def get_series(
+        self,
+        lat: float,
+        lon: float,
+        period: str,
+        since: Optional[str] = None,
+        metrics: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get stored series in the engine's columnar format.
+
+        Args:
+            lat: Latitude (series location key)
+            lon: Longitude (series location key)
+            period: "month" or "year"
+            since: First period start (YYYY-MM-DD) to include
+            metrics: Metric names (None = all stored)
+
+        Returns:
+            Dict with "period", "dates" and one value list per metric
+            under "metrics" (None where a period is missing)
+        """
+        await self.ensure_initialized()
+
+        query = """
+            SELECT metric, period_start, value FROM satellite_series
+            WHERE latitude = ? AND longitude = ? AND period = ?
+            AND period_start >= ?
+        """
+        params: List[Any] = [lat, lon, period, since or ""]
+        if metrics:
+            query += f" AND metric IN ({', '.join('?' for _ in metrics)})"
+            params.extend(metrics)
+
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(query + " ORDER BY period_start", params)
+            rows = await cursor.fetchall()
+
+        dates = sorted({row[1] for row in rows})
+        position = {date: i for i, date in enumerate(dates)}
+        values: Dict[str, List[Optional[float]]] = {}
+        for metric in metrics or []:
+            values[metric] = [None] * len(dates)
+        for metric, date, value in rows:
+            values.setdefault(metric, [None] * len(dates))[position[date]] = value
+
+        return {
+            "period": period,
+            "dates": dates,
+            "metrics": values
+        }
+
+    async def get_series_state(
+        self,
+        lat: float,
+        lon: float,
+        period: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the stored extent of each metric's series.
+
+        Returns:
+            Dict mapping metric names to first_period, last_period and
+            fetched_at (UTC time of the latest write)
+        """
+        await self.ensure_initialized()
+
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            cursor = await db.execute("""
+                SELECT metric,
+                       MIN(period_start) AS first_period,
+                       MAX(period_start) AS last_period,
+                       MAX(fetched_at) AS fetched_at
+                FROM satellite_series
+                WHERE latitude = ? AND longitude = ? AND period = ?
+                GROUP BY metric
+            """, (lat, lon, period))
+            rows = await cursor.fetchall()
+            return {row["metric"]: dict(row) for row in rows}
+
     # ==================== LOCATION OPERATIONS ====================
 
     async def add_location(
@@ -542,7 +682,8 @@ class DashboardDatabase:
         stats = {}
 
         async with aiosqlite.connect(self.db_path) as db:
-            for table in ["weather_readings", "air_quality_readings", "satellite_readings", "dashboard_locations"]:
+            for table in ["weather_readings", "air_quality_readings", "satellite_readings",
+                          "satellite_series", "dashboard_locations"]:
                 cursor = await db.execute(f"SELECT COUNT(*) FROM {table}")
                 row = await cursor.fetchone()
                 stats[f"{table}_count"] = row[0] if row else 0
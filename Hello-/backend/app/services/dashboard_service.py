@@ -11,7 +11,7 @@ All existing classes are IMPORTED, not recreated.
 
 import asyncio
 import sys
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
@@ -20,6 +20,14 @@ from app.services.external_apis.open_meteo import OpenMeteoAPI
 from app.services.external_apis.open_meteo_weather import OpenMeteoWeatherAPI
 from app.services.external_apis.cache import ExternalAPICache
 
+from app.config import (
+    GEE_QUERY_TIMEOUT,
+    DASHBOARD_SATELLITE_CACHE_TTL,
+    SATELLITE_SERIES_YEARS,
+    SATELLITE_SERIES_REFETCH_PERIODS,
+    SATELLITE_SERIES_COORD_PRECISION
+)
+
 # Import dashboard database
 from app.models.dashboard_models import DashboardDatabase, get_dashboard_db
 
@@ -40,12 +48,12 @@ _gee_engine = None
 
 
 def get_gee_engine():
-    """Lazy initialization of GEE Query Engine."""
+    """Lazy initialization of the process-wide GEE Query Engine."""
     global _gee_engine
     if _gee_engine is None:
         try:
-            from planetary_health_query import GEEQueryEngine
-            _gee_engine = GEEQueryEngine(auto_init=True)
+            from planetary_health_query import get_engine
+            _gee_engine = get_engine(auto_init=True)
             print("GEE Query Engine initialized for dashboard")
         except Exception as e:
             print(f"Warning: GEE initialization failed: {e}")
@@ -53,6 +61,17 @@ def get_gee_engine():
     return _gee_engine
 
 
+def _shift_periods(start: date, period: str, count: int) -> date:
+    """Move a period start by count months or years (negative = back)."""
+    months = start.year * 12 + start.month - 1 + count * (12 if period == "year" else 1)
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _period_floor(day: date, period: str) -> date:
+    """Start of the month or year containing day."""
+    return date(day.year, 1 if period == "year" else day.month, 1)
+
+
 class UnifiedDashboardService:
     """
     Unified service that combines ALL data sources for a location.
@@ -245,15 +264,16 @@ class UnifiedDashboardService:
             }
 
         try:
-            # Query GEE (this takes 15-30 seconds)
-            result = engine.query(
-                lat=lat,
-                lon=lon,
+            # Query GEE in a single batched round trip, off the event loop
+            result = await engine.aquery(
+                lat,
+                lon,
+                timeout=GEE_QUERY_TIMEOUT,
                 mode=mode,
                 temporal="latest",
                 include_scores=True,
                 include_raw=True,
-                parallel=True
+                batched=True
             )
 
             satellite_data = {
@@ -284,6 +304,13 @@ class UnifiedDashboardService:
 
             return satellite_data
 
+        except asyncio.TimeoutError:
+            return {
+                "available": False,
+                "source": "google_earth_engine",
+                "error": "Earth Engine query timed out",
+                "cached": False
+            }
         except Exception as e:
             return {
                 "available": False,
@@ -378,6 +405,96 @@ class UnifiedDashboardService:
         """Get historical satellite readings from SQLite."""
         return await self.db.get_satellite_history(lat, lon, days)
 
+    async def get_satellite_series(
+        self,
+        lat: float,
+        lon: float,
+        period: str = "month",
+        years: int = SATELLITE_SERIES_YEARS,
+        metrics: Optional[List[str]] = None,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get per-period satellite metric series, refreshed incrementally.
+
+        Series are stored per location and metric in SQLite. Earth Engine
+        is only asked for the periods after the last stored one, plus
+        SATELLITE_SERIES_REFETCH_PERIODS trailing periods to pick up late
+        MODIS reprocessing. Within DASHBOARD_SATELLITE_CACHE_TTL of the last
+        refresh the series is served from SQLite alone.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            period: "month" or "year"
+            years: Years of history to return
+            metrics: Metric names (None = every time-varying metric)
+            force_refresh: Refresh the trailing periods even if recent
+
+        Returns:
+            Columnar series ("dates" and one value list per metric) with
+            the source and number of periods fetched from Earth Engine
+        """
+        lat = round(lat, SATELLITE_SERIES_COORD_PRECISION)
+        lon = round(lon, SATELLITE_SERIES_COORD_PRECISION)
+
+        today = datetime.now().date()
+        start = _shift_periods(_period_floor(today, period), "year", -years)
+
+        # Only fetch what storage does not cover
+        state = await self.db.get_series_state(lat, lon, period)
+        wanted = metrics or list(state)
+        covered = bool(wanted) and all(
+            m in state and state[m]["first_period"] <= start.isoformat()
+            for m in wanted
+        )
+        fetch_from = start
+        if covered:
+            last_fetch = datetime.fromisoformat(min(state[m]["fetched_at"] for m in wanted))
+            age = (datetime.utcnow() - last_fetch).total_seconds()
+            if age < DASHBOARD_SATELLITE_CACHE_TTL and not force_refresh:
+                fetch_from = None
+            else:
+                last_period = date.fromisoformat(min(state[m]["last_period"] for m in wanted))
+                fetch_from = max(
+                    start,
+                    _shift_periods(last_period, period, -SATELLITE_SERIES_REFETCH_PERIODS)
+                )
+
+        fetched = 0
+        warning = None
+        if fetch_from is not None:
+            engine = get_gee_engine()
+            if engine is None:
+                warning = "GEE unavailable, serving stored series"
+            else:
+                try:
+                    series = await engine.aquery_time_series(
+                        lat,
+                        lon,
+                        timeout=GEE_QUERY_TIMEOUT,
+                        date_range=(fetch_from.isoformat(), (today + timedelta(days=1)).isoformat()),
+                        period=period,
+                        metrics=metrics
+                    )
+                    await self.db.store_series(lat, lon, period, series)
+                    fetched = len(series.get("dates", []))
+                except asyncio.TimeoutError:
+                    warning = "Earth Engine query timed out, serving stored series"
+                except Exception as e:
+                    warning = f"Series refresh failed ({e}), serving stored series"
+
+        stored = await self.db.get_series(lat, lon, period, start.isoformat(), metrics)
+        stored.update({
+            "location": {"latitude": lat, "longitude": lon},
+            "source": "google_earth_engine" if fetched else "sqlite",
+            "fetched_periods": fetched,
+            "stored_periods": len(stored["dates"]) - fetched
+        })
+        if warning:
+            stored["warning"] = warning
+        return stored
+
     # ==================== POLLING ====================
 
     async def start_polling(
@@ -11,9 +11,11 @@ Features:
 
 import os
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from pathlib import Path
-import httpx
+
+from app.services.http_pool import get_http_client
+from app.services.singleflight import AsyncSingleFlight
 
 
 # Supabase client (initialized lazily)
@@ -46,12 +48,17 @@ def get_supabase():
         return None
 
 
+# Concurrent lookups of the same coordinates share one Nominatim request
+_geocode_flights = AsyncSingleFlight("reverse_geocode")
+
+
 async def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     """
     Reverse geocode coordinates to location name using Nominatim (OpenStreetMap).
 
     Free service - no API key required.
     Rate limit: 1 request/second (we're okay for our use case).
+    Identical lookups already in flight are coalesced into one request.
 
     Args:
         lat: Latitude
@@ -60,44 +67,49 @@ async def reverse_geocode(lat: float, lon: float) -> Optional[str]:
     Returns:
         Location name or None if failed
     """
+    return await _geocode_flights.do((lat, lon), _reverse_geocode, lat, lon)
+
+
+async def _reverse_geocode(lat: float, lon: float) -> Optional[str]:
+    """Nominatim lookup behind reverse_geocode()."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://nominatim.openstreetmap.org/reverse",
-                params={
-                    "lat": lat,
-                    "lon": lon,
-                    "format": "json",
-                    "zoom": 10,  # City-level detail
-                    "addressdetails": 1
-                },
-                headers={"User-Agent": "ErthalokaPHI/1.0 (contact@erthaloka.com)"},
-                timeout=5.0
-            )
+        client = get_http_client()
+        response = await client.get(
+            "https://nominatim.openstreetmap.org/reverse",
+            params={
+                "lat": lat,
+                "lon": lon,
+                "format": "json",
+                "zoom": 10,  # City-level detail
+                "addressdetails": 1
+            },
+            headers={"User-Agent": "ErthalokaPHI/1.0 (contact@erthaloka.com)"},
+            timeout=5.0
+        )
 
-            if response.status_code == 200:
-                data = response.json()
+        if response.status_code == 200:
+            data = response.json()
 
-                # Try to build a readable location name
-                address = data.get("address", {})
+            # Try to build a readable location name
+            address = data.get("address", {})
 
-                # Priority: city -> town -> village -> county -> state
-                city = (
-                    address.get("city") or
-                    address.get("town") or
-                    address.get("village") or
-                    address.get("municipality") or
-                    address.get("county")
-                )
-                state = address.get("state") or address.get("region")
-                country = address.get("country")
+            # Priority: city -> town -> village -> county -> state
+            city = (
+                address.get("city") or
+                address.get("town") or
+                address.get("village") or
+                address.get("municipality") or
+                address.get("county")
+            )
+            state = address.get("state") or address.get("region")
+            country = address.get("country")
 
-                parts = [p for p in [city, state, country] if p]
-                if parts:
-                    return ", ".join(parts)
+            parts = [p for p in [city, state, country] if p]
+            if parts:
+                return ", ".join(parts)
 
-                # Fallback to display_name
-                return data.get("display_name")
+            # Fallback to display_name
+            return data.get("display_name")
 
     except Exception as e:
         print(f"Reverse geocoding failed: {e}")
@@ -114,7 +126,9 @@ async def log_query(
     report_generated: bool = False,
     user_agent: str = "web",
     ip_address: Optional[str] = None,
-    mode: str = "comprehensive"
+    mode: str = "comprehensive",
+    location_name: Optional[str] = None,
+    lookup_location: bool = True
 ) -> Optional[str]:
     """
     Log a query to Supabase with user tracking.
@@ -129,6 +143,9 @@ async def log_query(
         user_agent: Client identifier
         ip_address: Client IP address
         mode: Query mode (simple/comprehensive)
+        location_name: Location name, when already looked up
+        lookup_location: Reverse geocode the location (skipped when the
+                         caller already did, even if that lookup failed)
 
     Returns:
         Query ID (UUID) or None if failed
@@ -145,7 +162,8 @@ async def log_query(
         summary = result.get("summary", {})
 
         # Get location name asynchronously
-        location_name = await reverse_geocode(lat, lon)
+        if lookup_location and location_name is None:
+            location_name = await reverse_geocode(lat, lon)
 
         data = {
             # User identification
@@ -359,7 +377,7 @@ async def mark_pdf_downloaded(query_id: str) -> bool:
 
 
 async def upload_pdf_to_storage(
-    file_path: Path,
+    pdf: Union[Path, str, bytes],
     user_id: str,
     filename: str
 ) -> Optional[str]:
@@ -367,7 +385,7 @@ async def upload_pdf_to_storage(
     Upload PDF to Supabase Storage.
 
     Args:
-        file_path: Local path to PDF file
+        pdf: The PDF document, or a local path to it
         user_id: User ID for organizing storage
         filename: Desired filename
 
@@ -383,8 +401,11 @@ async def upload_pdf_to_storage(
         bucket_name = os.environ.get("SUPABASE_STORAGE_BUCKET", "phi-reports")
         storage_path = f"reports/{user_id}/{filename}"
 
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
+        if isinstance(pdf, bytes):
+            file_data = pdf
+        else:
+            with open(pdf, 'rb') as f:
+                file_data = f.read()
 
         # Upload to storage
         supabase.storage.from_(bucket_name).upload(
@@ -0,0 +1,157 @@
+"""
+Byte-budgeted on-disk LRU store, the shared base of TileStore and PdfStore.
+
+Subclasses map keys to file paths and list the files already on disk.
+The recency order is kept in memory and mirrored in file modification
+times, so it survives restarts: on startup the files are indexed oldest
+first.
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class DiskLRUStore(ABC):
+    """Thread-safe mapping of keys to files with LRU eviction."""
+
+    # Name of the entry count in stats()
+    entry_name = "entries"
+
+    def __init__(self, root: Path, max_bytes: int):
+        """
+        Args:
+            root: Directory holding the files (created if missing)
+            max_bytes: Disk budget; least recently used files are evicted
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> size in bytes; oldest first
+        self._index: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @abstractmethod
+    def _path(self, key: Hashable) -> Path:
+        """File path of a key."""
+        pass
+
+    @abstractmethod
+    def _scan(self) -> Iterable[Tuple[Hashable, Path]]:
+        """(key, path) of every stored file under root."""
+        pass
+
+    def _load_index(self):
+        """Rebuild the recency index from the files on disk."""
+        found = []
+        for key, path in self._scan():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, key, stat.st_size))
+
+        for _, key, size in sorted(found, key=lambda item: item[0]):
+            self._index[key] = size
+            self._bytes += size
+        self._evict()
+
+    def read(self, key: Hashable) -> Optional[bytes]:
+        """
+        Read a file and mark it most recently used.
+
+        Returns:
+            The file contents, or None if it is not stored
+        """
+        with self._lock:
+            if key not in self._index:
+                self._misses += 1
+                return None
+            self._index.move_to_end(key)
+            self._hits += 1
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            # Removed behind our back; treat as a miss
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._bytes -= size
+            return None
+        return data
+
+    def write(self, key: Hashable, data: bytes):
+        """Store a file, evicting least recently used files if over budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so readers never see a partial file
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        """Drop the oldest files until within budget (caller holds the lock)."""
+        while self._bytes > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def remove(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Delete stored files.
+
+        Args:
+            predicate: Only delete keys it returns True for (None = all)
+
+        Returns:
+            Number of files deleted
+        """
+        with self._lock:
+            keys = [key for key in self._index if predicate is None or predicate(key)]
+            for key in keys:
+                self._bytes -= self._index.pop(key)
+                try:
+                    self._path(key).unlink()
+                except OSError:
+                    pass
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return occupancy and hit metrics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "path": str(self.root),
+                self.entry_name: len(self._index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 3) if total else 0.0,
+                "evictions": self._evictions
+            }
@@ -16,6 +16,8 @@ backend_dir = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 sys.path.insert(0, str(backend_dir.parent))  # For planetary_health_query package
 
+from app.config import GEE_QUERY_TIMEOUT
+
 _initialized = False
 
 
@@ -83,6 +85,20 @@ def is_initialized() -> bool:
     return _initialized
 
 
+def get_shared_engine():
+    """
+    Get the process-wide GEEQueryEngine.
+
+    Earth Engine itself is initialized by initialize_ee() in this module, so
+    the engine is only marked as ready rather than initialized again.
+    """
+    from planetary_health_query import get_engine
+
+    engine = get_engine(auto_init=False)
+    engine._initialized = True  # Already initialized
+    return engine
+
+
 def query_location(
     lat: float,
     lon: float,
@@ -107,10 +123,7 @@ def query_location(
         initialize_ee()
 
     try:
-        from planetary_health_query import GEEQueryEngine
-
-        engine = GEEQueryEngine(auto_init=False)  # Already initialized
-        engine._initialized = True
+        engine = get_shared_engine()
 
         result = engine.query(
             lat=lat,
@@ -119,7 +132,8 @@ def query_location(
             include_scores=include_scores,
             include_raw=True,
             temporal="latest",
-            buffer_radius=500
+            buffer_radius=500,
+            batched=True
         )
 
         return result
@@ -135,10 +149,11 @@ def query_polygon(
     include_scores: bool = True
 ) -> dict:
     """
-    Query satellite data for a polygon area defined by 4 corner points.
+    Query satellite data for a parcel of any shape.
 
     Args:
-        points: List of 4 dicts with 'lat' and 'lng' keys
+        points: Vertices (dicts with 'lat' and 'lng' keys, 3 or more), or a
+                GeoJSON Polygon/MultiPolygon geometry or Feature
         mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
         include_scores: Include pillar health scores
 
@@ -151,10 +166,7 @@ def query_polygon(
         initialize_ee()
 
     try:
-        from planetary_health_query import GEEQueryEngine
-
-        engine = GEEQueryEngine(auto_init=False)  # Already initialized
-        engine._initialized = True
+        engine = get_shared_engine()
 
         result = engine.query_polygon(
             points=points,
@@ -171,16 +183,237 @@ def query_polygon(
         return create_polygon_demo_response(points, mode)
 
 
-def create_polygon_demo_response(points: list, mode: str) -> dict:
+def polygon_centroid(points) -> tuple:
+    """
+    Area-weighted centroid of a parcel, computed locally (no Earth Engine).
+
+    Args:
+        points: Vertices or a GeoJSON Polygon/MultiPolygon (see query_polygon())
+
+    Returns:
+        (lat, lng) tuple
+
+    Raises:
+        ValueError: If the geometry is invalid
+    """
+    try:
+        from planetary_health_query.utils import PolygonGeometry
+    except ImportError:
+        # Fallback if package not available
+        centroid = create_polygon_demo_response(points, "simple")["query"]["centroid"]
+        return centroid["latitude"], centroid["longitude"]
+
+    centroid = PolygonGeometry(points).centroid
+    return centroid["lat"], centroid["lng"]
+
+
+async def run_in_ee_executor(func, *args, timeout: float = None, **kwargs):
+    """
+    Run a blocking Earth Engine call without blocking the event loop.
+
+    Uses the bounded executor shared with GEEQueryEngine.aquery().
+    """
+    from planetary_health_query.core import run_in_query_executor
+
+    return await run_in_query_executor(func, *args, timeout=timeout, **kwargs)
+
+
+def rescore_result(result: dict) -> dict:
+    """
+    Recompute scores after metrics were merged into a query result.
+
+    See GEEQueryEngine.rescore(); demo responses are returned unchanged.
+    """
+    try:
+        engine = get_shared_engine()
+    except ImportError:
+        return result
+    return engine.rescore(result)
+
+
+async def aquery_location(
+    lat: float,
+    lon: float,
+    mode: str = "simple",
+    include_scores: bool = True,
+    timeout: float = GEE_QUERY_TIMEOUT,
+    provided: dict = None
+) -> dict:
+    """
+    Async version of query_location() for use in request handlers.
+
+    Args:
+        lat: Latitude (-90 to 90)
+        lon: Longitude (-180 to 180)
+        mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
+        include_scores: Include pillar health scores
+        timeout: Deadline in seconds
+        provided: Metric results from external sources, not queried on
+                  Earth Engine (see app/services/query_planner.py)
+
+    Returns:
+        Dict with pillar data and summary
+
+    Raises:
+        asyncio.TimeoutError: If the query exceeds the deadline
+    """
+    if not _initialized:
+        await run_in_ee_executor(initialize_ee, timeout=timeout)
+
+    try:
+        engine = get_shared_engine()
+    except ImportError:
+        # Fallback if package not available
+        return create_demo_response(lat, lon, mode)
+
+    return await engine.aquery(
+        lat,
+        lon,
+        timeout=timeout,
+        mode=mode,
+        include_scores=include_scores,
+        include_raw=True,
+        temporal="latest",
+        buffer_radius=500,
+        batched=True,
+        provided=provided
+    )
+
+
+async def aquery_polygon(
+    points: list,
+    mode: str = "comprehensive",
+    include_scores: bool = True,
+    timeout: float = GEE_QUERY_TIMEOUT,
+    provided: dict = None
+) -> dict:
+    """
+    Async version of query_polygon() for use in request handlers.
+
+    Args:
+        points: Vertices or a GeoJSON Polygon/MultiPolygon (see query_polygon())
+        mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
+        include_scores: Include pillar health scores
+        timeout: Deadline in seconds
+        provided: Metric results from external sources, not queried on
+                  Earth Engine (see app/services/query_planner.py)
+
+    Returns:
+        Dict with pillar data, summary, area info, carbon credits, and ESV
+
+    Raises:
+        asyncio.TimeoutError: If the query exceeds the deadline
+    """
+    if not _initialized:
+        await run_in_ee_executor(initialize_ee, timeout=timeout)
+
+    try:
+        engine = get_shared_engine()
+    except ImportError:
+        # Fallback if package not available
+        return create_polygon_demo_response(points, mode)
+
+    return await engine.aquery_polygon(
+        points,
+        timeout=timeout,
+        mode=mode,
+        include_scores=include_scores,
+        include_raw=True,
+        temporal="latest",
+        provided=provided
+    )
+
+
+async def ascore_raster(
+    points: list,
+    scale: int = 100,
+    mode: str = "comprehensive",
+    ecosystem_type: str = None,
+    timeout: float = GEE_QUERY_TIMEOUT
+) -> dict:
+    """
+    Score a polygon per pixel on Earth Engine (see GEEQueryEngine.score_raster).
+
+    Args:
+        points: Polygon vertices, dicts with 'lat' and 'lng' keys (3 or more)
+        scale: Pixel size in meters for the statistics
+        mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
+        ecosystem_type: Fixed ecosystem weights (None = detect per pixel)
+        timeout: Deadline in seconds
+
+    Returns:
+        Dict with per-band statistics, a summary and heatmap tile URLs
+
+    Raises:
+        asyncio.TimeoutError: If the query exceeds the deadline
+    """
+    if not _initialized:
+        await run_in_ee_executor(initialize_ee, timeout=timeout)
+
+    engine = get_shared_engine()
+    return await engine.ascore_raster(
+        points,
+        timeout=timeout,
+        scale=scale,
+        mode=mode,
+        ecosystem_type=ecosystem_type
+    )
+
+
+async def aquery_many_locations(
+    sites: list,
+    mode: str = "simple",
+    include_scores: bool = True,
+    buffer_radius: int = 500,
+    timeout: float = GEE_QUERY_TIMEOUT
+):
+    """
+    Query many locations, yielding each result as soon as its batch is done.
+
+    Args:
+        sites: List of dicts with 'lat', 'lon' and an optional 'id'
+        mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
+        include_scores: Include pillar health scores
+        buffer_radius: Radius in meters for spatial averaging
+        timeout: Deadline in seconds per batch of sites
+
+    Yields:
+        Per-site result dicts with a "site" entry (index and id)
+    """
+    if not _initialized:
+        await run_in_ee_executor(initialize_ee, timeout=timeout)
+
+    engine = get_shared_engine()
+    async for site_result in engine.aquery_many(
+        sites,
+        timeout=timeout,
+        mode=mode,
+        include_scores=include_scores,
+        include_raw=True,
+        temporal="latest",
+        buffer_radius=buffer_radius
+    ):
+        yield site_result
+
+
+def create_polygon_demo_response(points, mode: str) -> dict:
     """Create demo response for polygon query when Earth Engine is not available."""
     from datetime import datetime
     import math
 
+    # GeoJSON input: approximate with the first exterior ring
+    if isinstance(points, dict):
+        geometry = points.get("geometry") or points
+        rings = geometry["coordinates"]
+        if geometry.get("type") == "MultiPolygon":
+            rings = rings[0]
+        points = [{"lat": lat, "lng": lng} for lng, lat, *_ in rings[0][:-1]]
+
     # Calculate approximate area
     lats = [p['lat'] for p in points]
     lngs = [p['lng'] for p in points]
-    centroid_lat = sum(lats) / 4
-    centroid_lng = sum(lngs) / 4
+    centroid_lat = sum(lats) / len(points)
+    centroid_lng = sum(lngs) / len(points)
 
     # Simple area approximation
     lat_range = max(lats) - min(lats)
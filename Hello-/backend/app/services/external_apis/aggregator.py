@@ -17,6 +17,8 @@ from .open_meteo import OpenMeteoAPI
 from .open_meteo_weather import OpenMeteoWeatherAPI
 from .openaq import OpenAQAPI
 from .cache import ExternalAPICache
+from ..http_pool import get_http_pool_stats
+from ..singleflight import AsyncSingleFlight
 
 
 class ExternalDataAggregator:
@@ -42,6 +44,9 @@ class ExternalDataAggregator:
         # Cache instance (10 minute TTL for real-time data)
         self.cache = ExternalAPICache(ttl_seconds=600)
 
+        # Identical in-flight requests for a grid cell share one fetch
+        self._flights = AsyncSingleFlight("external_comprehensive")
+
         # Track which APIs are available
         self._api_status = {
             "open_meteo": True,  # Always available (no auth)
@@ -64,7 +69,7 @@ class ExternalDataAggregator:
         Returns:
             Aggregated air quality data
         """
-        cache_key = self.cache.make_key("aqi", round(lat, 3), round(lon, 3))
+        cache_key = self.cache.make_key("aqi", *self.cache.grid_cell(lat, lon))
 
         # Check cache first
         cached = self.cache.get(cache_key)
@@ -146,7 +151,7 @@ class ExternalDataAggregator:
         Returns:
             UV index data
         """
-        cache_key = self.cache.make_key("uv", round(lat, 3), round(lon, 3))
+        cache_key = self.cache.make_key("uv", *self.cache.grid_cell(lat, lon))
 
         # Check cache
         cached = self.cache.get(cache_key)
@@ -215,7 +220,7 @@ class ExternalDataAggregator:
         Returns:
             Weather data with current, hourly, and daily forecasts
         """
-        cache_key = self.cache.make_key("weather", round(lat, 3), round(lon, 3), forecast_days)
+        cache_key = self.cache.make_key("weather", *self.cache.grid_cell(lat, lon), forecast_days)
 
         # Check cache
         cached = self.cache.get(cache_key)
@@ -246,7 +251,7 @@ class ExternalDataAggregator:
         Returns:
             Soil data from weather API
         """
-        cache_key = self.cache.make_key("soil", round(lat, 3), round(lon, 3))
+        cache_key = self.cache.make_key("soil", *self.cache.grid_cell(lat, lon))
 
         cached = self.cache.get(cache_key)
         if cached is not None:
@@ -312,6 +317,24 @@ class ExternalDataAggregator:
         Returns:
             Comprehensive data from all sources
         """
+        key = self.cache.grid_cell(lat, lon)
+        return await self._flights.do(key, self._fetch_comprehensive_data, lat, lon)
+
+    def get_cached_comprehensive_data(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """
+        Comprehensive data already cached for the point's grid cell, without fetching.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+
+        Returns:
+            Data as returned by get_comprehensive_data(), or None
+        """
+        return self.cache.get(self.cache.make_key("comprehensive", *self.cache.grid_cell(lat, lon)))
+
+    async def _fetch_comprehensive_data(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Fetch air quality, weather and soil data for get_comprehensive_data()."""
         # Fetch all data in parallel
         tasks = [
             self.get_air_quality(lat, lon),
@@ -325,7 +348,7 @@ class ExternalDataAggregator:
         weather = results[1] if not isinstance(results[1], Exception) else {"error": str(results[1])}
         soil = results[2] if not isinstance(results[2], Exception) else {"error": str(results[2])}
 
-        return {
+        data = {
             "air_quality": air_quality,
             "weather": weather,
             "soil": soil,
@@ -334,6 +357,8 @@ class ExternalDataAggregator:
                 (["open_meteo_weather"] if weather.get("available") else [])
             ))
         }
+        self.cache.set(self.cache.make_key("comprehensive", *self.cache.grid_cell(lat, lon)), data)
+        return data
 
     def get_api_status(self) -> Dict[str, Any]:
         """
@@ -360,7 +385,9 @@ class ExternalDataAggregator:
                     "stats": self.openaq.get_stats() if self.openaq else None
                 }
             },
-            "cache_stats": self.cache.get_stats()
+            "cache_stats": self.cache.get_stats(),
+            "http_pool": get_http_pool_stats(),
+            "coalescing": self._flights.stats()
         }
 
     def clear_cache(self) -> Dict[str, Any]:
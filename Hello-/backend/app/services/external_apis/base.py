@@ -2,7 +2,7 @@
 Base class for external API integrations.
 
 Provides common functionality for all external API clients:
-- Async HTTP requests with aiohttp
+- Async HTTP requests over the shared aiohttp connection pool
 - Rate limiting
 - Error handling
 - Response normalization
@@ -14,6 +14,8 @@ from datetime import datetime
 import aiohttp
 import asyncio
 
+from app.services.http_pool import get_http_session
+
 
 class BaseExternalAPI(ABC):
     """Base class for all external API integrations."""
@@ -31,6 +33,18 @@ class BaseExternalAPI(ABC):
         self._request_count = 0
         self._last_reset = datetime.now()
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        HTTP session for requests.
+
+        The application-wide pooled session unless one was injected via
+        _session. Callers must not close it.
+        """
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return get_http_session()
+
     @abstractmethod
     async def fetch_data(self, lat: float, lon: float, **kwargs) -> Dict[str, Any]:
         """
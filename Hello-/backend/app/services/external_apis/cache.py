@@ -5,11 +5,17 @@ Similar to SensorCache but optimized for external API data with:
 - Shorter TTLs (real-time data)
 - Hit/miss statistics
 - Key-based retrieval
+- Grid-cell keys so nearby points share entries
 """
 
 import time
 import hashlib
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+# Grid cell size for location keys (~1 km). External providers serve
+# gridded model output at this resolution or coarser, so every point in a
+# cell gets the same answer.
+GRID_CELL_DEG = 0.01
 
 
 class ExternalAPICache:
@@ -35,6 +41,24 @@ class ExternalAPICache:
         key_data = ":".join(str(a) for a in args)
         return hashlib.md5(key_data.encode()).hexdigest()[:16]
 
+    @staticmethod
+    def grid_cell(lat: float, lon: float, cell_deg: float = GRID_CELL_DEG) -> Tuple[float, float]:
+        """
+        Snap a point to the centre of its grid cell.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            cell_deg: Cell size in degrees
+
+        Returns:
+            (lat, lon) of the cell centre
+        """
+        return (
+            round((lat // cell_deg + 0.5) * cell_deg, 6),
+            round((lon // cell_deg + 0.5) * cell_deg, 6)
+        )
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get cached value if not expired.
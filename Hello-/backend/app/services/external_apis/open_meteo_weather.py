@@ -192,14 +192,13 @@ class OpenMeteoWeatherAPI(BaseExternalAPI):
             params = daily_params or self.DAILY_PARAMETERS
             url_params["daily"] = ",".join(params)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.BASE_URL,
-                params=url_params,
-                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+        async with self.session.get(
+            self.BASE_URL,
+            params=url_params,
+            timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
 
     def normalize_response(self, raw_data: Dict) -> Dict[str, Any]:
         """
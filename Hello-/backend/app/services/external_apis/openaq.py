@@ -63,15 +63,14 @@ class OpenAQAPI(BaseExternalAPI):
             "order_by": "distance"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                self.BASE_URL,
-                params=params,
-                headers=self.headers,
-                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+        async with self.session.get(
+            self.BASE_URL,
+            params=params,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
 
     def normalize_response(self, raw_data: Dict) -> Dict[str, Any]:
         """
@@ -0,0 +1,148 @@
+"""
+Application-scoped HTTP connection pools.
+
+Every outbound call used to open its own client, paying DNS, TCP and TLS
+setup each time. Instead, one pool per client library is shared for the
+life of the process:
+
+- aiohttp session for the external API clients (keep-alive, per-host
+  limits, DNS cache)
+- httpx client for Nominatim geocoding (HTTP/2 when the h2 package is
+  installed, keep-alive otherwise)
+- blocking httpx client for code running on worker threads (tile fills)
+
+The pools are opened in main.py's lifespan and closed on shutdown. They
+are also created lazily on first use, so scripts and tests work without
+the app. A pool is bound to the event loop that created it; a caller on
+a different loop gets a fresh pool.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+import aiohttp
+import httpx
+
+from app.config import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_blocking_client: Optional[httpx.Client] = None
+_blocking_lock = threading.Lock()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it if needed.
+
+    Must be called from a running event loop. Callers must not close the
+    session; use close_http_pools() at shutdown.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        _session_loop = loop
+    return _session
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared httpx client, creating it if needed.
+
+    Negotiates HTTP/2 with servers that support it when h2 is installed.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_LIMIT,
+                max_keepalive_connections=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_expiry=HTTP_KEEPALIVE_TIMEOUT,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+def get_blocking_http_client() -> httpx.Client:
+    """
+    Get the shared blocking httpx client, creating it if needed.
+
+    For worker threads (e.g. Earth Engine executors); safe to share
+    across threads and independent of any event loop.
+    """
+    global _blocking_client
+    with _blocking_lock:
+        if _blocking_client is None or _blocking_client.is_closed:
+            _blocking_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_LIMIT,
+                    max_keepalive_connections=HTTP_POOL_LIMIT_PER_HOST,
+                    keepalive_expiry=HTTP_KEEPALIVE_TIMEOUT,
+                ),
+            )
+        return _blocking_client
+
+
+async def open_http_pools():
+    """Create both pools on the current loop (called at startup)."""
+    get_http_session()
+    get_http_client()
+
+
+async def close_http_pools():
+    """Close all pools, letting in-flight requests finish their reads."""
+    global _session, _session_loop, _client, _client_loop, _blocking_client
+    session, client = _session, _client
+    _session = _session_loop = _client = _client_loop = None
+
+    if session is not None and not session.closed:
+        await session.close()
+        # Give SSL transports a moment to close cleanly
+        await asyncio.sleep(0.25)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+    with _blocking_lock:
+        blocking, _blocking_client = _blocking_client, None
+    if blocking is not None:
+        blocking.close()
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Report pool configuration and whether each pool is open."""
+    return {
+        "limit": HTTP_POOL_LIMIT,
+        "limit_per_host": HTTP_POOL_LIMIT_PER_HOST,
+        "dns_cache_ttl": HTTP_DNS_CACHE_TTL,
+        "keepalive_timeout": HTTP_KEEPALIVE_TIMEOUT,
+        "http2": HTTP2_AVAILABLE,
+        "aiohttp_open": _session is not None and not _session.closed,
+        "httpx_open": _client is not None and not _client.is_closed,
+        "blocking_open": _blocking_client is not None and not _blocking_client.is_closed,
+    }
@@ -9,13 +9,21 @@ Generates visualization tiles/thumbnails from Earth Engine datasets:
 - Forest Cover (Hansen Global Forest Change)
 
 Note: This service generates thumbnails via EE getThumbURL() which provides
-static images suitable for dashboard display.
+static images suitable for dashboard display. Generated URLs are cached
+per grid cell (see imagery_cache.py).
 """
 
 import ee
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from .earth_engine import initialize_ee, is_initialized
+from .imagery_cache import (
+    cache_layer,
+    get_cached_layer,
+    imagery_cache_key,
+    snap_to_cell,
+)
+from planetary_health_query.core import get_ee_limiter, get_pillar_executor
 
 
 # Visualization parameters for different imagery types
@@ -90,6 +98,10 @@ VIS_PARAMS = {
 }
 
 
+# Layers in response order
+LAYERS = ["true_color", "ndvi", "lst", "land_cover", "forest_cover"]
+
+
 def get_imagery_urls(
     lat: float,
     lon: float,
@@ -100,6 +112,11 @@ def get_imagery_urls(
     """
     Generate imagery thumbnail URLs for a location.
 
+    Layers are served from the thumbnail cache when possible. Missing
+    layers are generated together: capture dates for all dated layers
+    are resolved in one request, then the thumbnails are built in
+    parallel.
+
     Args:
         lat: Latitude
         lon: Longitude
@@ -110,14 +127,6 @@ def get_imagery_urls(
     Returns:
         Dict with imagery URLs and metadata
     """
-    if not is_initialized():
-        initialize_ee()
-
-    # Create point and region
-    point = ee.Geometry.Point([lon, lat])
-    buffer_m = buffer_km * 1000
-    region = point.buffer(buffer_m).bounds()
-
     # Date range for recent imagery (last 90 days for most datasets)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=90)
@@ -126,94 +135,253 @@ def get_imagery_urls(
         "end": end_date.strftime("%Y-%m-%d")
     }
 
-    # Generate each imagery type
-    results = {
+    keys = {
+        layer: imagery_cache_key(
+            f"imagery:{layer}", lat, lon, buffer_km, image_size, date_range["end"]
+        )
+        for layer in LAYERS
+    }
+    imagery = {}
+    for layer, key in keys.items():
+        cached = get_cached_layer(key)
+        if cached is not None:
+            imagery[layer] = dict(cached)
+    missing = [layer for layer in LAYERS if layer not in imagery]
+
+    if missing:
+        if not is_initialized():
+            initialize_ee()
+
+        # Create region around the grid cell, so cached layers are valid
+        # for every point in the cell
+        cell_lat, cell_lon = snap_to_cell(lat, lon)
+        point = ee.Geometry.Point([cell_lon, cell_lat])
+        buffer_m = buffer_km * 1000
+        region = point.buffer(buffer_m).bounds()
+
+        generated = _generate_layers(missing, region, date_range, image_size)
+        for layer, value in generated.items():
+            if value.get("available"):
+                cache_layer(keys[layer], value)
+        imagery.update(generated)
+
+    return {
         "location": {"lat": lat, "lon": lon},
         "buffer_km": buffer_km,
         "generated_at": datetime.now().isoformat(),
-        "imagery": {}
+        "imagery": {layer: imagery[layer] for layer in LAYERS},
+        "cache": {"hits": len(LAYERS) - len(missing), "misses": len(missing)}
     }
 
-    try:
-        # 1. True Color (Sentinel-2)
-        results["imagery"]["true_color"] = _get_true_color_url(
-            region, date_range, image_size
-        )
-    except Exception as e:
-        results["imagery"]["true_color"] = {"error": str(e), "available": False}
 
-    try:
-        # 2. NDVI (Sentinel-2)
-        results["imagery"]["ndvi"] = _get_ndvi_url(
-            region, date_range, image_size
-        )
-    except Exception as e:
-        results["imagery"]["ndvi"] = {"error": str(e), "available": False}
+def _generate_layers(
+    layers: List[str],
+    region: ee.Geometry,
+    date_range: Dict[str, str],
+    image_size: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate thumbnails for several layers concurrently.
 
-    try:
-        # 3. LST (MODIS)
-        results["imagery"]["lst"] = _get_lst_url(
-            region, date_range, image_size
-        )
-    except Exception as e:
-        results["imagery"]["lst"] = {"error": str(e), "available": False}
+    Args:
+        layers: Layer names to generate
+        region: Thumbnail region
+        date_range: Recent imagery window
+        image_size: Output image size in pixels
 
-    try:
-        # 4. Land Cover (ESA WorldCover)
-        results["imagery"]["land_cover"] = _get_land_cover_url(
-            region, image_size
-        )
-    except Exception as e:
-        results["imagery"]["land_cover"] = {"error": str(e), "available": False}
+    Returns:
+        Dict mapping layer name to its result (or an error dict)
+    """
+    sources = {
+        layer: _DATED_SOURCES[layer](region, date_range)
+        for layer in layers
+        if layer in _DATED_SOURCES
+    }
 
-    try:
-        # 5. Forest Cover (Hansen)
-        results["imagery"]["forest_cover"] = _get_forest_cover_url(
-            region, image_size
+    # One request for the image counts and capture dates of every dated layer
+    infos: Dict[str, Dict[str, Any]] = {}
+    if sources:
+        try:
+            with get_ee_limiter().slot():
+                infos = ee.Dictionary({
+                    layer: _describe_collection(*source)
+                    for layer, source in sources.items()
+                }).getInfo()
+        except Exception:
+            # Resolve per layer instead, so one failing dataset
+            # doesn't take the others down with it
+            infos = {}
+
+    executor = get_pillar_executor()
+    futures = {
+        layer: executor.submit(
+            _build_layer, layer, region, image_size,
+            sources.get(layer), infos.get(layer)
         )
-    except Exception as e:
-        results["imagery"]["forest_cover"] = {"error": str(e), "available": False}
+        for layer in layers
+    }
 
+    results = {}
+    for layer, future in futures.items():
+        try:
+            results[layer] = future.result()
+        except Exception as e:
+            results[layer] = {"error": str(e), "available": False}
     return results
 
 
-def _get_true_color_url(
+def _build_layer(
+    layer: str,
     region: ee.Geometry,
-    date_range: Dict[str, str],
-    image_size: int
+    image_size: int,
+    source: Optional[Tuple[ee.ImageCollection, ee.ImageCollection, ee.Image]],
+    info: Optional[Dict[str, Any]]
 ) -> Dict[str, Any]:
-    """Generate Sentinel-2 true color composite."""
+    """Build one layer's thumbnail, resolving its metadata if not yet known."""
+    if layer == "land_cover":
+        return _get_land_cover_url(region, image_size)
+    if layer == "forest_cover":
+        return _get_forest_cover_url(region, image_size)
+
+    if info is None:
+        with get_ee_limiter().slot():
+            info = _describe_collection(*source).getInfo()
+    collection = source[1]
+    return _DATED_THUMBNAILS[layer](collection, region, image_size, info)
+
+
+def _thumb_url(image: ee.Image, params: Dict[str, Any]) -> str:
+    """Request a thumbnail URL, holding an Earth Engine call slot."""
+    with get_ee_limiter().slot():
+        return image.getThumbURL(params)
+
+
+def _recent_or_older(
+    recent: ee.ImageCollection,
+    older: ee.ImageCollection
+) -> ee.ImageCollection:
+    """
+    Use the recent collection if it has images, else the older one.
+
+    The choice is made on the server (ee.Algorithms.If), so no size()
+    probe round trip is needed before building the visualization.
+    """
+    return ee.ImageCollection(
+        ee.Algorithms.If(recent.size().gt(0), recent, older)
+    )
+
+
+def _describe_collection(
+    recent: ee.ImageCollection,
+    collection: ee.ImageCollection,
+    dated_image: ee.Image
+) -> ee.Dictionary:
+    """
+    Describe a layer's collection: image count, capture date and window.
+
+    Args:
+        recent: The preferred (recent) collection
+        collection: The collection chosen by _recent_or_older()
+        dated_image: Image whose acquisition date is reported
+
+    Returns:
+        Lazy dictionary with "count", "date" (YYYY-MM-dd or None) and "window"
+    """
+    has_images = collection.size().gt(0)
+    return ee.Dictionary({
+        "count": collection.size(),
+        "date": ee.Algorithms.If(
+            has_images,
+            ee.Date(dated_image.get("system:time_start")).format("YYYY-MM-dd"),
+            None
+        ),
+        "window": ee.Algorithms.If(recent.size().gt(0), "recent", "last_year")
+    })
+
+
+def _true_color_source(
+    region: ee.Geometry,
+    date_range: Dict[str, str]
+) -> Tuple[ee.ImageCollection, ee.ImageCollection, ee.Image]:
+    """Sentinel-2 scenes, least cloudy first."""
     # Get Sentinel-2 surface reflectance
-    collection = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
+    recent = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
         .filterBounds(region) \
         .filterDate(date_range["start"], date_range["end"]) \
         .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20)) \
         .sort("CLOUDY_PIXEL_PERCENTAGE")
 
-    # Get the least cloudy image or median composite
-    count = collection.size().getInfo()
+    # Fallback to older date range
+    older_start = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+    older = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
+        .filterBounds(region) \
+        .filterDate(older_start, date_range["end"]) \
+        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 30)) \
+        .sort("CLOUDY_PIXEL_PERCENTAGE")
+
+    # Dated by the least cloudy image
+    collection = _recent_or_older(recent, older)
+    return recent, collection, collection.first()
 
-    if count == 0:
-        # Fallback to older date range
-        older_start = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-        collection = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
-            .filterBounds(region) \
-            .filterDate(older_start, date_range["end"]) \
-            .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 30)) \
-            .sort("CLOUDY_PIXEL_PERCENTAGE")
-        count = collection.size().getInfo()
 
-    if count == 0:
+def _ndvi_source(
+    region: ee.Geometry,
+    date_range: Dict[str, str]
+) -> Tuple[ee.ImageCollection, ee.ImageCollection, ee.Image]:
+    """Sentinel-2 scenes for the NDVI composite."""
+    recent = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
+        .filterBounds(region) \
+        .filterDate(date_range["start"], date_range["end"]) \
+        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20))
+
+    older_start = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+    older = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
+        .filterBounds(region) \
+        .filterDate(older_start, date_range["end"]) \
+        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 30))
+
+    # Approximate date (median doesn't have a single date)
+    collection = _recent_or_older(recent, older)
+    return recent, collection, collection.sort("system:time_start", False).first()
+
+
+def _lst_source(
+    region: ee.Geometry,
+    date_range: Dict[str, str]
+) -> Tuple[ee.ImageCollection, ee.ImageCollection, ee.Image]:
+    """MODIS LST composites."""
+    recent = ee.ImageCollection("MODIS/061/MOD11A2") \
+        .filterBounds(region) \
+        .filterDate(date_range["start"], date_range["end"]) \
+        .select("LST_Day_1km")
+
+    older_start = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+    older = ee.ImageCollection("MODIS/061/MOD11A2") \
+        .filterBounds(region) \
+        .filterDate(older_start, date_range["end"]) \
+        .select("LST_Day_1km")
+
+    # Approximate date
+    collection = _recent_or_older(recent, older)
+    return recent, collection, collection.sort("system:time_start", False).first()
+
+
+def _get_true_color_url(
+    collection: ee.ImageCollection,
+    region: ee.Geometry,
+    image_size: int,
+    info: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Generate Sentinel-2 true color composite."""
+    if not info["count"]:
         return {"error": "No imagery available", "available": False}
 
+    # Get the least cloudy image
     image = collection.first()
 
-    # Get image date
-    image_date = ee.Date(image.get("system:time_start")).format("YYYY-MM-dd").getInfo()
-
     # Generate thumbnail URL
     vis_params = VIS_PARAMS["true_color"]
-    url = image.getThumbURL({
+    url = _thumb_url(image, {
         "bands": vis_params["bands"],
         "min": vis_params["min"],
         "max": vis_params["max"],
@@ -225,7 +393,8 @@ def _get_true_color_url(
     return {
         "url": url,
         "available": True,
-        "capture_date": image_date,
+        "capture_date": info["date"],
+        "window": info["window"],
         "source": "Sentinel-2",
         "description": vis_params["description"],
         "legend": None  # No legend for true color
@@ -233,40 +402,21 @@ def _get_true_color_url(
 
 
 def _get_ndvi_url(
+    collection: ee.ImageCollection,
     region: ee.Geometry,
-    date_range: Dict[str, str],
-    image_size: int
+    image_size: int,
+    info: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Generate NDVI visualization from Sentinel-2."""
-    # Get Sentinel-2 surface reflectance
-    collection = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
-        .filterBounds(region) \
-        .filterDate(date_range["start"], date_range["end"]) \
-        .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20))
-
-    count = collection.size().getInfo()
-
-    if count == 0:
-        older_start = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-        collection = ee.ImageCollection("COPERNICUS/S2_SR_HARMONIZED") \
-            .filterBounds(region) \
-            .filterDate(older_start, date_range["end"]) \
-            .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 30))
-        count = collection.size().getInfo()
-
-    if count == 0:
+    if not info["count"]:
         return {"error": "No imagery available", "available": False}
 
     # Compute NDVI from median composite
     image = collection.median()
     ndvi = image.normalizedDifference(["B8", "B4"]).rename("NDVI")
 
-    # Get approximate date (median doesn't have a single date)
-    latest_date = collection.sort("system:time_start", False).first()
-    image_date = ee.Date(latest_date.get("system:time_start")).format("YYYY-MM-dd").getInfo()
-
     vis_params = VIS_PARAMS["ndvi"]
-    url = ndvi.getThumbURL({
+    url = _thumb_url(ndvi, {
         "min": vis_params["min"],
         "max": vis_params["max"],
         "palette": vis_params["palette"],
@@ -278,7 +428,8 @@ def _get_ndvi_url(
     return {
         "url": url,
         "available": True,
-        "capture_date": image_date,
+        "capture_date": info["date"],
+        "window": info["window"],
         "source": "Sentinel-2 (computed)",
         "description": vis_params["description"],
         "legend": {
@@ -289,39 +440,20 @@ def _get_ndvi_url(
 
 
 def _get_lst_url(
+    collection: ee.ImageCollection,
     region: ee.Geometry,
-    date_range: Dict[str, str],
-    image_size: int
+    image_size: int,
+    info: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Generate Land Surface Temperature from MODIS."""
-    # MODIS LST product
-    collection = ee.ImageCollection("MODIS/061/MOD11A2") \
-        .filterBounds(region) \
-        .filterDate(date_range["start"], date_range["end"]) \
-        .select("LST_Day_1km")
-
-    count = collection.size().getInfo()
-
-    if count == 0:
-        older_start = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-        collection = ee.ImageCollection("MODIS/061/MOD11A2") \
-            .filterBounds(region) \
-            .filterDate(older_start, date_range["end"]) \
-            .select("LST_Day_1km")
-        count = collection.size().getInfo()
-
-    if count == 0:
+    if not info["count"]:
         return {"error": "No LST data available", "available": False}
 
     # Get mean LST (already in Kelvin * 0.02)
     image = collection.mean().multiply(0.02)  # Scale factor
 
-    # Get approximate date
-    latest_date = collection.sort("system:time_start", False).first()
-    image_date = ee.Date(latest_date.get("system:time_start")).format("YYYY-MM-dd").getInfo()
-
     vis_params = VIS_PARAMS["lst"]
-    url = image.getThumbURL({
+    url = _thumb_url(image, {
         "min": vis_params["min"],
         "max": vis_params["max"],
         "palette": vis_params["palette"],
@@ -333,7 +465,8 @@ def _get_lst_url(
     return {
         "url": url,
         "available": True,
-        "capture_date": image_date,
+        "capture_date": info["date"],
+        "window": info["window"],
         "source": "MODIS Terra",
         "description": vis_params["description"],
         "legend": {
@@ -343,6 +476,20 @@ def _get_lst_url(
     }
 
 
+# Thumbnail builders for layers with a capture date, and their sources
+_DATED_SOURCES = {
+    "true_color": _true_color_source,
+    "ndvi": _ndvi_source,
+    "lst": _lst_source,
+}
+
+_DATED_THUMBNAILS = {
+    "true_color": _get_true_color_url,
+    "ndvi": _get_ndvi_url,
+    "lst": _get_lst_url,
+}
+
+
 def _get_land_cover_url(
     region: ee.Geometry,
     image_size: int
@@ -352,7 +499,7 @@ def _get_land_cover_url(
     image = ee.Image("ESA/WorldCover/v200/2021").select("Map")
 
     vis_params = VIS_PARAMS["land_cover"]
-    url = image.getThumbURL({
+    url = _thumb_url(image, {
         "min": vis_params["min"],
         "max": vis_params["max"],
         "palette": vis_params["palette"],
@@ -392,7 +539,7 @@ def _get_forest_cover_url(
         .select("treecover2000")
 
     vis_params = VIS_PARAMS["forest_cover"]
-    url = image.getThumbURL({
+    url = _thumb_url(image, {
         "min": vis_params["min"],
         "max": vis_params["max"],
         "palette": vis_params["palette"],
@@ -453,3 +600,4 @@ def get_available_imagery_types() -> List[Dict[str, Any]]:
             "technology": "LiDAR & Optical Analysis"
         }
     ]
+
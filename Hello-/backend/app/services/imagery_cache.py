@@ -0,0 +1,76 @@
+"""
+Thumbnail URL cache shared by the imagery services.
+
+Earth Engine thumbnail URLs stay valid for hours, but building one costs
+at least one round trip per layer. Both /api/imagery and
+/api/satellite/images cache the generated layers, keyed by:
+
+- layer (namespaced per service, since their palettes differ)
+- grid cell of the point (~1 km, so nearby clicks share thumbnails)
+- buffer_km and image size
+- date window (the window's end date, so entries roll over daily)
+
+Entries expire after IMAGERY_URL_TTL, before the URL itself does.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import IMAGERY_URL_TTL, IMAGERY_CACHE_MAX_ENTRIES
+from app.services.external_apis.cache import ExternalAPICache
+
+_cache = None
+
+
+def get_imagery_cache():
+    """Get the process-wide thumbnail cache (an LRUCache), creating it if needed."""
+    global _cache
+    if _cache is None:
+        from planetary_health_query.utils import LRUCache
+
+        _cache = LRUCache(max_entries=IMAGERY_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def snap_to_cell(lat: float, lon: float) -> Tuple[float, float]:
+    """Snap a point to the centre of its imagery grid cell."""
+    return ExternalAPICache.grid_cell(lat, lon)
+
+
+def imagery_cache_key(
+    layer: str,
+    lat: float,
+    lon: float,
+    buffer_km: float,
+    image_size: Any,
+    window_end: str
+) -> Tuple:
+    """
+    Build the cache key for one thumbnail layer.
+
+    Args:
+        layer: Namespaced layer name, e.g. "imagery:ndvi"
+        lat: Latitude
+        lon: Longitude
+        buffer_km: Buffer around the point in kilometers
+        image_size: Thumbnail size (pixels or "WxH")
+        window_end: Last day (YYYY-MM-DD) of the imagery date window
+
+    Returns:
+        Hashable cache key
+    """
+    return (layer, snap_to_cell(lat, lon), float(buffer_km), str(image_size), window_end)
+
+
+def get_cached_layer(key: Tuple) -> Optional[Any]:
+    """Get a cached layer, or None on a miss."""
+    return get_imagery_cache().get(key)
+
+
+def cache_layer(key: Tuple, value: Any):
+    """Cache a generated layer until its URL is due to expire."""
+    get_imagery_cache().set(key, value, ttl=IMAGERY_URL_TTL)
+
+
+def get_imagery_cache_stats() -> Dict[str, Any]:
+    """Report cache metrics and the URL TTL."""
+    return {**get_imagery_cache().stats(), "ttl_seconds": IMAGERY_URL_TTL}
@@ -0,0 +1,144 @@
+"""
+PDF Renderer - warm process pool for reportlab reports.
+
+reportlab is pure Python and CPU bound, so reports render in worker
+processes rather than on the event loop or the GIL-bound thread pool.
+Each worker builds the styles, page furniture and score gauges once
+(pdf_generator.warm_up) and then only lays out each report's own data.
+Reports come back as bytes, ready for the HTTP response or the storage
+upload, without a temporary file.
+
+Usage:
+    warm_render_pool()                      # on startup
+    pdf = await render_pdf(lat, lon, result)
+    shutdown_render_pool()                  # on shutdown
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from app.config import PDF_RENDER_WORKERS
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_renders = 0
+_failures = 0
+_restarts = 0
+_render_seconds = 0.0
+
+
+def _init_worker():
+    """Worker initializer: build the shared report resources."""
+    from app.api.pdf_generator import warm_up
+    warm_up()
+
+
+def _render(lat: float, lon: float, data: Dict[str, Any]) -> bytes:
+    """Render one report (runs in a worker)."""
+    from app.api.pdf_generator import report_pdf_bytes
+    return report_pdf_bytes(lat, lon, data)
+
+
+def _ready() -> bool:
+    return True
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Get the report worker pool, creating it if needed."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned workers do not inherit the server's threads and locks
+                _pool = ProcessPoolExecutor(
+                    max_workers=PDF_RENDER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+    return _pool
+
+
+def warm_render_pool() -> List[Future]:
+    """
+    Start every worker now instead of on the first reports.
+
+    Returns:
+        One future per worker, done once that worker is warm
+    """
+    pool = get_render_pool()
+    return [pool.submit(_ready) for _ in range(PDF_RENDER_WORKERS)]
+
+
+def shutdown_render_pool(wait: bool = False):
+    """Stop the worker pool (on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+            _pool = None
+
+
+def _discard_render_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next render starts a fresh one."""
+    global _pool, _restarts
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            with _stats_lock:
+                _restarts += 1
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def render_pdf(lat: float, lon: float, data: Dict[str, Any]) -> bytes:
+    """
+    Render a report in the worker pool.
+
+    Args:
+        lat: Latitude shown in the report
+        lon: Longitude shown in the report
+        data: Query result
+
+    Returns:
+        The PDF document
+
+    A pool broken by a dead worker (e.g. killed for memory) is replaced
+    and the report retried once on the fresh pool.
+    """
+    global _renders, _failures, _render_seconds
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        pool = get_render_pool()
+        try:
+            pdf = await loop.run_in_executor(pool, _render, lat, lon, data)
+        except BrokenProcessPool:
+            _discard_render_pool(pool)
+            pdf = await loop.run_in_executor(get_render_pool(), _render, lat, lon, data)
+    except Exception:
+        with _stats_lock:
+            _failures += 1
+        raise
+    with _stats_lock:
+        _renders += 1
+        _render_seconds += time.perf_counter() - start
+    return pdf
+
+
+def get_render_stats() -> Dict[str, Any]:
+    """Return worker pool and render latency metrics."""
+    with _stats_lock:
+        return {
+            "workers": PDF_RENDER_WORKERS,
+            "started": _pool is not None,
+            "renders": _renders,
+            "failures": _failures,
+            "restarts": _restarts,
+            "avg_render_ms": round(_render_seconds / _renders * 1000, 1) if _renders else 0.0
+        }
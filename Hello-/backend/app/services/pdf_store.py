@@ -0,0 +1,97 @@
+"""
+On-disk cache of rendered PDF reports with LRU eviction under a byte budget.
+
+Reports are stored as {root}/{key}.pdf, keyed by the content hash of the
+result they render; recency and eviction are handled by DiskLRUStore.
+
+Usage:
+    store = PdfStore(Path("temp_pdfs/cache"), max_bytes=256 * 1024 ** 2)
+    pdf = store.get(result_hash)
+    if pdf is None:
+        pdf = store.put(result_hash, render())
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from app.config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+from app.services.disk_lru import DiskLRUStore
+
+
+class PdfStore(DiskLRUStore):
+    """Thread-safe on-disk report cache."""
+
+    entry_name = "reports"
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pdf"
+
+    def _scan(self) -> Iterable[Tuple[str, Path]]:
+        return ((path.stem, path) for path in self.root.glob("*.pdf"))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read a report and mark it most recently used.
+
+        Returns:
+            The PDF, or None if it is not stored
+        """
+        return self.read(key)
+
+    def put(self, key: str, data: bytes) -> bytes:
+        """
+        Store a report, evicting least recently used reports if over budget.
+
+        Returns:
+            The stored PDF
+        """
+        self.write(key, data)
+        return data
+
+
+_store: Optional[PdfStore] = None
+_store_lock = threading.Lock()
+
+
+def get_pdf_store() -> PdfStore:
+    """Get the process-wide report cache."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PdfStore(PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES)
+    return _store
+
+
+def configure_pdf_store(root: Path, max_bytes: int = PDF_CACHE_MAX_BYTES) -> PdfStore:
+    """Replace the process-wide report cache (tests, custom locations)."""
+    global _store
+    with _store_lock:
+        _store = PdfStore(root, max_bytes)
+    return _store
+
+
+def remove_stale_files(directory: Path, max_age: float, pattern: str = "*.pdf") -> int:
+    """
+    Delete files older than max_age seconds from a directory (not recursive).
+
+    Args:
+        directory: Directory to sweep
+        max_age: Age limit in seconds
+        pattern: Glob of the files to consider
+
+    Returns:
+        Number of files deleted
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in Path(directory).glob(pattern):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
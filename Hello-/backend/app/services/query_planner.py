@@ -0,0 +1,189 @@
+"""
+Query Planner - decides which source answers each metric.
+
+Some satellite metrics are replaced by Open-Meteo values whenever those
+are available (see apply_open_meteo_fallbacks in app/api/routes.py).
+Querying them on Earth Engine first wastes round trips, so the planner
+looks at the external data and hands the metrics it will answer to the
+engine as "provided"; only the rest are reduced on Earth Engine.
+
+METRIC_SOURCES lists each metric's candidate sources by priority. A
+metric is provided when the first source in its list that has data is
+an external one. The metric results come from external_metrics(), which
+apply_open_meteo_fallbacks also uses, so final metrics are identical
+whichever way a metric was filled.
+
+Usage:
+    external_data = await aggregator.get_comprehensive_data(lat, lon)
+    provided = plan_provided_metrics(external_data)
+    result = await aquery_location(lat, lon, provided=provided)
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# Source names
+OPEN_METEO = "open_meteo"
+EARTH_ENGINE = "earth_engine"
+
+# Candidate sources per metric, highest priority first
+METRIC_SOURCES: Dict[str, List[str]] = {
+    # Pillar A
+    "aqi": [OPEN_METEO, EARTH_ENGINE],
+    "uv_index": [OPEN_METEO, EARTH_ENGINE],
+    "visibility": [OPEN_METEO, EARTH_ENGINE],
+    # Pillar D
+    "soil_moisture": [OPEN_METEO, EARTH_ENGINE],
+    "evaporative_stress": [OPEN_METEO, EARTH_ENGINE],
+    "lst": [EARTH_ENGINE, OPEN_METEO],
+}
+
+
+def _uv_category(value: float) -> str:
+    if value < 3:
+        return "Low"
+    if value < 6:
+        return "Moderate"
+    if value < 8:
+        return "High"
+    if value < 11:
+        return "Very High"
+    return "Extreme"
+
+
+def _first_hourly(hourly: Dict[str, Any], key: str) -> Optional[float]:
+    values = hourly.get(key)
+    if values and len(values) > 0:
+        return values[0]
+    return None
+
+
+def _aqi(weather, air_quality, soil) -> Optional[Dict[str, Any]]:
+    if not air_quality.get("primary_aqi"):
+        return None
+    return {
+        "value": air_quality.get("primary_aqi"),
+        "unit": "US AQI",
+        "description": "Air Quality Index",
+        "source": "Open-Meteo",
+        "quality": "good" if air_quality.get("confidence") == "high" else "moderate"
+    }
+
+
+def _uv_index(weather, air_quality, soil) -> Optional[Dict[str, Any]]:
+    uv_val = (air_quality.get("uv_index") or {}).get("value")
+    if uv_val is None:
+        return None
+    uv_category = _uv_category(uv_val)
+    return {
+        "value": uv_val,
+        "category": uv_category,
+        "unit": "index",
+        "description": f"UV Index ({uv_category})",
+        "source": "Open-Meteo",
+        "quality": "good"
+    }
+
+
+def _visibility(weather, air_quality, soil) -> Optional[Dict[str, Any]]:
+    vis_val = _first_hourly(weather.get("hourly", {}), "visibility")
+    if vis_val is None:
+        return None
+    return {
+        "value": vis_val / 1000,  # Convert m to km
+        "unit": "km",
+        "description": "Visibility Distance",
+        "source": "Open-Meteo",
+        "quality": "good"
+    }
+
+
+def _soil_moisture(weather, air_quality, soil) -> Optional[Dict[str, Any]]:
+    soil_moisture = soil.get("soil_moisture", {}).get("value")
+    if soil_moisture is None:
+        return None
+    return {
+        "value": round(soil_moisture * 100, 1),  # Convert to %
+        "unit": "%",
+        "description": "Soil Moisture (Average)",
+        "source": "Open-Meteo",
+        "quality": "good"
+    }
+
+
+def _evaporative_stress(weather, air_quality, soil) -> Optional[Dict[str, Any]]:
+    vpd_current = _first_hourly(weather.get("hourly", {}), "vapour_pressure_deficit")
+    if vpd_current is None:
+        return None
+    # Evaporative stress from VPD
+    esi = (vpd_current - 1.0) / 1.5
+    esi = max(-2, min(2, esi))
+    return {
+        "value": round(esi, 2),
+        "unit": "index",
+        "description": "Evaporative Stress Index",
+        "source": "Calculated",
+        "quality": "moderate"
+    }
+
+
+# Open-Meteo metric builders: (weather, air_quality, soil) -> result or None
+_OPEN_METEO_METRICS: Dict[str, Callable[..., Optional[Dict[str, Any]]]] = {
+    "aqi": _aqi,
+    "uv_index": _uv_index,
+    "visibility": _visibility,
+    "soil_moisture": _soil_moisture,
+    "evaporative_stress": _evaporative_stress,
+}
+
+
+def external_metrics(external_data: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Satellite metrics that Open-Meteo data can answer.
+
+    Args:
+        external_data: Aggregator comprehensive data (weather, air_quality, soil)
+
+    Returns:
+        Metric name to metric result, for metrics with data. Empty when
+        weather data is unavailable, as apply_open_meteo_fallbacks then
+        leaves the satellite result untouched.
+    """
+    if not external_data:
+        return {}
+    weather = external_data.get("weather", {})
+    if not weather.get("available"):
+        return {}
+
+    air_quality = external_data.get("air_quality", {})
+    soil = external_data.get("soil", {})
+    metrics = {}
+    for name, build in _OPEN_METEO_METRICS.items():
+        value = build(weather, air_quality, soil)
+        if value is not None:
+            metrics[name] = value
+    return metrics
+
+
+def plan_provided_metrics(external_data: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Metrics to take from external sources instead of Earth Engine.
+
+    Args:
+        external_data: Aggregator comprehensive data, or None if it did not
+                       arrive in time (everything is then queried)
+
+    Returns:
+        Metric name to metric result, to pass as the engine's provided
+        metrics
+    """
+    available = {OPEN_METEO: external_metrics(external_data)}
+    provided = {}
+    for name, sources in METRIC_SOURCES.items():
+        for source in sources:
+            if source == EARTH_ENGINE:
+                break
+            value = available.get(source, {}).get(name)
+            if value is not None:
+                provided[name] = value
+                break
+    return provided
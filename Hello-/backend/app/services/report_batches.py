@@ -0,0 +1,216 @@
+"""
+Report Batches - many reports in one request, streamed as a ZIP.
+
+A batch is a list of items, each either a stored query result (by query
+id or result hash) or a parcel to query. Reports are produced
+concurrently, up to REPORT_BATCH_CONCURRENCY at a time, so rendering
+spreads across the PDF worker pool while parcel queries overlap on
+Earth Engine. Each finished report is written to the ZIP at once, and a
+manifest.json listing every item's outcome closes the archive.
+
+Progress is kept per batch id in memory, so it is visible from the
+worker process serving the batch; finished batches are forgotten after
+REPORT_BATCH_TTL seconds.
+
+Usage:
+    batch = create_batch(items)
+    async for chunk in batch.stream_zip():
+        ...
+    get_batch(batch.batch_id).progress()
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+import uuid
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config import REPORT_BATCH_CONCURRENCY, REPORT_BATCH_TTL
+from app.services.reports import load_result, remember_result, render_report
+
+# Item states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_batches: Dict[str, "ReportBatch"] = {}
+_batches_lock = threading.Lock()
+
+
+class _ZipBuffer:
+    """Write-only stream that hands ZipFile output back in chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _part_name(index: int, label: Optional[str]) -> str:
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", label or "").strip("._")[:60]
+    return f"{index + 1:04d}_{slug or 'report'}.pdf"
+
+
+class ReportBatch:
+    """One batch of reports and its progress."""
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        """
+        Args:
+            items: Report sources. Each has "query_id" and/or "result_hash"
+                   for a stored result, or "region" (polygon points or
+                   GeoJSON) and "mode" for a parcel to query; "label"
+                   names the report in the ZIP.
+        """
+        self.batch_id = uuid.uuid4().hex
+        self.items = items
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.status = PENDING
+        self._states = [
+            {
+                "index": index,
+                "label": item.get("label") or item.get("query_id"),
+                "status": PENDING,
+                "filename": None,
+                "error": None
+            }
+            for index, item in enumerate(items)
+        ]
+
+    async def _result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """The query result an item reports on."""
+        if item.get("region") is not None:
+            from app.services.earth_engine import aquery_polygon
+
+            result = await aquery_polygon(
+                points=item["region"],
+                mode=item.get("mode", "comprehensive"),
+                include_scores=True
+            )
+            await remember_result(result)
+            return result
+
+        result = await load_result(query_id=item.get("query_id"), digest=item.get("result_hash"))
+        if result is None:
+            raise LookupError("Query result not found")
+        return result
+
+    async def _report(self, index: int, limit: asyncio.Semaphore) -> Tuple[int, Optional[bytes]]:
+        state = self._states[index]
+        async with limit:
+            state["status"] = RUNNING
+            try:
+                result = await self._result(self.items[index])
+                pdf = await render_report(result)
+            except Exception as e:
+                state["status"] = FAILED
+                state["error"] = str(e) or type(e).__name__
+                return index, None
+        state["status"] = DONE
+        state["filename"] = _part_name(index, state["label"])
+        return index, pdf
+
+    async def stream_zip(self) -> AsyncIterator[bytes]:
+        """
+        Produce the reports and yield the ZIP archive as they finish.
+
+        Reports are stored uncompressed (PDF streams are already
+        compressed). Stopping the iteration cancels outstanding reports.
+        """
+        self.status = RUNNING
+        limit = asyncio.Semaphore(REPORT_BATCH_CONCURRENCY)
+        tasks = [asyncio.ensure_future(self._report(index, limit)) for index in range(len(self.items))]
+        buffer = _ZipBuffer()
+
+        try:
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+                for next_done in asyncio.as_completed(tasks):
+                    index, pdf = await next_done
+                    if pdf is None:
+                        continue
+                    archive.writestr(self._states[index]["filename"], pdf)
+                    yield buffer.drain()
+
+                self.status = DONE
+                self.finished = time.time()
+                archive.writestr(
+                    "manifest.json",
+                    json.dumps(self.progress(), indent=2),
+                    compress_type=zipfile.ZIP_DEFLATED
+                )
+            yield buffer.drain()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if self.status != DONE:
+                self.status = FAILED
+                self.finished = time.time()
+
+    def progress(self) -> Dict[str, Any]:
+        """Return counts per state, throughput and every item's outcome."""
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for state in self._states:
+            counts[state["status"]] += 1
+        elapsed = (self.finished or time.time()) - self.created
+        return {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "total": len(self._states),
+            "completed": counts[DONE],
+            "failed": counts[FAILED],
+            "running": counts[RUNNING],
+            "pending": counts[PENDING],
+            "elapsed_seconds": round(elapsed, 2),
+            "reports_per_second": round(counts[DONE] / elapsed, 2) if elapsed > 0 else 0.0,
+            "items": [dict(state) for state in self._states]
+        }
+
+
+def create_batch(items: List[Dict[str, Any]]) -> ReportBatch:
+    """
+    Register a new batch, forgetting batches that finished (or were
+    never streamed) more than REPORT_BATCH_TTL seconds ago.
+
+    Args:
+        items: Report sources (see ReportBatch)
+
+    Returns:
+        The batch, ready to stream
+    """
+    batch = ReportBatch(items)
+    cutoff = time.time() - REPORT_BATCH_TTL
+    with _batches_lock:
+        expired = [
+            key for key, old in _batches.items()
+            if old.status != RUNNING and (old.finished or old.created) < cutoff
+        ]
+        for batch_id in expired:
+            del _batches[batch_id]
+        _batches[batch.batch_id] = batch
+    return batch
+
+
+def get_batch(batch_id: str) -> Optional[ReportBatch]:
+    """Find a batch by id (None if unknown or forgotten)."""
+    with _batches_lock:
+        return _batches.get(batch_id)
@@ -0,0 +1,166 @@
+"""
+Report Service - PDF reports from stored query results.
+
+A PDF is almost always requested right after /api/query for the same
+result, so query results are kept locally and reports are built from
+them instead of re-running Earth Engine:
+
+- Results: every query result is stored under its content hash (and its
+  query id, when logged) in the process-wide ResultStore, or an in-memory
+  LRUCache when the store is disabled. Results logged to Supabase
+  (phi_queries.phi_response) are found by query id as a fallback.
+- Rendering: reports render in the PDF worker pool (pdf_renderer.py).
+- PDF cache: rendered PDFs are kept in the PdfStore under the result
+  hash, so repeat downloads are a file read. Concurrent requests for the
+  same result share one render.
+
+Usage:
+    result_hash = await remember_result(result, query_id)
+    result = await load_result(query_id=query_id)
+    pdf = await render_report(result)
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import REPORT_RESULT_TTL, REPORT_RESULT_CACHE_ENTRIES
+from app.services.pdf_renderer import render_pdf
+from app.services.pdf_store import get_pdf_store
+from app.services.singleflight import AsyncSingleFlight
+
+# Key prefixes in the shared ResultStore
+RESULT_PREFIX = "report:result:"
+QUERY_PREFIX = "report:query:"
+
+_memory_store = None
+
+# Concurrent renders of the same result share one render
+_render_flights = AsyncSingleFlight("render_report")
+
+
+def _canonical(result: Dict[str, Any]) -> str:
+    return json.dumps(result, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def result_hash(result: Dict[str, Any]) -> str:
+    """Content hash of a query result (hex, 32 chars)."""
+    return hashlib.sha256(_canonical(result).encode()).hexdigest()[:32]
+
+
+def _store():
+    """The process-wide ResultStore, or an in-memory LRUCache without one."""
+    global _memory_store
+    from planetary_health_query.utils import LRUCache, get_result_store
+
+    store = get_result_store()
+    if store is not None:
+        return store
+    if _memory_store is None:
+        _memory_store = LRUCache(max_entries=REPORT_RESULT_CACHE_ENTRIES)
+    return _memory_store
+
+
+def _remember(result: Dict[str, Any], query_id: Optional[str]) -> str:
+    canonical = _canonical(result)
+    digest = hashlib.sha256(canonical.encode()).hexdigest()[:32]
+    try:
+        store = _store()
+        # Stored as plain JSON, so reports see what the client saw
+        store.set(RESULT_PREFIX + digest, json.loads(canonical), ttl=REPORT_RESULT_TTL)
+        if query_id:
+            store.set(QUERY_PREFIX + query_id, digest, ttl=REPORT_RESULT_TTL)
+    except Exception as e:
+        print(f"Warning: Could not store result for reports: {e}")
+    return digest
+
+
+def _lookup(query_id: Optional[str], digest: Optional[str]) -> Optional[Dict[str, Any]]:
+    store = _store()
+    if digest is None and query_id:
+        digest = store.get(QUERY_PREFIX + query_id)
+    if digest is None:
+        return None
+    return store.get(RESULT_PREFIX + digest)
+
+
+async def remember_result(result: Dict[str, Any], query_id: Optional[str] = None) -> str:
+    """
+    Store a query result for later reports.
+
+    Args:
+        result: Query result (as returned to the client)
+        query_id: Logged query id, if any
+
+    Returns:
+        The result's content hash
+    """
+    # json encoding and SQLite writes stay off the event loop
+    return await asyncio.to_thread(_remember, result, query_id)
+
+
+async def load_result(
+    query_id: Optional[str] = None,
+    digest: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Find a stored query result by query id or content hash.
+
+    The local store is tried first; a query id not found there is looked
+    up in Supabase (phi_queries.phi_response) and stored locally.
+
+    Args:
+        query_id: Logged query id
+        digest: Content hash from result_hash()
+
+    Returns:
+        The result, or None if not found
+    """
+    result = await asyncio.to_thread(_lookup, query_id, digest)
+    if result is not None or not query_id:
+        return result
+
+    from app.services.database import get_query_by_id
+
+    record = await get_query_by_id(query_id)
+    result = (record or {}).get("phi_response")
+    if result:
+        await remember_result(result, query_id)
+        return result
+    return None
+
+
+def report_location(result: Dict[str, Any]) -> Tuple[float, float]:
+    """(lat, lon) a result describes: the point, or a polygon's centroid."""
+    query = result.get("query", {})
+    if "centroid" in query:
+        return query["centroid"]["latitude"], query["centroid"]["longitude"]
+    return query["latitude"], query["longitude"]
+
+
+async def render_report(result: Dict[str, Any], digest: Optional[str] = None) -> bytes:
+    """
+    PDF report of a query result, rendered once per result.
+
+    Args:
+        result: Query result
+        digest: The result's content hash, if already known
+
+    Returns:
+        The PDF document
+    """
+    digest = digest or result_hash(result)
+    store = get_pdf_store()
+    pdf = await asyncio.to_thread(store.get, digest)
+    if pdf is not None:
+        return pdf
+
+    async def render():
+        lat, lon = report_location(result)
+        pdf = await render_pdf(lat, lon, result)
+        # Kept for repeat downloads
+        await asyncio.to_thread(store.put, digest, pdf)
+        return pdf
+
+    return await _render_flights.do(digest, render)
@@ -7,12 +7,22 @@ Generates color-mapped satellite images from Google Earth Engine:
 - LST Heatmap (Land Surface Temperature)
 - Land Cover (ESA WorldCover)
 - Forest Cover (Hansen Tree Cover)
+
+Image URLs are cached per grid cell (see imagery_cache.py), and
+get_all_image_urls() builds missing images in parallel.
 """
 
 from typing import Dict, Any, Optional, Tuple
 import ee
 from datetime import datetime, timedelta
 
+from app.services.imagery_cache import (
+    cache_layer,
+    get_cached_layer,
+    imagery_cache_key,
+    snap_to_cell,
+)
+
 
 # Color palettes for different image types
 COLOR_PALETTES = {
@@ -64,6 +74,18 @@ COLOR_PALETTES = {
 }
 
 
+def _thumb_url(image: ee.Image, params: Dict[str, Any]) -> str:
+    """Request a thumbnail URL, holding an Earth Engine call slot."""
+    from planetary_health_query.core import get_ee_limiter
+
+    with get_ee_limiter().slot():
+        return image.getThumbURL(params)
+
+
+# Image types in response order
+IMAGE_TYPES = ['true_color', 'ndvi', 'lst', 'land_cover', 'forest']
+
+
 class SatelliteImageGenerator:
     """Generate satellite imagery visualizations from Earth Engine."""
 
@@ -131,7 +153,7 @@ class SatelliteImageGenerator:
                 'gamma': 1.2
             }
 
-            url = s2.getThumbURL({
+            url = _thumb_url(s2, {
                 'region': region,
                 'dimensions': dimensions,
                 'format': 'png',
@@ -187,7 +209,7 @@ class SatelliteImageGenerator:
             ndvi = s2.normalizedDifference(['B8', 'B4']).rename('NDVI')
 
             # NDVI visualization
-            url = ndvi.getThumbURL({
+            url = _thumb_url(ndvi, {
                 'region': region,
                 'dimensions': dimensions,
                 'format': 'png',
@@ -241,7 +263,7 @@ class SatelliteImageGenerator:
             lst_celsius = modis_lst.multiply(0.02).subtract(273.15)
 
             # LST visualization
-            url = lst_celsius.getThumbURL({
+            url = _thumb_url(lst_celsius, {
                 'region': region,
                 'dimensions': dimensions,
                 'format': 'png',
@@ -296,7 +318,7 @@ class SatelliteImageGenerator:
                 for i in [10, 20, 30, 40, 50, 60, 70, 80, 90, 95, 100]
             ]
 
-            url = worldcover.getThumbURL({
+            url = _thumb_url(worldcover, {
                 'region': region,
                 'dimensions': dimensions,
                 'format': 'png',
@@ -340,7 +362,7 @@ class SatelliteImageGenerator:
             hansen = ee.Image('UMD/hansen/global_forest_change_2023_v1_11')
             tree_cover = hansen.select('treecover2000')
 
-            url = tree_cover.getThumbURL({
+            url = _thumb_url(tree_cover, {
                 'region': region,
                 'dimensions': dimensions,
                 'format': 'png',
@@ -355,6 +377,53 @@ class SatelliteImageGenerator:
             print(f"Forest cover image error: {e}")
             return None
 
+    def get_image_url(
+        self,
+        image_type: str,
+        lat: float,
+        lon: float,
+        buffer_km: float = 5.0,
+        dimensions: str = "512x512"
+    ) -> Optional[str]:
+        """
+        Get one satellite image URL, from the cache when possible.
+
+        The image is generated for the centre of the point's grid cell,
+        so every point in the cell shares it.
+
+        Args:
+            image_type: true_color, ndvi, lst, land_cover or forest
+            lat: Latitude
+            lon: Longitude
+            buffer_km: Buffer radius in km
+            dimensions: Image dimensions
+
+        Returns:
+            URL to thumbnail image or None
+        """
+        builders = {
+            'true_color': self.get_true_color_url,
+            'ndvi': self.get_ndvi_url,
+            'lst': self.get_lst_url,
+            'land_cover': self.get_land_cover_url,
+            'forest': self.get_forest_cover_url
+        }
+        builder = builders.get(image_type)
+        if builder is None:
+            return None
+
+        key = imagery_cache_key(
+            f"satellite:{image_type}", lat, lon, buffer_km, dimensions,
+            datetime.now().strftime('%Y-%m-%d')
+        )
+        url = get_cached_layer(key)
+        if url is None:
+            cell_lat, cell_lon = snap_to_cell(lat, lon)
+            url = builder(cell_lat, cell_lon, buffer_km, dimensions)
+            if url is not None:
+                cache_layer(key, url)
+        return url
+
     def get_all_image_urls(
         self,
         lat: float,
@@ -365,6 +434,8 @@ class SatelliteImageGenerator:
         """
         Get all satellite image URLs for a location.
 
+        Images missing from the cache are generated concurrently.
+
         Args:
             lat: Latitude
             lon: Longitude
@@ -374,13 +445,18 @@ class SatelliteImageGenerator:
         Returns:
             Dict with image type keys and URL values
         """
-        return {
-            'true_color': self.get_true_color_url(lat, lon, buffer_km, dimensions),
-            'ndvi': self.get_ndvi_url(lat, lon, buffer_km, dimensions),
-            'lst': self.get_lst_url(lat, lon, buffer_km, dimensions),
-            'land_cover': self.get_land_cover_url(lat, lon, buffer_km, dimensions),
-            'forest': self.get_forest_cover_url(lat, lon, buffer_km, dimensions)
+        from planetary_health_query.core import get_pillar_executor
+
+        self._ensure_initialized()
+
+        executor = get_pillar_executor()
+        futures = {
+            image_type: executor.submit(
+                self.get_image_url, image_type, lat, lon, buffer_km, dimensions
+            )
+            for image_type in IMAGE_TYPES
         }
+        return {image_type: future.result() for image_type, future in futures.items()}
 
 
 # Global instance
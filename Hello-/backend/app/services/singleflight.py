@@ -0,0 +1,77 @@
+"""
+Async request coalescing (single-flight).
+
+When many clients ask for the same thing at once (e.g. a shared link to
+one location), only the first request reaches the upstream service; the
+others await the same result.
+
+Usage:
+    geocode_flights = AsyncSingleFlight("reverse_geocode")
+
+    async def reverse_geocode(lat, lon):
+        return await geocode_flights.do((lat, lon), _reverse_geocode, lat, lon)
+"""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent identical coroutine calls into one execution."""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Group name, reported in stats
+        """
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Await fn(*args, **kwargs), or join an identical call in flight.
+
+        The shared call runs as its own task, so a caller that is cancelled
+        stops waiting without cancelling the work for everyone else.
+
+        Args:
+            key: Hashable identity of the call
+            fn: Coroutine function to run if no identical call is in flight
+
+        Returns:
+            fn's result (a deep copy for coalesced callers)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            return copy.deepcopy(await asyncio.shield(task))
+
+        self._executions += 1
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing metrics."""
+        total = self._executions + self._coalesced
+        return {
+            "name": self.name,
+            "inflight": len(self._inflight),
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "coalesced_ratio": round(self._coalesced / total, 3) if total else 0.0
+        }
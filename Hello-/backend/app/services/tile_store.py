@@ -0,0 +1,84 @@
+"""
+On-disk tile pyramid with LRU eviction under a byte budget.
+
+Tiles are stored as {root}/{layer}/{z}/{x}/{y}.png; recency and eviction
+are handled by DiskLRUStore.
+
+Usage:
+    store = TileStore(Path("tile_cache"), max_bytes=512 * 1024 ** 2)
+    tile = store.get("land_cover", 12, 2920, 1710)
+    if tile is None:
+        tile = store.put("land_cover", 12, 2920, 1710, png_bytes)
+    tile.data, tile.etag
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from app.services.disk_lru import DiskLRUStore
+
+TileKey = Tuple[str, int, int, int]
+
+
+class Tile(NamedTuple):
+    """A stored tile and its HTTP entity tag."""
+    data: bytes
+    etag: str
+
+
+def tile_etag(data: bytes) -> str:
+    """Strong ETag derived from the tile bytes."""
+    return '"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+
+
+class TileStore(DiskLRUStore):
+    """Thread-safe on-disk tile cache."""
+
+    entry_name = "tiles"
+
+    def _path(self, key: TileKey) -> Path:
+        layer, z, x, y = key
+        return self.root / layer / str(z) / str(x) / f"{y}.png"
+
+    def _scan(self) -> Iterable[Tuple[TileKey, Path]]:
+        for path in self.root.glob("*/*/*/*.png"):
+            try:
+                layer, z, x = path.parts[-4:-1]
+                yield (layer, int(z), int(x), int(path.stem)), path
+            except ValueError:
+                continue
+
+    def get(self, layer: str, z: int, x: int, y: int) -> Optional[Tile]:
+        """
+        Read a tile and mark it most recently used.
+
+        Returns:
+            The tile, or None if it is not stored
+        """
+        data = self.read((layer, z, x, y))
+        return None if data is None else Tile(data, tile_etag(data))
+
+    def put(self, layer: str, z: int, x: int, y: int, data: bytes) -> Tile:
+        """
+        Store a tile, evicting least recently used tiles if over budget.
+
+        Returns:
+            The stored tile
+        """
+        self.write((layer, z, x, y), data)
+        return Tile(data, tile_etag(data))
+
+    def clear(self, layer: Optional[str] = None) -> int:
+        """
+        Delete stored tiles.
+
+        Args:
+            layer: Only delete this layer's tiles (None = all)
+
+        Returns:
+            Number of tiles deleted
+        """
+        if layer is None:
+            return self.remove()
+        return self.remove(lambda key: key[0] == layer)
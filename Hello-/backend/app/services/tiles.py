@@ -0,0 +1,335 @@
+"""
+Raster Tile Service for static base layers.
+
+Serves XYZ (Web Mercator) PNG tiles for layers that never change between
+requests (land cover, tree cover, elevation) from a local tile pyramid
+(see tile_store.py). Missing tiles are rendered once from the layer's
+raster source and stored, so after warm-up the map needs no Earth Engine
+calls for base layers.
+
+Sources:
+- EarthEngineTileSource: fetches the tile from an Earth Engine map id
+  (default for every layer)
+- GeoTIFFTileSource: renders from a local north-up EPSG:4326 GeoTIFF,
+  configured per layer with TILE_SOURCES
+
+Any object with a render(z, x, y) -> bytes method can be registered with
+register_tile_source().
+"""
+
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from app.config import (
+    TILE_CACHE_DIR,
+    TILE_CACHE_MAX_BYTES,
+    TILE_MAX_ZOOM,
+    TILE_SOURCES,
+)
+from app.services.tile_store import Tile, TileStore
+
+TILE_SIZE = 256
+
+# Earth Engine map ids are refreshed well before their tokens expire
+MAP_ID_TTL = 3600
+
+# GeoTIFF tags (see the GeoTIFF specification)
+MODEL_PIXEL_SCALE_TAG = 33550
+MODEL_TIEPOINT_TAG = 33922
+GDAL_NODATA_TAG = 42113
+
+
+def _land_cover_image():
+    import ee
+    return ee.Image("ESA/WorldCover/v200/2021").select("Map")
+
+
+def _forest_cover_image():
+    import ee
+    return ee.Image("UMD/hansen/global_forest_change_2022_v1_10").select("treecover2000")
+
+
+def _elevation_image():
+    import ee
+    return ee.Image("USGS/SRTMGL1_003").select("elevation")
+
+
+# Static layers served as tiles
+TILE_LAYERS: Dict[str, Dict[str, Any]] = {
+    "land_cover": {
+        "name": "Land Classification",
+        "source": "ESA WorldCover 2021",
+        "image": _land_cover_image,
+        "vis": {
+            "min": 10,
+            "max": 100,
+            "palette": [
+                "#006400", "#ffbb22", "#ffff4c", "#f096ff", "#fa0000", "#b4b4b4",
+                "#f0f0f0", "#0064c8", "#0096a0", "#00cf75", "#fae6a0"
+            ]
+        }
+    },
+    "forest_cover": {
+        "name": "Forest Density",
+        "source": "Hansen/UMD/Google",
+        "image": _forest_cover_image,
+        "vis": {
+            "min": 0,
+            "max": 100,
+            "palette": ["#ffffcc", "#c2e699", "#78c679", "#31a354", "#006837"]
+        }
+    },
+    "elevation": {
+        "name": "Elevation",
+        "source": "SRTM (NASA/USGS)",
+        "image": _elevation_image,
+        "vis": {
+            "min": 0,
+            "max": 3000,
+            "palette": ["#006837", "#a6d96a", "#ffffbf", "#fdae61", "#a50026", "#ffffff"]
+        }
+    }
+}
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    """Check tile coordinates against the pyramid's zoom range."""
+    return 0 <= z <= TILE_MAX_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)
+
+
+def colorize(values: np.ndarray, mask: np.ndarray, vis: Dict[str, Any]) -> np.ndarray:
+    """
+    Map values to RGBA like Earth Engine's palette visualization.
+
+    Values are stretched from vis["min"] to vis["max"] and interpolated
+    linearly between palette colors. Masked pixels are transparent.
+
+    Args:
+        values: 2-D array of raster values
+        mask: 2-D boolean array, True where values are valid
+        vis: Visualization parameters (min, max, palette)
+
+    Returns:
+        (rows, cols, 4) uint8 array
+    """
+    palette = np.array(
+        [[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in vis["palette"]],
+        dtype=float
+    )
+    stops = np.linspace(0, 1, len(palette))
+    span = float(vis["max"] - vis["min"]) or 1.0
+    position = np.clip((values.astype(float) - vis["min"]) / span, 0, 1)
+
+    rgba = np.zeros(values.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(position, stops, palette[:, channel]).round()
+    rgba[..., 3] = np.where(mask, 255, 0)
+    return rgba
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Encode an RGBA array as PNG."""
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, "RGBA").save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+class GeoTIFFTileSource:
+    """
+    Renders tiles from a local north-up GeoTIFF in EPSG:4326.
+
+    The raster is read once with Pillow and sampled (nearest neighbour)
+    at each tile pixel's centre. Suitable for regional extracts; very
+    large rasters should be pre-tiled instead.
+    """
+
+    def __init__(self, path: str, vis: Dict[str, Any], nodata: Optional[float] = None):
+        """
+        Args:
+            path: GeoTIFF path
+            vis: Visualization parameters (min, max, palette)
+            nodata: Value treated as missing (defaults to the file's GDAL_NODATA tag)
+        """
+        self.path = Path(path)
+        self.vis = vis
+
+        with Image.open(self.path) as image:
+            tags = image.tag_v2
+            scale_x, scale_y = tags[MODEL_PIXEL_SCALE_TAG][:2]
+            tiepoint = tags[MODEL_TIEPOINT_TAG]
+            if nodata is None and GDAL_NODATA_TAG in tags:
+                nodata = float(str(tags[GDAL_NODATA_TAG]).strip("\x00 "))
+            self._data = np.asarray(image)
+
+        # Tie point maps raster (i, j) to (lon, lat) of the top-left corner
+        self._origin_lon = tiepoint[3] - tiepoint[0] * scale_x
+        self._origin_lat = tiepoint[4] + tiepoint[1] * scale_y
+        self._scale_x = scale_x
+        self._scale_y = scale_y
+        self.nodata = nodata
+
+    def render(self, z: int, x: int, y: int) -> bytes:
+        """Render one tile as PNG (transparent outside the raster)."""
+        n = 1 << z
+        offsets = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+        lons = (x + offsets) / n * 360 - 180
+        lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / n))))
+
+        cols = np.floor((lons - self._origin_lon) / self._scale_x).astype(int)
+        rows = np.floor((self._origin_lat - lats) / self._scale_y).astype(int)
+        height, width = self._data.shape[:2]
+        col_ok = (cols >= 0) & (cols < width)
+        row_ok = (rows >= 0) & (rows < height)
+
+        values = self._data[np.clip(rows, 0, height - 1)[:, None], np.clip(cols, 0, width - 1)[None, :]]
+        mask = row_ok[:, None] & col_ok[None, :]
+        if self.nodata is not None:
+            mask &= values != self.nodata
+        return encode_png(colorize(values, mask, self.vis))
+
+
+class EarthEngineTileSource:
+    """Fetches tiles from an Earth Engine map id, refreshed hourly."""
+
+    def __init__(self, build_image: Callable[[], Any], vis: Dict[str, Any]):
+        """
+        Args:
+            build_image: Returns the ee.Image to visualize
+            vis: Visualization parameters (min, max, palette)
+        """
+        self.build_image = build_image
+        self.vis = vis
+        self._lock = threading.Lock()
+        self._map_id: Optional[Dict[str, Any]] = None
+        self._map_id_at = 0.0
+
+    def _get_map_id(self, refresh: bool = False) -> Dict[str, Any]:
+        from planetary_health_query.core import get_ee_limiter
+        from app.services.earth_engine import initialize_ee, is_initialized
+
+        with self._lock:
+            expired = time.time() - self._map_id_at > MAP_ID_TTL
+            if self._map_id is None or expired or refresh:
+                if not is_initialized():
+                    initialize_ee()
+                with get_ee_limiter().slot():
+                    self._map_id = self.build_image().getMapId({
+                        "min": self.vis["min"],
+                        "max": self.vis["max"],
+                        "palette": self.vis["palette"]
+                    })
+                self._map_id_at = time.time()
+            return self._map_id
+
+    def render(self, z: int, x: int, y: int) -> bytes:
+        """Download one tile, retrying once with a fresh map id."""
+        from app.services.http_pool import get_blocking_http_client
+
+        client = get_blocking_http_client()
+        for refresh in (False, True):
+            url = self._get_map_id(refresh)["tile_fetcher"].format_tile_url(x, y, z)
+            response = client.get(url)
+            if response.status_code not in (401, 403, 404) or refresh:
+                break
+        response.raise_for_status()
+        return response.content
+
+
+_store: Optional[TileStore] = None
+_store_lock = threading.Lock()
+_sources: Dict[str, Any] = {}
+
+
+def get_tile_store() -> TileStore:
+    """Get the process-wide tile store, creating it if needed."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TileStore(TILE_CACHE_DIR, TILE_CACHE_MAX_BYTES)
+        return _store
+
+
+def configure_tile_store(root: Path, max_bytes: int = TILE_CACHE_MAX_BYTES) -> TileStore:
+    """Replace the process-wide tile store (e.g. to use another directory)."""
+    global _store
+    with _store_lock:
+        _store = TileStore(root, max_bytes)
+        return _store
+
+
+def register_tile_source(layer: str, source: Any):
+    """
+    Use a custom raster source for a layer.
+
+    Args:
+        layer: Layer id from TILE_LAYERS
+        source: Object with render(z, x, y) -> PNG bytes
+    """
+    _sources[layer] = source
+
+
+def get_tile_source(layer: str) -> Any:
+    """Get a layer's source: registered, configured GeoTIFF, or Earth Engine."""
+    source = _sources.get(layer)
+    if source is None:
+        config = TILE_LAYERS[layer]
+        if layer in TILE_SOURCES:
+            source = GeoTIFFTileSource(TILE_SOURCES[layer], config["vis"])
+        else:
+            source = EarthEngineTileSource(config["image"], config["vis"])
+        _sources[layer] = source
+    return source
+
+
+def get_cached_tile(layer: str, z: int, x: int, y: int) -> Optional[Tile]:
+    """Read a tile from the pyramid without rendering it."""
+    return get_tile_store().get(layer, z, x, y)
+
+
+def render_tile(layer: str, z: int, x: int, y: int) -> Tile:
+    """
+    Get a tile, rendering and storing it on a miss.
+
+    Concurrent requests for the same missing tile render it once.
+
+    Args:
+        layer: Layer id from TILE_LAYERS
+        z: Zoom level
+        x: Tile column
+        y: Tile row
+
+    Returns:
+        The tile
+    """
+    from planetary_health_query.core import get_flight_group
+
+    def fill() -> Tile:
+        tile = get_tile_store().get(layer, z, x, y)
+        if tile is None:
+            data = get_tile_source(layer).render(z, x, y)
+            tile = get_tile_store().put(layer, z, x, y, data)
+        return tile
+
+    return get_flight_group("tiles").do((layer, z, x, y), fill)
+
+
+def get_tile_layers() -> List[Dict[str, Any]]:
+    """List tile layers with their source and zoom range."""
+    return [
+        {
+            "id": layer,
+            "name": config["name"],
+            "source": config["source"],
+            "local_raster": layer in TILE_SOURCES,
+            "min_zoom": 0,
+            "max_zoom": TILE_MAX_ZOOM,
+            "url": f"/api/tiles/{layer}/{{z}}/{{x}}/{{y}}.png"
+        }
+        for layer, config in TILE_LAYERS.items()
+    ]
@@ -0,0 +1,32 @@
+"""
+Shared pytest configuration.
+
+Wall-clock benchmarks are marked @pytest.mark.benchmark and skipped
+unless requested, since timing ratios are unreliable on shared runners:
+
+    pytest tests --run-benchmarks -s
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run wall-clock benchmarks"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock benchmark, opt-in with --run-benchmarks")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,231 @@
+"""
+Minimal stand-in for the Earth Engine client used by engine tests.
+
+Every ee call returns a lazy FakeObject. Nothing is evaluated until
+getInfo(), and each top-level getInfo() is counted as one round trip so
+tests can assert how many requests a query would make.
+"""
+
+import sys
+from pathlib import Path
+
+# Make planetary_health_query importable (mirrors app/services/earth_engine.py)
+HELLO_DIR = Path(__file__).parent.parent.parent
+if str(HELLO_DIR) not in sys.path:
+    sys.path.insert(0, str(HELLO_DIR))
+
+EE_MODULES = [
+    "planetary_health_query.core.engine",
+    "planetary_health_query.pillars.base",
+    "planetary_health_query.pillars.atmospheric",
+    "planetary_health_query.pillars.biodiversity",
+    "planetary_health_query.pillars.carbon",
+    "planetary_health_query.pillars.degradation",
+    "planetary_health_query.pillars.ecosystem",
+    "planetary_health_query.utils.ee_scoring",
+    "planetary_health_query.utils.geometry",
+]
+
+
+class BandValues(dict):
+    """reduceRegion result that reports the same value for every band."""
+
+    def __init__(self, value):
+        super().__init__()
+        self._value = value
+
+    def get(self, key, default=None):
+        return super().get(key, self._value)
+
+
+class FakeObject:
+    """Lazy placeholder for any ee object (Image, Geometry, Filter, ...)."""
+
+    def __init__(self, ee, value=1.0, error=None, resolve=None):
+        self._ee = ee
+        self._value = value
+        self._error = error
+        self._resolve = resolve
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return FakeObject(self._ee, self._value, self._error)
+
+    def __call__(self, *args, **kwargs):
+        return FakeObject(self._ee, self._value, self._error)
+
+    def reduceRegion(self, reducer=None, geometry=None, scale=None, maxPixels=None):
+        self._ee.reduced_regions.append((geometry, scale))
+        error = self._error
+        if scale in self._ee.failing_scales:
+            error = f"Reduction at scale {scale} failed"
+        return FakeObject(self._ee, BandValues(self._ee.band_value), error)
+
+    def reduceRegions(self, collection=None, reducer=None, scale=None):
+        """Per-site reduction: one feature per site in the collection."""
+        error = self._error
+        if scale in self._ee.failing_scales:
+            error = f"Reduction at scale {scale} failed"
+        features = [
+            {"type": "Feature", "geometry": None, "properties": BandValues(self._ee.band_value)}
+            for _ in collection._value
+        ]
+        return FakeObject(self._ee, features, error)
+
+    def size(self):
+        return FakeObject(self._ee, self._ee.collection_size, self._error)
+
+    def contains(self, key):
+        return FakeObject(self._ee, True)
+
+    def get(self, key, default=None):
+        return FakeObject(self._ee, resolve=lambda: self.evaluate().get(key, default))
+
+    def set(self, key, value):
+        """Dictionary/Feature.set: a copy of the resolved dict with key set."""
+        def resolve():
+            base = self.evaluate()
+            updated = BandValues(base._value) if isinstance(base, BandValues) else {}
+            updated.update(base)
+            updated[key] = _evaluate(value)
+            return updated
+        return FakeObject(self._ee, resolve=resolve)
+
+    def getThumbURL(self, params=None):
+        """Thumbnail request: counted separately from getInfo."""
+        if self._error:
+            raise RuntimeError(self._error)
+        self._ee.thumbnail_calls += 1
+        return f"https://earthengine.test/thumbnails/{self._ee.thumbnail_calls}:getPixels"
+
+    def getMapId(self, vis_params=None):
+        """Map id request: counted separately from getInfo."""
+        if self._error:
+            raise RuntimeError(self._error)
+        self._ee.map_id_calls += 1
+        url = f"https://earthengine.test/maps/{self._ee.map_id_calls}/tiles/{{z}}/{{x}}/{{y}}"
+        return {"mapid": str(self._ee.map_id_calls), "tile_fetcher": TileFetcher(url)}
+
+    def evaluate(self):
+        """Resolve server side without counting a round trip."""
+        if self._error:
+            raise RuntimeError(self._error)
+        if self._resolve is not None:
+            return self._resolve()
+        return self._value
+
+    def getInfo(self):
+        self._ee.getinfo_calls += 1
+        return self.evaluate()
+
+
+class TileFetcher:
+    """getMapId()["tile_fetcher"] stand-in."""
+
+    def __init__(self, url_format):
+        self.url_format = url_format
+
+
+class FakeDictionary(FakeObject):
+    """ee.Dictionary whose values are resolved together."""
+
+    def __init__(self, ee, mapping):
+        super().__init__(ee)
+        self._mapping = mapping
+
+    def evaluate(self):
+        return {
+            key: value.evaluate() if isinstance(value, FakeObject) else value
+            for key, value in self._mapping.items()
+        }
+
+
+class FakeAlgorithms:
+    """ee.Algorithms with a lazily evaluated If."""
+
+    def __init__(self, ee):
+        self._ee = ee
+
+    def If(self, condition, true_case, false_case):
+        def resolve():
+            chosen = true_case if _evaluate(condition) else false_case
+            return _evaluate(chosen)
+        return FakeObject(self._ee, resolve=resolve)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return FakeObject(self._ee)
+
+
+class FakeList:
+    """ee.List whose sequence().map() runs the function per element."""
+
+    def __init__(self, ee):
+        self._ee = ee
+
+    def __call__(self, *args, **kwargs):
+        return FakeObject(self._ee)
+
+    def sequence(self, start, end):
+        return FakeSequence(self._ee, range(int(start), int(end) + 1))
+
+
+class FakeSequence(FakeObject):
+    """ee.List.sequence result: map() builds one element per number."""
+
+    def __init__(self, ee, numbers):
+        super().__init__(ee, list(numbers))
+
+    def map(self, function):
+        elements = [function(number) for number in self._value]
+        return FakeObject(self._ee, resolve=lambda: [_evaluate(e) for e in elements])
+
+
+def _evaluate(value):
+    return value.evaluate() if isinstance(value, FakeObject) else value
+
+
+class FakeEE:
+    """Replacement for the ee module."""
+
+    def __init__(self, band_value=1.0, collection_size=1, failing_scales=()):
+        self.getinfo_calls = 0
+        self.thumbnail_calls = 0
+        self.map_id_calls = 0
+        self.reduced_regions = []
+        self.band_value = band_value
+        self.collection_size = collection_size
+        self.failing_scales = set(failing_scales)
+
+    def Dictionary(self, mapping=None):
+        if isinstance(mapping, FakeObject):
+            return mapping
+        return FakeDictionary(self, mapping or {})
+
+    @property
+    def Algorithms(self):
+        return FakeAlgorithms(self)
+
+    @property
+    def List(self):
+        return FakeList(self)
+
+    def FeatureCollection(self, features=None):
+        return FakeObject(self, list(features or []))
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return FakeObject(self)
+
+
+def install(monkeypatch, fake):
+    """Point every ee-using module of the package at the fake."""
+    import importlib
+
+    for module_name in EE_MODULES:
+        module = importlib.import_module(module_name)
+        monkeypatch.setattr(module, "ee", fake)
+    return fake
@@ -0,0 +1,70 @@
+"""
+Tests for the non-blocking GEEQueryEngine.aquery() path.
+
+Run with: pytest tests/test_async_query.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    from planetary_health_query import GEEQueryEngine
+
+    install(monkeypatch, FakeEE())
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_aquery_matches_query(engine):
+    """aquery returns the same pillars as the blocking query."""
+    result = await engine.aquery(28.6, 77.2, mode="simple", batched=True)
+    expected = engine.query(28.6, 77.2, mode="simple", batched=True)
+
+    assert result["pillars"].keys() == expected["pillars"].keys()
+    assert result["summary"]["overall_score"] == expected["summary"]["overall_score"]
+
+
+@pytest.mark.asyncio
+async def test_aquery_does_not_block_event_loop(engine, monkeypatch):
+    """Other coroutines keep running while a slow query is in flight."""
+    def slow_query(*args, cancel_event=None, **kwargs):
+        time.sleep(0.3)
+        return {"pillars": {}}
+
+    monkeypatch.setattr(engine, "query", slow_query)
+
+    task = asyncio.create_task(engine.aquery(28.6, 77.2))
+    start = time.perf_counter()
+    await asyncio.sleep(0.01)
+    assert time.perf_counter() - start < 0.1
+
+    assert await task == {"pillars": {}}
+
+
+@pytest.mark.asyncio
+async def test_aquery_deadline_sets_cancel_event(engine, monkeypatch):
+    """A timed-out query is told to stop."""
+    seen = {}
+    release = threading.Event()
+
+    def stuck_query(*args, cancel_event=None, **kwargs):
+        seen["cancel_event"] = cancel_event
+        release.wait(2)
+        return {}
+
+    monkeypatch.setattr(engine, "query", stuck_query)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await engine.aquery(28.6, 77.2, timeout=0.05)
+
+    assert seen["cancel_event"].is_set()
+    release.set()
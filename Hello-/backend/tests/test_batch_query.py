@@ -0,0 +1,97 @@
+"""
+Tests for multi-site queries (GEEQueryEngine.query_many and /api/query/batch).
+
+Uses the fake ee module (tests/fake_ee.py), which counts getInfo calls.
+
+Run with: pytest tests/test_batch_query.py -v
+"""
+
+import json
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    return install(monkeypatch, FakeEE())
+
+
+@pytest.fixture
+def engine():
+    from planetary_health_query import GEEQueryEngine
+
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+def _sites(count):
+    return [
+        {"lat": 10 + i * 0.1, "lon": 70 + i * 0.1, "id": f"site-{i}"}
+        for i in range(count)
+    ]
+
+
+def _metric_values(result):
+    return {
+        pillar_key: {
+            name: metric.get("value")
+            for name, metric in pillar["metrics"].items()
+        }
+        for pillar_key, pillar in result["pillars"].items()
+    }
+
+
+def test_one_round_trip_per_batch_regardless_of_sites(fake_ee, engine):
+    """Request count depends on batches, not on the number of sites."""
+    results = list(engine.query_many(_sites(40), mode="comprehensive", batch_size=40))
+
+    assert fake_ee.getinfo_calls == 1
+    assert len(results) == 40
+
+    fake_ee.getinfo_calls = 0
+    list(engine.query_many(_sites(40), mode="comprehensive", batch_size=10))
+    assert fake_ee.getinfo_calls == 4
+
+
+def test_site_results_match_point_queries(fake_ee, engine):
+    """Each site is parsed and scored like a single point query."""
+    site_result = next(engine.query_many(_sites(1), mode="comprehensive"))
+    point_result = engine.query(10, 70, mode="comprehensive", batched=True, use_cache=False)
+
+    assert site_result["site"] == {"index": 0, "id": "site-0"}
+    assert _metric_values(site_result) == _metric_values(point_result)
+    assert site_result["summary"]["overall_score"] == point_result["summary"]["overall_score"]
+
+
+def test_invalid_sites_are_reported_without_failing_the_batch(fake_ee, engine):
+    """A bad coordinate yields an error line; other sites still resolve."""
+    points = _sites(3)
+    points[1]["lat"] = 123
+
+    results = {r["site"]["index"]: r for r in engine.query_many(points)}
+
+    assert "error" in results[1]
+    assert "pillars" in results[0] and "pillars" in results[2]
+
+
+def test_batch_endpoint_streams_ndjson(fake_ee, engine, monkeypatch):
+    """POST /api/query/batch streams one JSON line per site."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.services import earth_engine
+
+    monkeypatch.setattr(earth_engine, "_initialized", True)
+    monkeypatch.setattr(earth_engine, "get_shared_engine", lambda: engine)
+
+    client = TestClient(app)
+    response = client.post("/api/query/batch", json={"sites": _sites(5)})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(line["site"]["id"] for line in lines) == [f"site-{i}" for i in range(5)]
+    assert all("summary" in line for line in lines)
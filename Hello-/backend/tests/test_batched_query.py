@@ -0,0 +1,95 @@
+"""
+Tests for batched single-round-trip pillar evaluation.
+
+Uses a fake ee module (tests/fake_ee.py) that counts getInfo calls, so
+these run without Earth Engine credentials.
+
+Run with: pytest tests/test_batched_query.py -v
+"""
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    return install(monkeypatch, FakeEE())
+
+
+@pytest.fixture
+def engine():
+    from planetary_health_query import GEEQueryEngine
+
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+def _metric_values(result):
+    return {
+        pillar_key: {
+            name: metric.get("value")
+            for name, metric in pillar["metrics"].items()
+        }
+        for pillar_key, pillar in result["pillars"].items()
+    }
+
+
+def test_batched_query_uses_one_round_trip(fake_ee, engine):
+    """All five pillars resolve with a single getInfo call."""
+    result = engine.query(28.6, 77.2, mode="comprehensive", batched=True)
+
+    assert fake_ee.getinfo_calls == 1
+    assert len(result["pillars"]) == 5
+    for pillar in result["pillars"].values():
+        assert "error" not in pillar
+        assert pillar["metrics"]
+
+
+def test_batched_matches_per_pillar_results(fake_ee, engine):
+    """Batched and sequential modes produce the same metric values."""
+    batched = engine.query(28.6, 77.2, mode="comprehensive", batched=True)
+    fake_ee.getinfo_calls = 0
+    sequential = engine.query(28.6, 77.2, mode="comprehensive", parallel=False)
+
+    assert fake_ee.getinfo_calls == 5  # one request per pillar
+    assert _metric_values(batched) == _metric_values(sequential)
+    assert batched["summary"]["overall_score"] == sequential["summary"]["overall_score"]
+
+
+def test_batched_isolates_failing_reduction(monkeypatch, engine):
+    """A failing reduction only affects its own metric."""
+    # cumulativeCost distance is the only reduction at 100 m scale
+    fake = install(monkeypatch, FakeEE(failing_scales={100}))
+
+    result = engine.query(28.6, 77.2, mode="comprehensive", batched=True)
+
+    ecosystem = result["pillars"]["E_ecosystem"]["metrics"]
+    assert ecosystem["distance_to_water"]["description"] == "Distance to Water (simplified)"
+    assert ecosystem["elevation"]["value"] is not None
+    assert result["pillars"]["A_atmospheric"]["metrics"]["aod"]["value"] is not None
+    assert fake.getinfo_calls > 1
+
+
+def test_fallback_sources_resolve_in_the_same_round_trip(monkeypatch, engine):
+    """Empty primary collections fall back on the server, with no probes."""
+    fake = install(monkeypatch, FakeEE(collection_size=0))
+
+    result = engine.query(28.6, 77.2, mode="comprehensive", batched=True)
+
+    assert fake.getinfo_calls == 1
+    pillars = result["pillars"]
+    assert pillars["B_biodiversity"]["metrics"]["ndvi"]["source"] == "MODIS"
+    assert pillars["C_climate"]["metrics"]["canopy_height"]["source"].startswith("ETH")
+    assert pillars["D_dlwd"]["metrics"]["soil_moisture"]["source"] == "ERA5-Land"
+
+
+def test_primary_sources_preferred_when_available(fake_ee, engine):
+    """Sources with data are used without consulting the fallback."""
+    result = engine.query(28.6, 77.2, mode="comprehensive", batched=True)
+
+    pillars = result["pillars"]
+    assert pillars["B_biodiversity"]["metrics"]["ndvi"]["source"] == "Sentinel-2"
+    assert pillars["C_climate"]["metrics"]["canopy_height"]["source"] == "GEDI"
+    assert pillars["D_dlwd"]["metrics"]["soil_moisture"]["source"] == "SMAP L4"
@@ -0,0 +1,122 @@
+"""
+Tests and per-call overhead benchmark for the shared HTTP pools.
+
+A local stub server stands in for the external APIs and records which
+TCP connection served each request.
+
+Run with: pytest tests/test_http_pool.py -v -s
+"""
+
+import time
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+
+CALLS = 50
+
+
+@pytest_asyncio.fixture
+async def stub_server():
+    """Serve a minimal Open-Meteo-shaped response on localhost."""
+    peers = []
+
+    async def current(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"latitude": 28.6, "longitude": 77.2, "current": {"us_aqi": 42}})
+
+    app = web.Application()
+    app.router.add_get("/v1/air-quality", current)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}/v1/air-quality", peers
+
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def pools():
+    from app.services.http_pool import close_http_pools
+
+    yield
+    await close_http_pools()
+
+
+async def _per_call_session(url):
+    """The previous pattern: a new session (and connection) per request."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, params={"latitude": 28.6, "longitude": 77.2}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+@pytest.mark.asyncio
+async def test_shared_session_reuses_connections(stub_server, pools):
+    """External API clients share one kept-alive connection."""
+    from app.services.external_apis import OpenMeteoAPI, OpenMeteoWeatherAPI
+
+    url, peers = stub_server
+    air, weather = OpenMeteoAPI(), OpenMeteoWeatherAPI()
+    air.BASE_URL = weather.BASE_URL = url
+
+    for _ in range(CALLS):
+        assert (await air.get_data(28.6, 77.2))["available"] is True
+        await weather.fetch_data(28.6, 77.2)
+
+    assert air.session is weather.session
+    assert len(peers) == 2 * CALLS
+    assert len(set(peers)) == 1
+
+
+@pytest.mark.asyncio
+async def test_per_call_overhead_before_and_after(stub_server, pools):
+    """Per-call latency and connections: session per call vs shared pool."""
+    from app.services.external_apis import OpenMeteoAPI
+
+    url, peers = stub_server
+    api = OpenMeteoAPI()
+    api.BASE_URL = url
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await _per_call_session(url)
+    before = (time.perf_counter() - start) / CALLS
+    before_connections = len(set(peers))
+
+    peers.clear()
+    await api.fetch_data(28.6, 77.2)  # warm the pool
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await api.fetch_data(28.6, 77.2)
+    after = (time.perf_counter() - start) / CALLS
+    after_connections = len(set(peers))
+
+    print(
+        f"\nper call: {before * 1e3:.2f} ms with a session per call "
+        f"({before_connections} connections), {after * 1e3:.2f} ms pooled "
+        f"({after_connections} connection)"
+    )
+    assert before_connections == CALLS
+    assert after_connections == 1
+
+
+@pytest.mark.asyncio
+async def test_close_and_reopen(pools):
+    """Closing the pools is graceful and the next caller gets fresh ones."""
+    from app.services import http_pool
+
+    session = http_pool.get_http_session()
+    client = http_pool.get_http_client()
+    assert http_pool.get_http_pool_stats()["aiohttp_open"] is True
+
+    await http_pool.close_http_pools()
+
+    assert session.closed and client.is_closed
+    assert http_pool.get_http_session() is not session
+    assert http_pool.get_http_client() is not client
@@ -0,0 +1,95 @@
+"""
+Tests for imagery thumbnail generation and the thumbnail URL cache.
+
+Uses the fake ee module (tests/fake_ee.py), which counts getInfo and
+getThumbURL calls.
+
+Run with: pytest tests/test_imagery.py -v
+"""
+
+import pytest
+
+from tests.fake_ee import FakeEE
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    from app.services import imagery_cache
+
+    monkeypatch.setattr(imagery_cache, "_cache", None)
+
+
+def _install(monkeypatch, fake):
+    from app.services import imagery, satellite_imagery
+
+    monkeypatch.setattr(imagery, "ee", fake)
+    monkeypatch.setattr(imagery, "is_initialized", lambda: True)
+    monkeypatch.setattr(satellite_imagery, "ee", fake)
+    return fake
+
+
+def test_layers_share_one_metadata_request(monkeypatch):
+    """Capture dates for all dated layers come back in one getInfo."""
+    from app.services.imagery import LAYERS, get_imagery_urls
+
+    fake = _install(monkeypatch, FakeEE())
+
+    result = get_imagery_urls(28.6, 77.2)
+
+    assert fake.getinfo_calls == 1
+    assert fake.thumbnail_calls == len(LAYERS)
+    assert list(result["imagery"]) == LAYERS
+    assert all(layer["available"] for layer in result["imagery"].values())
+    assert result["cache"] == {"hits": 0, "misses": len(LAYERS)}
+
+
+def test_nearby_points_are_served_from_cache(monkeypatch):
+    """A second request in the same grid cell makes no Earth Engine calls."""
+    from app.services.imagery import LAYERS, get_imagery_urls
+
+    fake = _install(monkeypatch, FakeEE())
+
+    first = get_imagery_urls(28.6012, 77.2012)
+    second = get_imagery_urls(28.6018, 77.2018)
+
+    assert fake.getinfo_calls == 1
+    assert fake.thumbnail_calls == len(LAYERS)
+    assert second["cache"] == {"hits": len(LAYERS), "misses": 0}
+    assert second["imagery"] == first["imagery"]
+
+    # A different image size is a different thumbnail
+    get_imagery_urls(28.6018, 77.2018, image_size=256)
+    assert fake.thumbnail_calls == 2 * len(LAYERS)
+
+
+def test_unavailable_layers_are_not_cached(monkeypatch):
+    """Layers without imagery are retried on the next request."""
+    from app.services.imagery import get_imagery_urls
+
+    fake = _install(monkeypatch, FakeEE(collection_size=0))
+
+    result = get_imagery_urls(28.6, 77.2)
+    assert result["imagery"]["ndvi"]["available"] is False
+    assert result["imagery"]["land_cover"]["available"] is True
+
+    result = get_imagery_urls(28.6, 77.2)
+    assert result["cache"] == {"hits": 2, "misses": 3}
+    assert fake.getinfo_calls == 2
+
+
+def test_satellite_images_are_cached(monkeypatch):
+    """SatelliteImageGenerator reuses cached URLs per grid cell."""
+    from app.services.satellite_imagery import IMAGE_TYPES, SatelliteImageGenerator
+
+    fake = _install(monkeypatch, FakeEE())
+    generator = SatelliteImageGenerator()
+    generator._initialized = True
+
+    first = generator.get_all_image_urls(28.6, 77.2)
+    second = generator.get_all_image_urls(28.6001, 77.2001)
+
+    assert list(first) == IMAGE_TYPES
+    assert all(first.values())
+    assert second == first
+    assert fake.thumbnail_calls == len(IMAGE_TYPES)
+    assert generator.get_image_url("ndvi", 28.6, 77.2) == first["ndvi"]
@@ -0,0 +1,148 @@
+"""
+Tests and microbenchmark for the striped LRU cache behind QueryCache.
+
+Run with: pytest tests/test_lru_cache.py -v
+Benchmark: pytest tests/test_lru_cache.py --run-benchmarks -v -s
+"""
+
+import threading
+import time
+
+import pytest
+
+import tests.fake_ee  # noqa: F401  (puts planetary_health_query on sys.path)
+
+
+def test_evicts_least_recently_used():
+    """Reading an entry protects it from eviction."""
+    from planetary_health_query.utils import LRUCache
+
+    cache = LRUCache(max_entries=3, stripes=1)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")
+
+    assert cache.get("a") == "a"
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_and_counters():
+    """Entries are evicted by approximate size; counters add up."""
+    from planetary_health_query.utils import LRUCache
+
+    cache = LRUCache(max_bytes=1000, stripes=1)
+    for i in range(10):
+        cache.set(i, "x" * 200)
+    cache.set("short", 1, ttl=-1)
+
+    assert cache.bytes <= 1000
+    assert cache.get("short") is None
+    assert cache.get(9) is not None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["evictions"] >= 5
+
+
+def test_concurrent_access_keeps_accounting_consistent():
+    """Parallel writers never corrupt entry or byte counts."""
+    from planetary_health_query.utils import LRUCache
+
+    cache = LRUCache(max_entries=500)
+
+    def worker(offset):
+        for i in range(2000):
+            cache.set(offset * 10000 + i, i, size=10)
+            cache.get(offset * 10000 + i // 2)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(cache) <= 500
+    assert cache.bytes == len(cache) * 10
+
+
+def test_query_cache_roundtrip():
+    """QueryCache serves stored results and respects max_size."""
+    from planetary_health_query.utils import QueryCache
+
+    cache = QueryCache(max_size=16)
+    for i in range(100):
+        cache.set(10 + i, 20, "simple", {"i": i})
+
+    assert cache.get(109, 20, "simple") == {"i": 99}
+    assert cache.stats()["entries"] <= 16
+
+
+def _time_per_op(cache, keys):
+    start = time.perf_counter()
+    for key in keys:
+        cache.set(key, key, size=64)
+        cache.get(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def test_eviction_does_not_scan_entries():
+    """A full cache evicts without iterating over its entries.
+
+    The previous implementation scanned every entry on each set() once
+    full; the OrderedDict here raises if anything walks it.
+    """
+    from collections import OrderedDict
+
+    from planetary_health_query.utils import LRUCache
+
+    class NoScan(OrderedDict):
+        def _scan(self, *args):
+            raise AssertionError("LRUCache iterated over its entries")
+
+        __iter__ = keys = values = items = __reversed__ = _scan
+
+    cache = LRUCache(max_entries=1000, stripes=1)
+    stripe = cache._stripes[0]
+    for i in range(1000):
+        cache.set(("fill", i), i, size=64)
+    stripe.entries = NoScan(stripe.entries)
+
+    for i in range(2000):
+        cache.set(("op", i), i, size=64)
+        assert cache.get(("op", i)) == i
+
+    assert len(stripe.entries) == 1000
+    assert cache.stats()["evictions"] == 2000
+
+
+@pytest.mark.benchmark
+def test_microbenchmark_constant_time_at_100k_entries():
+    """Per-operation cost at 100k entries stays close to that at 1k.
+
+    The previous implementation scanned every entry on each set() once
+    full, so a full 100k cache was ~100x slower per insert than a 1k one.
+    """
+    from planetary_health_query.utils import LRUCache
+
+    ops = 20000
+    timings = {}
+    for size in (1000, 100000):
+        cache = LRUCache(max_entries=size)
+        for i in range(size):
+            cache.set(("fill", i), i, size=64)
+        # Every insert below evicts, the worst case for the old scan
+        best = min(
+            _time_per_op(cache, [("op", run, i) for i in range(ops)])
+            for run in range(3)
+        )
+        timings[size] = best
+
+    print(
+        f"\nLRUCache set+get: {timings[1000] * 1e6:.2f} us/op at 1k, "
+        f"{timings[100000] * 1e6:.2f} us/op at 100k"
+    )
+    assert timings[100000] < timings[1000] * 5
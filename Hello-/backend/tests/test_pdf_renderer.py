@@ -0,0 +1,172 @@
+"""
+Tests for the PDF worker pool, the shared report resources and the
+report cache.
+
+Run with: pytest tests/test_pdf_renderer.py -v -s   (-s shows the benchmark)
+Benchmark: pytest tests/test_pdf_renderer.py --run-benchmarks -v -s
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.api import pdf_generator
+from app.config import PDF_RENDER_WORKERS
+from app.services import pdf_renderer
+from app.services.earth_engine import create_demo_response
+from app.services.pdf_store import PdfStore, remove_stale_files
+
+
+def _results(count):
+    results = []
+    for index in range(count):
+        result = create_demo_response(10 + index * 0.01, 20, "comprehensive")
+        result["summary"]["overall_score"] = index % 101
+        results.append(result)
+    return results
+
+
+def _clear_resources():
+    for cached in (
+        pdf_generator.report_styles,
+        pdf_generator._furniture,
+        pdf_generator._pillar_table_style,
+        pdf_generator._metric_table_style,
+    ):
+        cached.cache_clear()
+    pdf_generator._gauge_cache().clear()
+
+
+@pytest.fixture
+def pool():
+    futures = pdf_renderer.warm_render_pool()
+    for future in futures:
+        future.result(timeout=60)
+    yield pdf_renderer.get_render_pool()
+    pdf_renderer.shutdown_render_pool(wait=True)
+
+
+def test_gauges_are_shared_per_score():
+    """Warm-up builds every integer gauge; reports reuse them."""
+    _clear_resources()
+    pdf_generator.warm_up()
+
+    assert len(pdf_generator._gauge_cache()) == 101
+    assert pdf_generator.create_score_gauge(72) is pdf_generator.create_score_gauge(72)
+
+
+def test_shared_resources_render_concurrently():
+    """Reports sharing styles and furniture render correctly side by side."""
+    pdf_generator.warm_up()
+    results = _results(8)
+    for result in results[::2]:
+        result["summary"]["overall_score"] = 55
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pdfs = list(executor.map(
+            lambda result: pdf_generator.report_pdf_bytes(10, 20, result), results
+        ))
+
+    assert all(pdf.startswith(b"%PDF") and pdf.rstrip().endswith(b"%%EOF") for pdf in pdfs)
+    assert pdfs[0] != pdfs[1]
+
+
+@pytest.mark.benchmark
+def test_warm_resources_render_faster():
+    """Prebuilt styles, furniture and gauges cut the per-report cost."""
+    result = _results(1)[0]
+
+    cold = float("inf")
+    for _ in range(5):
+        _clear_resources()
+        start = time.perf_counter()
+        pdf_generator.report_pdf_bytes(10, 20, result)
+        cold = min(cold, time.perf_counter() - start)
+
+    pdf_generator.warm_up()
+    warm = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        pdf_generator.report_pdf_bytes(10, 20, result)
+        warm = min(warm, time.perf_counter() - start)
+
+    print(f"\ncold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms per report")
+    assert warm < cold
+
+
+@pytest.mark.asyncio
+async def test_pool_throughput(pool):
+    """Benchmark: reports per second per core through the warm pool."""
+    results = _results(10 * PDF_RENDER_WORKERS)
+
+    start = time.perf_counter()
+    pdfs = await asyncio.gather(*[
+        pdf_renderer.render_pdf(10, 20, result) for result in results
+    ])
+    elapsed = time.perf_counter() - start
+
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
+    rate = len(pdfs) / elapsed
+    print(
+        f"\n{len(pdfs)} reports on {PDF_RENDER_WORKERS} workers: "
+        f"{rate:.1f} reports/s, {rate / PDF_RENDER_WORKERS:.1f} reports/s/core"
+    )
+    stats = pdf_renderer.get_render_stats()
+    assert stats["renders"] >= len(pdfs) and stats["failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_replaced(pool):
+    """A dead worker breaks the pool; the report is retried on a fresh one."""
+    restarts = pdf_renderer.get_render_stats()["restarts"]
+    for process in list(pool._processes.values()):
+        process.kill()
+
+    pdf = await pdf_renderer.render_pdf(10, 20, _results(1)[0])
+
+    assert pdf.startswith(b"%PDF")
+    assert pdf_renderer.get_render_pool() is not pool
+    assert pdf_renderer.get_render_stats()["restarts"] == restarts + 1
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    """The report cache stays within its byte budget, oldest out first."""
+    store = PdfStore(tmp_path, max_bytes=250)
+    store.put("a", b"a" * 100)
+    store.put("b", b"b" * 100)
+    assert store.get("a") == b"a" * 100
+    store.put("c", b"c" * 100)
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats()["evictions"] == 1
+
+    # The index is rebuilt from disk
+    assert PdfStore(tmp_path, max_bytes=250).stats()["reports"] == 2
+
+
+def test_store_subclass_must_map_keys_to_files(tmp_path):
+    """A disk store without its path hooks fails when it is built."""
+    from app.services.disk_lru import DiskLRUStore
+
+    class Unscanned(DiskLRUStore):
+        def _path(self, key):
+            return self.root / str(key)
+
+    with pytest.raises(TypeError):
+        Unscanned(tmp_path, max_bytes=100)
+
+
+def test_stale_files_are_removed(tmp_path):
+    """Loose report files past their age limit are swept."""
+    old = tmp_path / "report_old.pdf"
+    new = tmp_path / "report_new.pdf"
+    old.write_bytes(b"%PDF")
+    new.write_bytes(b"%PDF")
+    os.utime(old, (time.time() - 7200, time.time() - 7200))
+
+    assert remove_stale_files(tmp_path, max_age=3600) == 1
+    assert not old.exists() and new.exists()
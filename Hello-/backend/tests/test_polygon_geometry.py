@@ -0,0 +1,205 @@
+"""
+Tests for local polygon geometry (utils/geometry.py) and the polygon
+query path that uses it instead of geometry getInfo calls.
+
+Run with: pytest tests/test_polygon_geometry.py -v
+"""
+
+import math
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+from planetary_health_query.utils import PolygonGeometry, ring_area_m2
+
+PARCEL = [
+    {"lat": 28.62, "lng": 77.20},
+    {"lat": 28.62, "lng": 77.21},
+    {"lat": 28.61, "lng": 77.21},
+    {"lat": 28.61, "lng": 77.20},
+]
+
+
+def test_ellipsoidal_area_matches_geodesic_reference():
+    """One-degree cells against GeographicLib geodesic polygon areas."""
+    equator = ring_area_m2([(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert equator == pytest.approx(1.2308778e10, rel=2e-4)
+
+    # Ellipsoid flattening: a cell at 60N is less than half the equator's
+    high = ring_area_m2([(0, 60), (1, 60), (1, 61), (0, 61)])
+    assert 0.49 < high / equator < 0.50
+
+    # Orientation, closure and the antimeridian do not matter
+    assert ring_area_m2([(0, 1), (1, 1), (1, 0), (0, 0), (0, 1)]) == pytest.approx(equator)
+    assert ring_area_m2([(179.5, 0), (-179.5, 0), (-179.5, 1), (179.5, 1)]) == pytest.approx(equator)
+
+
+def test_geometry_context():
+    geometry = PolygonGeometry(PARCEL)
+
+    assert geometry.centroid == pytest.approx({"lat": 28.615, "lng": 77.205})
+    assert geometry.bbox == pytest.approx((77.20, 28.61, 77.21, 28.62))
+    assert geometry.area_ha == pytest.approx(108.39, rel=1e-3)
+    assert geometry.as_dict()["area_acres"] == pytest.approx(geometry.area_ha * 2.47105)
+
+    with pytest.raises(ValueError):
+        PolygonGeometry(PARCEL[:2])
+    with pytest.raises(ValueError):
+        PolygonGeometry([{"lat": 95, "lng": 0}] + PARCEL[1:])
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    return install(monkeypatch, FakeEE())
+
+
+@pytest.fixture
+def engine():
+    from planetary_health_query import GEEQueryEngine
+
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+def test_polygon_query_has_no_geometry_round_trips(fake_ee, engine):
+    """One request per pillar: area and centroid are computed locally."""
+    result = engine.query_polygon(PARCEL, mode="comprehensive", parallel=False)
+
+    assert fake_ee.getinfo_calls == 5
+    geometry = result["summary"]["geometry"]
+    assert geometry["area_ha"] == pytest.approx(PolygonGeometry(PARCEL).area_ha)
+    assert result["query"]["centroid"] == pytest.approx({"latitude": 28.615, "longitude": 77.205})
+
+    # Population density uses the local area, not a server-side reduction
+    population = result["pillars"]["E_ecosystem"]["metrics"]["population"]
+    assert population["buffer_area_km2"] == pytest.approx(geometry["area_m2"] / 1e6)
+
+
+def _circle(lat, lng, radius_deg, vertices):
+    """Closed GeoJSON ring approximating a circle (counter-clockwise)."""
+    ring = [
+        [lng + radius_deg * math.cos(2 * math.pi * i / vertices),
+         lat + radius_deg * math.sin(2 * math.pi * i / vertices)]
+        for i in range(vertices)
+    ]
+    return ring + [ring[0]]
+
+
+def test_multipolygon_with_hole():
+    """Holes are subtracted; areas add up across parts."""
+    outer = [[77.20, 28.61], [77.21, 28.61], [77.21, 28.62], [77.20, 28.62], [77.20, 28.61]]
+    hole = [[77.2025, 28.6125], [77.2025, 28.6175], [77.2075, 28.6175], [77.2075, 28.6125], [77.2025, 28.6125]]
+    second = [[77.30, 28.61], [77.31, 28.61], [77.31, 28.62], [77.30, 28.62], [77.30, 28.61]]
+
+    geometry = PolygonGeometry({
+        "type": "Feature",
+        "geometry": {"type": "MultiPolygon", "coordinates": [[outer, hole], [second]]}
+    })
+
+    square = PolygonGeometry(PARCEL).area_m2
+    assert geometry.type == "MultiPolygon"
+    assert geometry.area_m2 == pytest.approx(square * 2 - square / 4, rel=1e-3)
+    assert geometry.bbox == pytest.approx((77.20, 28.61, 77.31, 28.62))
+    assert geometry.as_dict()["holes"] == 1
+    assert geometry.repairs == []
+
+
+def test_repairs_and_rejections():
+    """Fixable input is repaired and reported; tangled rings are rejected."""
+    clockwise = [[0, 0], [0, 1], [0, 1], [0.5, 1], [1, 1], [1, 0], [0, 0]]
+    outside = [[5, 5], [5, 6], [6, 6], [6, 5], [5, 5]]
+    geometry = PolygonGeometry({"type": "Polygon", "coordinates": [clockwise, outside]})
+
+    # Counter-clockwise, without the duplicate and the collinear vertex
+    assert geometry.polygons[0][0] == [(1, 0), (1, 1), (0, 1), (0, 0)]
+    assert geometry.area_m2 == pytest.approx(ring_area_m2([(0, 0), (1, 0), (1, 1), (0, 1)]))
+    assert any("removed 2" in repair for repair in geometry.repairs)
+    assert any("orientation" in repair for repair in geometry.repairs)
+    assert any("outside" in repair for repair in geometry.repairs)
+
+    bowtie = [[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]
+    with pytest.raises(ValueError, match="self-intersecting"):
+        PolygonGeometry({"type": "Polygon", "coordinates": [bowtie]})
+    with pytest.raises(ValueError):
+        PolygonGeometry({"type": "LineString", "coordinates": [[0, 0], [1, 1]]})
+    with pytest.raises(ValueError):
+        PolygonGeometry([{"lat": 0, "lng": 0}, {"lat": 0, "lng": 1}, {"lat": 0, "lng": 2}])
+
+
+def test_invalid_holes_and_overlapping_parts():
+    """Holes must fit their exterior; parts must not overlap."""
+    square = [[0, 0], [0.01, 0], [0.01, 0.01], [0, 0.01], [0, 0]]
+    # Starts inside the square but runs out of its top edge
+    crossing = [[0.004, 0.004], [0.004, 0.012], [0.006, 0.012], [0.006, 0.004], [0.004, 0.004]]
+    geometry = PolygonGeometry({"type": "Polygon", "coordinates": [square, crossing]})
+
+    assert len(geometry.polygons[0]) == 1
+    assert geometry.area_m2 == pytest.approx(ring_area_m2([tuple(v) for v in square]))
+    assert any("crossing its exterior" in repair for repair in geometry.repairs)
+
+    hole = [[0.002, 0.002], [0.002, 0.008], [0.008, 0.008], [0.008, 0.002], [0.002, 0.002]]
+    inner = [[0.003, 0.003], [0.003, 0.005], [0.005, 0.005], [0.005, 0.003], [0.003, 0.003]]
+    geometry = PolygonGeometry({"type": "Polygon", "coordinates": [square, hole, inner]})
+    assert len(geometry.polygons[0]) == 2
+    assert any("overlapping another hole" in repair for repair in geometry.repairs)
+
+    for second in (square, [[0.005, 0.005], [0.015, 0.005], [0.015, 0.015], [0.005, 0.015], [0.005, 0.005]]):
+        with pytest.raises(ValueError, match="Polygon 1 overlaps polygon 0"):
+            PolygonGeometry({"type": "MultiPolygon", "coordinates": [[square], [second]]})
+
+    # An island inside another part's hole is fine
+    island = PolygonGeometry({"type": "MultiPolygon", "coordinates": [[square, hole], [inner]]})
+    assert island.area_m2 == pytest.approx(
+        ring_area_m2([tuple(v) for v in square]) - ring_area_m2([tuple(v) for v in hole])
+        + ring_area_m2([tuple(v) for v in inner])
+    )
+
+
+def test_simplification_keeps_holes_inside():
+    """A tolerance that would push a hole out of its exterior is reduced."""
+    unit = 0.01
+    # A 56 m bump on the top edge, with a 139 m tab of the hole inside it
+    exterior = [(0, 0), (1, 0), (1, 1), (0.6, 1), (0.6, 1.05), (0.4, 1.05), (0.4, 1), (0, 1)]
+    hole = [(0.2, 0.2), (0.2, 0.9), (0.45, 0.9), (0.45, 1.025), (0.55, 1.025), (0.55, 0.9), (0.8, 0.9), (0.8, 0.2)]
+    rings = [[[x * unit, y * unit] for x, y in ring] for ring in (exterior, hole)]
+
+    plain = PolygonGeometry({"type": "Polygon", "coordinates": rings[:1]})
+    assert len(plain.simplified(100)[0][0]) == 4
+
+    geometry = PolygonGeometry({"type": "Polygon", "coordinates": rings})
+    assert geometry.repairs == []
+    simplified = geometry.simplified(100)[0]
+    assert len(simplified) == 2
+    assert max(lat for _, lat in simplified[0]) == pytest.approx(1.05 * unit)
+    assert simplified[1] == geometry.polygons[0][1]
+
+
+def test_simplification_follows_scale(monkeypatch):
+    install(monkeypatch, FakeEE())
+    geometry = PolygonGeometry({"type": "Polygon", "coordinates": [_circle(28.6, 77.2, 0.05, 5000)]})
+    fine = geometry.simplified(geometry.tolerance(10))
+    coarse = geometry.simplified(geometry.tolerance(1000))
+
+    # Capped for Earth Engine even at the finest scale
+    assert sum(len(ring) for ring in fine[0]) <= 2000
+    assert sum(len(ring) for ring in coarse[0]) < sum(len(ring) for ring in fine[0])
+    assert geometry.to_ee(1000) is geometry.to_ee(1000)
+
+    # A parcel smaller than the tolerance keeps its exterior
+    assert len(PolygonGeometry(PARCEL).simplified(5000)[0][0]) == 4
+
+
+def test_geojson_query_reduces_simplified_regions(fake_ee, engine):
+    """Each reduction gets the parcel simplified for its own scale."""
+    feature = {"type": "Polygon", "coordinates": [_circle(28.6, 77.2, 0.01, 400)]}
+    result = engine.query_polygon(feature, mode="simple", parallel=False)
+
+    assert result["query"]["geometry_type"] == "Polygon"
+    assert result["query"]["points"] is None
+    assert result["summary"]["geometry"]["vertices"] == 400
+
+    regions = {id(region): scale for region, scale in fake_ee.reduced_regions}
+    assert len(regions) > 1
+    assert all(scale is not None for scale in regions.values())
@@ -0,0 +1,148 @@
+"""
+Tests for the /api/query source pipeline (gather_query_sources).
+
+Earth Engine, the external APIs and geocoding are replaced by slow
+coroutines, so these check that the sources overlap, what the satellite
+query is told to skip and how the results are merged.
+
+Run with: pytest tests/test_query_pipeline.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.api import routes
+
+DELAY = 0.2
+
+
+async def _slow(value):
+    await asyncio.sleep(DELAY)
+    return value
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    calls = {"external": 0, "geocode": 0}
+
+    async def fetch_external_data(lat, lon):
+        calls["external"] += 1
+        return await _slow({
+            "weather": {"available": True},
+            "air_quality": {"primary_aqi": 87},
+            "sources": ["open-meteo"]
+        })
+
+    async def reverse_geocode(lat, lon):
+        calls["geocode"] += 1
+        return await _slow("New Delhi, Delhi, India")
+
+    monkeypatch.setattr(routes, "fetch_external_data", fetch_external_data)
+    monkeypatch.setattr(routes, "reverse_geocode", reverse_geocode)
+    monkeypatch.setattr(routes, "get_supabase", lambda: object())
+    monkeypatch.setattr(routes, "cached_external_data", lambda lat, lon: None)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_satellite_query_starts_immediately_by_default(sources):
+    """Without the opt-in wait, Earth Engine does not wait for external APIs."""
+    seen = {}
+
+    async def satellite(provided):
+        seen["provided"] = provided
+        return await _slow({"pillars": {}})
+
+    start = time.perf_counter()
+    result, _ = await routes.gather_query_sources(satellite, 28.6, 77.2)
+
+    assert time.perf_counter() - start < DELAY * 1.75
+    assert seen["provided"] == {}
+    assert result["external_sources"] == ["open-meteo"]
+
+
+@pytest.mark.asyncio
+async def test_cached_external_data_is_planned_without_waiting(sources, monkeypatch):
+    """External data already cached for the cell is used to skip metrics."""
+    cached = {"weather": {"available": True}, "air_quality": {"primary_aqi": 80}}
+    monkeypatch.setattr(routes, "cached_external_data", lambda lat, lon: cached)
+    seen = {}
+
+    async def satellite(provided):
+        seen["provided"] = provided
+        return await _slow({"pillars": {}})
+
+    start = time.perf_counter()
+    await routes.gather_query_sources(satellite, 28.6, 77.2)
+
+    assert time.perf_counter() - start < DELAY * 1.75
+    assert set(seen["provided"]) == {"aqi"}
+    assert seen["provided"]["aqi"]["value"] == 80
+
+
+@pytest.mark.asyncio
+async def test_satellite_query_skips_external_metrics(sources, monkeypatch):
+    """With the wait enabled, external data answers metrics the engine skips."""
+    monkeypatch.setattr(routes, "QUERY_PLAN_EXTERNAL_WAIT", DELAY * 5)
+    seen = {}
+
+    async def satellite(provided):
+        seen["provided"] = provided
+        return await _slow({"pillars": {}})
+
+    start = time.perf_counter()
+    result, location_name = await routes.gather_query_sources(satellite, 28.6, 77.2)
+    elapsed = time.perf_counter() - start
+
+    # Geocoding overlaps the external APIs and the satellite query
+    assert elapsed < DELAY * 2.5
+    assert set(seen["provided"]) == {"aqi"}
+    assert location_name == "New Delhi, Delhi, India"
+    assert result["weather"] == {"available": True}
+    assert result["external_sources"] == ["open-meteo"]
+
+
+@pytest.mark.asyncio
+async def test_slow_external_apis_do_not_hold_satellite(sources, monkeypatch):
+    """Past the planning wait, everything is queried on Earth Engine."""
+    monkeypatch.setattr(routes, "QUERY_PLAN_EXTERNAL_WAIT", DELAY / 4)
+    seen = {}
+
+    async def satellite(provided):
+        seen["provided"] = provided
+        return await _slow({"pillars": {}})
+
+    start = time.perf_counter()
+    result, _ = await routes.gather_query_sources(satellite, 28.6, 77.2)
+
+    assert time.perf_counter() - start < DELAY * 1.75
+    assert seen["provided"] == {}
+    assert result["weather"] == {"available": True}
+
+
+@pytest.mark.asyncio
+async def test_no_geocoding_without_logging(sources, monkeypatch):
+    monkeypatch.setattr(routes, "get_supabase", lambda: None)
+
+    result, location_name = await routes.gather_query_sources(
+        lambda provided: _slow({"pillars": {}}), 28.6, 77.2
+    )
+
+    assert location_name is None
+    assert sources == {"external": 1, "geocode": 0}
+
+
+@pytest.mark.asyncio
+async def test_satellite_failure_cancels_other_sources(sources):
+    async def timed_out(provided):
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await routes.gather_query_sources(timed_out, 28.6, 77.2)
+
+    # Nothing is left running once the request has failed
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    await asyncio.sleep(0)
+    assert all(t.cancelled() or t.done() for t in pending)
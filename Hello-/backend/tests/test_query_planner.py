@@ -0,0 +1,131 @@
+"""
+Tests for fallback-aware query planning (app/services/query_planner.py).
+
+The engine runs against the fake ee module (tests/fake_ee.py), which
+records every reduction, so these check which datasets Earth Engine is
+asked for and that the final metrics match the unplanned query.
+
+Run with: pytest tests/test_query_planner.py -v
+"""
+
+import pytest
+
+from app.api.routes import apply_open_meteo_fallbacks
+from app.services.query_planner import plan_provided_metrics
+
+from tests.fake_ee import FakeEE, install
+
+EXTERNAL_DATA = {
+    "weather": {
+        "available": True,
+        "current": {"temperature": {"value": 31.0}},
+        "hourly": {"visibility": [12000], "vapour_pressure_deficit": [1.6]},
+    },
+    "air_quality": {"primary_aqi": 87, "confidence": "high", "uv_index": {"value": 6.5}},
+    "soil": {"soil_moisture": {"value": 0.21}},
+}
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    return install(monkeypatch, FakeEE(band_value=0.5))
+
+
+@pytest.fixture
+def engine():
+    from planetary_health_query import GEEQueryEngine
+
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+def test_plan_follows_source_priority():
+    provided = plan_provided_metrics(EXTERNAL_DATA)
+
+    assert set(provided) == {"aqi", "uv_index", "visibility", "soil_moisture", "evaporative_stress"}
+    assert provided["visibility"]["value"] == 12.0
+    assert provided["soil_moisture"]["value"] == 21.0
+
+    # Earth Engine comes first for LST; no weather means nothing is provided
+    assert "lst" not in provided
+    assert plan_provided_metrics({**EXTERNAL_DATA, "weather": {"available": False}}) == {}
+    assert plan_provided_metrics(None) == {}
+
+
+def test_provided_metrics_skip_earth_engine(fake_ee, engine):
+    """Pillar A without AQI/UV skips the MOD08_M3 reduction entirely."""
+    kwargs = dict(mode="comprehensive", batched=True, use_cache=False, coalesce=False, pillars=["A"])
+    engine.query(28.6, 77.2, **kwargs)
+    full = len(fake_ee.reduced_regions)
+
+    fake_ee.reduced_regions.clear()
+    provided = {"aqi": {"value": 87}, "uv_index": {"value": 6.5}, "cloud_fraction": {"value": 0.3}}
+    result = engine.query(28.6, 77.2, provided=provided, **kwargs)
+
+    assert len(fake_ee.reduced_regions) == full - 1
+    metrics = result["pillars"]["A_atmospheric"]["metrics"]
+    assert list(metrics) == ["aod", "aqi", "uv_index", "visibility", "cloud_fraction"]
+    assert metrics["aqi"]["value"] == 87
+
+
+def test_final_metrics_match_unplanned_query(fake_ee, engine):
+    """Planned and unplanned queries end with the same metrics and scores.
+
+    As in gather_query_sources, results are rescored after the fallbacks.
+    """
+    kwargs = dict(mode="comprehensive", batched=True, use_cache=False, coalesce=False)
+
+    def final(result):
+        return engine.rescore(apply_open_meteo_fallbacks(result, EXTERNAL_DATA))
+
+    unplanned = final(engine.query(28.6, 77.2, **kwargs))
+    planned = final(engine.query(28.6, 77.2, provided=plan_provided_metrics(EXTERNAL_DATA), **kwargs))
+
+    assert planned["pillars"].keys() == unplanned["pillars"].keys()
+    for pillar in planned["pillars"]:
+        assert planned["pillars"][pillar]["metrics"] == unplanned["pillars"][pillar]["metrics"]
+        assert planned["pillars"][pillar]["score"] == unplanned["pillars"][pillar]["score"]
+    assert planned["summary"] == unplanned["summary"]
+
+
+def test_percent_soil_moisture_scored_in_engine_units(fake_ee, engine):
+    """Open-Meteo soil moisture (percent) scores like the same m3/m3 value."""
+    from planetary_health_query.utils import calculate_pillar_score
+
+    percent = calculate_pillar_score("D", {"soil_moisture": {"value": 21.0, "unit": "%"}})
+    fraction = calculate_pillar_score("D", {"soil_moisture": {"value": 0.21, "unit": "m3/m3"}})
+
+    assert percent == fraction
+
+
+def test_provided_soil_moisture_skips_smap_for_drought_index(fake_ee, engine):
+    """drought_index is derived from provided soil moisture; SMAP is not queried."""
+    kwargs = dict(mode="comprehensive", batched=True, use_cache=False, coalesce=False, pillars=["D"])
+    engine.query(28.6, 77.2, **kwargs)
+    # SMAP and its ERA5-Land fallback reduce at 11 km
+    assert 11000 in [scale for _, scale in fake_ee.reduced_regions]
+
+    fake_ee.reduced_regions.clear()
+    provided = {"soil_moisture": {"value": 21.0, "unit": "%"}}
+    result = engine.query(28.6, 77.2, provided=provided, **kwargs)
+
+    assert 11000 not in [scale for _, scale in fake_ee.reduced_regions]
+    metrics = result["pillars"]["D_dlwd"]["metrics"]
+    assert metrics["soil_moisture"] == provided["soil_moisture"]
+    lst = metrics["lst"]["value"]
+    expected = max(-3, min(3, -(0.21 - 0.2) / 0.3 + (lst - 25) / 15 * 0.5))
+    assert metrics["drought_index"]["value"] == pytest.approx(expected)
+
+
+def test_polygon_query_uses_provided_metrics(fake_ee, engine):
+    parcel = [
+        {"lat": 28.62, "lng": 77.20}, {"lat": 28.62, "lng": 77.21},
+        {"lat": 28.61, "lng": 77.21}, {"lat": 28.61, "lng": 77.20},
+    ]
+    provided = {"aqi": {"value": 87}}
+    result = engine.query_polygon(parcel, mode="simple", parallel=False, pillars=["A"], provided=provided)
+
+    metrics = result["pillars"]["A_atmospheric"]["metrics"]
+    assert metrics["aqi"] == {"value": 87}
+    assert "aod" in metrics
@@ -0,0 +1,105 @@
+"""
+Tests for per-pixel (raster) PHI scoring.
+
+Uses the fake ee module (tests/fake_ee.py): the score image is built as a
+lazy graph and the zonal statistics request returns canned values, so
+these run without Earth Engine credentials.
+
+Run with: pytest tests/test_raster_scoring.py -v
+"""
+
+import pytest
+
+from tests.fake_ee import FakeEE, FakeObject, install
+
+from planetary_health_query.utils import PHI_BAND, get_scoring_plan
+from planetary_health_query.utils.ee_scoring import ecosystem_types
+
+POLYGON = [
+    {"lat": 28.60, "lng": 77.20},
+    {"lat": 28.60, "lng": 77.25},
+    {"lat": 28.55, "lng": 77.25},
+    {"lat": 28.55, "lng": 77.20},
+]
+
+
+class ZonalFakeEE(FakeEE):
+    """Fake ee whose zonal statistics dictionary resolves to `zonal`."""
+
+    def __init__(self, zonal):
+        super().__init__()
+        self.zonal = zonal
+
+    def Dictionary(self, mapping=None):
+        if isinstance(mapping, dict) and "stats" in mapping:
+            return FakeObject(self, self.zonal)
+        return super().Dictionary(mapping)
+
+
+def _zonal():
+    types = ecosystem_types()
+    return {
+        "stats": {
+            "phi_mean": 61.234, "phi_min": 20.0, "phi_max": 90.0,
+            "phi_p10": 35.0, "phi_p50": 62.0, "phi_p90": 84.0, "phi_count": 400,
+            "A_atmospheric_mean": 70.456, "A_atmospheric_count": 400,
+            "B_biodiversity_mean": 55.0, "B_biodiversity_count": 380,
+        },
+        "ecosystems": {
+            "ecosystem": {
+                str(types.index("tropical_forest")): 300,
+                str(types.index("urban_green")): 100,
+            }
+        },
+        "area_km2": 27.5,
+    }
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    return install(monkeypatch, ZonalFakeEE(_zonal()))
+
+
+@pytest.fixture
+def engine():
+    from planetary_health_query import GEEQueryEngine
+
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+def test_score_raster_makes_one_stats_request(fake_ee, engine):
+    """Statistics resolve in one getInfo, tiles with one map id per band."""
+    pillar_keys = get_scoring_plan().pillar_keys
+    result = engine.score_raster(POLYGON, scale=250, tile_bands=[PHI_BAND, pillar_keys["A"]])
+
+    assert fake_ee.getinfo_calls == 1
+    assert fake_ee.map_id_calls == 2
+    assert set(result["tiles"]) == {PHI_BAND, "A_atmospheric"}
+    assert result["tiles"][PHI_BAND]["url"].endswith("/{z}/{x}/{y}")
+    assert result["query"]["scale"] == 250
+    assert result["query"]["ecosystem_weights"] == "per_pixel"
+
+
+def test_score_raster_parses_band_statistics(fake_ee, engine):
+    """Reducer outputs are grouped per band, pillar names included."""
+    result = engine.score_raster(POLYGON)
+
+    assert result["stats"][PHI_BAND]["p50"] == 62.0
+    assert result["stats"]["A_atmospheric"] == {"mean": 70.456, "count": 400}
+
+    summary = result["summary"]
+    assert summary["overall_score"] == 61.23
+    assert summary["pillar_scores"] == {"A": 70.46, "B": 55.0}
+    assert summary["area_km2"] == 27.5
+    assert summary["ecosystems"] == {"tropical_forest": 0.75, "urban_green": 0.25}
+    assert summary["dominant_ecosystem"] == "tropical_forest"
+
+
+def test_score_raster_validates_input(fake_ee, engine):
+    with pytest.raises(ValueError):
+        engine.score_raster(POLYGON, mode="bogus")
+    with pytest.raises(ValueError):
+        engine.score_raster(POLYGON[:2])
+    assert fake_ee.getinfo_calls == 0
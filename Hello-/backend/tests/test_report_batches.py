@@ -0,0 +1,145 @@
+"""
+Tests for batch reports (POST /api/reports/batch).
+
+Rendering runs in process; stored results and the PDF cache live in a
+temporary directory.
+
+Run with: pytest tests/test_report_batches.py -v
+"""
+
+import asyncio
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.pdf_generator import report_pdf_bytes
+from app.config import PDF_CACHE_DIR
+from app.main import app
+from app.services import database, earth_engine, report_batches, reports
+from app.services.earth_engine import create_demo_response, create_polygon_demo_response
+from app.services.pdf_store import configure_pdf_store
+
+from planetary_health_query.utils import configure_result_store
+
+PARCEL = [
+    {"lat": 28.60, "lng": 77.20},
+    {"lat": 28.60, "lng": 77.21},
+    {"lat": 28.61, "lng": 77.21},
+    {"lat": 28.61, "lng": 77.20},
+]
+
+
+@pytest.fixture
+def report_env(tmp_path, monkeypatch):
+    configure_result_store(tmp_path / "results.sqlite3", compaction=False)
+    configure_pdf_store(tmp_path / "pdfs", max_bytes=50 * 1024 ** 2)
+
+    async def render_pdf(lat, lon, data):
+        return await asyncio.to_thread(report_pdf_bytes, lat, lon, data)
+
+    async def no_record(query_id):
+        return None
+
+    monkeypatch.setattr(reports, "render_pdf", render_pdf)
+    monkeypatch.setattr(database, "get_query_by_id", no_record)
+    yield
+    configure_result_store(None)
+    configure_pdf_store(PDF_CACHE_DIR)
+
+
+def _remember(count):
+    async def remember():
+        return [
+            await reports.remember_result(create_demo_response(10 + i, 20, "comprehensive"), f"query-{i}")
+            for i in range(count)
+        ]
+    return asyncio.run(remember())
+
+
+def test_batch_streams_zip_with_manifest(report_env, monkeypatch):
+    """Stored results, parcels and failures all end up in one ZIP."""
+    parcels = []
+
+    async def aquery_polygon(points, mode="comprehensive", include_scores=True, **kwargs):
+        parcels.append(points)
+        return create_polygon_demo_response(points, mode)
+
+    monkeypatch.setattr(earth_engine, "aquery_polygon", aquery_polygon)
+    digests = _remember(3)
+
+    client = TestClient(app)
+    response = client.post("/api/reports/batch", json={"items": [
+        {"query_id": "query-0"},
+        {"query_id": "query-1", "label": "North field"},
+        {"result_hash": digests[2]},
+        {"points": PARCEL, "label": "Parcel 7"},
+        {"query_id": "missing"},
+    ]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    names = sorted(archive.namelist())
+    assert names == [
+        "0001_query-0.pdf", "0002_North_field.pdf", "0003_report.pdf",
+        "0004_Parcel_7.pdf", "manifest.json"
+    ]
+    assert all(archive.read(name).startswith(b"%PDF") for name in names[:-1])
+    assert len(parcels) == 1
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest["status"] == "done"
+    assert (manifest["completed"], manifest["failed"]) == (4, 1)
+    assert manifest["items"][4]["error"] == "Query result not found"
+
+    progress = client.get(f"/api/reports/batch/{response.headers['x-batch-id']}").json()
+    assert progress["status"] == "done" and progress["completed"] == 4
+    assert client.get("/api/reports/batch/unknown").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_parts_stream_as_they_finish(report_env, monkeypatch):
+    """A slow item does not hold back reports that are ready."""
+    for i in range(3):
+        await reports.remember_result(create_demo_response(10 + i, 20, "simple"), f"query-{i}")
+    release = asyncio.Event()
+    load = reports.load_result
+
+    async def load_result(query_id=None, digest=None):
+        if query_id == "query-0":
+            await release.wait()
+        return await load(query_id=query_id, digest=digest)
+
+    monkeypatch.setattr(report_batches, "load_result", load_result)
+    batch = report_batches.create_batch([{"query_id": f"query-{i}"} for i in range(3)])
+
+    chunks = []
+    stream = batch.stream_zip()
+    chunks.append(await stream.__anext__())
+    progress = report_batches.get_batch(batch.batch_id).progress()
+    assert progress["status"] == "running"
+    assert progress["items"][0]["status"] == "running"
+
+    release.set()
+    async for chunk in stream:
+        chunks.append(chunk)
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert len(archive.namelist()) == 4
+    assert batch.progress()["completed"] == 3
+
+
+def test_batch_items_are_validated(report_env):
+    """Each item names exactly one source."""
+    client = TestClient(app)
+    for item in (
+        {},
+        {"query_id": "query-0", "points": PARCEL},
+        {"points": PARCEL, "geometry": {"type": "Polygon", "coordinates": []}},
+        {"geometry": {"type": "Point", "coordinates": [0, 0]}},
+    ):
+        response = client.post("/api/reports/batch", json={"items": [item]})
+        assert response.status_code == 422, item
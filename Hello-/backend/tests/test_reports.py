@@ -0,0 +1,118 @@
+"""
+Tests for PDF reports built from stored query results.
+
+Run with: pytest tests/test_reports.py -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import routes
+from app.api.pdf_generator import report_pdf_bytes
+from app.config import PDF_CACHE_DIR
+from app.services import database, reports
+from app.services.earth_engine import create_demo_response
+from app.services.pdf_store import configure_pdf_store, get_pdf_store
+
+from planetary_health_query.utils import configure_result_store
+
+
+@pytest.fixture
+def result():
+    return create_demo_response(28.6, 77.2, "comprehensive")
+
+
+@pytest.fixture
+def report_env(tmp_path, monkeypatch):
+    """Result store and PDF cache confined to the test, rendering in process."""
+    configure_result_store(tmp_path / "results.sqlite3", compaction=False)
+    configure_pdf_store(tmp_path / "pdfs", max_bytes=10 * 1024 ** 2)
+
+    renders = []
+
+    async def render_pdf(lat, lon, data):
+        renders.append((lat, lon))
+        return await asyncio.to_thread(report_pdf_bytes, lat, lon, data)
+
+    monkeypatch.setattr(reports, "render_pdf", render_pdf)
+    yield renders
+    configure_result_store(None)
+    configure_pdf_store(PDF_CACHE_DIR)
+
+
+@pytest.mark.asyncio
+async def test_results_found_by_query_id_and_hash(report_env, result, monkeypatch):
+    """Stored results are found by either key; unknown ones are not."""
+    async def no_record(query_id):
+        return None
+
+    monkeypatch.setattr(database, "get_query_by_id", no_record)
+
+    digest = await reports.remember_result(result, "query-1")
+    assert digest == reports.result_hash(result)
+    assert await reports.load_result(query_id="query-1") == result
+    assert await reports.load_result(digest=digest) == result
+    assert await reports.load_result(query_id="query-2") is None
+
+
+@pytest.mark.asyncio
+async def test_logged_results_are_loaded_from_supabase_once(report_env, result, monkeypatch):
+    """A query id missing locally is fetched from phi_queries and kept."""
+    lookups = []
+
+    async def record(query_id):
+        lookups.append(query_id)
+        return {"id": query_id, "phi_response": result}
+
+    monkeypatch.setattr(database, "get_query_by_id", record)
+
+    assert await reports.load_result(query_id="query-1") == result
+    assert await reports.load_result(query_id="query-1") == result
+    assert lookups == ["query-1"]
+
+
+@pytest.mark.asyncio
+async def test_pdf_route_renders_stored_result_once(report_env, result, monkeypatch):
+    """/api/pdf never queries Earth Engine for a stored result and caches the PDF."""
+    async def no_query(*args, **kwargs):
+        raise AssertionError("Earth Engine queried for a stored result")
+
+    monkeypatch.setattr(routes, "aquery_location", no_query)
+    digest = await reports.remember_result(result)
+
+    request = routes.PdfRequest(result_hash=digest)
+    http_request = SimpleNamespace(client=None)
+    responses = await asyncio.gather(*[
+        routes.generate_pdf_report(request, http_request, None) for _ in range(3)
+    ])
+    # Concurrent waiters may or may not read the PDF back from the store,
+    # so only the later, sequential request has a known hit count
+    hits = get_pdf_store().stats()["hits"]
+    again = await routes.generate_pdf_report(request, http_request, None)
+
+    assert len(report_env) == 1
+    bodies = {response.body for response in responses + [again]}
+    assert len(bodies) == 1 and bodies.pop().startswith(b"%PDF")
+    assert again.headers["content-disposition"].startswith("attachment")
+    assert get_pdf_store().stats()["hits"] == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_pdf_route_rejects_unknown_result_without_location(report_env, monkeypatch):
+    """Without a stored result or a location there is nothing to report."""
+    async def no_record(query_id):
+        return None
+
+    monkeypatch.setattr(database, "get_query_by_id", no_record)
+
+    with pytest.raises(HTTPException) as error:
+        await routes.generate_pdf_report(
+            routes.PdfRequest(query_id="missing"), SimpleNamespace(client=None), None
+        )
+    assert error.value.status_code == 404
+
+    with pytest.raises(ValueError):
+        routes.PdfRequest(lat=28.6)
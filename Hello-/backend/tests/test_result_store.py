@@ -0,0 +1,122 @@
+"""
+Tests for the persistent SQLite result store.
+
+Run with: pytest tests/test_result_store.py -v
+"""
+
+import time
+
+import pytest
+
+import tests.fake_ee  # noqa: F401  (puts planetary_health_query on sys.path)
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return tmp_path / "results.sqlite3"
+
+
+def test_roundtrip_and_expiry(store_path):
+    """Values round-trip; expired entries are hidden and purged."""
+    from planetary_health_query.utils import ResultStore
+
+    store = ResultStore(store_path)
+    store.set("live", {"value": [1, 2, 3]}, ttl=60)
+    store.set("forever", {"value": "static"})
+    store.set("stale", {"value": 0}, ttl=-1)
+
+    assert store.get("live") == {"value": [1, 2, 3]}
+    assert store.get("forever") == {"value": "static"}
+    assert store.get("stale") is None
+    assert store.purge_expired() == 1
+    assert store.stats()["entries"] == 2
+
+
+def test_large_payloads_are_compressed(store_path):
+    """Payloads above the threshold are stored compressed."""
+    from planetary_health_query.utils import ResultStore
+
+    store = ResultStore(store_path, compress_min_bytes=100)
+    payload = {"metrics": ["x" * 50] * 100}
+    store.set("big", payload)
+
+    assert store.get("big") == payload
+    assert store.total_bytes() < len(str(payload)) / 5
+
+
+def test_byte_cap_evicts_least_recently_used(store_path):
+    """Over the byte cap, the least recently read entries go first."""
+    from planetary_health_query.utils import ResultStore
+
+    store = ResultStore(store_path, max_bytes=1000, compression=None, access_slack=0)
+    for i in range(5):
+        store.set(f"k{i}", "x" * 200)
+        time.sleep(0.01)
+    store.get("k0")  # k0 becomes most recently used
+
+    store.set("k5", "x" * 200)
+    store.enforce_size()
+
+    assert store.total_bytes() <= 1000
+    assert store.get("k0") is not None
+    assert store.get("k1") is None
+
+
+def test_reads_do_not_write_within_slack(store_path):
+    """Fresh entries are read without a write; stale recency is batched."""
+    from planetary_health_query.utils import ResultStore
+
+    store = ResultStore(store_path, access_slack=60)
+    store.set("fresh", {"value": 1})
+    store.set("old", {"value": 2})
+    store._connect().execute("UPDATE entries SET accessed_at = 0 WHERE key = 'old'")
+    changes = store._connect().total_changes
+
+    assert store.get("fresh") == {"value": 1}
+    assert store.get("old") == {"value": 2}
+    assert store._connect().total_changes == changes
+
+    assert store.flush_access() == 1
+    accessed_at = store._connect().execute(
+        "SELECT accessed_at FROM entries WHERE key = 'old'"
+    ).fetchone()[0]
+    assert accessed_at > 0
+
+
+def test_stores_on_same_file_share_entries(store_path):
+    """Separate handles (e.g. uvicorn workers) see each other's writes."""
+    from planetary_health_query.utils import ResultStore
+
+    writer = ResultStore(store_path)
+    reader = ResultStore(store_path)
+
+    writer.set("shared", {"value": 42})
+    assert reader.get("shared") == {"value": 42}
+
+
+def test_query_cache_clear_keeps_other_namespaces(store_path):
+    """QueryCache.clear() only removes its own entries from a shared store."""
+    from planetary_health_query.utils import QueryCache, ResultStore
+
+    store = ResultStore(store_path)
+    store.set("metric:aod", {"value": 1})
+    cache = QueryCache(store=store)
+    cache.set(28.6, 77.2, "simple", {"pillars": {}})
+
+    assert QueryCache(store=store).get(28.6, 77.2, "simple") == {"pillars": {}}
+    cache.clear()
+    assert store.get("metric:aod") == {"value": 1}
+
+
+def test_metric_cache_survives_restart(store_path):
+    """A fresh metric cache on the same file serves earlier values."""
+    from planetary_health_query.utils import ResultStore
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    window = ("2026-09-15", "2026-10-15")
+    first = SpatialMetricCache(store=ResultStore(store_path))
+    first.set_metrics(28.61, 77.20, {"elevation": {"value": 216}}, window, 500)
+
+    restarted = SpatialMetricCache(store=ResultStore(store_path))
+    assert restarted.get("elevation", 28.61, 77.20, window, 500) == {"value": 216}
+    assert restarted.stats()["entries"] == 1
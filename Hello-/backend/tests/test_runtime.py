@@ -0,0 +1,93 @@
+"""
+Tests for the shared engine registry and Earth Engine worker pools.
+
+Run with: pytest tests/test_runtime.py -v
+"""
+
+import threading
+import time
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+
+def test_get_engine_returns_shared_instance():
+    """Every caller gets the same engine for a project."""
+    from planetary_health_query import get_engine
+
+    first = get_engine(project_id="test-project", auto_init=False)
+    second = get_engine(project_id="test-project", auto_init=False)
+
+    assert first is second
+
+
+def test_executor_reports_queue_depth_and_saturation():
+    """Queued and active tasks are visible while the pool is busy."""
+    from planetary_health_query.core.runtime import InstrumentedExecutor
+
+    executor = InstrumentedExecutor("test-pool", max_workers=2)
+    release = threading.Event()
+    futures = [executor.submit(release.wait, 2) for _ in range(5)]
+
+    deadline = time.time() + 1
+    while executor.stats()["active"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+
+    stats = executor.stats()
+    assert stats["active"] == 2
+    assert stats["queued"] == 3
+    assert stats["saturation"] == 1.0
+
+    release.set()
+    for future in futures:
+        future.result()
+    executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["completed"] == 5
+    assert stats["queued"] == 0
+    assert stats["latency_ms"]["max"] is not None
+
+
+def test_ee_limiter_caps_concurrent_calls():
+    """No more than max_inflight calls run at once."""
+    from planetary_health_query.core.runtime import EECallLimiter
+
+    limiter = EECallLimiter(max_inflight=2)
+    lock = threading.Lock()
+    current = {"now": 0, "peak": 0}
+
+    def call():
+        with limiter.slot():
+            with lock:
+                current["now"] += 1
+                current["peak"] = max(current["peak"], current["now"])
+            time.sleep(0.02)
+            with lock:
+                current["now"] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert current["peak"] == 2
+    assert limiter.stats()["calls"] == 6
+
+
+def test_parallel_query_uses_shared_pillar_pool(monkeypatch):
+    """Parallel queries run pillars on the process-wide pool."""
+    from planetary_health_query import GEEQueryEngine
+    from planetary_health_query.core import get_pillar_executor
+
+    install(monkeypatch, FakeEE())
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+
+    before = get_pillar_executor().stats()["completed"]
+    result = engine.query(28.6, 77.2, mode="simple", parallel=True)
+
+    assert len(result["pillars"]) == 5
+    assert get_pillar_executor().stats()["completed"] - before == 5
@@ -0,0 +1,115 @@
+"""
+Tests for incremental satellite series storage (dashboard SQLite).
+
+A fake engine stands in for Earth Engine and records the date ranges it
+is asked for, so these run without credentials.
+
+Run with: pytest tests/test_satellite_series.py -v
+"""
+
+from datetime import date
+
+import pytest
+
+from app.models.dashboard_models import DashboardDatabase
+from app.services import dashboard_service
+from app.services.dashboard_service import UnifiedDashboardService, _shift_periods
+
+
+class FakeSeriesEngine:
+    """Returns one value per month of the requested range."""
+
+    def __init__(self):
+        self.ranges = []
+
+    async def aquery_time_series(self, lat, lon, timeout=None, date_range=None,
+                                 period="month", metrics=None):
+        self.ranges.append(date_range)
+        start = date.fromisoformat(date_range[0])
+        end = date.fromisoformat(date_range[1])
+        dates = []
+        current = start
+        while current < end:
+            dates.append(current.isoformat())
+            current = _shift_periods(current, period, 1)
+        return {
+            "period": period,
+            "dates": dates,
+            "metrics": {"ndvi": [0.5] * len(dates), "lst": [30.0] * len(dates)}
+        }
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    fake = FakeSeriesEngine()
+    monkeypatch.setattr(dashboard_service, "get_gee_engine", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = UnifiedDashboardService()
+    service.db = DashboardDatabase(tmp_path / "dashboard.db")
+    return service
+
+
+def test_shift_periods():
+    assert _shift_periods(date(2026, 2, 1), "month", -3) == date(2025, 11, 1)
+    assert _shift_periods(date(2026, 1, 1), "year", -5) == date(2021, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_first_request_fetches_full_history(engine, service):
+    series = await service.get_satellite_series(28.6139, 77.2090, years=5)
+
+    assert len(engine.ranges) == 1
+    assert series["source"] == "google_earth_engine"
+    assert series["location"] == {"latitude": 28.614, "longitude": 77.209}
+    assert len(series["dates"]) >= 60
+    assert series["metrics"]["ndvi"] == [0.5] * len(series["dates"])
+
+
+@pytest.mark.asyncio
+async def test_recent_series_served_from_storage(engine, service):
+    first = await service.get_satellite_series(28.6, 77.2, years=5)
+    second = await service.get_satellite_series(28.6, 77.2, years=5)
+
+    assert len(engine.ranges) == 1
+    assert second["source"] == "sqlite"
+    assert second["dates"] == first["dates"]
+    assert second["metrics"] == first["metrics"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_fetches_only_trailing_periods(engine, service):
+    await service.get_satellite_series(28.6, 77.2, years=5)
+    series = await service.get_satellite_series(28.6, 77.2, years=5, force_refresh=True)
+
+    # Last stored month plus the re-fetched trailing window
+    start = date.fromisoformat(engine.ranges[1][0])
+    last = date.fromisoformat(series["dates"][-1])
+    assert _shift_periods(start, "month", dashboard_service.SATELLITE_SERIES_REFETCH_PERIODS) == last
+    assert series["fetched_periods"] == dashboard_service.SATELLITE_SERIES_REFETCH_PERIODS + 1
+    assert len(series["dates"]) >= 60
+
+
+@pytest.mark.asyncio
+async def test_store_series_replaces_periods(tmp_path):
+    db = DashboardDatabase(tmp_path / "dashboard.db")
+    await db.store_series(1.0, 2.0, "month", {
+        "dates": ["2025-01-01", "2025-02-01"],
+        "metrics": {"ndvi": [0.4, None]}
+    })
+    await db.store_series(1.0, 2.0, "month", {
+        "dates": ["2025-02-01", "2025-03-01"],
+        "metrics": {"ndvi": [0.6, 0.7], "lst": [31.0, 32.0]}
+    })
+
+    series = await db.get_series(1.0, 2.0, "month", since="2025-01-01")
+    assert series["dates"] == ["2025-01-01", "2025-02-01", "2025-03-01"]
+    assert series["metrics"]["ndvi"] == [0.4, 0.6, 0.7]
+    assert series["metrics"]["lst"] == [None, 31.0, 32.0]
+
+    state = await db.get_series_state(1.0, 2.0, "month")
+    assert state["ndvi"]["first_period"] == "2025-01-01"
+    assert state["lst"]["last_period"] == "2025-03-01"
@@ -0,0 +1,122 @@
+"""
+Tests for precompiled scoring plans (utils/scoring_plan.py).
+
+Plans must score exactly like the configuration they were compiled from,
+and pick up configuration changes on reload.
+
+Run with: pytest tests/test_scoring_plan.py -v
+"""
+
+import random
+
+import pytest
+
+from tests.fake_ee import HELLO_DIR  # noqa: F401  (puts the package on sys.path)
+
+from planetary_health_query.core import config
+from planetary_health_query.utils import (
+    calculate_overall_score,
+    get_scoring_plan,
+    normalize_metric,
+    normalize_value,
+    reload_scoring_plans,
+)
+
+
+@pytest.fixture
+def restore_config():
+    """Undo in-place config edits and recompile the plans afterwards."""
+    saved = {
+        ecosystem_type: dict(weights)
+        for ecosystem_type, weights in config.ECOSYSTEM_CATEGORY_WEIGHTS.items()
+    }
+    yield
+    for ecosystem_type, weights in saved.items():
+        config.ECOSYSTEM_CATEGORY_WEIGHTS[ecosystem_type].update(weights)
+    reload_scoring_plans()
+
+
+def test_normalizers_match_config_dispatch():
+    """Bound normalizers give the same scores as dispatching on norm_type."""
+    rng = random.Random(0)
+    for metric_name, params in config.PHI_METRIC_PARAMS.items():
+        v_min = params.get("v_min", 0)
+        v_max = params.get("v_max", 100)
+        span = (v_max - v_min) or 1
+        for _ in range(200):
+            value = rng.uniform(v_min - 0.2 * span, v_max + 0.2 * span)
+            expected = normalize_value(
+                value, params.get("norm_type", "linear"), v_min, v_max,
+                v_opt=params.get("v_opt"), sigma=params.get("sigma"),
+                k=params.get("k", 0.5), v_mid=params.get("v_mid")
+            )
+            assert normalize_metric(metric_name, value) == expected
+
+    assert normalize_metric("not_a_metric", 1.0) is None
+
+
+def test_plan_contents_and_fallbacks():
+    """Plans flatten the configured weights and map metrics to pillars."""
+    plan = get_scoring_plan("tropical_forest", "simple")
+    weights = config.ECOSYSTEM_CATEGORY_WEIGHTS["tropical_forest"]
+
+    assert plan.weight_vector == tuple(weights[c] for c in "ABCDE")
+    assert dict(plan.weights) == {c: weights[c] for c in "ABCDE"}
+    assert set(plan.metric_pillars) == {
+        metric
+        for pillar in config.PILLAR_CONFIG.values()
+        for metric in pillar["simple_metrics"]
+    }
+    assert plan.metric_pillar_keys["land_cover"] == "B_biodiversity"
+    assert "ndvi" in plan.critical_metrics
+
+    # Unknown ecosystem types and modes fall back like the scalar path
+    assert get_scoring_plan("unknown").weights == get_scoring_plan("default").weights
+    assert get_scoring_plan("wetland", "bogus").mode == "comprehensive"
+
+    with pytest.raises(TypeError):
+        plan.weights["A"] = 1.0
+
+
+def test_reload_picks_up_config_changes(restore_config):
+    """Edited weights apply after reload_scoring_plans()."""
+    pillar_scores = {"A": 90, "B": 10, "C": 10, "D": 10, "E": 10}
+    before = calculate_overall_score(pillar_scores, "default")
+
+    config.ECOSYSTEM_CATEGORY_WEIGHTS["default"]["A"] = 0.60
+    assert calculate_overall_score(pillar_scores, "default") == before
+
+    reload_scoring_plans()
+    assert get_scoring_plan("default").weights["A"] == 0.60
+    assert calculate_overall_score(pillar_scores, "default") > before
+
+
+def test_reload_config_compiles_from_file_without_touching_config(restore_config):
+    """reload_config=True compiles the file's values; the module stays as is."""
+    weights = config.ECOSYSTEM_CATEGORY_WEIGHTS
+    original = weights["wetland"]["D"]
+    weights["wetland"]["D"] = 0.99
+    reload_scoring_plans()
+    assert get_scoring_plan("wetland").weights["D"] == 0.99
+
+    reload_scoring_plans(reload_config=True)
+
+    assert config.ECOSYSTEM_CATEGORY_WEIGHTS is weights
+    assert weights["wetland"]["D"] == 0.99
+    assert get_scoring_plan("wetland").weights["D"] == original
+
+
+def test_failed_reload_keeps_current_plans(restore_config, monkeypatch):
+    """A reload that raises while compiling leaves the old plans serving."""
+    from planetary_health_query.utils import scoring_plan
+
+    before = get_scoring_plan("default")
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("bad config")
+
+    monkeypatch.setattr(scoring_plan, "build_scoring_plan", broken)
+    with pytest.raises(RuntimeError):
+        reload_scoring_plans()
+
+    assert get_scoring_plan("default") is before
@@ -0,0 +1,135 @@
+"""
+Tests for single-flight coalescing of identical in-flight requests.
+
+Run with: pytest tests/test_singleflight.py -v
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+
+def test_burst_of_identical_queries_evaluates_once(monkeypatch):
+    """N concurrent identical engine queries cost one Earth Engine request."""
+    from planetary_health_query import GEEQueryEngine
+
+    fake = install(monkeypatch, FakeEE())
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+
+    resolve = engine._query_batched
+
+    def slow_batched(*args, **kwargs):
+        time.sleep(0.2)
+        return resolve(*args, **kwargs)
+
+    monkeypatch.setattr(engine, "_query_batched", slow_batched)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                engine.query(28.6, 77.2, mode="simple", batched=True)
+            )
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fake.getinfo_calls == 1
+    assert len(results) == 8
+    assert all(r["pillars"].keys() == results[0]["pillars"].keys() for r in results)
+    # Followers get their own copy
+    assert len({id(r) for r in results}) == 8
+
+
+def test_followers_retry_when_leader_is_cancelled():
+    """A cancelled leader does not fail the callers waiting on it."""
+    from planetary_health_query.core.runtime import SingleFlight
+
+    flights = SingleFlight("test")
+    started = threading.Event()
+    calls = []
+
+    def cancelled_leader():
+        calls.append("leader")
+        started.set()
+        time.sleep(0.05)
+        raise CancelledError("Query cancelled")
+
+    def follower_work():
+        calls.append("follower")
+        return "ok"
+
+    outcome = {}
+
+    def leader():
+        with pytest.raises(CancelledError):
+            flights.do("key", cancelled_leader)
+
+    def follower():
+        started.wait()
+        outcome["result"] = flights.do("key", follower_work)
+
+    threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert outcome["result"] == "ok"
+    assert calls == ["leader", "follower"]
+
+
+@pytest.mark.asyncio
+async def test_reverse_geocode_coalesces_identical_lookups(monkeypatch):
+    """Concurrent lookups of the same point make one upstream request."""
+    from app.services import database
+
+    calls = []
+
+    async def fake_lookup(lat, lon):
+        calls.append((lat, lon))
+        await asyncio.sleep(0.05)
+        return "New Delhi, Delhi, India"
+
+    monkeypatch.setattr(database, "_reverse_geocode", fake_lookup)
+
+    names = await asyncio.gather(*[
+        database.reverse_geocode(28.6, 77.2) for _ in range(10)
+    ])
+
+    assert calls == [(28.6, 77.2)]
+    assert names == ["New Delhi, Delhi, India"] * 10
+
+
+@pytest.mark.asyncio
+async def test_comprehensive_data_coalesces_per_grid_cell(monkeypatch):
+    """Identical external data requests share one fetch."""
+    from app.services.external_apis.aggregator import ExternalDataAggregator
+
+    aggregator = ExternalDataAggregator()
+    calls = []
+
+    async def fake_fetch(lat, lon):
+        calls.append((lat, lon))
+        await asyncio.sleep(0.05)
+        return {"air_quality": {}, "weather": {}, "soil": {}, "sources": []}
+
+    monkeypatch.setattr(aggregator, "_fetch_comprehensive_data", fake_fetch)
+
+    results = await asyncio.gather(*[
+        aggregator.get_comprehensive_data(28.6, 77.2) for _ in range(5)
+    ])
+
+    assert len(calls) == 1
+    assert all(r == results[0] for r in results)
+    assert aggregator.get_api_status()["coalescing"]["coalesced"] == 4
@@ -0,0 +1,172 @@
+"""
+Tests for the spatially-indexed per-metric cache.
+
+Run with: pytest tests/test_spatial_cache.py -v
+"""
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+WINDOW = ("2026-09-15", "2026-10-15")
+
+
+def test_quadkey_prefix_is_parent_cell():
+    """A coarser cell's quadkey is a prefix of its children's."""
+    from planetary_health_query.utils.spatial_cache import quadkey
+
+    fine = quadkey(28.6139, 77.2090, 16)
+    coarse = quadkey(28.6139, 77.2090, 8)
+
+    assert len(fine) == 16
+    assert fine.startswith(coarse)
+
+
+def test_coarse_metric_shared_across_region():
+    """~100 km MOD08_M3 values are reused by points tens of km apart,
+    while 1 km MODIS AOD values are not."""
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    cache = SpatialMetricCache()
+    cache.set("aqi", 28.61, 77.20, WINDOW, 500, {"value": 120})
+    cache.set("aod", 28.61, 77.20, WINDOW, 500, {"value": 0.4})
+
+    assert cache.get("aqi", 28.70, 77.30, WINDOW, 500) == {"value": 120}
+    assert cache.get("aod", 28.70, 77.30, WINDOW, 500) is None
+    assert cache.get("aqi", 28.70, 77.30, WINDOW, 1000) is None
+
+
+def test_lookup_reads_one_key_per_metric():
+    """Misses fall through to the store with only the metrics' own cells."""
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    class RecordingStore:
+        def __init__(self):
+            self.keys = []
+
+        def get_many(self, keys):
+            self.keys.extend(keys)
+            return {}
+
+    store = RecordingStore()
+    cache = SpatialMetricCache(store=store)
+    cache.get_metrics(28.61, 77.20, ["aod", "aqi"], WINDOW, 500)
+
+    assert store.keys == [
+        f"metric:aod|500|{WINDOW[0]}_{WINDOW[1]}|{cache.cell_for('aod', 28.61, 77.20)}",
+        f"metric:aqi|500|{WINDOW[1][:7]}/30d|{cache.cell_for('aqi', 28.61, 77.20)}",
+    ]
+
+
+def test_ttl_follows_dataset_cadence():
+    """Static layers never expire; fast products expire within hours."""
+    from planetary_health_query.utils.spatial_cache import metric_cache_policy
+
+    assert metric_cache_policy("elevation") == ("static", None)
+    assert metric_cache_policy("tree_cover") == ("static", None)
+    assert metric_cache_policy("aqi")[0] == "monthly"
+    cadence, ttl = metric_cache_policy("aod")
+    assert cadence == "daily" and ttl <= 6 * 3600
+
+
+def test_period_keys_ignore_exact_window():
+    """Static and monthly entries survive a shifted 'latest' window."""
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    cache = SpatialMetricCache()
+    next_day = ("2026-09-16", "2026-10-16")
+    for metric in ("elevation", "aqi", "aod"):
+        cache.set(metric, 28.61, 77.20, WINDOW, 500, {"value": 1})
+
+    assert cache.get("elevation", 28.61, 77.20, next_day, 500) is not None
+    assert cache.get("aqi", 28.61, 77.20, next_day, 500) is not None
+    assert cache.get("aod", 28.61, 77.20, next_day, 500) is None
+    assert cache.get("aqi", 28.61, 77.20, ("2026-10-01", "2026-11-01"), 500) is None
+    assert cache.get("aqi", 28.61, 77.20, ("2021-10-15", "2026-10-15"), 500) is None
+
+
+def test_annual_query_does_not_reuse_latest_values(monkeypatch):
+    """After a 'latest' query, a 5-year 'annual' query only reuses static metrics."""
+    from planetary_health_query import GEEQueryEngine
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    install(monkeypatch, FakeEE())
+    cache = SpatialMetricCache()
+    engine = GEEQueryEngine(auto_init=False, metric_cache=cache)
+    engine._initialized = True
+    kwargs = dict(mode="comprehensive", batched=True, pillars=["A", "E"])
+    engine.query(28.6139, 77.2090, **kwargs)
+
+    hits = []
+    get_metrics = cache.get_metrics
+
+    def recording_get_metrics(*args, **kw):
+        found = get_metrics(*args, **kw)
+        hits.extend(found)
+        return found
+
+    monkeypatch.setattr(cache, "get_metrics", recording_get_metrics)
+    result = engine.query(28.6139, 77.2090, temporal="annual", **kwargs)
+
+    assert all(cache.policy_for(metric)[0] == "static" for metric in hits)
+    assert "aqi" not in hits and "cloud_fraction" not in hits
+    assert not result["pillars"]["E_ecosystem"].get("cached")
+
+
+def test_engine_skips_earth_engine_for_cached_pillars(monkeypatch):
+    """A repeat query nearby is served from the cache without getInfo."""
+    from planetary_health_query import GEEQueryEngine
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    fake = install(monkeypatch, FakeEE())
+    engine = GEEQueryEngine(auto_init=False, metric_cache=SpatialMetricCache())
+    engine._initialized = True
+
+    first = engine.query(28.6139, 77.2090, mode="simple", batched=True)
+    assert fake.getinfo_calls == 1
+
+    fake.getinfo_calls = 0
+    second = engine.query(28.6140, 77.2091, mode="simple", batched=True)
+
+    assert fake.getinfo_calls == 0
+    assert second["pillars"].keys() == first["pillars"].keys()
+    assert all(p["cached"] for p in second["pillars"].values())
+    assert second["summary"]["overall_score"] == first["summary"]["overall_score"]
+
+    fake.getinfo_calls = 0
+    engine.query(28.6140, 77.2091, mode="simple", batched=True, use_cache=False)
+    assert fake.getinfo_calls == 1
+
+
+def test_engine_refetches_only_expired_metrics(monkeypatch):
+    """An expired derived metric is re-queried with its inputs only."""
+    from planetary_health_query import GEEQueryEngine
+    from planetary_health_query.utils.spatial_cache import SpatialMetricCache
+
+    install(monkeypatch, FakeEE())
+    cache = SpatialMetricCache()
+    engine = GEEQueryEngine(auto_init=False, metric_cache=cache)
+    engine._initialized = True
+    engine.query(28.6139, 77.2090, mode="comprehensive", batched=True)
+
+    # Expire carbon_stock only
+    for key in [k for k in cache._memory.keys() if k.startswith("carbon_stock|")]:
+        cache._memory.set(key, {}, expires_at=0)
+
+    requested = {}
+    carbon = engine._pillars["C"]
+    build = carbon.build_reductions
+
+    def spy(region, date_range, metrics):
+        requested["metrics"] = metrics
+        return build(region, date_range, metrics)
+
+    monkeypatch.setattr(carbon, "build_reductions", spy)
+    result = engine.query(28.6139, 77.2090, mode="comprehensive", batched=True)
+
+    assert sorted(requested["metrics"]) == [
+        "biomass", "canopy_height", "carbon_stock", "tree_cover"
+    ]
+    carbon_metrics = result["pillars"]["C_climate"]["metrics"]
+    assert list(carbon_metrics) == carbon.get_metrics("comprehensive")
+    assert result["pillars"]["A_atmospheric"]["cached"] is True
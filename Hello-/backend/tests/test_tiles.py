@@ -0,0 +1,124 @@
+"""
+Tests for the local tile pyramid (/api/tiles).
+
+Tiles are rendered from a small GeoTIFF written in the test, so no Earth
+Engine access is needed.
+
+Run with: pytest tests/test_tiles.py -v
+"""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, TiffImagePlugin, TiffTags
+
+# Tile at zoom 8 containing (28.5, 77.5), inside the test raster
+Z, X, Y = 8, 183, 107
+
+
+@pytest.fixture
+def geotiff(tmp_path):
+    """1° x 1° float raster over 77-78°E, 28-29°N with a nodata corner."""
+    data = np.full((100, 100), 50.0, dtype=np.float32)
+    data[:10, :10] = -9999
+
+    tags = TiffImagePlugin.ImageFileDirectory_v2()
+    tags[33550] = (0.01, 0.01, 0.0)
+    tags.tagtype[33550] = TiffTags.DOUBLE
+    tags[33922] = (0.0, 0.0, 0.0, 77.0, 29.0, 0.0)
+    tags.tagtype[33922] = TiffTags.DOUBLE
+    tags[42113] = "-9999"
+    tags.tagtype[42113] = TiffTags.ASCII
+
+    path = tmp_path / "forest.tif"
+    Image.fromarray(data, "F").save(path, tiffinfo=tags)
+    return path
+
+
+@pytest.fixture
+def tiles(tmp_path, monkeypatch):
+    from app.services import tiles
+
+    monkeypatch.setattr(tiles, "_store", None)
+    monkeypatch.setattr(tiles, "_sources", {})
+    tiles.configure_tile_store(tmp_path / "pyramid")
+    return tiles
+
+
+class CountingSource:
+    """Raster source stub that records which tiles it renders."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.rendered = []
+
+    def render(self, z, x, y):
+        self.rendered.append((z, x, y))
+        return self.inner.render(z, x, y)
+
+
+def _alpha(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGBA"))[..., 3]
+
+
+def test_geotiff_source_renders_inside_raster_only(tiles, geotiff):
+    """Pixels over the raster are opaque; elsewhere tiles are transparent."""
+    source = tiles.GeoTIFFTileSource(geotiff, tiles.TILE_LAYERS["forest_cover"]["vis"])
+
+    inside = _alpha(source.render(Z, X, Y))
+    assert inside.max() == 255
+    assert inside.min() == 0  # Tile extends past the raster
+
+    outside = _alpha(source.render(Z, 0, 0))
+    assert outside.max() == 0
+
+
+def test_tiles_are_rendered_once_and_revalidated(tiles, geotiff):
+    """The endpoint fills the pyramid lazily and honours If-None-Match."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    source = CountingSource(
+        tiles.GeoTIFFTileSource(geotiff, tiles.TILE_LAYERS["forest_cover"]["vis"])
+    )
+    tiles.register_tile_source("forest_cover", source)
+    client = TestClient(app)
+    url = f"/api/tiles/forest_cover/{Z}/{X}/{Y}.png"
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "image/png"
+    assert "max-age=" in first.headers["cache-control"]
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert source.rendered == [(Z, X, Y)]
+
+    revalidated = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+
+    assert client.get(f"/api/tiles/unknown/{Z}/{X}/{Y}.png").status_code == 404
+    assert client.get("/api/tiles/forest_cover/2/9/0.png").status_code == 404
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    """Over the disk budget, the least recently read tile goes first."""
+    from app.services.tile_store import TileStore
+
+    store = TileStore(tmp_path, max_bytes=250)
+    store.put("layer", 1, 0, 0, b"a" * 100)
+    store.put("layer", 1, 0, 1, b"b" * 100)
+    store.get("layer", 1, 0, 0)
+    store.put("layer", 1, 1, 0, b"c" * 100)
+
+    assert store.get("layer", 1, 0, 1) is None
+    assert store.get("layer", 1, 0, 0).data == b"a" * 100
+    assert store.stats()["bytes"] == 200
+
+    # The index is rebuilt from disk on restart
+    reopened = TileStore(tmp_path, max_bytes=250)
+    assert reopened.stats()["tiles"] == 2
+    assert reopened.get("layer", 1, 1, 0).data == b"c" * 100
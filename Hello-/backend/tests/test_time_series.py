@@ -0,0 +1,86 @@
+"""
+Tests for monthly/annual time-series queries.
+
+Uses the fake ee module (tests/fake_ee.py), which runs server-side
+ee.List.sequence().map() functions per element and counts getInfo calls,
+so these run without Earth Engine credentials.
+
+Run with: pytest tests/test_time_series.py -v
+"""
+
+import pytest
+
+from tests.fake_ee import FakeEE, install
+
+from planetary_health_query.pillars.base import BasePillar, count_periods
+
+
+@pytest.fixture
+def fake_ee(monkeypatch):
+    return install(monkeypatch, FakeEE(band_value=0.5))
+
+
+@pytest.fixture
+def engine():
+    from planetary_health_query import GEEQueryEngine
+
+    engine = GEEQueryEngine(auto_init=False)
+    engine._initialized = True
+    return engine
+
+
+def test_count_periods():
+    assert count_periods(("2021-01-01", "2026-01-01"), "month") == 60
+    assert count_periods(("2021-01-01", "2026-01-02"), "month") == 61
+    assert count_periods(("2025-10-16", "2026-10-16"), "month") == 12
+    assert count_periods(("2021-10-16", "2026-10-16"), "year") == 5
+    assert count_periods(("2026-10-16", "2026-10-16"), "month") == 0
+    with pytest.raises(ValueError):
+        count_periods(("2021-01-01", "2026-01-01"), "week")
+
+
+def test_five_year_monthly_series_is_one_round_trip(fake_ee, engine):
+    """Sixty monthly composites of NDVI and LST resolve with one getInfo."""
+    series = engine.query_time_series(
+        28.6, 77.2, date_range=("2021-01-01", "2026-01-01"), metrics=["ndvi", "lst"]
+    )
+
+    assert fake_ee.getinfo_calls == 1
+    assert series["period"] == "month"
+    assert len(series["dates"]) == 60
+    assert set(series["metrics"]) == {"ndvi", "lst"}
+    assert series["metrics"]["ndvi"] == [0.5] * 60
+
+
+def test_monthly_query_returns_series(fake_ee, engine):
+    """temporal="monthly" adds columnar series of time-varying metrics only."""
+    result = engine.query(28.6, 77.2, temporal="monthly", batched=True, use_cache=False)
+
+    date_range = result["query"]["date_range"]
+    periods = count_periods((date_range["start"], date_range["end"]), "month")
+    series = result["time_series"]
+
+    assert fake_ee.getinfo_calls == 2  # pillars + the whole series
+    assert series["enabled"] and series["mode"] == "monthly"
+    assert "ndvi" in series["metrics"] and "nightlights" in series["metrics"]
+    assert "tree_cover" not in series["metrics"]
+    assert all(len(values) == periods for values in series["metrics"].values())
+
+
+def test_latest_query_has_no_series(fake_ee, engine):
+    result = engine.query(28.6, 77.2, batched=True, use_cache=False)
+
+    assert fake_ee.getinfo_calls == 1
+    assert result["time_series"] == {"enabled": False, "mode": "latest"}
+
+
+def test_parse_time_series_keeps_gaps():
+    rows = [
+        {"date": "2025-01-01", "ndvi": 0.61234567},
+        {"date": "2025-02-01", "ndvi": None},
+        {"date": "2025-03-01"},
+    ]
+    dates, values = BasePillar.parse_time_series(rows, ["ndvi"])
+
+    assert dates == ["2025-01-01", "2025-02-01", "2025-03-01"]
+    assert values == {"ndvi": [0.6123, None, None]}
@@ -16,8 +16,8 @@ Usage:
     result = engine.query(lat=28.6139, lon=77.2090, mode="comprehensive")
 """
 
-from .core.engine import GEEQueryEngine
+from .core.engine import GEEQueryEngine, get_engine
 from .core.config import DATASETS, PILLAR_CONFIG
 
 __version__ = "1.0.0"
-__all__ = ["GEEQueryEngine", "DATASETS", "PILLAR_CONFIG"]
+__all__ = ["GEEQueryEngine", "get_engine", "DATASETS", "PILLAR_CONFIG"]
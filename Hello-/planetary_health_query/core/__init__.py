@@ -1,11 +1,30 @@
 """Core modules for the Planetary Health Query System."""
 
-from .engine import GEEQueryEngine
+from .engine import GEEQueryEngine, get_engine
+from .runtime import (
+    configure_runtime,
+    get_query_executor,
+    get_pillar_executor,
+    get_ee_limiter,
+    get_flight_group,
+    get_runtime_stats,
+    run_in_query_executor,
+    shutdown_runtime
+)
 from .authenticator import initialize_ee, get_project_id
 from .config import DATASETS, PILLAR_CONFIG, RESOLUTION_PRESETS
 
 __all__ = [
     "GEEQueryEngine",
+    "get_engine",
+    "configure_runtime",
+    "get_query_executor",
+    "get_pillar_executor",
+    "get_ee_limiter",
+    "get_flight_group",
+    "get_runtime_stats",
+    "run_in_query_executor",
+    "shutdown_runtime",
     "initialize_ee",
     "get_project_id",
     "DATASETS",
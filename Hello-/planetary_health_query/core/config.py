@@ -3,9 +3,20 @@ Configuration and constants for Earth Engine datasets.
 Contains all dataset IDs, metadata, and pillar configurations.
 """
 
+import os
+
 # Default Google Cloud Project ID
 DEFAULT_PROJECT_ID = "vibrant-arcanum-477610-v0"
 
+# Process-wide worker pools and Earth Engine concurrency (see core/runtime.py).
+# Bounded so concurrent requests queue instead of spawning threads.
+QUERY_EXECUTOR_WORKERS = int(os.environ.get("PHQ_QUERY_WORKERS", 8))       # Whole async queries
+PILLAR_EXECUTOR_WORKERS = int(os.environ.get("PHQ_PILLAR_WORKERS", 20))    # Per-pillar tasks
+MAX_INFLIGHT_EE_CALLS = int(os.environ.get("PHQ_MAX_INFLIGHT_EE_CALLS", 20))  # Concurrent EE requests
+
+# Multi-site queries (GEEQueryEngine.query_many): sites per Earth Engine request
+SITE_BATCH_SIZE = int(os.environ.get("PHQ_SITE_BATCH_SIZE", 100))
+
 # Resolution presets for different query modes
 RESOLUTION_PRESETS = {
     "high": {
@@ -95,6 +106,7 @@ DATASETS = {
         "description": "ESA WorldCover 10m Land Cover",
         "resolution": 10,
         "temporal": "annual",
+        "cadence": "static",  # Fixed v200 release
         "pillar": "B",
         "classes": {
             10: "Tree cover",
@@ -124,6 +136,7 @@ DATASETS = {
         "description": "Hansen Global Forest Change",
         "resolution": 30,
         "temporal": "annual",
+        "cadence": "static",  # Fixed 2023_v1_11 release
         "pillar": "C"
     },
     "gedi_biomass": {
@@ -294,6 +307,91 @@ PILLAR_CONFIG = {
     }
 }
 
+# Datasets each metric is derived from (including fallbacks).
+# Used to size spatial cache cells by native resolution.
+METRIC_DATASETS = {
+    # Pillar A
+    "aod": ["modis_aod"],
+    "aqi": ["modis_atmosphere"],
+    "uv_index": ["modis_atmosphere"],
+    "cloud_fraction": ["modis_atmosphere"],
+    "visibility": ["modis_aod"],
+
+    # Pillar B
+    "ndvi": ["sentinel2", "modis_ndvi"],
+    "evi": ["sentinel2", "modis_ndvi"],
+    "lai": ["modis_lai"],
+    "fpar": ["modis_lai"],
+    "land_cover": ["worldcover"],
+
+    # Pillar C
+    "tree_cover": ["hansen_gfc"],
+    "forest_loss": ["hansen_gfc"],
+    "canopy_height": ["gedi_biomass", "eth_canopy_height"],
+    "biomass": ["gedi_biomass", "eth_canopy_height", "hansen_gfc"],
+    "carbon_stock": ["gedi_biomass", "eth_canopy_height", "hansen_gfc"],
+
+    # Pillar D
+    "lst": ["modis_lst"],
+    "soil_moisture": ["smap_soil_moisture", "era5_land"],
+    "water_occurrence": ["jrc_water"],
+    "drought_index": ["smap_soil_moisture", "era5_land", "modis_lst"],
+    "evaporative_stress": ["modis_et"],
+
+    # Pillar E
+    "population": ["worldpop"],
+    "nightlights": ["viirs_dnb"],
+    "human_modification": ["human_modification"],
+    "elevation": ["srtm"],
+    "distance_to_water": ["jrc_water"]
+}
+
+# Metric values reported in other units by external sources, scaled to the
+# units of PHI_METRIC_PARAMS before scoring: (metric, unit) -> factor
+METRIC_UNIT_SCALES = {
+    ("soil_moisture", "%"): 0.01    # Open-Meteo percent -> m3/m3
+}
+
+# Metrics a derived metric is computed from within its pillar.
+# A derived metric is re-queried together with its inputs unless they are provided.
+METRIC_DEPENDENCIES = {
+    "visibility": ["aod"],
+    "carbon_stock": ["biomass"],
+    "biomass": ["canopy_height", "tree_cover"],
+    "drought_index": ["soil_moisture", "lst"]
+}
+
+# Spatial metric cache (see utils/spatial_cache.py)
+SPATIAL_CACHE_MIN_CELL_M = 150       # Finest cell size; points this close share values
+METRIC_CACHE_TTL_SECONDS = 3600      # TTL for datasets with an unknown cadence
+METRIC_CACHE_MAX_ENTRIES = 100000    # In-memory entry limit
+METRIC_CACHE_MAX_BYTES = int(os.environ.get("PHQ_METRIC_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# In-memory QueryCache byte budget (approximate, JSON-encoded size)
+QUERY_CACHE_MAX_BYTES = int(os.environ.get("PHQ_QUERY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Persistent result store (see utils/result_store.py). Unset = memory only.
+RESULT_STORE_PATH = os.environ.get("PHQ_RESULT_STORE")
+RESULT_STORE_MAX_BYTES = int(os.environ.get("PHQ_RESULT_STORE_MAX_BYTES", 256 * 1024 * 1024))
+RESULT_STORE_COMPACT_INTERVAL = 300      # Seconds between background compactions
+RESULT_STORE_COMPRESS_MIN_BYTES = 512    # Smaller payloads are stored uncompressed
+RESULT_STORE_ACCESS_SLACK = 60           # Reads refresh an entry's recency at most this often (seconds)
+
+# Metric cache TTL by dataset update cadence ("cadence", else "temporal").
+# None = never expires. Annual and monthly entries are also keyed to their
+# period, so a new year/month starts a fresh entry; the TTL only bounds how
+# long a still-open period is trusted before re-checking for new data.
+CADENCE_CACHE_TTL_SECONDS = {
+    "static": None,
+    "annual": 7 * 86400,
+    "monthly": 86400,
+    "16-day": 12 * 3600,
+    "8-day": 12 * 3600,
+    "5-day": 6 * 3600,
+    "daily": 3 * 3600,
+    "3-hourly": 3600
+}
+
 # Metric metadata for scoring and display
 METRIC_METADATA = {
     # Pillar A
@@ -4,12 +4,26 @@ This is the primary entry point for the Planetary Health Query System.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, AsyncIterator, Iterator, Tuple, Union
+import asyncio
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import CancelledError, Future, as_completed
+
+import ee
 
 from .authenticator import initialize_ee, get_project_id
-from .config import PILLAR_CONFIG, LANDCOVER_TO_ECOSYSTEM, ECOSYSTEM_CATEGORY_WEIGHTS
+from .config import (
+    PILLAR_CONFIG,
+    LANDCOVER_TO_ECOSYSTEM,
+    SITE_BATCH_SIZE
+)
+from .runtime import (
+    get_ee_limiter,
+    get_flight_group,
+    get_pillar_executor,
+    run_in_query_executor
+)
 from ..pillars import (
     AtmosphericPillar,
     BiodiversityPillar,
@@ -17,12 +31,27 @@ from ..pillars import (
     DegradationPillar,
     EcosystemPillar
 )
+from ..pillars.base import SITE_PROPERTY, TIME_SERIES_SCALE, BasePillar
+from ..utils.scoring_plan import get_scoring_plan
+from ..utils.geometry import PolygonGeometry
+from ..utils.ee_scoring import (
+    ECOSYSTEM_BAND,
+    PHI_BAND,
+    PHI_PALETTE,
+    ecosystem_types,
+    score_image
+)
 from ..utils.scoring import (
     calculate_pillar_score,
     calculate_overall_score,
     calculate_phi_esv_multiplier,
     get_score_interpretation
 )
+from ..utils.spatial_cache import (
+    SpatialMetricCache,
+    expand_dependencies,
+    get_metric_cache
+)
 from ..utils.quality import (
     assess_data_completeness,
     calculate_dqs,
@@ -30,6 +59,9 @@ from ..utils.quality import (
     get_dqs_recommendation
 )
 
+# Time-series period for each temporal mode
+TEMPORAL_PERIODS = {"monthly": "month", "annual": "year"}
+
 
 class GEEQueryEngine:
     """
@@ -40,7 +72,12 @@ class GEEQueryEngine:
         result = engine.query(lat=28.6139, lon=77.2090, mode="comprehensive")
     """
 
-    def __init__(self, project_id: str = None, auto_init: bool = True):
+    def __init__(
+        self,
+        project_id: str = None,
+        auto_init: bool = True,
+        metric_cache: Optional[SpatialMetricCache] = None
+    ):
         """
         Initialize the query engine.
 
@@ -48,9 +85,12 @@ class GEEQueryEngine:
             project_id: Google Cloud Project ID for Earth Engine.
                        If None, uses default from config.
             auto_init: If True, automatically initializes Earth Engine.
+            metric_cache: Optional spatial cache for per-metric values.
+                          Point queries reuse cached metrics when set.
         """
         self.project_id = project_id or get_project_id()
         self._initialized = False
+        self.metric_cache = metric_cache
 
         # Initialize pillar handlers
         self._pillars = {
@@ -86,7 +126,13 @@ class GEEQueryEngine:
         date_range: Optional[Tuple[str, str]] = None,
         buffer_radius: int = 500,
         pillars: Optional[List[str]] = None,
-        parallel: bool = True
+        parallel: bool = True,
+        batched: bool = False,
+        use_cache: bool = True,
+        coalesce: bool = True,
+        coalesce_pillars: bool = False,
+        cancel_event: Optional[threading.Event] = None,
+        provided: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Query all planetary health pillars for a location.
@@ -97,15 +143,77 @@ class GEEQueryEngine:
             mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
             include_scores: Include calculated pillar scores (0-100)
             include_raw: Include raw satellite values
-            temporal: "latest", "monthly", or "annual"
+            temporal: "latest", "monthly", or "annual". Monthly and annual
+                      queries also return per-period series of the
+                      time-varying metrics in result["time_series"]
             date_range: Optional (start_date, end_date) in YYYY-MM-DD format
             buffer_radius: Radius in meters for spatial averaging
             pillars: List of pillars to query (e.g., ["A", "B"]). None = all.
             parallel: If True, query pillars in parallel
+            batched: If True, resolve all pillars in a single Earth Engine
+                     request (takes precedence over parallel)
+            use_cache: If True and the engine has a metric cache, only
+                       metrics missing from the cache are queried
+            coalesce: If True, identical queries already in flight are
+                      shared instead of repeated
+            coalesce_pillars: If True, identical pillar queries are shared
+                              across different queries (parallel and
+                              sequential modes)
+            cancel_event: Optional event; once set, remaining work is skipped
+                          and CancelledError is raised
+            provided: Metric results from other sources that take precedence
+                      over Earth Engine (e.g. {"aqi": {"value": 42, ...}}).
+                      They are used as they are, and only the remaining
+                      metrics (plus inputs of derived ones) are queried.
 
         Returns:
             Dict containing all pillar results and summary
         """
+        kwargs = dict(
+            mode=mode,
+            include_scores=include_scores,
+            include_raw=include_raw,
+            temporal=temporal,
+            date_range=date_range,
+            buffer_radius=buffer_radius,
+            pillars=pillars,
+            parallel=parallel,
+            batched=batched,
+            use_cache=use_cache,
+            coalesce_pillars=coalesce_pillars,
+            cancel_event=cancel_event,
+            provided=provided
+        )
+        if not coalesce:
+            return self._query(lat, lon, **kwargs)
+
+        key = (
+            self.project_id, lat, lon, mode, include_scores, include_raw,
+            temporal, tuple(date_range) if date_range else None,
+            buffer_radius, tuple(pillars) if pillars else None, use_cache,
+            json.dumps(provided, sort_keys=True, default=str) if provided else None
+        )
+        return get_flight_group("query").do(key, self._query, lat, lon, **kwargs)
+
+    def _query(
+        self,
+        lat: float,
+        lon: float,
+        mode: str,
+        include_scores: bool,
+        include_raw: bool,
+        temporal: str,
+        date_range: Optional[Tuple[str, str]],
+        buffer_radius: int,
+        pillars: Optional[List[str]],
+        parallel: bool,
+        batched: bool,
+        use_cache: bool,
+        coalesce_pillars: bool,
+        cancel_event: Optional[threading.Event],
+        provided: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Run one point query; see query() for arguments."""
         if not self._initialized:
             self.initialize()
 
@@ -120,7 +228,361 @@ class GEEQueryEngine:
         pillar_ids = pillars or list(self._pillars.keys())
 
         # Build query result
-        result = {
+        result = self._new_result(lat, lon, mode, temporal, buffer_radius, date_range)
+
+        # The series resolves alongside the pillar queries
+        series = self._start_time_series(
+            ee.Geometry.Point([lon, lat]).buffer(buffer_radius),
+            date_range, temporal, mode, pillar_ids
+        )
+
+        # Reuse cached and provided metrics; only the rest hit Earth Engine
+        cache = self.metric_cache if use_cache else None
+        cached = {}
+        hits = {}
+        fetch = None
+        if cache is not None or provided:
+            cached, hits, fetch = self._plan_metrics(
+                cache, provided, lat, lon, mode, buffer_radius, date_range, pillar_ids
+            )
+        remaining = [pid for pid in pillar_ids if pid not in cached]
+
+        # Query each remaining pillar
+        self._raise_if_cancelled(cancel_event)
+        queried = {}
+        if not remaining:
+            pass
+        elif batched:
+            queried = self._query_batched(
+                lat, lon, mode, buffer_radius, date_range, remaining, fetch
+            )
+        elif parallel:
+            queried = self._query_parallel(
+                lat, lon, mode, buffer_radius, date_range, remaining, fetch,
+                coalesce_pillars
+            )
+        else:
+            queried = self._query_sequential(
+                lat, lon, mode, buffer_radius, date_range, remaining, fetch,
+                coalesce_pillars
+            )
+        self._raise_if_cancelled(cancel_event)
+
+        # Keep pillars in request order, filling in cached metrics
+        for pid in pillar_ids:
+            pillar_key = f"{pid}_{PILLAR_CONFIG[pid]['name'].lower()}"
+            if pid in cached:
+                result["pillars"][pillar_key] = cached[pid]
+                continue
+            if pillar_key not in queried:
+                continue
+
+            pillar_data = queried[pillar_key]
+            if cache is not None:
+                cache.set_metrics(lat, lon, pillar_data.get("metrics", {}), date_range, buffer_radius)
+            self._merge_hits(pillar_data, hits.get(pid), self._pillars[pid].get_metrics(mode), provided)
+            if provided and "error" not in pillar_data:
+                self._pillars[pid].derive_metrics(pillar_data.get("metrics", {}))
+            result["pillars"][pillar_key] = pillar_data
+
+        return self._finalize_result(result, include_scores, include_raw, temporal, series)
+
+    def query_many(
+        self,
+        points: List[Dict[str, Any]],
+        mode: str = "simple",
+        include_scores: bool = True,
+        include_raw: bool = True,
+        temporal: str = "latest",
+        date_range: Optional[Tuple[str, str]] = None,
+        buffer_radius: int = 500,
+        pillars: Optional[List[str]] = None,
+        batch_size: int = SITE_BATCH_SIZE,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Query many locations, yielding each result as its batch completes.
+
+        Sites are grouped into batches of batch_size. For each batch, every
+        dataset is reduced over all sites with one reduceRegions() call, and
+        the whole batch is resolved in a single Earth Engine request, so cost
+        grows with the number of datasets rather than datasets x sites.
+        Batches run in parallel on the shared pillar pool.
+
+        Args:
+            points: Dicts with 'lat', 'lon' and an optional 'id'
+            mode: "simple" or "comprehensive"
+            include_scores: Include calculated pillar scores (0-100)
+            include_raw: Include raw satellite values
+            temporal: "latest", "monthly", or "annual"
+            date_range: Optional (start_date, end_date) in YYYY-MM-DD format
+            buffer_radius: Radius in meters for spatial averaging
+            pillars: List of pillars to query (e.g., ["A", "B"]). None = all.
+            batch_size: Sites per Earth Engine request
+            cancel_event: Optional event; once set, batches not yet started
+                          are skipped and CancelledError is raised
+
+        Yields:
+            Per-site results shaped like query(), plus a "site" entry with
+            the site's index in points and its id. Sites with invalid
+            coordinates yield {"site": ..., "error": message}.
+        """
+        if not self._initialized:
+            self.initialize()
+
+        sites, invalid, date_range = self._plan_sites(points, mode, temporal, date_range)
+        yield from invalid
+
+        batches = [sites[i:i + batch_size] for i in range(0, len(sites), batch_size)]
+        executor = get_pillar_executor()
+        futures = {
+            executor.submit(
+                self._query_sites, batch, date_range, mode, include_scores,
+                include_raw, temporal, buffer_radius, pillars, cancel_event
+            ): batch
+            for batch in batches
+        }
+
+        try:
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    results = [
+                        {"site": site, "error": str(e)}
+                        for site in futures[future]
+                    ]
+                yield from results
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def aquery_many(
+        self,
+        points: List[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        mode: str = "simple",
+        temporal: str = "latest",
+        date_range: Optional[Tuple[str, str]] = None,
+        batch_size: int = SITE_BATCH_SIZE,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async version of query_many() that does not block the event loop.
+
+        Each batch runs on the shared query executor with its own deadline.
+        A batch that times out yields an error for each of its sites; the
+        other batches are unaffected. Closing the iterator early cancels
+        batches that have not finished.
+
+        Args:
+            points: Dicts with 'lat', 'lon' and an optional 'id'
+            timeout: Optional deadline in seconds per batch
+            mode: "simple" or "comprehensive"
+            temporal: "latest", "monthly", or "annual"
+            date_range: Optional (start_date, end_date) in YYYY-MM-DD format
+            batch_size: Sites per Earth Engine request
+            **kwargs: include_scores, include_raw, buffer_radius, pillars
+
+        Yields:
+            Per-site results, as in query_many()
+        """
+        if not self._initialized:
+            await run_in_query_executor(self.initialize, timeout=timeout)
+
+        sites, invalid, date_range = self._plan_sites(points, mode, temporal, date_range)
+        for site_result in invalid:
+            yield site_result
+
+        async def run_batch(batch):
+            try:
+                return await run_in_query_executor(
+                    self._query_sites, batch, date_range,
+                    timeout=timeout, cancellable=True,
+                    mode=mode, temporal=temporal, **kwargs
+                )
+            except asyncio.TimeoutError:
+                return [
+                    {"site": site, "error": "Earth Engine query timed out"}
+                    for site in batch
+                ]
+            except Exception as e:
+                return [{"site": site, "error": str(e)} for site in batch]
+
+        tasks = [
+            asyncio.ensure_future(run_batch(sites[i:i + batch_size]))
+            for i in range(0, len(sites), batch_size)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for site_result in await next_done:
+                    yield site_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _plan_sites(
+        self,
+        points: List[Dict[str, Any]],
+        mode: str,
+        temporal: str,
+        date_range: Optional[Tuple[str, str]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Tuple[str, str]]:
+        """
+        Validate a multi-site request.
+
+        Returns:
+            (sites, invalid, date_range): valid sites as {"index", "id",
+            "lat", "lon"}, error results for invalid ones, and the window
+        """
+        # Mode and temporal apply to every site
+        self._validate_inputs(0.0, 0.0, mode, temporal)
+        if date_range is None:
+            date_range = self._get_date_range(temporal)
+
+        sites = []
+        invalid = []
+        for index, point in enumerate(points):
+            site = {"index": index, "id": point.get("id")}
+            try:
+                lat = float(point["lat"])
+                lon = float(point["lon"])
+                self._validate_inputs(lat, lon, mode, temporal)
+            except (KeyError, TypeError, ValueError) as e:
+                invalid.append({"site": site, "error": str(e)})
+                continue
+            sites.append({**site, "lat": lat, "lon": lon})
+
+        return sites, invalid, date_range
+
+    def _query_sites(
+        self,
+        sites: List[Dict[str, Any]],
+        date_range: Tuple[str, str],
+        mode: str = "simple",
+        include_scores: bool = True,
+        include_raw: bool = True,
+        temporal: str = "latest",
+        buffer_radius: int = 500,
+        pillars: Optional[List[str]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query one batch of sites with a single Earth Engine round trip.
+
+        Per-site reductions are returned as property lists (geometry
+        dropped) and split back into one pillar result per site, which is
+        then scored exactly like a point query.
+        """
+        self._raise_if_cancelled(cancel_event)
+        pillar_ids = pillars or list(self._pillars.keys())
+
+        collection = ee.FeatureCollection([
+            ee.Feature(
+                ee.Geometry.Point([site["lon"], site["lat"]]).buffer(buffer_radius),
+                {SITE_PROPERTY: position}
+            )
+            for position, site in enumerate(sites)
+        ])
+
+        plans = {}
+        build_errors = {}
+        for pillar_id in pillar_ids:
+            pillar = self._pillars[pillar_id]
+            metrics = pillar.get_metrics(mode)
+            try:
+                reductions, per_site = pillar.build_site_reductions(
+                    collection, date_range, metrics
+                )
+            except Exception as e:
+                build_errors[pillar_id] = str(e)
+                continue
+            # Per-site values come back as property dicts, without geometry
+            for key in per_site:
+                reductions[key] = reductions[key] \
+                    .select([".*"], None, False) \
+                    .toList(len(sites))
+            plans[pillar_id] = (metrics, reductions, per_site)
+
+        resolved = {}
+        if plans:
+            try:
+                with get_ee_limiter().slot():
+                    resolved = ee.Dictionary({
+                        pillar_id: ee.Dictionary(reductions)
+                        for pillar_id, (_, reductions, _) in plans.items()
+                    }).getInfo()
+            except Exception:
+                resolved = {
+                    pillar_id: self._pillars[pillar_id].resolve_reductions(reductions)
+                    for pillar_id, (_, reductions, _) in plans.items()
+                }
+        self._raise_if_cancelled(cancel_event)
+
+        results = []
+        for position, site in enumerate(sites):
+            lat, lon = site["lat"], site["lon"]
+            result = self._new_result(lat, lon, mode, temporal, buffer_radius, date_range)
+            result["site"] = {"index": site["index"], "id": site["id"]}
+
+            for pillar_id in pillar_ids:
+                pillar = self._pillars[pillar_id]
+                pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+                if pillar_id in build_errors:
+                    result["pillars"][pillar_key] = {
+                        "error": build_errors[pillar_id],
+                        "metrics": {}
+                    }
+                    continue
+
+                metrics, _, per_site = plans[pillar_id]
+                pillar_data = resolved.get(pillar_id) or {}
+                data = {
+                    key: self._site_value(value, position) if key in per_site else value
+                    for key, value in pillar_data.items()
+                }
+                try:
+                    pillar_result = pillar.parse_reductions(data, date_range, metrics)
+                    pillar_result = pillar.add_metadata(pillar_result, mode)
+                except Exception as e:
+                    pillar_result = {"error": str(e), "metrics": {}}
+                else:
+                    if self.metric_cache is not None:
+                        self.metric_cache.set_metrics(
+                            lat, lon, pillar_result["metrics"], date_range, buffer_radius
+                        )
+                result["pillars"][pillar_key] = pillar_result
+
+            results.append(
+                self._finalize_result(result, include_scores, include_raw, temporal)
+            )
+
+        return results
+
+    @staticmethod
+    def _site_value(value: Any, position: int) -> Any:
+        """Pick one site's properties out of a resolved per-site list."""
+        if not isinstance(value, list):
+            return value  # e.g. {"error": ...} shared by every site
+        if position >= len(value):
+            return {}
+        feature = value[position] or {}
+        properties = feature.get("properties")
+        return properties if properties is not None else {}
+
+    def _new_result(
+        self,
+        lat: float,
+        lon: float,
+        mode: str,
+        temporal: str,
+        buffer_radius: int,
+        date_range: Tuple[str, str]
+    ) -> Dict[str, Any]:
+        """Start a point query result with its query description."""
+        return {
             "query": {
                 "latitude": lat,
                 "longitude": lon,
@@ -136,16 +598,15 @@ class GEEQueryEngine:
             "pillars": {}
         }
 
-        # Query each pillar
-        if parallel:
-            result["pillars"] = self._query_parallel(
-                lat, lon, mode, buffer_radius, date_range, pillar_ids
-            )
-        else:
-            result["pillars"] = self._query_sequential(
-                lat, lon, mode, buffer_radius, date_range, pillar_ids
-            )
-
+    def _finalize_result(
+        self,
+        result: Dict[str, Any],
+        include_scores: bool,
+        include_raw: bool,
+        temporal: str,
+        series: Optional[Future] = None
+    ) -> Dict[str, Any]:
+        """Score, trim and summarize a point query result."""
         # Add scores if requested
         if include_scores:
             result = self._add_scores(result)
@@ -157,38 +618,47 @@ class GEEQueryEngine:
         # Add summary
         result["summary"] = self._create_summary(result)
 
-        # Add time series info
-        result["time_series"] = {
-            "enabled": temporal != "latest",
-            "mode": temporal
-        }
+        # Add time series
+        result["time_series"] = self._time_series_info(temporal, series)
 
         return result
 
     def query_polygon(
         self,
-        points: List[Dict[str, float]],
+        points: Union[List[Dict[str, float]], Dict[str, Any]],
         mode: str = "comprehensive",
         include_scores: bool = True,
         include_raw: bool = True,
         temporal: str = "latest",
         date_range: Optional[Tuple[str, str]] = None,
         pillars: Optional[List[str]] = None,
-        parallel: bool = True
+        parallel: bool = True,
+        cancel_event: Optional[threading.Event] = None,
+        provided: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
-        Query all planetary health pillars for a polygon area defined by 4 points.
+        Query all planetary health pillars for a parcel.
+
+        Parcels may have any number of vertices, holes and parts. Input is
+        validated and repaired locally (see utils/geometry.py); each
+        reduction uses a copy simplified to its dataset's scale, while
+        area, carbon credits and ESV use the full-detail geometry.
 
         Args:
-            points: List of 4 dicts with 'lat' and 'lng' keys defining polygon corners
-                    Expected order: [NW, NE, SE, SW]
+            points: Vertices (at least 3 dicts with 'lat' and 'lng' keys),
+                    or a GeoJSON Polygon/MultiPolygon geometry or Feature
             mode: "simple" (10 metrics) or "comprehensive" (24 metrics)
             include_scores: Include calculated pillar scores (0-100)
             include_raw: Include raw satellite values
-            temporal: "latest", "monthly", or "annual"
+            temporal: "latest", "monthly", or "annual" (monthly and annual
+                      also return per-period series, see query())
             date_range: Optional (start_date, end_date) in YYYY-MM-DD format
             pillars: List of pillars to query (e.g., ["A", "B"]). None = all.
             parallel: If True, query pillars in parallel
+            cancel_event: Optional event; once set, remaining work is skipped
+                          and CancelledError is raised
+            provided: Metric results from other sources that take precedence
+                      over Earth Engine (see query())
 
         Returns:
             Dict containing all pillar results, summary, area info, carbon credits, and ESV
@@ -196,20 +666,8 @@ class GEEQueryEngine:
         if not self._initialized:
             self.initialize()
 
-        # Validate we have exactly 4 points
-        if len(points) != 4:
-            raise ValueError(f"Expected 4 points for polygon, got {len(points)}")
-
-        # Validate all point coordinates
-        for i, pt in enumerate(points):
-            lat = pt.get('lat')
-            lng = pt.get('lng')
-            if lat is None or lng is None:
-                raise ValueError(f"Point {i} missing lat or lng")
-            if not -90 <= lat <= 90:
-                raise ValueError(f"Point {i}: Latitude must be between -90 and 90, got {lat}")
-            if not -180 <= lng <= 180:
-                raise ValueError(f"Point {i}: Longitude must be between -180 and 180, got {lng}")
+        # Area, centroid and bbox are computed once, locally, for all pillars
+        geometry = PolygonGeometry(points)
 
         # Validate mode and temporal
         if mode not in ["simple", "comprehensive"]:
@@ -224,20 +682,15 @@ class GEEQueryEngine:
         # Determine which pillars to query
         pillar_ids = pillars or list(self._pillars.keys())
 
-        # Calculate centroid for reference
-        lats = [pt['lat'] for pt in points]
-        lngs = [pt['lng'] for pt in points]
-        centroid_lat = sum(lats) / 4
-        centroid_lng = sum(lngs) / 4
-
         # Build query result
         result = {
             "query": {
                 "type": "polygon",
-                "points": points,
+                "points": geometry.points,
+                "geometry_type": geometry.type,
                 "centroid": {
-                    "latitude": centroid_lat,
-                    "longitude": centroid_lng
+                    "latitude": geometry.centroid["lat"],
+                    "longitude": geometry.centroid["lng"]
                 },
                 "timestamp": datetime.now().isoformat(),
                 "mode": mode,
@@ -250,15 +703,47 @@ class GEEQueryEngine:
             "pillars": {}
         }
 
+        # The series resolves alongside the pillar queries
+        series = self._start_time_series(
+            geometry.to_ee(TIME_SERIES_SCALE), date_range, temporal, mode, pillar_ids
+        )
+
+        # Provided metrics are not queried
+        cached, hits, fetch = {}, {}, None
+        if provided:
+            cached, hits, fetch = self._plan_metrics(
+                None, provided, geometry.centroid["lat"], geometry.centroid["lng"],
+                mode, 0, date_range, pillar_ids
+            )
+        remaining = [pid for pid in pillar_ids if pid not in cached]
+
         # Query each pillar using polygon method
-        if parallel:
-            result["pillars"] = self._query_polygon_parallel(
-                points, mode, date_range, pillar_ids
+        self._raise_if_cancelled(cancel_event)
+        queried = {}
+        if not remaining:
+            pass
+        elif parallel:
+            queried = self._query_polygon_parallel(
+                geometry, mode, date_range, remaining, fetch
             )
         else:
-            result["pillars"] = self._query_polygon_sequential(
-                points, mode, date_range, pillar_ids
+            queried = self._query_polygon_sequential(
+                geometry, mode, date_range, remaining, fetch
             )
+        self._raise_if_cancelled(cancel_event)
+
+        # Keep pillars in request order
+        for pid in pillar_ids:
+            pillar_key = f"{pid}_{PILLAR_CONFIG[pid]['name'].lower()}"
+            if pid in cached:
+                cached[pid]["geometry"] = geometry.as_dict()
+                result["pillars"][pillar_key] = cached[pid]
+            elif pillar_key in queried:
+                pillar_data = queried[pillar_key]
+                self._merge_hits(pillar_data, hits.get(pid), self._pillars[pid].get_metrics(mode), provided)
+                if provided and "error" not in pillar_data:
+                    self._pillars[pid].derive_metrics(pillar_data.get("metrics", {}))
+                result["pillars"][pillar_key] = pillar_data
 
         # Add scores if requested
         if include_scores:
@@ -269,66 +754,547 @@ class GEEQueryEngine:
             result = self._remove_raw_values(result)
 
         # Add summary with polygon-specific data
-        result["summary"] = self._create_polygon_summary(result, points)
+        result["summary"] = self._create_polygon_summary(result, geometry)
+
+        # Add time series
+        result["time_series"] = self._time_series_info(temporal, series)
+
+        return result
+
+    def query_time_series(
+        self,
+        lat: float,
+        lon: float,
+        date_range: Optional[Tuple[str, str]] = None,
+        period: str = "month",
+        metrics: Optional[List[str]] = None,
+        mode: str = "comprehensive",
+        buffer_radius: int = 500,
+        pillars: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query per-period series of the time-varying metrics at a location.
 
-        # Add time series info
-        result["time_series"] = {
+        Every period of every pillar is composited and reduced on the
+        server, and the whole series comes back in one request: a 5-year
+        monthly series costs one round trip, like a single-date query.
+
+        Args:
+            lat: Latitude (-90 to 90)
+            lon: Longitude (-180 to 180)
+            date_range: Optional (start_date, end_date) in YYYY-MM-DD format.
+                        Defaults to the last year (month) or 5 years (year).
+            period: "month" or "year"
+            metrics: Metric names to include (None = the mode's metrics)
+            mode: "simple" or "comprehensive"
+            buffer_radius: Radius in meters for spatial averaging
+            pillars: List of pillars to query (e.g., ["A", "B"]). None = all.
+
+        Returns:
+            Dict with "period", "dates" (period start dates) and "metrics"
+            (one value list per metric, aligned with dates)
+        """
+        if not self._initialized:
+            self.initialize()
+
+        self._validate_inputs(lat, lon, mode, "latest")
+        if date_range is None:
+            date_range = self._get_date_range("annual" if period == "year" else "monthly")
+
+        return self._query_time_series(
+            ee.Geometry.Point([lon, lat]).buffer(buffer_radius),
+            date_range, period, mode, pillars or list(self._pillars.keys()), metrics
+        )
+
+    def _start_time_series(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        temporal: str,
+        mode: str,
+        pillar_ids: List[str]
+    ) -> Optional[Future]:
+        """Start the series for a monthly/annual query on the pillar pool."""
+        period = TEMPORAL_PERIODS.get(temporal)
+        if period is None:
+            return None
+        return get_pillar_executor().submit(
+            self._query_time_series, region, date_range, period, mode, pillar_ids
+        )
+
+    def _query_time_series(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        period: str,
+        mode: str,
+        pillar_ids: List[str],
+        metrics: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Resolve the series of every pillar in one request, as columns."""
+        plans = {}
+        for pillar_id in pillar_ids:
+            pillar = self._pillars[pillar_id]
+            if metrics is None:
+                wanted = pillar.get_metrics(mode)
+            else:
+                wanted = [m for m in pillar.get_comprehensive_metrics() if m in metrics]
+            wanted = [m for m in wanted if m in pillar.TIME_SERIES_METRICS]
+            series = pillar.build_time_series(region, date_range, wanted, period)
+            if series is not None:
+                plans[pillar_id] = (wanted, series)
+
+        dates = []
+        values = {}
+        if plans:
+            with get_ee_limiter().slot():
+                resolved = ee.Dictionary({
+                    pillar_id: series for pillar_id, (_, series) in plans.items()
+                }).getInfo()
+            # Every pillar uses the same periods, so the dates are shared
+            for pillar_id, (wanted, _) in plans.items():
+                dates, columns = BasePillar.parse_time_series(
+                    resolved.get(pillar_id) or [], wanted
+                )
+                values.update(columns)
+
+        return {
+            "period": period,
+            "dates": dates,
+            "metrics": values
+        }
+
+    @staticmethod
+    def _time_series_info(temporal: str, series: Optional[Future]) -> Dict[str, Any]:
+        """Time-series section of a result, waiting for the series if started."""
+        info = {
             "enabled": temporal != "latest",
             "mode": temporal
         }
+        if series is not None:
+            try:
+                info.update(series.result())
+            except Exception as e:
+                info["error"] = str(e)
+        return info
 
-        return result
+    async def aquery(
+        self,
+        lat: float,
+        lon: float,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async version of query() that does not block the event loop.
 
-    def _query_polygon_parallel(
+        The query runs on the shared query executor. If the caller is
+        cancelled or the timeout expires, a query still waiting in the
+        queue never starts and a running one stops at its next stage.
+
+        Args:
+            lat: Latitude (-90 to 90)
+            lon: Longitude (-180 to 180)
+            timeout: Optional deadline in seconds
+            **kwargs: Any other query() argument
+
+        Returns:
+            Dict containing all pillar results and summary
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+        """
+        return await run_in_query_executor(
+            self.query, lat, lon, timeout=timeout, cancellable=True, **kwargs
+        )
+
+    async def aquery_time_series(
+        self,
+        lat: float,
+        lon: float,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async version of query_time_series() that does not block the event loop.
+
+        Args:
+            lat: Latitude (-90 to 90)
+            lon: Longitude (-180 to 180)
+            timeout: Optional deadline in seconds
+            **kwargs: Any other query_time_series() argument
+
+        Returns:
+            Dict with "period", "dates" and "metrics" columns
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+        """
+        return await run_in_query_executor(
+            self.query_time_series, lat, lon, timeout=timeout, **kwargs
+        )
+
+    async def aquery_polygon(
         self,
-        points: List[Dict[str, float]],
+        points: Union[List[Dict[str, float]], Dict[str, Any]],
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async version of query_polygon() that does not block the event loop.
+
+        Args:
+            points: Vertices or a GeoJSON Polygon/MultiPolygon (see query_polygon())
+            timeout: Optional deadline in seconds
+            **kwargs: Any other query_polygon() argument
+
+        Returns:
+            Dict containing all pillar results, summary, area info, carbon credits, and ESV
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+        """
+        return await run_in_query_executor(
+            self.query_polygon, points, timeout=timeout, cancellable=True, **kwargs
+        )
+
+    def build_score_image(
+        self,
+        region: Any,
+        mode: str = "comprehensive",
+        date_range: Optional[Tuple[str, str]] = None,
+        ecosystem_type: Optional[str] = None
+    ) -> ee.Image:
+        """
+        Build the per-pixel PHI image for a region (nothing is evaluated).
+
+        Args:
+            region: ee.Geometry, GeoJSON geometry dict, or list of dicts
+                    with 'lat' and 'lng' keys (polygon vertices)
+            mode: "simple" or "comprehensive"
+            date_range: Optional (start_date, end_date). Defaults to last 30 days.
+            ecosystem_type: Fixed ecosystem weights (None = detect per pixel)
+
+        Returns:
+            ee.Image with a "phi" band, one band per pillar (e.g.
+            "A_atmospheric") and an "ecosystem" band, clipped to the region
+        """
+        region = self._raster_region(region)
+        if date_range is None:
+            date_range = self._get_date_range("latest")
+
+        metric_images = {}
+        for pillar in self._pillars.values():
+            metric_images.update(
+                pillar.build_metric_images(region, date_range, pillar.get_metrics(mode))
+            )
+        return score_image(metric_images, ecosystem_type, mode).clip(region)
+
+    def score_raster(
+        self,
+        region: Any,
+        scale: int = 100,
+        mode: str = "comprehensive",
+        temporal: str = "latest",
+        date_range: Optional[Tuple[str, str]] = None,
+        ecosystem_type: Optional[str] = None,
+        tile_bands: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score a whole region per pixel on Earth Engine.
+
+        Zonal statistics and heatmap tiles come from the same image graph:
+        one request returns the statistics of every band, and one map id
+        per tiled band (requested concurrently) serves the heatmap.
+
+        Args:
+            region: ee.Geometry, GeoJSON geometry dict, or list of dicts
+                    with 'lat' and 'lng' keys (polygon vertices)
+            scale: Pixel size in meters for the statistics
+            mode: "simple" or "comprehensive"
+            temporal: "latest", "monthly", or "annual" (ignored with date_range)
+            date_range: Optional (start_date, end_date) in YYYY-MM-DD format
+            ecosystem_type: Fixed ecosystem weights (None = detect per pixel)
+            tile_bands: Bands to serve as map tiles (default: phi only)
+
+        Returns:
+            Dict with per-band statistics, a summary and tile URL templates
+        """
+        if not self._initialized:
+            self.initialize()
+        if mode not in ["simple", "comprehensive"]:
+            raise ValueError(f"Mode must be 'simple' or 'comprehensive', got {mode}")
+        if temporal not in ["latest", "monthly", "annual"]:
+            raise ValueError(f"Temporal must be 'latest', 'monthly', or 'annual', got {temporal}")
+        if date_range is None:
+            date_range = self._get_date_range(temporal)
+        if tile_bands is None:
+            tile_bands = [PHI_BAND]
+
+        region = self._raster_region(region)
+        image = self.build_score_image(region, mode, date_range, ecosystem_type)
+        score_bands = image.bandNames().filter(ee.Filter.neq("item", ECOSYSTEM_BAND))
+
+        stats_reducer = ee.Reducer.mean() \
+            .combine(ee.Reducer.minMax(), sharedInputs=True) \
+            .combine(ee.Reducer.percentile([10, 50, 90]), sharedInputs=True) \
+            .combine(ee.Reducer.count(), sharedInputs=True)
+        zonal = ee.Dictionary({
+            "stats": image.select(score_bands).reduceRegion(
+                reducer=stats_reducer, geometry=region, scale=scale, maxPixels=1e9
+            ),
+            "ecosystems": image.select(ECOSYSTEM_BAND).reduceRegion(
+                reducer=ee.Reducer.frequencyHistogram(), geometry=region, scale=scale, maxPixels=1e9
+            ),
+            "area_km2": region.area(1).divide(1e6)
+        })
+
+        # Tiles and statistics are independent requests on the same graph
+        executor = get_pillar_executor()
+        tile_futures = {
+            band: executor.submit(self._raster_tiles, image, band)
+            for band in tile_bands
+        }
+        with get_ee_limiter().slot():
+            resolved = zonal.getInfo()
+
+        stats = {}
+        for key, value in (resolved.get("stats") or {}).items():
+            band, statistic = key.rsplit("_", 1)
+            stats.setdefault(band, {})[statistic] = value
+
+        types = ecosystem_types()
+        histogram = (resolved.get("ecosystems") or {}).get(ECOSYSTEM_BAND) or {}
+        pixels = sum(histogram.values())
+        ecosystems = {
+            types[int(float(position))]: round(count / pixels, 4)
+            for position, count in histogram.items()
+        } if pixels else {}
+
+        phi = stats.get(PHI_BAND, {}).get("mean")
+        overall_score = round(phi, 2) if phi is not None else None
+        pillar_keys = get_scoring_plan(mode=mode).pillar_keys
+        pillar_scores = {
+            pillar_id: round(stats[key]["mean"], 2)
+            for pillar_id, key in pillar_keys.items()
+            if stats.get(key, {}).get("mean") is not None
+        }
+
+        return {
+            "query": {
+                "type": "raster",
+                "timestamp": datetime.now().isoformat(),
+                "mode": mode,
+                "scale": scale,
+                "ecosystem_weights": ecosystem_type or "per_pixel",
+                "date_range": {
+                    "start": date_range[0],
+                    "end": date_range[1]
+                }
+            },
+            "stats": stats,
+            "summary": {
+                "overall_score": overall_score,
+                "overall_interpretation": get_score_interpretation(
+                    round(overall_score) if overall_score is not None else None
+                ),
+                "pillar_scores": pillar_scores,
+                "area_km2": resolved.get("area_km2"),
+                "ecosystems": ecosystems,
+                "dominant_ecosystem": max(ecosystems, key=ecosystems.get) if ecosystems else None,
+                "methodology": "PHI Technical Framework v1.0 (per-pixel)"
+            },
+            "tiles": {band: future.result() for band, future in tile_futures.items()}
+        }
+
+    async def ascore_raster(
+        self,
+        region: Any,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async version of score_raster() that does not block the event loop.
+
+        Args:
+            region: ee.Geometry, GeoJSON geometry dict, or polygon vertices
+            timeout: Optional deadline in seconds
+            **kwargs: Any other score_raster() argument
+
+        Returns:
+            Dict with per-band statistics, a summary and tile URL templates
+
+        Raises:
+            asyncio.TimeoutError: If the deadline expires
+        """
+        return await run_in_query_executor(
+            self.score_raster, region, timeout=timeout, **kwargs
+        )
+
+    @staticmethod
+    def _raster_region(region: Any) -> ee.Geometry:
+        """Accept an ee.Geometry, a GeoJSON geometry or polygon vertices."""
+        if isinstance(region, dict):
+            return ee.Geometry(region)
+        if isinstance(region, (list, tuple)):
+            if len(region) < 3:
+                raise ValueError(f"A polygon needs at least 3 points, got {len(region)}")
+            coords = [[pt["lng"], pt["lat"]] for pt in region]
+            coords.append(coords[0])
+            return ee.Geometry.Polygon([coords])
+        return region
+
+    @staticmethod
+    def _raster_tiles(image: ee.Image, band: str) -> Dict[str, Any]:
+        """Map id for one band of a score image, as an XYZ URL template."""
+        vis = {"min": 0, "max": 100, "palette": PHI_PALETTE}
+        with get_ee_limiter().slot():
+            map_id = image.select(band).getMapId(vis)
+        return {"url": map_id["tile_fetcher"].url_format, **vis}
+
+    def _plan_metrics(
+        self,
+        cache: Optional[SpatialMetricCache],
+        provided: Optional[Dict[str, Dict[str, Any]]],
+        lat: float,
+        lon: float,
         mode: str,
+        buffer_radius: int,
         date_range: Tuple[str, str],
         pillar_ids: List[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict], Dict[str, List[str]]]:
+        """
+        Split a query into known metrics and metrics to fetch.
+
+        Metrics are known when cached or provided by another source
+        (provided values win). Derived metrics are fetched together with
+        their inputs, so a pillar can recompute them (e.g. carbon_stock
+        from biomass). Provided inputs are not fetched; the pillar derives
+        from them after the query (BasePillar.derive_metrics).
+
+        Returns:
+            (cached, hits, fetch):
+            cached - pillar ID to a full result assembled from known metrics
+            hits   - pillar ID to its known metrics, for partial pillars
+            fetch  - pillar ID to the metrics still to query
+        """
+        provided = provided or {}
+        cached = {}
+        hits = {}
+        fetch = {}
+
+        for pid in pillar_ids:
+            pillar = self._pillars[pid]
+            metrics = pillar.get_metrics(mode)
+            pillar_hits = {}
+            if cache is not None:
+                pillar_hits = cache.get_metrics(
+                    lat, lon, metrics, date_range, buffer_radius
+                )
+            pillar_hits.update({m: provided[m] for m in metrics if m in provided})
+            missing = [m for m in metrics if m not in pillar_hits]
+
+            if not missing:
+                pillar_result = {
+                    "metrics": {name: pillar_hits[name] for name in metrics},
+                    "data_date": pillar.get_data_date(date_range),
+                    "cached": not any(m in provided for m in metrics)
+                }
+                cached[pid] = pillar.add_metadata(pillar_result, mode)
+                continue
+
+            needed = expand_dependencies(missing, known=provided)
+            hits[pid] = {m: v for m, v in pillar_hits.items() if m not in needed}
+            fetch[pid] = [m for m in metrics if m in needed] + \
+                [m for m in needed if m not in metrics]
+
+        return cached, hits, fetch
+
+    @staticmethod
+    def _merge_hits(
+        pillar_data: Dict[str, Any],
+        hits: Optional[Dict],
+        order: List[str],
+        provided: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        """
+        Fill known metrics into a queried pillar, in the pillar's metric order.
+
+        Provided metrics also replace values fetched only as inputs of
+        derived metrics.
+        """
+        overrides = {m: v for m, v in (provided or {}).items() if m in order}
+        if not (hits or overrides) or "error" in pillar_data:
+            return
+        merged = {**(hits or {}), **pillar_data.get("metrics", {}), **overrides}
+        pillar_data["metrics"] = {
+            name: merged[name]
+            for name in order + [m for m in merged if m not in order]
+            if name in merged
+        }
+
+    @staticmethod
+    def _raise_if_cancelled(cancel_event: Optional[threading.Event]):
+        """Stop a query whose caller has gone away."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise CancelledError("Query cancelled")
+
+    def _query_polygon_parallel(
+        self,
+        geometry: PolygonGeometry,
+        mode: str,
+        date_range: Tuple[str, str],
+        pillar_ids: List[str],
+        pillar_metrics: Optional[Dict[str, List[str]]] = None
     ) -> Dict[str, Any]:
         """Query pillars for polygon in parallel."""
+        pillar_metrics = pillar_metrics or {}
         results = {}
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                executor.submit(
-                    self._pillars[pid].query_polygon,
-                    points, mode, date_range
-                ): pid
-                for pid in pillar_ids
-            }
+        executor = get_pillar_executor()
+        futures = {
+            executor.submit(
+                self._pillars[pid].query_polygon,
+                geometry.points, mode, date_range, geometry, pillar_metrics.get(pid)
+            ): pid
+            for pid in pillar_ids
+        }
 
-            for future in as_completed(futures):
-                pillar_id = futures[future]
-                try:
-                    pillar_result = future.result()
-                    pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
-                    results[pillar_key] = pillar_result
-                except Exception as e:
-                    pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
-                    results[pillar_key] = {
-                        "error": str(e),
-                        "metrics": {}
-                    }
+        for future in as_completed(futures):
+            pillar_id = futures[future]
+            try:
+                pillar_result = future.result()
+                pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+                results[pillar_key] = pillar_result
+            except Exception as e:
+                pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+                results[pillar_key] = {
+                    "error": str(e),
+                    "metrics": {}
+                }
 
         return results
 
     def _query_polygon_sequential(
         self,
-        points: List[Dict[str, float]],
+        geometry: PolygonGeometry,
         mode: str,
         date_range: Tuple[str, str],
-        pillar_ids: List[str]
+        pillar_ids: List[str],
+        pillar_metrics: Optional[Dict[str, List[str]]] = None
     ) -> Dict[str, Any]:
         """Query pillars for polygon sequentially."""
+        pillar_metrics = pillar_metrics or {}
         results = {}
 
         for pillar_id in pillar_ids:
             try:
                 pillar_result = self._pillars[pillar_id].query_polygon(
-                    points=points,
+                    points=geometry.points,
                     mode=mode,
-                    date_range=date_range
+                    date_range=date_range,
+                    geometry=geometry,
+                    metrics=pillar_metrics.get(pillar_id)
                 )
                 pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
                 results[pillar_key] = pillar_result
@@ -341,30 +1307,17 @@ class GEEQueryEngine:
 
         return results
 
-    def _create_polygon_summary(self, result: Dict, points: List[Dict[str, float]]) -> Dict:
+    def _create_polygon_summary(self, result: Dict, geometry: PolygonGeometry) -> Dict:
         """
         Create summary statistics for polygon query with carbon credits and ESV.
         """
+        return self._polygon_summary(result, geometry.area_ha, geometry.as_dict())
+
+    def _polygon_summary(self, result: Dict, area_ha: float, geometry_info: Dict) -> Dict:
+        """Polygon summary from the parcel's area and geometry section."""
         # Get base summary from existing method
         base_summary = self._create_summary(result)
 
-        # Extract geometry info from first pillar that has it
-        area_ha = None
-        area_m2 = None
-        geometry_info = None
-
-        for pillar_data in result["pillars"].values():
-            if "geometry" in pillar_data:
-                geometry_info = pillar_data["geometry"]
-                area_ha = geometry_info.get("area_ha")
-                area_m2 = geometry_info.get("area_m2")
-                break
-
-        # If no geometry found, calculate approximate area using Haversine formula
-        if area_ha is None:
-            area_ha = self._calculate_polygon_area_approx(points)
-            area_m2 = area_ha * 10000
-
         # Extract biomass and carbon data from Carbon pillar
         biomass = None
         tree_cover = None
@@ -400,48 +1353,12 @@ class GEEQueryEngine:
         )
 
         # Add polygon-specific data to summary
-        base_summary["geometry"] = {
-            "type": "Polygon",
-            "points": points,
-            "area_m2": area_m2,
-            "area_ha": area_ha,
-            "area_acres": area_ha * 2.47105 if area_ha else None
-        }
+        base_summary["geometry"] = geometry_info
         base_summary["carbon_credits"] = carbon_credits
         base_summary["ecosystem_service_value"] = esv
 
         return base_summary
 
-    def _calculate_polygon_area_approx(self, points: List[Dict[str, float]]) -> float:
-        """
-        Calculate approximate area of polygon in hectares using Shoelace formula.
-        Approximation using lat/lng as planar coordinates (works for small areas).
-        """
-        import math
-
-        # Convert to list of (lat, lng) tuples
-        coords = [(pt['lat'], pt['lng']) for pt in points]
-
-        # Shoelace formula for polygon area
-        n = len(coords)
-        area = 0.0
-        for i in range(n):
-            j = (i + 1) % n
-            area += coords[i][1] * coords[j][0]
-            area -= coords[j][1] * coords[i][0]
-        area = abs(area) / 2.0
-
-        # Convert from degrees^2 to hectares (approximate)
-        # 1 degree ≈ 111.32 km at equator
-        avg_lat = sum(c[0] for c in coords) / n
-        lat_km = 111.32  # km per degree latitude
-        lng_km = 111.32 * math.cos(math.radians(avg_lat))  # km per degree longitude
-
-        area_km2 = area * lat_km * lng_km
-        area_ha = area_km2 * 100  # 1 km² = 100 ha
-
-        return area_ha
-
     def _calculate_carbon_credits(
         self,
         biomass: Optional[float],
@@ -655,32 +1572,132 @@ class GEEQueryEngine:
         mode: str,
         buffer_radius: int,
         date_range: Tuple[str, str],
-        pillar_ids: List[str]
+        pillar_ids: List[str],
+        pillar_metrics: Optional[Dict[str, List[str]]] = None,
+        coalesce: bool = False
     ) -> Dict[str, Any]:
         """Query pillars in parallel."""
+        pillar_metrics = pillar_metrics or {}
+        results = {}
+
+        executor = get_pillar_executor()
+        futures = {
+            executor.submit(
+                self._query_pillar,
+                pid, lat, lon, mode, buffer_radius, date_range,
+                pillar_metrics.get(pid), coalesce
+            ): pid
+            for pid in pillar_ids
+        }
+
+        for future in as_completed(futures):
+            pillar_id = futures[future]
+            try:
+                pillar_result = future.result()
+                pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+                results[pillar_key] = pillar_result
+            except Exception as e:
+                pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+                results[pillar_key] = {
+                    "error": str(e),
+                    "metrics": {}
+                }
+
+        return results
+
+    def _query_pillar(
+        self,
+        pillar_id: str,
+        lat: float,
+        lon: float,
+        mode: str,
+        buffer_radius: int,
+        date_range: Tuple[str, str],
+        metrics: Optional[List[str]],
+        coalesce: bool
+    ) -> Dict[str, Any]:
+        """Query one pillar, sharing identical pillar queries in flight."""
+        pillar = self._pillars[pillar_id]
+        if not coalesce:
+            return pillar.query(lat, lon, mode, buffer_radius, date_range, metrics)
+
+        key = (
+            self.project_id, pillar_id, lat, lon, mode, buffer_radius,
+            tuple(date_range), tuple(metrics) if metrics else None
+        )
+        return get_flight_group("pillar").do(
+            key, pillar.query, lat, lon, mode, buffer_radius, date_range, metrics
+        )
+
+    def _query_batched(
+        self,
+        lat: float,
+        lon: float,
+        mode: str,
+        buffer_radius: int,
+        date_range: Tuple[str, str],
+        pillar_ids: List[str],
+        pillar_metrics: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query pillars with a single Earth Engine round trip.
+
+        Every pillar contributes its lazy reductions to one nested
+        ee.Dictionary, which is resolved with one getInfo() call and split
+        back into the per-pillar results. One failing reduction fails the
+        whole request, so in that case each pillar is resolved on its own.
+
+        pillar_metrics optionally limits each pillar to a subset of metrics.
+        """
+        pillar_metrics = pillar_metrics or {}
+        region = ee.Geometry.Point([lon, lat]).buffer(buffer_radius)
+
         results = {}
+        plans = {}
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                executor.submit(
-                    self._pillars[pid].query,
-                    lat, lon, mode, buffer_radius, date_range
-                ): pid
-                for pid in pillar_ids
+        for pillar_id in pillar_ids:
+            pillar = self._pillars[pillar_id]
+            try:
+                metrics = pillar_metrics.get(pillar_id) or pillar.get_metrics(mode)
+                plans[pillar_id] = (
+                    metrics,
+                    pillar.build_reductions(region, date_range, metrics)
+                )
+            except Exception as e:
+                pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+                results[pillar_key] = {
+                    "error": str(e),
+                    "metrics": {}
+                }
+
+        if not plans:
+            return results
+
+        try:
+            with get_ee_limiter().slot():
+                resolved = ee.Dictionary({
+                    pillar_id: ee.Dictionary(reductions)
+                    for pillar_id, (_, reductions) in plans.items()
+                }).getInfo()
+        except Exception:
+            resolved = {
+                pillar_id: self._pillars[pillar_id].resolve_reductions(reductions)
+                for pillar_id, (_, reductions) in plans.items()
             }
 
-            for future in as_completed(futures):
-                pillar_id = futures[future]
-                try:
-                    pillar_result = future.result()
-                    pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
-                    results[pillar_key] = pillar_result
-                except Exception as e:
-                    pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
-                    results[pillar_key] = {
-                        "error": str(e),
-                        "metrics": {}
-                    }
+        for pillar_id, (metrics, _) in plans.items():
+            pillar = self._pillars[pillar_id]
+            pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
+            try:
+                pillar_result = pillar.parse_reductions(
+                    resolved.get(pillar_id) or {}, date_range, metrics
+                )
+                results[pillar_key] = pillar.add_metadata(pillar_result, mode)
+            except Exception as e:
+                results[pillar_key] = {
+                    "error": str(e),
+                    "metrics": {}
+                }
 
         return results
 
@@ -691,19 +1708,19 @@ class GEEQueryEngine:
         mode: str,
         buffer_radius: int,
         date_range: Tuple[str, str],
-        pillar_ids: List[str]
+        pillar_ids: List[str],
+        pillar_metrics: Optional[Dict[str, List[str]]] = None,
+        coalesce: bool = False
     ) -> Dict[str, Any]:
         """Query pillars sequentially."""
+        pillar_metrics = pillar_metrics or {}
         results = {}
 
         for pillar_id in pillar_ids:
             try:
-                pillar_result = self._pillars[pillar_id].query(
-                    lat=lat,
-                    lon=lon,
-                    mode=mode,
-                    buffer_radius=buffer_radius,
-                    date_range=date_range
+                pillar_result = self._query_pillar(
+                    pillar_id, lat, lon, mode, buffer_radius, date_range,
+                    pillar_metrics.get(pillar_id), coalesce
                 )
                 pillar_key = f"{pillar_id}_{PILLAR_CONFIG[pillar_id]['name'].lower()}"
                 results[pillar_key] = pillar_result
@@ -716,6 +1733,32 @@ class GEEQueryEngine:
 
         return results
 
+    def rescore(self, result: Dict) -> Dict:
+        """
+        Recompute pillar scores and the summary of a query result.
+
+        For results whose metrics were replaced after the query (e.g. by
+        Open-Meteo fallbacks), so scores match the returned metrics.
+        Results queried without scores are returned unchanged.
+
+        Args:
+            result: Point or polygon query result
+
+        Returns:
+            The result, updated in place
+        """
+        pillars = result.get("pillars", {})
+        if not any("score" in pillar_data for pillar_data in pillars.values()):
+            return result
+
+        result = self._add_scores(result)
+        geometry_info = result.get("summary", {}).get("geometry")
+        if geometry_info is None:
+            result["summary"] = self._create_summary(result)
+        else:
+            result["summary"] = self._polygon_summary(result, geometry_info["area_ha"], geometry_info)
+        return result
+
     def _add_scores(self, result: Dict) -> Dict:
         """Add pillar scores to result."""
         for pillar_key, pillar_data in result["pillars"].items():
@@ -811,42 +1854,25 @@ class GEEQueryEngine:
         - PHI-to-ESV multiplier
         - Missing critical metrics identification
         """
-        # Extract metrics for ecosystem detection
-        land_cover = None
-        tree_cover = None
-        human_modification = None
-
-        for pillar_key, pillar_data in result["pillars"].items():
-            metrics = pillar_data.get("metrics", {})
-
-            # Get land_cover value
-            if "land_cover" in metrics:
-                lc_data = metrics["land_cover"]
-                if isinstance(lc_data, dict):
-                    land_cover = lc_data.get("value")
-                else:
-                    land_cover = lc_data
-
-            # Get tree_cover value
-            if "tree_cover" in metrics:
-                tc_data = metrics["tree_cover"]
-                if isinstance(tc_data, dict):
-                    tree_cover = tc_data.get("value")
-                else:
-                    tree_cover = tc_data
-
-            # Get human_modification value
-            if "human_modification" in metrics:
-                hm_data = metrics["human_modification"]
-                if isinstance(hm_data, dict):
-                    human_modification = hm_data.get("value")
-                else:
-                    human_modification = hm_data
+        mode = result.get("query", {}).get("mode", "comprehensive")
+        plan = get_scoring_plan(mode=mode)
+
+        # Ecosystem detection metrics, read from the pillars that produce them
+        detection = {}
+        for metric_name in ("land_cover", "tree_cover", "human_modification"):
+            pillar_data = result["pillars"].get(plan.metric_pillar_keys.get(metric_name), {})
+            metric_data = pillar_data.get("metrics", {}).get(metric_name)
+            if isinstance(metric_data, dict):
+                metric_data = metric_data.get("value")
+            detection[metric_name] = metric_data
 
         # Detect ecosystem type for adaptive weighting
         ecosystem_type = self.detect_ecosystem_type(
-            land_cover, tree_cover, human_modification
+            detection["land_cover"],
+            detection["tree_cover"],
+            detection["human_modification"]
         )
+        plan = get_scoring_plan(ecosystem_type, mode)
 
         # Calculate pillar scores
         pillar_scores = {}
@@ -893,11 +1919,7 @@ class GEEQueryEngine:
         missing_critical = get_missing_critical_metrics(result["pillars"])
 
         # Get ecosystem weights used
-        ecosystem_config = ECOSYSTEM_CATEGORY_WEIGHTS.get(
-            ecosystem_type,
-            ECOSYSTEM_CATEGORY_WEIGHTS["default"]
-        )
-        weights_used = {k: v for k, v in ecosystem_config.items() if k in ["A", "B", "C", "D", "E"]}
+        weights_used = dict(plan.weights)
 
         return {
             # Core scores
@@ -924,6 +1946,42 @@ class GEEQueryEngine:
         }
 
 
+# Process-wide engine registry, one engine per project
+_engines: Dict[str, GEEQueryEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(project_id: str = None, auto_init: bool = True) -> GEEQueryEngine:
+    """
+    Get the shared query engine for a project, creating it on first use.
+
+    Engines hold no per-request state, so one instance serves every caller
+    in the process (backend API, dashboard and standalone app).
+
+    Args:
+        project_id: Google Cloud Project ID. If None, uses get_project_id().
+        auto_init: If True, initialize Earth Engine if not done yet.
+
+    Returns:
+        The shared GEEQueryEngine
+    """
+    project_id = project_id or get_project_id()
+
+    with _engines_lock:
+        engine = _engines.get(project_id)
+        if engine is None:
+            engine = GEEQueryEngine(
+                project_id=project_id,
+                auto_init=False,
+                metric_cache=get_metric_cache()
+            )
+            _engines[project_id] = engine
+
+    if auto_init:
+        engine.initialize()
+    return engine
+
+
 def query_location(
     lat: float,
     lon: float,
@@ -942,5 +2000,5 @@ def query_location(
     Returns:
         Query result dict
     """
-    engine = GEEQueryEngine(project_id=project_id)
+    engine = get_engine(project_id=project_id)
     return engine.query(lat=lat, lon=lon, mode=mode)
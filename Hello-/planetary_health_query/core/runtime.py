@@ -0,0 +1,431 @@
+"""
+Process-wide execution runtime for Earth Engine work.
+
+Holds the shared worker pools and the global cap on in-flight Earth Engine
+calls, so every engine in the process (backend API, dashboard, standalone
+app) draws from the same bounded resources:
+
+    query pool   - whole queries submitted by aquery()/aquery_polygon()
+    pillar pool  - per-pillar tasks of parallel queries
+    EE limiter   - caps concurrent getInfo()/thumbnail requests
+    flight groups - coalesce identical in-flight queries (single-flight)
+
+Both pools and the limiter record saturation, queue depth and latency,
+available through get_runtime_stats().
+"""
+
+import asyncio
+import copy
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+from .config import (
+    QUERY_EXECUTOR_WORKERS,
+    PILLAR_EXECUTOR_WORKERS,
+    MAX_INFLIGHT_EE_CALLS
+)
+
+# Number of recent samples kept for latency percentiles
+LATENCY_WINDOW = 1000
+
+
+def _summarize(samples: Deque[float]) -> Dict[str, Optional[float]]:
+    """Summarize latency samples (seconds) as milliseconds."""
+    if not samples:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        "avg": round(sum(ordered) / count * 1000, 2),
+        "p50": round(ordered[int(count * 0.50)] * 1000, 2),
+        "p95": round(ordered[min(count - 1, int(count * 0.95))] * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2)
+    }
+
+
+class InstrumentedExecutor:
+    """
+    ThreadPoolExecutor that tracks queue depth, saturation and latency.
+
+    Usage:
+        executor = InstrumentedExecutor("gee-pillar", max_workers=20)
+        future = executor.submit(fn, *args)
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Args:
+            name: Pool name, also used as the thread name prefix
+            max_workers: Maximum number of worker threads
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._queue_waits: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Submit a task, recording how long it waits and runs."""
+        enqueued_at = time.perf_counter()
+        started = threading.Event()
+
+        def run():
+            started.set()
+            began = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._queue_waits.append(began - enqueued_at)
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._latencies.append(time.perf_counter() - began)
+
+        def on_done(future: Future):
+            # A task cancelled while queued never runs, so un-queue it here
+            if future.cancelled() and not started.is_set():
+                with self._lock:
+                    self._queued -= 1
+                    self._cancelled += 1
+
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(run)
+        future.add_done_callback(on_done)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the underlying pool."""
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool metrics."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "saturation": round(self._active / self.max_workers, 3),
+                "completed": self._completed,
+                "failed": self._failed,
+                "cancelled": self._cancelled,
+                "latency_ms": _summarize(self._latencies),
+                "queue_wait_ms": _summarize(self._queue_waits)
+            }
+
+
+class EECallLimiter:
+    """
+    Global cap on concurrent Earth Engine requests.
+
+    Usage:
+        with get_ee_limiter().slot():
+            value = reduction.getInfo()
+    """
+
+    def __init__(self, max_inflight: int):
+        """
+        Args:
+            max_inflight: Maximum concurrent Earth Engine requests
+        """
+        self.max_inflight = max_inflight
+        self._semaphore = threading.BoundedSemaphore(max_inflight)
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._waiting = 0
+        self._calls = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._waits: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    @contextmanager
+    def slot(self):
+        """Hold one in-flight slot for the duration of an EE request."""
+        requested_at = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+
+        self._semaphore.acquire()
+        began = time.perf_counter()
+        with self._lock:
+            self._waiting -= 1
+            self._inflight += 1
+            self._calls += 1
+            self._waits.append(began - requested_at)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._inflight -= 1
+                self._latencies.append(time.perf_counter() - began)
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limiter metrics."""
+        with self._lock:
+            return {
+                "max_inflight": self.max_inflight,
+                "inflight": self._inflight,
+                "waiting": self._waiting,
+                "saturation": round(self._inflight / self.max_inflight, 3),
+                "calls": self._calls,
+                "latency_ms": _summarize(self._latencies),
+                "wait_ms": _summarize(self._waits)
+            }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one execution.
+
+    The first caller for a key (the leader) runs the function; callers
+    arriving while it runs wait for its result instead of repeating the
+    work, and receive a deep copy so they can modify it freely. If the
+    leader is cancelled, waiting callers retry and one of them takes over.
+
+    Usage:
+        flights = SingleFlight("query")
+        result = flights.do(key, engine_query, lat, lon)
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Group name, reported in stats
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs), or wait for an identical call in flight.
+
+        Args:
+            key: Hashable identity of the call
+            fn: Function to run if no identical call is in flight
+
+        Returns:
+            fn's result (a deep copy for coalesced callers)
+        """
+        while True:
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._inflight[key] = future
+                    self._executions += 1
+                else:
+                    self._coalesced += 1
+
+            if leader:
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    with self._lock:
+                        self._inflight.pop(key, None)
+                    future.set_exception(e)
+                    raise
+                with self._lock:
+                    self._inflight.pop(key, None)
+                future.set_result(result)
+                return result
+
+            try:
+                return copy.deepcopy(future.result())
+            except CancelledError:
+                # The leader's caller went away; run it ourselves
+                continue
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing metrics."""
+        with self._lock:
+            total = self._executions + self._coalesced
+            return {
+                "name": self.name,
+                "inflight": len(self._inflight),
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "coalesced_ratio": round(self._coalesced / total, 3) if total else 0.0
+            }
+
+
+# Process-wide instances, created lazily
+_runtime_lock = threading.Lock()
+_settings = {
+    "query_workers": QUERY_EXECUTOR_WORKERS,
+    "pillar_workers": PILLAR_EXECUTOR_WORKERS,
+    "max_inflight_ee_calls": MAX_INFLIGHT_EE_CALLS
+}
+_query_executor: Optional[InstrumentedExecutor] = None
+_pillar_executor: Optional[InstrumentedExecutor] = None
+_ee_limiter: Optional[EECallLimiter] = None
+_flight_groups: Dict[str, SingleFlight] = {}
+
+
+def configure_runtime(
+    query_workers: Optional[int] = None,
+    pillar_workers: Optional[int] = None,
+    max_inflight_ee_calls: Optional[int] = None
+):
+    """
+    Resize the shared pools and EE call cap.
+
+    Pools that already exist are replaced; tasks already submitted to the
+    old pool still finish.
+
+    Args:
+        query_workers: Threads for whole async queries
+        pillar_workers: Threads for per-pillar tasks
+        max_inflight_ee_calls: Maximum concurrent Earth Engine requests
+    """
+    global _query_executor, _pillar_executor, _ee_limiter
+
+    with _runtime_lock:
+        if query_workers is not None:
+            _settings["query_workers"] = query_workers
+            if _query_executor is not None:
+                _query_executor.shutdown(wait=False)
+                _query_executor = None
+        if pillar_workers is not None:
+            _settings["pillar_workers"] = pillar_workers
+            if _pillar_executor is not None:
+                _pillar_executor.shutdown(wait=False)
+                _pillar_executor = None
+        if max_inflight_ee_calls is not None:
+            _settings["max_inflight_ee_calls"] = max_inflight_ee_calls
+            _ee_limiter = None
+
+
+def get_query_executor() -> InstrumentedExecutor:
+    """Get the shared pool that runs whole queries for aquery()."""
+    global _query_executor
+    if _query_executor is None:
+        with _runtime_lock:
+            if _query_executor is None:
+                _query_executor = InstrumentedExecutor(
+                    "gee-query", _settings["query_workers"]
+                )
+    return _query_executor
+
+
+def get_pillar_executor() -> InstrumentedExecutor:
+    """Get the shared pool that runs per-pillar tasks."""
+    global _pillar_executor
+    if _pillar_executor is None:
+        with _runtime_lock:
+            if _pillar_executor is None:
+                _pillar_executor = InstrumentedExecutor(
+                    "gee-pillar", _settings["pillar_workers"]
+                )
+    return _pillar_executor
+
+
+def get_ee_limiter() -> EECallLimiter:
+    """Get the global cap on in-flight Earth Engine requests."""
+    global _ee_limiter
+    if _ee_limiter is None:
+        with _runtime_lock:
+            if _ee_limiter is None:
+                _ee_limiter = EECallLimiter(_settings["max_inflight_ee_calls"])
+    return _ee_limiter
+
+
+def get_flight_group(name: str) -> SingleFlight:
+    """Get the process-wide single-flight group with a name."""
+    with _runtime_lock:
+        group = _flight_groups.get(name)
+        if group is None:
+            group = _flight_groups[name] = SingleFlight(name)
+        return group
+
+
+def get_runtime_stats() -> Dict[str, Any]:
+    """Return metrics for the shared pools, EE call limiter and flight groups."""
+    with _runtime_lock:
+        groups = list(_flight_groups.values())
+    return {
+        "query_pool": get_query_executor().stats(),
+        "pillar_pool": get_pillar_executor().stats(),
+        "ee_calls": get_ee_limiter().stats(),
+        "coalescing": {group.name: group.stats() for group in groups}
+    }
+
+
+def shutdown_runtime(wait: bool = True):
+    """Shut down the shared pools (e.g. on application shutdown)."""
+    global _query_executor, _pillar_executor
+
+    with _runtime_lock:
+        for executor in (_query_executor, _pillar_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        _query_executor = None
+        _pillar_executor = None
+
+
+async def run_in_query_executor(
+    func: Callable[..., Any],
+    *args,
+    timeout: Optional[float] = None,
+    cancellable: bool = False,
+    **kwargs
+) -> Any:
+    """
+    Run a blocking Earth Engine call on the shared query pool.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        timeout: Optional deadline in seconds
+        cancellable: If True, pass a cancel_event to func that is set when
+                     the caller is cancelled or times out
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        asyncio.TimeoutError: If the deadline expires
+    """
+    cancel_event = None
+    if cancellable:
+        cancel_event = threading.Event()
+        kwargs["cancel_event"] = cancel_event
+
+    future = asyncio.wrap_future(
+        get_query_executor().submit(functools.partial(func, *args, **kwargs))
+    )
+
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        if cancel_event is not None:
+            cancel_event.set()
+        raise
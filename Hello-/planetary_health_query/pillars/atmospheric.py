@@ -15,6 +15,7 @@ class AtmosphericPillar(BasePillar):
     PILLAR_ID = "A"
     PILLAR_NAME = "Atmospheric"
     PILLAR_COLOR = "#3498db"
+    TIME_SERIES_METRICS = ["aod", "visibility", "aqi", "uv_index", "cloud_fraction"]
 
     def get_simple_metrics(self) -> List[str]:
         return ["aod", "aqi"]
@@ -22,34 +23,104 @@ class AtmosphericPillar(BasePillar):
     def get_comprehensive_metrics(self) -> List[str]:
         return ["aod", "aqi", "uv_index", "visibility", "cloud_fraction"]
 
-    def query_metrics(
+    def build_reductions(
         self,
-        point: ee.Geometry.Point,
-        buffer_radius: int,
+        region: ee.Geometry,
         date_range: Tuple[str, str],
         metrics: List[str]
-    ) -> Dict[str, Any]:
-        """Query atmospheric metrics."""
+    ) -> Dict[str, ee.ComputedObject]:
+        """Build atmospheric reductions."""
 
-        region = self._create_buffered_region(point, buffer_radius)
         date_filter = self._get_date_filter(date_range)
+        reductions = {}
+
+        # AOD from MCD19A2
+        if "aod" in metrics:
+            aod_collection = ee.ImageCollection(DATASETS["modis_aod"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["aod"] = self._reduce_region_lazy(
+                aod_collection.mean(),
+                region,
+                scale=1000
+            )
+
+        # Atmosphere products from MOD08_M3
+        if any(m in metrics for m in ["aqi", "uv_index", "cloud_fraction"]):
+            atm_collection = ee.ImageCollection(DATASETS["modis_atmosphere"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["atmosphere"] = self._reduce_region_lazy(
+                atm_collection.mean(),
+                region,
+                scale=100000  # ~1 degree
+            )
+
+        return reductions
+
+    def build_metric_images(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.Image]:
+        """Build per-pixel atmospheric metrics (same conversions as parse_reductions)."""
+
+        date_filter = self._get_date_filter(date_range)
+        images = {}
+
+        if "aod" in metrics or "visibility" in metrics:
+            aod_band = DATASETS["modis_aod"]["band"]
+            aod_collection = ee.ImageCollection(DATASETS["modis_aod"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            aod = self._composite_or(aod_collection, [aod_band]) \
+                .multiply(DATASETS["modis_aod"]["scale_factor"])
+
+            if "aod" in metrics:
+                images["aod"] = aod.rename("aod")
+            if "visibility" in metrics:
+                # visibility (km) ~ 50 / (1 + 10 * AOD), clamped to 1-50 km
+                images["visibility"] = ee.Image.constant(50) \
+                    .divide(aod.multiply(10).add(1)) \
+                    .clamp(1, 50) \
+                    .updateMask(aod.gte(0)) \
+                    .rename("visibility")
+
+        if any(m in metrics for m in ["aqi", "uv_index", "cloud_fraction"]):
+            bands = DATASETS["modis_atmosphere"]["bands"]
+            atm_collection = ee.ImageCollection(DATASETS["modis_atmosphere"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            atm = self._composite_or(atm_collection, [bands["aqi"], bands["uv"], bands["cloud"]])
+
+            if "aqi" in metrics:
+                images["aqi"] = atm.select(bands["aqi"]).multiply(1000).clamp(0, 500).rename("aqi")
+            if "uv_index" in metrics:
+                images["uv_index"] = ee.Image.constant(15) \
+                    .subtract(atm.select(bands["uv"]).divide(30)) \
+                    .max(0) \
+                    .rename("uv_index")
+            if "cloud_fraction" in metrics:
+                images["cloud_fraction"] = atm.select(bands["cloud"]).multiply(0.01).rename("cloud_fraction")
+
+        return images
+
+    def parse_reductions(
+        self,
+        data: Dict[str, Any],
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """Parse atmospheric metrics."""
 
         results = {"metrics": {}}
-        data_dates = []
 
-        # Query AOD from MCD19A2
         if "aod" in metrics:
             try:
-                aod_collection = ee.ImageCollection(DATASETS["modis_aod"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region)
-
-                aod_image = aod_collection.mean()
-                aod_data = self._reduce_region(
-                    aod_image,
-                    region,
-                    scale=1000
-                )
+                aod_data = data.get("aod", {})
 
                 aod_value = self._safe_get_value(
                     aod_data,
@@ -71,20 +142,9 @@ class AtmosphericPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query atmosphere products from MOD08_M3
         if any(m in metrics for m in ["aqi", "uv_index", "cloud_fraction"]):
             try:
-                atm_collection = ee.ImageCollection(DATASETS["modis_atmosphere"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region)
-
-                atm_image = atm_collection.mean()
-                atm_data = self._reduce_region(
-                    atm_image,
-                    region,
-                    scale=100000  # ~1 degree
-                )
-
+                atm_data = data.get("atmosphere", {})
                 if "aqi" in metrics:
                     aqi_value = self._safe_get_value(
                         atm_data,
@@ -166,7 +226,7 @@ class AtmosphericPillar(BasePillar):
                     "error": "Requires valid AOD value for calculation"
                 }
 
-        results["data_date"] = date_range[1]
+        results["data_date"] = self.get_data_date(date_range)
         return results
 
     def _assess_aod_quality(self, value: float) -> str:
@@ -5,9 +5,62 @@ All pillar implementations inherit from this class.
 
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
+import threading
 import ee
 
+from ..core.runtime import get_ee_limiter
+from ..utils.geometry import PolygonGeometry, polygon_geometry
+
+# Per-site reductions recorded while build_site_reductions() runs
+_site_reductions = threading.local()
+
+# Polygon whose region is simplified per reduction scale while a polygon
+# query builds its reductions
+_polygon_context = threading.local()
+
+# Feature property holding a site's position in a multi-site collection
+SITE_PROPERTY = "site"
+
+# Key naming the source a fallback chain resolved to
+SOURCE_KEY = "source"
+
+# Reduction key holding the query region's area in km2
+AREA_KEY = "area_km2"
+
+# Time-series periods (Earth Engine date units) and the key holding each
+# period's start date in a series row
+PERIODS = ("month", "year")
+DATE_KEY = "date"
+
+# Scale (meters) used to reduce every period of a time series
+TIME_SERIES_SCALE = 250
+
+
+def count_periods(date_range: Tuple[str, str], period: str) -> int:
+    """
+    Number of whole or partial periods in a date range.
+
+    Args:
+        date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
+        period: "month" or "year"
+
+    Returns:
+        Number of periods starting before the end date
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Period must be one of {PERIODS}, got {period}")
+
+    start = datetime.strptime(date_range[0], "%Y-%m-%d")
+    end = datetime.strptime(date_range[1], "%Y-%m-%d")
+    step = 12 if period == "year" else 1
+
+    months = (end.year - start.year) * 12 + end.month - start.month
+    full = max(months // step, 0)
+    offset = start.month - 1 + full * step
+    last_start = (start.year + offset // 12, offset % 12 + 1, start.day)
+    return full + 1 if last_start < (end.year, end.month, end.day) else full
+
 
 class BasePillar(ABC):
     """Abstract base class for planetary health pillars."""
@@ -17,6 +70,9 @@ class BasePillar(ABC):
     PILLAR_NAME: str = ""
     PILLAR_COLOR: str = "#000000"
 
+    # Metrics whose value changes between periods (see build_time_series)
+    TIME_SERIES_METRICS: List[str] = []
+
     def __init__(self):
         """Initialize the pillar query handler."""
         self._cache = {}
@@ -32,6 +88,143 @@ class BasePillar(ABC):
         pass
 
     @abstractmethod
+    def build_reductions(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.ComputedObject]:
+        """
+        Build the Earth Engine reductions needed for the requested metrics.
+
+        Nothing is evaluated here. The returned objects are resolved either
+        per pillar (query_metrics) or together with the other pillars in a
+        single request (GEEQueryEngine batched mode).
+
+        Args:
+            region: Region geometry to reduce over
+            date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
+            metrics: List of metric names to query
+
+        Returns:
+            Dict mapping reduction keys to un-evaluated ee objects
+        """
+        pass
+
+    @abstractmethod
+    def parse_reductions(
+        self,
+        data: Dict[str, Any],
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Convert resolved reductions into metric values.
+
+        Args:
+            data: Resolved values keyed like build_reductions. A reduction
+                  that failed is represented as {"error": message}.
+            date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
+            metrics: List of metric names to query
+
+        Returns:
+            Dict with metric values and metadata
+        """
+        pass
+
+    def build_metric_images(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.Image]:
+        """
+        Build per-pixel images of the requested metrics (raster scoring).
+
+        Each image has one band named after the metric, in the units
+        parse_reductions() reports. Metrics that only exist as a region
+        aggregate may be left out. Nothing is evaluated here.
+
+        Args:
+            region: Region the images will be scored over
+            date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
+            metrics: List of metric names to build
+
+        Returns:
+            Dict mapping metric names to un-evaluated single-band images
+        """
+        return {}
+
+    def build_time_series(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str],
+        period: str = "month",
+        scale: int = TIME_SERIES_SCALE
+    ) -> Optional[ee.List]:
+        """
+        Build a per-period series of the requested metrics.
+
+        Periods are generated on the server (ee.List.sequence + map): each
+        one composites build_metric_images() over its own dates and reduces
+        all metrics together, so the whole series resolves in one request
+        whatever its length. Metrics not in TIME_SERIES_METRICS are left out.
+
+        Args:
+            region: Region geometry to reduce over
+            date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
+            metrics: List of metric names to include
+            period: "month" or "year"
+            scale: Scale in meters for every period's reduction
+
+        Returns:
+            Lazy list with one dict per period (metric values plus DATE_KEY),
+            or None if no requested metric has a series
+        """
+        series_metrics = [m for m in metrics if m in self.TIME_SERIES_METRICS]
+        count = count_periods(date_range, period)
+        if not series_metrics or count == 0:
+            return None
+
+        start = ee.Date(date_range[0])
+        end = ee.Date(date_range[1])
+
+        def reduce_period(offset):
+            period_start = start.advance(offset, period)
+            period_end = ee.Date(period_start.advance(1, period).millis().min(end.millis()))
+            images = self.build_metric_images(region, (period_start, period_end), series_metrics)
+            return self._reduce_region_lazy(ee.Image.cat(list(images.values())), region, scale) \
+                .set(DATE_KEY, period_start.format("YYYY-MM-dd"))
+
+        return ee.List.sequence(0, count - 1).map(reduce_period)
+
+    @staticmethod
+    def parse_time_series(
+        rows: List[Dict[str, Any]],
+        metrics: List[str]
+    ) -> Tuple[List[str], Dict[str, List[Optional[float]]]]:
+        """
+        Convert resolved series rows into columns.
+
+        Args:
+            rows: Resolved build_time_series() output
+            metrics: Metric names to extract
+
+        Returns:
+            (dates, values): period start dates, and one value list per
+            metric aligned with dates (None where a period has no data)
+        """
+        dates = [row.get(DATE_KEY) for row in rows]
+        values = {}
+        for name in metrics:
+            column = []
+            for row in rows:
+                value = row.get(name)
+                column.append(round(float(value), 4) if isinstance(value, (int, float)) else None)
+            values[name] = column
+        return dates, values
+
     def query_metrics(
         self,
         point: ee.Geometry.Point,
@@ -51,7 +244,108 @@ class BasePillar(ABC):
         Returns:
             Dict with metric values and metadata
         """
-        pass
+        region = self._create_buffered_region(point, buffer_radius)
+        reductions = self.build_reductions(region, date_range, metrics)
+        data = self.resolve_reductions(reductions)
+        return self.parse_reductions(data, date_range, metrics)
+
+    def build_site_reductions(
+        self,
+        sites: ee.FeatureCollection,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Tuple[Dict[str, ee.ComputedObject], Set[str]]:
+        """
+        Build reductions for many sites at once.
+
+        Runs build_reductions() with the site collection as the region.
+        Image reductions become one reduceRegions() call over all sites;
+        anything else (e.g. collection sizes) is computed once and shared.
+
+        Args:
+            sites: Collection of buffered site features
+            date_range: Tuple of (start_date, end_date) in YYYY-MM-DD format
+            metrics: List of metric names to query
+
+        Returns:
+            (reductions, per_site): reductions keyed like build_reductions,
+            and the keys whose value is a per-site FeatureCollection
+        """
+        _site_reductions.recorded = []
+        try:
+            reductions = self.build_reductions(sites, date_range, metrics)
+            recorded = _site_reductions.recorded
+        finally:
+            _site_reductions.recorded = None
+
+        per_site = {
+            key for key, obj in reductions.items()
+            if any(obj is r for r in recorded)
+        }
+        return reductions, per_site
+
+    def get_metrics(self, mode: str) -> List[str]:
+        """Return the metric names queried for a mode."""
+        if mode == "simple":
+            return self.get_simple_metrics()
+        return self.get_comprehensive_metrics()
+
+    def get_data_date(self, date_range: Tuple[str, str]) -> str:
+        """Return the data_date reported for a query window."""
+        return date_range[1]
+
+    def derive_metrics(self, metrics: Dict[str, Any]):
+        """
+        Fill derived metrics whose inputs were provided rather than queried.
+
+        Called with a pillar's merged metrics. Derived metrics that could
+        not be computed from the query alone are recomputed in place;
+        the default pillar has none.
+        """
+
+    def add_metadata(self, result: Dict[str, Any], mode: str) -> Dict[str, Any]:
+        """Attach pillar metadata to a metrics result."""
+        result["pillar_id"] = self.PILLAR_ID
+        result["pillar_name"] = self.PILLAR_NAME
+        result["pillar_color"] = self.PILLAR_COLOR
+        result["mode"] = mode
+        result["query_time"] = datetime.now().isoformat()
+        return result
+
+    @staticmethod
+    def resolve_reductions(
+        reductions: Dict[str, ee.ComputedObject]
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a set of reductions in one request.
+
+        A single failing reduction fails the whole dictionary, so on error
+        each reduction is retried on its own and failures are recorded as
+        {"error": message} for that key only.
+
+        Args:
+            reductions: Dict of un-evaluated ee objects
+
+        Returns:
+            Dict of resolved values with the same keys
+        """
+        if not reductions:
+            return {}
+
+        limiter = get_ee_limiter()
+
+        try:
+            with limiter.slot():
+                return ee.Dictionary(reductions).getInfo()
+        except Exception:
+            resolved = {}
+            for key, obj in reductions.items():
+                try:
+                    with limiter.slot():
+                        resolved[key] = obj.getInfo()
+                except Exception as e:
+                    resolved[key] = {"error": str(e)}
+            return resolved
 
     def query(
         self,
@@ -59,7 +353,8 @@ class BasePillar(ABC):
         lon: float,
         mode: str = "comprehensive",
         buffer_radius: int = 500,
-        date_range: Optional[Tuple[str, str]] = None
+        date_range: Optional[Tuple[str, str]] = None,
+        metrics: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Query all metrics for this pillar at a location.
@@ -70,6 +365,8 @@ class BasePillar(ABC):
             mode: "simple" or "comprehensive"
             buffer_radius: Buffer radius in meters for spatial averaging
             date_range: Optional (start_date, end_date). Defaults to last 30 days.
+            metrics: Optional subset of metrics to query. Defaults to the
+                     mode's metrics.
 
         Returns:
             Dict containing all metric values and pillar metadata
@@ -93,20 +390,14 @@ class BasePillar(ABC):
             )
 
         # Get metrics based on mode
-        if mode == "simple":
-            metrics = self.get_simple_metrics()
-        else:
-            metrics = self.get_comprehensive_metrics()
+        if metrics is None:
+            metrics = self.get_metrics(mode)
 
         # Query metrics
         result = self.query_metrics(point, buffer_radius, date_range, metrics)
 
         # Add pillar metadata
-        result["pillar_id"] = self.PILLAR_ID
-        result["pillar_name"] = self.PILLAR_NAME
-        result["pillar_color"] = self.PILLAR_COLOR
-        result["mode"] = mode
-        result["query_time"] = datetime.now().isoformat()
+        self.add_metadata(result, mode)
 
         return result
 
@@ -114,48 +405,30 @@ class BasePillar(ABC):
         self,
         points: List[Dict[str, float]],
         mode: str = "comprehensive",
-        date_range: Optional[Tuple[str, str]] = None
+        date_range: Optional[Tuple[str, str]] = None,
+        geometry: Optional[PolygonGeometry] = None,
+        metrics: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
-        Query all metrics for this pillar over a polygon area defined by 4 points.
+        Query all metrics for this pillar over a polygon area.
+
+        Area and centroid come from the local geometry context, so the
+        only Earth Engine request is the pillar's own reductions.
 
         Args:
-            points: List of 4 dicts with 'lat' and 'lng' keys defining polygon corners
-                    Expected order: [NW, NE, SE, SW]
+            points: Vertices (dicts with 'lat' and 'lng' keys), or a GeoJSON
+                    Polygon/MultiPolygon
             mode: "simple" or "comprehensive"
             date_range: Optional (start_date, end_date). Defaults to last 30 days.
+            geometry: Geometry context shared across pillars (built from
+                      points if None)
+            metrics: Specific metrics to query (None = all for mode)
 
         Returns:
             Dict containing all metric values, pillar metadata, and area info
         """
-        # Validate we have exactly 4 points
-        if len(points) != 4:
-            raise ValueError(f"Expected 4 points for polygon, got {len(points)}")
-
-        # Validate all coordinates
-        for i, pt in enumerate(points):
-            lat = pt.get('lat')
-            lng = pt.get('lng')
-            if lat is None or lng is None:
-                raise ValueError(f"Point {i} missing lat or lng")
-            if not -90 <= lat <= 90:
-                raise ValueError(f"Point {i}: Latitude must be between -90 and 90, got {lat}")
-            if not -180 <= lng <= 180:
-                raise ValueError(f"Point {i}: Longitude must be between -180 and 180, got {lng}")
-
-        # Create polygon geometry (GEE expects [lon, lat] order)
-        # Close the polygon by repeating the first point
-        coords = [[pt['lng'], pt['lat']] for pt in points]
-        coords.append(coords[0])  # Close the polygon
-        polygon = ee.Geometry.Polygon([coords])
-
-        # Calculate centroid for reference
-        centroid = polygon.centroid()
-        centroid_coords = centroid.coordinates().getInfo()
-
-        # Calculate area in hectares
-        area_m2 = polygon.area().getInfo()
-        area_ha = area_m2 / 10000
+        # Validates and repairs the input; nothing is evaluated on Earth Engine
+        geometry = polygon_geometry(points, geometry)
 
         # Get date range
         if date_range is None:
@@ -167,38 +440,19 @@ class BasePillar(ABC):
             )
 
         # Get metrics based on mode
-        if mode == "simple":
-            metrics = self.get_simple_metrics()
-        else:
-            metrics = self.get_comprehensive_metrics()
+        if metrics is None:
+            metrics = self.get_metrics(mode)
 
-        # Query metrics using polygon directly
-        # Create a dummy point at centroid for the query_metrics signature
-        # but pass polygon as the actual region
-        centroid_point = ee.Geometry.Point([centroid_coords[0], centroid_coords[1]])
-
-        # Use buffer_radius=0 and override region with polygon in query
-        result = self._query_metrics_with_region(centroid_point, polygon, date_range, metrics)
+        result = self._query_metrics_with_region(
+            geometry.centroid_point(), geometry.to_ee(), date_range, metrics,
+            area_km2=geometry.area_km2, geometry=geometry
+        )
 
         # Add pillar metadata
-        result["pillar_id"] = self.PILLAR_ID
-        result["pillar_name"] = self.PILLAR_NAME
-        result["pillar_color"] = self.PILLAR_COLOR
-        result["mode"] = mode
-        result["query_time"] = datetime.now().isoformat()
+        self.add_metadata(result, mode)
 
         # Add polygon-specific geometry data
-        result["geometry"] = {
-            "type": "Polygon",
-            "points": points,
-            "centroid": {
-                "lat": centroid_coords[1],
-                "lng": centroid_coords[0]
-            },
-            "area_m2": area_m2,
-            "area_ha": area_ha,
-            "area_acres": area_ha * 2.47105
-        }
+        result["geometry"] = geometry.as_dict()
 
         return result
 
@@ -207,7 +461,9 @@ class BasePillar(ABC):
         point: ee.Geometry.Point,
         region: ee.Geometry,
         date_range: Tuple[str, str],
-        metrics: List[str]
+        metrics: List[str],
+        area_km2: Optional[float] = None,
+        geometry: Optional[PolygonGeometry] = None
     ) -> Dict[str, Any]:
         """
         Query metrics with a custom region geometry.
@@ -218,28 +474,35 @@ class BasePillar(ABC):
             region: The actual region to query (polygon)
             date_range: Date range tuple
             metrics: List of metrics to query
+            area_km2: Region area when already known (replaces the
+                      server-side area reduction)
+            geometry: Polygon that region was built from; each reduction
+                      then uses a copy simplified for its scale
 
         Returns:
             Dict with metric values
         """
-        # Store the polygon region so query_metrics (and _create_buffered_region)
-        # can use the actual polygon instead of a point buffer.
-        self._polygon_region = region
+        _polygon_context.geometry = geometry
+        _polygon_context.region = region
         try:
-            return self.query_metrics(point, 0, date_range, metrics)
+            reductions = self.build_reductions(region, date_range, metrics)
         finally:
-            self._polygon_region = None
+            _polygon_context.geometry = None
+            _polygon_context.region = None
+        known = {}
+        if area_km2 is not None and AREA_KEY in reductions:
+            del reductions[AREA_KEY]
+            known[AREA_KEY] = area_km2
+        data = self.resolve_reductions(reductions)
+        data.update(known)
+        return self.parse_reductions(data, date_range, metrics)
 
     def _create_buffered_region(
         self,
         point: ee.Geometry.Point,
         buffer_radius: int
     ) -> ee.Geometry:
-        """Create a buffered region around a point, or use stored polygon."""
-        # If a polygon region was set by _query_metrics_with_region, use it
-        polygon = getattr(self, "_polygon_region", None)
-        if polygon is not None:
-            return polygon
+        """Create a buffered region around a point."""
         return point.buffer(buffer_radius)
 
     def _get_date_filter(
@@ -268,20 +531,179 @@ class BasePillar(ABC):
         Returns:
             Dict with reduced values
         """
-        if reducer is None:
-            reducer = ee.Reducer.mean()
-
         try:
-            result = image.reduceRegion(
-                reducer=reducer,
-                geometry=region,
-                scale=scale,
-                maxPixels=1e9
-            ).getInfo()
-            return result
+            with get_ee_limiter().slot():
+                return self._reduce_region_lazy(image, region, scale, reducer).getInfo()
         except Exception as e:
             return {"error": str(e)}
 
+    def _reduce_region_lazy(
+        self,
+        image: ee.Image,
+        region: ee.Geometry,
+        scale: int,
+        reducer: ee.Reducer = None
+    ) -> ee.Dictionary:
+        """
+        Build an un-evaluated reduction of an image over a region.
+
+        During a polygon query the polygon region is replaced by its copy
+        simplified to half the reduction scale (see PolygonGeometry.to_ee).
+
+        Args:
+            image: Earth Engine Image
+            region: Region geometry
+            scale: Scale in meters
+            reducer: Reducer to use (default: mean)
+
+        Returns:
+            Lazy ee.Dictionary with reduced values
+        """
+        if reducer is None:
+            reducer = ee.Reducer.mean()
+
+        recorded = getattr(_site_reductions, "recorded", None)
+        if recorded is not None:
+            # Site mode: region is a FeatureCollection of buffered sites.
+            # forEachBand keeps reduceRegion's band-named outputs.
+            reduced = image.reduceRegions(
+                collection=region,
+                reducer=reducer.forEachBand(image),
+                scale=scale
+            )
+            recorded.append(reduced)
+            return reduced
+
+        geometry = getattr(_polygon_context, "geometry", None)
+        if geometry is not None and region is _polygon_context.region:
+            region = geometry.to_ee(scale)
+
+        return image.reduceRegion(
+            reducer=reducer,
+            geometry=region,
+            scale=scale,
+            maxPixels=1e9
+        )
+
+    def _reduce_with_fallback(
+        self,
+        sources: List[Tuple[str, ee.Image, int, str]],
+        region: ee.Geometry,
+        reducer: ee.Reducer = None
+    ) -> ee.ComputedObject:
+        """
+        Reduce the first source in a fallback chain that has data.
+
+        The choice is made on the server with ee.Algorithms.If, so no size
+        probe precedes the real query. A source "has data" when its
+        reduction holds a non-null value for its key band, which also
+        covers empty collections (their composite has no bands). The last
+        source is used unconditionally.
+
+        Args:
+            sources: (name, image, scale, key_band) from preferred to last
+                     resort, e.g. [("Sentinel-2", s2.mean(), 10, "NDVI"),
+                     ("MODIS", modis.mean(), 1000, "NDVI")]
+            region: Region geometry (or sites, see build_site_reductions)
+            reducer: Reducer to use (default: mean)
+
+        Returns:
+            Lazy reduction of the chosen source with SOURCE_KEY set to its name
+        """
+        reduced = [
+            (name, self._reduce_region_lazy(image, region, scale, reducer), band)
+            for name, image, scale, band in sources
+        ]
+
+        recorded = getattr(_site_reductions, "recorded", None)
+        if recorded is not None:
+            chain = self._site_fallback_chain(reduced)
+            recorded.append(chain)
+            return chain
+
+        name, chain, _ = reduced[-1]
+        chain = chain.set(SOURCE_KEY, name)
+        for name, values, band in reversed(reduced[:-1]):
+            chain = ee.Algorithms.If(
+                self._has_value(values, values.keys(), band),
+                values.set(SOURCE_KEY, name),
+                chain
+            )
+        return ee.Dictionary(chain)
+
+    def _site_fallback_chain(
+        self,
+        reduced: List[Tuple[str, ee.FeatureCollection, str]]
+    ) -> ee.FeatureCollection:
+        """Per-site version of a fallback chain over reduceRegions outputs."""
+        name, chain, _ = reduced[-1]
+        chain = chain.map(lambda f, name=name: f.set(SOURCE_KEY, name))
+
+        for name, features, band in reversed(reduced[:-1]):
+            later = chain.toList(chain.size())
+
+            def pick(feature, name=name, band=band, later=later):
+                return ee.Feature(ee.Algorithms.If(
+                    self._has_value(feature, feature.propertyNames(), band),
+                    feature.set(SOURCE_KEY, name),
+                    later.get(ee.Number(feature.get(SITE_PROPERTY)))
+                ))
+
+            chain = features.map(pick)
+        return chain
+
+    @staticmethod
+    def _has_value(
+        values: ee.ComputedObject,
+        keys: ee.List,
+        band: str
+    ) -> ee.ComputedObject:
+        """Lazy check that a reduction holds a non-null value for band."""
+        return ee.Algorithms.If(
+            keys.contains(band),
+            ee.List([values.get(band)]).filter(ee.Filter.notNull(["item"])).size().gt(0),
+            False
+        )
+
+    @staticmethod
+    def _empty_image(bands: List[str]) -> ee.Image:
+        """Fully masked image with the given bands (no data)."""
+        empty = ee.Image.constant([0] * len(bands)).rename(bands)
+        return empty.updateMask(ee.Image.constant(0))
+
+    def _composite_or(
+        self,
+        collection: ee.ImageCollection,
+        bands: List[str],
+        fallback: Optional[ee.Image] = None
+    ) -> ee.Image:
+        """
+        Mean composite of a collection's bands, chosen on the server.
+
+        Pixels the composite leaves masked take the fallback's values; an
+        empty collection yields the fallback (or no data) instead of an
+        image without bands.
+
+        Args:
+            collection: Filtered image collection
+            bands: Bands to composite
+            fallback: Image with the same band names (None = no data)
+
+        Returns:
+            Lazy composite image
+        """
+        if fallback is None:
+            fallback = self._empty_image(bands)
+        composite = collection.select(bands).mean().unmask(fallback, False)
+        return ee.Image(ee.Algorithms.If(collection.size().gt(0), composite, fallback))
+
+    def _region_area_km2(self, region: ee.Geometry) -> ee.Number:
+        """Lazy area of the query region in km2."""
+        if getattr(_site_reductions, "recorded", None) is not None:
+            # All sites share one buffer radius, so one site's area serves all
+            return ee.Feature(region.first()).geometry().area().divide(1e6)
+        return region.area().divide(1e6)
+
     def _safe_get_value(
         self,
         data: Dict,
@@ -15,6 +15,7 @@ class BiodiversityPillar(BasePillar):
     PILLAR_ID = "B"
     PILLAR_NAME = "Biodiversity"
     PILLAR_COLOR = "#27ae60"
+    TIME_SERIES_METRICS = ["ndvi", "evi", "lai", "fpar"]
 
     def get_simple_metrics(self) -> List[str]:
         return ["ndvi", "evi"]
@@ -22,49 +23,158 @@ class BiodiversityPillar(BasePillar):
     def get_comprehensive_metrics(self) -> List[str]:
         return ["ndvi", "evi", "lai", "land_cover", "fpar"]
 
-    def query_metrics(
+    def build_reductions(
         self,
-        point: ee.Geometry.Point,
-        buffer_radius: int,
+        region: ee.Geometry,
         date_range: Tuple[str, str],
         metrics: List[str]
-    ) -> Dict[str, Any]:
-        """Query biodiversity metrics."""
+    ) -> Dict[str, ee.ComputedObject]:
+        """Build biodiversity reductions."""
+
+        date_filter = self._get_date_filter(date_range)
+        reductions = {}
+
+        # NDVI/EVI from Sentinel-2 (preferred) with MODIS as fallback,
+        # chosen on the server so the choice costs no extra round trip.
+        if "ndvi" in metrics or "evi" in metrics:
+            s2_collection = ee.ImageCollection(DATASETS["sentinel2"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region) \
+                .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20))
+
+            def calc_ndvi(image):
+                ndvi = image.normalizedDifference(["B8", "B4"]).rename("NDVI")
+                evi = image.expression(
+                    "2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))",
+                    {
+                        "NIR": image.select("B8"),
+                        "RED": image.select("B4"),
+                        "BLUE": image.select("B2")
+                    }
+                ).rename("EVI")
+                return image.addBands([ndvi, evi])
+
+            vi_image = s2_collection.map(calc_ndvi).select(["NDVI", "EVI"]).mean()
+
+            modis_collection = ee.ImageCollection(DATASETS["modis_ndvi"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["vi"] = self._reduce_with_fallback(
+                [
+                    ("Sentinel-2", vi_image, 10, "NDVI"),
+                    ("MODIS", modis_collection.mean(), 1000,
+                     DATASETS["modis_ndvi"]["bands"]["ndvi"])
+                ],
+                region
+            )
+
+        # LAI and FPAR from MODIS
+        if "lai" in metrics or "fpar" in metrics:
+            lai_collection = ee.ImageCollection(DATASETS["modis_lai"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["lai"] = self._reduce_region_lazy(
+                lai_collection.mean(), region, scale=500
+            )
+
+        # Land Cover from WorldCover
+        if "land_cover" in metrics:
+            worldcover = ee.ImageCollection(DATASETS["worldcover"]["id"]) \
+                .filterBounds(region) \
+                .first()
+
+            reductions["land_cover"] = self._reduce_region_lazy(
+                worldcover,
+                region,
+                scale=10,
+                reducer=ee.Reducer.mode()
+            )
+
+        return reductions
+
+    def build_metric_images(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.Image]:
+        """Build per-pixel biodiversity metrics (same conversions as parse_reductions)."""
 
-        region = self._create_buffered_region(point, buffer_radius)
         date_filter = self._get_date_filter(date_range)
+        images = {}
+
+        # Sentinel-2 indices where available, MODIS elsewhere
+        if "ndvi" in metrics or "evi" in metrics:
+            modis_bands = DATASETS["modis_ndvi"]["bands"]
+            modis_collection = ee.ImageCollection(DATASETS["modis_ndvi"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            modis = self._composite_or(modis_collection, [modis_bands["ndvi"], modis_bands["evi"]]) \
+                .multiply(DATASETS["modis_ndvi"]["scale_factor"]) \
+                .rename(["NDVI", "EVI"])
+
+            s2_collection = ee.ImageCollection(DATASETS["sentinel2"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region) \
+                .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20))
+
+            def calc_vi(image):
+                ndvi = image.normalizedDifference(["B8", "B4"]).rename("NDVI")
+                evi = image.expression(
+                    "2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))",
+                    {
+                        "NIR": image.select("B8"),
+                        "RED": image.select("B4"),
+                        "BLUE": image.select("B2")
+                    }
+                ).rename("EVI")
+                return ndvi.addBands(evi)
+
+            vi = self._composite_or(s2_collection.map(calc_vi), ["NDVI", "EVI"], modis)
+            if "ndvi" in metrics:
+                images["ndvi"] = vi.select("NDVI").rename("ndvi")
+            if "evi" in metrics:
+                images["evi"] = vi.select("EVI").rename("evi")
+
+        if "lai" in metrics or "fpar" in metrics:
+            lai_bands = DATASETS["modis_lai"]["bands"]
+            lai_collection = ee.ImageCollection(DATASETS["modis_lai"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            lai = self._composite_or(lai_collection, [lai_bands["lai"], lai_bands["fpar"]])
+
+            if "lai" in metrics:
+                images["lai"] = lai.select(lai_bands["lai"]) \
+                    .multiply(DATASETS["modis_lai"]["scale_factor"]) \
+                    .rename("lai")
+            if "fpar" in metrics:
+                images["fpar"] = lai.select(lai_bands["fpar"]).multiply(0.01).rename("fpar")
+
+        if "land_cover" in metrics:
+            images["land_cover"] = ee.ImageCollection(DATASETS["worldcover"]["id"]) \
+                .filterBounds(region) \
+                .mosaic() \
+                .select(DATASETS["worldcover"]["band"]) \
+                .rename("land_cover")
+
+        return images
+
+    def parse_reductions(
+        self,
+        data: Dict[str, Any],
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """Parse biodiversity metrics."""
 
         results = {"metrics": {}}
 
-        # Query NDVI/EVI from Sentinel-2 (preferred) or MODIS
         if "ndvi" in metrics or "evi" in metrics:
             try:
-                # Try Sentinel-2 first for higher resolution
-                s2_collection = ee.ImageCollection(DATASETS["sentinel2"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region) \
-                    .filter(ee.Filter.lt("CLOUDY_PIXEL_PERCENTAGE", 20))
-
-                count = s2_collection.size().getInfo()
-
-                if count > 0:
-                    # Calculate NDVI from Sentinel-2
-                    def calc_ndvi(image):
-                        ndvi = image.normalizedDifference(["B8", "B4"]).rename("NDVI")
-                        evi = image.expression(
-                            "2.5 * ((NIR - RED) / (NIR + 6 * RED - 7.5 * BLUE + 1))",
-                            {
-                                "NIR": image.select("B8"),
-                                "RED": image.select("B4"),
-                                "BLUE": image.select("B2")
-                            }
-                        ).rename("EVI")
-                        return image.addBands([ndvi, evi])
-
-                    s2_with_vi = s2_collection.map(calc_ndvi)
-                    vi_image = s2_with_vi.select(["NDVI", "EVI"]).mean()
-
-                    vi_data = self._reduce_region(vi_image, region, scale=10)
+                vi_data = data.get("vi", {})
+                if vi_data.get("source") != "MODIS":
 
                     if "ndvi" in metrics:
                         results["metrics"]["ndvi"] = {
@@ -91,30 +201,20 @@ class BiodiversityPillar(BasePillar):
                         }
                 else:
                     # Fallback to MODIS
-                    self._query_modis_vi(region, date_filter, metrics, results)
+                    self._parse_modis_vi(vi_data, metrics, results)
 
             except Exception as e:
-                # Try MODIS as fallback
-                try:
-                    self._query_modis_vi(region, date_filter, metrics, results)
-                except Exception as e2:
-                    for m in ["ndvi", "evi"]:
-                        if m in metrics:
-                            results["metrics"][m] = {
-                                "value": None,
-                                "quality": "unavailable",
-                                "error": str(e2)
-                            }
-
-        # Query LAI and FPAR from MODIS
+                for m in ["ndvi", "evi"]:
+                    if m in metrics:
+                        results["metrics"][m] = {
+                            "value": None,
+                            "quality": "unavailable",
+                            "error": str(e)
+                        }
+
         if "lai" in metrics or "fpar" in metrics:
             try:
-                lai_collection = ee.ImageCollection(DATASETS["modis_lai"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region)
-
-                lai_image = lai_collection.mean()
-                lai_data = self._reduce_region(lai_image, region, scale=500)
+                lai_data = data.get("lai", {})
 
                 if "lai" in metrics:
                     lai_value = self._safe_get_value(
@@ -151,20 +251,9 @@ class BiodiversityPillar(BasePillar):
                             "error": str(e)
                         }
 
-        # Query Land Cover from WorldCover
         if "land_cover" in metrics:
             try:
-                worldcover = ee.ImageCollection(DATASETS["worldcover"]["id"]) \
-                    .filterBounds(region) \
-                    .first()
-
-                lc_data = self._reduce_region(
-                    worldcover,
-                    region,
-                    scale=10,
-                    reducer=ee.Reducer.mode()
-                )
-
+                lc_data = data.get("land_cover", {})
                 lc_value = lc_data.get(DATASETS["worldcover"]["band"])
                 lc_class = DATASETS["worldcover"]["classes"].get(
                     lc_value, "Unknown"
@@ -185,24 +274,16 @@ class BiodiversityPillar(BasePillar):
                     "error": str(e)
                 }
 
-        results["data_date"] = date_range[1]
+        results["data_date"] = self.get_data_date(date_range)
         return results
 
-    def _query_modis_vi(
+    def _parse_modis_vi(
         self,
-        region: ee.Geometry,
-        date_filter: ee.Filter,
+        modis_data: Dict[str, Any],
         metrics: List[str],
         results: Dict
     ):
-        """Query MODIS vegetation indices as fallback."""
-        modis_collection = ee.ImageCollection(DATASETS["modis_ndvi"]["id"]) \
-            .filter(date_filter) \
-            .filterBounds(region)
-
-        modis_image = modis_collection.mean()
-        modis_data = self._reduce_region(modis_image, region, scale=1000)
-
+        """Parse MODIS vegetation indices used as fallback."""
         if "ndvi" in metrics:
             ndvi_value = self._safe_get_value(
                 modis_data,
@@ -22,25 +22,103 @@ class CarbonPillar(BasePillar):
     def get_comprehensive_metrics(self) -> List[str]:
         return ["tree_cover", "forest_loss", "canopy_height", "biomass", "carbon_stock"]
 
-    def query_metrics(
+    def build_reductions(
         self,
-        point: ee.Geometry.Point,
-        buffer_radius: int,
+        region: ee.Geometry,
         date_range: Tuple[str, str],
         metrics: List[str]
-    ) -> Dict[str, Any]:
-        """Query carbon metrics."""
+    ) -> Dict[str, ee.ComputedObject]:
+        """Build carbon reductions."""
+
+        reductions = {}
+
+        # Hansen Global Forest Change
+        if "tree_cover" in metrics or "forest_loss" in metrics:
+            hansen = ee.Image(DATASETS["hansen_gfc"]["id"])
+            reductions["hansen"] = self._reduce_region_lazy(hansen, region, scale=30)
+
+        # GEDI serves both canopy height and biomass; ETH is the height fallback
+        if "canopy_height" in metrics or "biomass" in metrics:
+            gedi_image = ee.ImageCollection(DATASETS["gedi_biomass"]["id"]) \
+                .filterBounds(region) \
+                .mean()
+
+            if "canopy_height" in metrics:
+                eth_height = ee.Image(DATASETS["eth_canopy_height"]["id"])
+                reductions["canopy_height"] = self._reduce_with_fallback(
+                    [
+                        ("GEDI", gedi_image, 1000, "rh_98"),
+                        ("ETH", eth_height, 10, DATASETS["eth_canopy_height"]["band"])
+                    ],
+                    region
+                )
+
+            if "biomass" in metrics:
+                reductions["gedi"] = self._reduce_region_lazy(
+                    gedi_image, region, scale=1000
+                )
+
+        return reductions
+
+    def build_metric_images(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.Image]:
+        """
+        Build per-pixel carbon metrics.
+
+        GEDI footprints are too sparse to map, so canopy height comes from
+        the wall-to-wall ETH product (the point query's fallback) and
+        biomass falls back per pixel to the same height-based estimate.
+        """
+        images = {}
+
+        if "tree_cover" in metrics or "forest_loss" in metrics:
+            bands = DATASETS["hansen_gfc"]["bands"]
+            hansen = ee.Image(DATASETS["hansen_gfc"]["id"])
+            if "tree_cover" in metrics:
+                images["tree_cover"] = hansen.select(bands["tree_cover"]).rename("tree_cover")
+            if "forest_loss" in metrics:
+                images["forest_loss"] = hansen.select(bands["loss"]).gt(0).rename("forest_loss")
+
+        if any(m in metrics for m in ["canopy_height", "biomass", "carbon_stock"]):
+            height = ee.Image(DATASETS["eth_canopy_height"]["id"]) \
+                .select(DATASETS["eth_canopy_height"]["band"]) \
+                .rename("canopy_height")
+            if "canopy_height" in metrics:
+                images["canopy_height"] = height
+
+            gedi_collection = ee.ImageCollection(DATASETS["gedi_biomass"]["id"]) \
+                .filterBounds(region)
+            # Simple allometric estimate where GEDI has no footprint
+            biomass = self._composite_or(
+                gedi_collection,
+                [DATASETS["gedi_biomass"]["band"]],
+                height.multiply(8).rename(DATASETS["gedi_biomass"]["band"])
+            ).rename("biomass")
+            if "biomass" in metrics:
+                images["biomass"] = biomass
+            if "carbon_stock" in metrics:
+                # IPCC carbon fraction: 0.47 of above-ground biomass
+                images["carbon_stock"] = biomass.multiply(0.47).rename("carbon_stock")
 
-        region = self._create_buffered_region(point, buffer_radius)
+        return images
+
+    def parse_reductions(
+        self,
+        data: Dict[str, Any],
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """Parse carbon metrics."""
 
         results = {"metrics": {}}
 
-        # Query Hansen Global Forest Change
         if "tree_cover" in metrics or "forest_loss" in metrics:
             try:
-                hansen = ee.Image(DATASETS["hansen_gfc"]["id"])
-                hansen_data = self._reduce_region(hansen, region, scale=30)
-
+                hansen_data = data.get("hansen", {})
                 if "tree_cover" in metrics:
                     tree_cover = self._safe_get_value(
                         hansen_data,
@@ -75,15 +153,15 @@ class CarbonPillar(BasePillar):
                             "error": str(e)
                         }
 
-        # Query Canopy Height
+        # Canopy Height
         if "canopy_height" in metrics:
             try:
-                # Try GEDI first
-                gedi_success = self._query_gedi_height(region, results)
-
-                if not gedi_success:
+                height_data = data.get("canopy_height", {})
+                if height_data.get("source") == "ETH":
                     # Fallback to ETH Canopy Height
-                    self._query_eth_height(region, results)
+                    self._parse_eth_height(height_data, results)
+                else:
+                    self._parse_gedi_height(height_data, results)
 
             except Exception as e:
                 results["metrics"]["canopy_height"] = {
@@ -92,23 +170,15 @@ class CarbonPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query Biomass from GEDI
+        # Biomass from GEDI
         if "biomass" in metrics:
             try:
-                gedi_collection = ee.ImageCollection(DATASETS["gedi_biomass"]["id"]) \
-                    .filterBounds(region)
-
-                count = gedi_collection.size().getInfo()
-
-                if count > 0:
-                    gedi_image = gedi_collection.mean()
-                    gedi_data = self._reduce_region(gedi_image, region, scale=1000)
-
-                    biomass_value = self._safe_get_value(
-                        gedi_data,
-                        DATASETS["gedi_biomass"]["band"]
-                    )
+                biomass_value = self._safe_get_value(
+                    data.get("gedi", {}),
+                    DATASETS["gedi_biomass"]["band"]
+                )
 
+                if biomass_value is not None:
                     results["metrics"]["biomass"] = {
                         "value": biomass_value,
                         "unit": "Mg/ha",
@@ -173,37 +243,24 @@ class CarbonPillar(BasePillar):
                     "error": "Requires biomass estimate"
                 }
 
-        results["data_date"] = "2023"  # Hansen is annual
+        results["data_date"] = self.get_data_date(date_range)
         return results
 
-    def _query_gedi_height(self, region: ee.Geometry, results: Dict) -> bool:
-        """Query GEDI canopy height. Returns True if successful."""
-        try:
-            gedi_collection = ee.ImageCollection(DATASETS["gedi_biomass"]["id"]) \
-                .filterBounds(region)
-
-            count = gedi_collection.size().getInfo()
-
-            if count > 0:
-                gedi_image = gedi_collection.mean()
-                gedi_data = self._reduce_region(gedi_image, region, scale=1000)
+    def get_data_date(self, date_range: Tuple[str, str]) -> str:
+        """Hansen and GEDI products are annual composites."""
+        return "2023"
 
-                height_value = self._safe_get_value(gedi_data, "rh_98")
+    def _parse_gedi_height(self, gedi_data: Dict[str, Any], results: Dict):
+        """Parse GEDI canopy height."""
+        height_value = self._safe_get_value(gedi_data, "rh_98")
 
-                if height_value is not None:
-                    results["metrics"]["canopy_height"] = {
-                        "value": height_value,
-                        "unit": "meters",
-                        "description": "Canopy Height (98th percentile)",
-                        "source": "GEDI",
-                        "quality": self._assess_quality(height_value, "canopy_height")
-                    }
-                    return True
-
-            return False
-
-        except Exception:
-            return False
+        results["metrics"]["canopy_height"] = {
+            "value": height_value,
+            "unit": "meters",
+            "description": "Canopy Height (98th percentile)",
+            "source": "GEDI",
+            "quality": self._assess_quality(height_value, "canopy_height")
+        }
 
     # Ecosystem-type-based biomass defaults (Mg/ha) from whitepaper
     ECOSYSTEM_BIOMASS_DEFAULTS = {
@@ -236,12 +293,9 @@ class CarbonPillar(BasePillar):
         # Fallback: desert/bare
         return self.ECOSYSTEM_BIOMASS_DEFAULTS["default"]
 
-    def _query_eth_height(self, region: ee.Geometry, results: Dict):
-        """Query ETH Canopy Height as fallback."""
+    def _parse_eth_height(self, eth_data: Dict[str, Any], results: Dict):
+        """Parse ETH Canopy Height used as fallback."""
         try:
-            eth_height = ee.Image(DATASETS["eth_canopy_height"]["id"])
-            eth_data = self._reduce_region(eth_height, region, scale=10)
-
             height_value = self._safe_get_value(
                 eth_data,
                 DATASETS["eth_canopy_height"]["band"]
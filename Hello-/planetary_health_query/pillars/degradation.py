@@ -7,6 +7,7 @@ from typing import Dict, List, Any, Tuple
 import ee
 from .base import BasePillar
 from ..core.config import DATASETS
+from ..utils.scoring import metric_value
 
 
 class DegradationPillar(BasePillar):
@@ -15,6 +16,7 @@ class DegradationPillar(BasePillar):
     PILLAR_ID = "D"
     PILLAR_NAME = "DLWD"
     PILLAR_COLOR = "#e74c3c"
+    TIME_SERIES_METRICS = ["lst", "soil_moisture", "drought_index", "evaporative_stress"]
 
     def get_simple_metrics(self) -> List[str]:
         return ["lst", "soil_moisture"]
@@ -22,29 +24,145 @@ class DegradationPillar(BasePillar):
     def get_comprehensive_metrics(self) -> List[str]:
         return ["lst", "soil_moisture", "water_occurrence", "drought_index", "evaporative_stress"]
 
-    def query_metrics(
+    def build_reductions(
         self,
-        point: ee.Geometry.Point,
-        buffer_radius: int,
+        region: ee.Geometry,
         date_range: Tuple[str, str],
         metrics: List[str]
-    ) -> Dict[str, Any]:
-        """Query degradation metrics."""
+    ) -> Dict[str, ee.ComputedObject]:
+        """Build degradation reductions."""
+
+        date_filter = self._get_date_filter(date_range)
+        reductions = {}
+
+        # Land Surface Temperature from MODIS
+        if "lst" in metrics:
+            lst_collection = ee.ImageCollection(DATASETS["modis_lst"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["lst"] = self._reduce_region_lazy(
+                lst_collection.mean(), region, scale=1000
+            )
+
+        # Soil Moisture from SMAP with ERA5 as fallback
+        if "soil_moisture" in metrics:
+            smap_collection = ee.ImageCollection(DATASETS["smap_soil_moisture"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            era5_collection = ee.ImageCollection(DATASETS["era5_land"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["soil_moisture"] = self._reduce_with_fallback(
+                [
+                    ("SMAP", smap_collection.mean(), 11000,
+                     DATASETS["smap_soil_moisture"]["band"]),
+                    ("ERA5-Land", era5_collection.mean(), 11000,
+                     DATASETS["era5_land"]["bands"]["soil_moisture"])
+                ],
+                region
+            )
+
+        # Water Occurrence from JRC
+        if "water_occurrence" in metrics:
+            jrc_water = ee.Image(DATASETS["jrc_water"]["id"])
+            reductions["water"] = self._reduce_region_lazy(jrc_water, region, scale=30)
+
+        # Evaporative Stress from MODIS ET
+        if "evaporative_stress" in metrics:
+            et_collection = ee.ImageCollection(DATASETS["modis_et"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["et"] = self._reduce_region_lazy(
+                et_collection.mean(), region, scale=500
+            )
+
+        return reductions
+
+    def build_metric_images(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.Image]:
+        """Build per-pixel degradation metrics (same conversions as parse_reductions)."""
 
-        region = self._create_buffered_region(point, buffer_radius)
         date_filter = self._get_date_filter(date_range)
+        images = {}
+
+        lst = None
+        if "lst" in metrics or "drought_index" in metrics:
+            lst_collection = ee.ImageCollection(DATASETS["modis_lst"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            lst = self._composite_or(lst_collection, [DATASETS["modis_lst"]["bands"]["lst_day"]]) \
+                .multiply(DATASETS["modis_lst"]["scale_factor"]) \
+                .add(DATASETS["modis_lst"]["offset"]) \
+                .rename("lst")
+            if "lst" in metrics:
+                images["lst"] = lst
+
+        soil_moisture = None
+        if "soil_moisture" in metrics or "drought_index" in metrics:
+            sm_band = DATASETS["smap_soil_moisture"]["band"]
+            era5_collection = ee.ImageCollection(DATASETS["era5_land"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            era5 = self._composite_or(
+                era5_collection, [DATASETS["era5_land"]["bands"]["soil_moisture"]]
+            ).rename(sm_band)
+
+            smap_collection = ee.ImageCollection(DATASETS["smap_soil_moisture"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            soil_moisture = self._composite_or(smap_collection, [sm_band], era5).rename("soil_moisture")
+            if "soil_moisture" in metrics:
+                images["soil_moisture"] = soil_moisture
+
+        if "water_occurrence" in metrics:
+            images["water_occurrence"] = ee.Image(DATASETS["jrc_water"]["id"]) \
+                .select(DATASETS["jrc_water"]["bands"]["occurrence"]) \
+                .rename("water_occurrence")
+
+        if "drought_index" in metrics:
+            # Low soil moisture + high temperature = drought, clamped to +/-3
+            images["drought_index"] = soil_moisture.subtract(0.2).divide(0.3).multiply(-1) \
+                .add(lst.subtract(25).divide(15).multiply(0.5)) \
+                .clamp(-3, 3) \
+                .rename("drought_index")
+
+        if "evaporative_stress" in metrics:
+            bands = DATASETS["modis_et"]["bands"]
+            et_collection = ee.ImageCollection(DATASETS["modis_et"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            et = self._composite_or(et_collection, [bands["et"], bands["pet"]]) \
+                .multiply(DATASETS["modis_et"]["scale_factor"])
+            pet = et.select(bands["pet"])
+            # Evaporative Stress Index: 1 - ET/PET where PET > 0
+            images["evaporative_stress"] = ee.Image.constant(1) \
+                .subtract(et.select(bands["et"]).divide(pet)) \
+                .updateMask(pet.gt(0)) \
+                .rename("evaporative_stress")
+
+        return images
+
+    def parse_reductions(
+        self,
+        data: Dict[str, Any],
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """Parse degradation metrics."""
 
         results = {"metrics": {}}
 
-        # Query Land Surface Temperature from MODIS
         if "lst" in metrics:
             try:
-                lst_collection = ee.ImageCollection(DATASETS["modis_lst"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region)
-
-                lst_image = lst_collection.mean()
-                lst_data = self._reduce_region(lst_image, region, scale=1000)
+                lst_data = data.get("lst", {})
 
                 lst_day = self._safe_get_value(
                     lst_data,
@@ -83,15 +201,15 @@ class DegradationPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query Soil Moisture
+        # Soil Moisture
         if "soil_moisture" in metrics:
             try:
-                # Try SMAP first
-                smap_success = self._query_smap(region, date_filter, results)
-
-                if not smap_success:
+                sm_data = data.get("soil_moisture", {})
+                if sm_data.get("source") == "ERA5-Land":
                     # Fallback to ERA5
-                    self._query_era5_soil(region, date_filter, results)
+                    self._parse_era5_soil(sm_data, results)
+                else:
+                    self._parse_smap(sm_data, results)
 
             except Exception as e:
                 results["metrics"]["soil_moisture"] = {
@@ -100,11 +218,10 @@ class DegradationPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query Water Occurrence from JRC
+        # Water Occurrence from JRC
         if "water_occurrence" in metrics:
             try:
-                jrc_water = ee.Image(DATASETS["jrc_water"]["id"])
-                water_data = self._reduce_region(jrc_water, region, scale=30)
+                water_data = data.get("water", {})
 
                 occurrence = self._safe_get_value(
                     water_data,
@@ -133,42 +250,12 @@ class DegradationPillar(BasePillar):
 
         # Calculate Drought Index (simplified)
         if "drought_index" in metrics:
-            # Calculate from soil moisture and temperature
-            sm = results.get("metrics", {}).get("soil_moisture", {}).get("value")
-            lst = results.get("metrics", {}).get("lst", {}).get("value")
-
-            if sm is not None and lst is not None:
-                # Simplified drought index: low soil moisture + high temp = drought
-                # Normalize and combine
-                sm_norm = (sm - 0.2) / 0.3  # Center around typical values
-                lst_norm = (lst - 25) / 15  # Center around 25C
+            results["metrics"]["drought_index"] = self._drought_index(results["metrics"])
 
-                drought_index = -sm_norm + (lst_norm * 0.5)
-                drought_index = max(-3, min(3, drought_index))
-
-                results["metrics"]["drought_index"] = {
-                    "value": drought_index,
-                    "unit": "index",
-                    "description": "Drought Index (-3 to +3, higher = more drought stress)",
-                    "interpretation": self._interpret_drought(drought_index),
-                    "quality": "moderate"
-                }
-            else:
-                results["metrics"]["drought_index"] = {
-                    "value": None,
-                    "quality": "unavailable",
-                    "error": "Requires soil moisture and LST"
-                }
-
-        # Query Evaporative Stress from MODIS ET
+        # Evaporative Stress from MODIS ET
         if "evaporative_stress" in metrics:
             try:
-                et_collection = ee.ImageCollection(DATASETS["modis_et"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region)
-
-                et_image = et_collection.mean()
-                et_data = self._reduce_region(et_image, region, scale=500)
+                et_data = data.get("et", {})
 
                 et_value = self._safe_get_value(
                     et_data,
@@ -203,62 +290,27 @@ class DegradationPillar(BasePillar):
                     "error": str(e)
                 }
 
-        results["data_date"] = date_range[1]
+        results["data_date"] = self.get_data_date(date_range)
         return results
 
-    def _query_smap(
-        self,
-        region: ee.Geometry,
-        date_filter: ee.Filter,
-        results: Dict
-    ) -> bool:
-        """Query SMAP soil moisture. Returns True if successful."""
-        try:
-            smap_collection = ee.ImageCollection(DATASETS["smap_soil_moisture"]["id"]) \
-                .filter(date_filter) \
-                .filterBounds(region)
-
-            count = smap_collection.size().getInfo()
-
-            if count > 0:
-                smap_image = smap_collection.mean()
-                smap_data = self._reduce_region(smap_image, region, scale=11000)
-
-                sm_value = self._safe_get_value(
-                    smap_data,
-                    DATASETS["smap_soil_moisture"]["band"]
-                )
-
-                if sm_value is not None:
-                    results["metrics"]["soil_moisture"] = {
-                        "value": sm_value,
-                        "unit": "m3/m3",
-                        "description": "Surface Soil Moisture",
-                        "source": "SMAP L4",
-                        "quality": self._assess_sm_quality(sm_value)
-                    }
-                    return True
-
-            return False
-
-        except Exception:
-            return False
-
-    def _query_era5_soil(
-        self,
-        region: ee.Geometry,
-        date_filter: ee.Filter,
-        results: Dict
-    ):
-        """Query ERA5 soil moisture as fallback."""
+    def _parse_smap(self, smap_data: Dict[str, Any], results: Dict):
+        """Parse SMAP soil moisture."""
+        sm_value = self._safe_get_value(
+            smap_data,
+            DATASETS["smap_soil_moisture"]["band"]
+        )
+
+        results["metrics"]["soil_moisture"] = {
+            "value": sm_value,
+            "unit": "m3/m3",
+            "description": "Surface Soil Moisture",
+            "source": "SMAP L4",
+            "quality": self._assess_sm_quality(sm_value)
+        }
+
+    def _parse_era5_soil(self, era5_data: Dict[str, Any], results: Dict):
+        """Parse ERA5 soil moisture used as fallback."""
         try:
-            era5_collection = ee.ImageCollection(DATASETS["era5_land"]["id"]) \
-                .filter(date_filter) \
-                .filterBounds(region)
-
-            era5_image = era5_collection.mean()
-            era5_data = self._reduce_region(era5_image, region, scale=11000)
-
             sm_value = self._safe_get_value(
                 era5_data,
                 DATASETS["era5_land"]["bands"]["soil_moisture"]
@@ -295,6 +347,41 @@ class DegradationPillar(BasePillar):
             return "poor"
         return "good"
 
+    def derive_metrics(self, metrics: Dict[str, Any]):
+        """Compute the drought index from provided soil moisture (e.g. Open-Meteo)."""
+        drought = metrics.get("drought_index")
+        if drought is not None and drought.get("value") is None:
+            metrics["drought_index"] = self._drought_index(metrics)
+
+    def _drought_index(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Drought index from soil moisture and LST metrics."""
+        # In m3/m3, whichever source reported it
+        sm = metric_value("soil_moisture", metrics.get("soil_moisture") or {})
+        lst = (metrics.get("lst") or {}).get("value")
+
+        if sm is None or lst is None:
+            return {
+                "value": None,
+                "quality": "unavailable",
+                "error": "Requires soil moisture and LST"
+            }
+
+        # Simplified drought index: low soil moisture + high temp = drought
+        # Normalize and combine
+        sm_norm = (sm - 0.2) / 0.3  # Center around typical values
+        lst_norm = (lst - 25) / 15  # Center around 25C
+
+        drought_index = -sm_norm + (lst_norm * 0.5)
+        drought_index = max(-3, min(3, drought_index))
+
+        return {
+            "value": drought_index,
+            "unit": "index",
+            "description": "Drought Index (-3 to +3, higher = more drought stress)",
+            "interpretation": self._interpret_drought(drought_index),
+            "quality": "moderate"
+        }
+
     def _interpret_drought(self, value: float) -> str:
         """Interpret drought index value."""
         if value < -1.5:
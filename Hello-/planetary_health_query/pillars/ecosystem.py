@@ -5,7 +5,7 @@ Datasets: WorldPop, VIIRS DNB, CSP gHM, SRTM
 
 from typing import Dict, List, Any, Tuple
 import ee
-from .base import BasePillar
+from .base import AREA_KEY, BasePillar
 from ..core.config import DATASETS
 
 
@@ -15,6 +15,7 @@ class EcosystemPillar(BasePillar):
     PILLAR_ID = "E"
     PILLAR_NAME = "Ecosystem"
     PILLAR_COLOR = "#f39c12"
+    TIME_SERIES_METRICS = ["nightlights"]
 
     def get_simple_metrics(self) -> List[str]:
         return ["population", "nightlights"]
@@ -22,60 +23,159 @@ class EcosystemPillar(BasePillar):
     def get_comprehensive_metrics(self) -> List[str]:
         return ["population", "nightlights", "human_modification", "elevation", "distance_to_water"]
 
-    def query_metrics(
+    def build_reductions(
         self,
-        point: ee.Geometry.Point,
-        buffer_radius: int,
+        region: ee.Geometry,
         date_range: Tuple[str, str],
         metrics: List[str]
-    ) -> Dict[str, Any]:
-        """Query ecosystem metrics."""
+    ) -> Dict[str, ee.ComputedObject]:
+        """Build ecosystem reductions."""
 
-        region = self._create_buffered_region(point, buffer_radius)
         date_filter = self._get_date_filter(date_range)
+        reductions = {}
+
+        # Population Density from WorldPop
+        if "population" in metrics:
+            # WorldPop uses annual per-country collections; mosaic them so
+            # regions spanning borders (or many sites) read every country
+            year = int(date_range[1][:4])
+            worldpop = ee.ImageCollection(DATASETS["worldpop"]["id"]) \
+                .filterBounds(region) \
+                .filter(ee.Filter.eq("year", min(year, 2020)))  # Max available year
+
+            reductions["population"] = self._reduce_region_lazy(
+                worldpop.mosaic(),
+                region,
+                scale=100,
+                reducer=ee.Reducer.sum()
+            )
+            reductions[AREA_KEY] = self._region_area_km2(region)
+
+        # Nighttime Lights from VIIRS
+        if "nightlights" in metrics:
+            viirs_collection = ee.ImageCollection(DATASETS["viirs_dnb"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+
+            reductions["nightlights"] = self._reduce_region_lazy(
+                viirs_collection.mean(), region, scale=500
+            )
+
+        # Human Modification Index
+        if "human_modification" in metrics:
+            ghm = ee.ImageCollection(DATASETS["human_modification"]["id"]).first()
+            reductions["human_modification"] = self._reduce_region_lazy(ghm, region, scale=1000)
+
+        # Elevation from SRTM, with min/max for terrain analysis
+        if "elevation" in metrics:
+            srtm = ee.Image(DATASETS["srtm"]["id"])
+            reductions["elevation"] = self._reduce_region_lazy(srtm, region, scale=30)
+            reductions["elevation_range"] = self._reduce_region_lazy(
+                srtm, region, scale=30, reducer=ee.Reducer.minMax()
+            )
+
+        # Distance to Water, with JRC occurrence as a simplified fallback
+        if "distance_to_water" in metrics:
+            # Use JRC water occurrence > 50% as "water"
+            jrc_water = ee.Image(DATASETS["jrc_water"]["id"]) \
+                .select(DATASETS["jrc_water"]["bands"]["occurrence"])
+
+            water_mask = jrc_water.gt(50)
+
+            # Calculate distance to nearest water pixel
+            distance = water_mask.Not().cumulativeCost(
+                source=water_mask,
+                maxDistance=50000
+            )
+
+            reductions["water_distance"] = self._reduce_region_lazy(distance, region, scale=100)
+            reductions["water_occurrence"] = self._reduce_region_lazy(jrc_water, region, scale=30)
+
+        return reductions
+
+    def build_metric_images(
+        self,
+        region: ee.Geometry,
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, ee.Image]:
+        """Build per-pixel ecosystem metrics (same conversions as parse_reductions)."""
+
+        date_filter = self._get_date_filter(date_range)
+        images = {}
+
+        if "population" in metrics:
+            year = int(date_range[1][:4])
+            worldpop = ee.ImageCollection(DATASETS["worldpop"]["id"]) \
+                .filterBounds(region) \
+                .filter(ee.Filter.eq("year", min(year, 2020))) \
+                .mosaic() \
+                .select(DATASETS["worldpop"]["band"])
+            # People per pixel -> people per km2
+            images["population"] = worldpop \
+                .divide(ee.Image.pixelArea().divide(1e6)) \
+                .rename("population")
+
+        if "nightlights" in metrics:
+            viirs_collection = ee.ImageCollection(DATASETS["viirs_dnb"]["id"]) \
+                .filter(date_filter) \
+                .filterBounds(region)
+            images["nightlights"] = self._composite_or(
+                viirs_collection, [DATASETS["viirs_dnb"]["band"]]
+            ).rename("nightlights")
+
+        if "human_modification" in metrics:
+            images["human_modification"] = ee.ImageCollection(DATASETS["human_modification"]["id"]) \
+                .first() \
+                .select(DATASETS["human_modification"]["band"]) \
+                .rename("human_modification")
+
+        if "elevation" in metrics:
+            images["elevation"] = ee.Image(DATASETS["srtm"]["id"]) \
+                .select(DATASETS["srtm"]["band"]) \
+                .rename("elevation")
+
+        if "distance_to_water" in metrics:
+            water_mask = ee.Image(DATASETS["jrc_water"]["id"]) \
+                .select(DATASETS["jrc_water"]["bands"]["occurrence"]) \
+                .gt(50)
+            images["distance_to_water"] = water_mask.Not() \
+                .cumulativeCost(source=water_mask, maxDistance=50000) \
+                .rename("distance_to_water")
+
+        return images
+
+    def parse_reductions(
+        self,
+        data: Dict[str, Any],
+        date_range: Tuple[str, str],
+        metrics: List[str]
+    ) -> Dict[str, Any]:
+        """Parse ecosystem metrics."""
 
         results = {"metrics": {}}
 
-        # Query Population Density from WorldPop
         if "population" in metrics:
             try:
-                # WorldPop uses annual collections
-                year = int(date_range[1][:4])
-                worldpop = ee.ImageCollection(DATASETS["worldpop"]["id"]) \
-                    .filterBounds(region) \
-                    .filter(ee.Filter.eq("year", min(year, 2020)))  # Max available year
-
-                pop_image = worldpop.first()
-
-                if pop_image:
-                    pop_data = self._reduce_region(
-                        pop_image,
-                        region,
-                        scale=100,
-                        reducer=ee.Reducer.sum()
-                    )
-
-                    # Get total population in buffer
-                    pop_total = self._safe_get_value(pop_data, DATASETS["worldpop"]["band"])
-
-                    # Calculate density (people per km2)
-                    area_km2 = region.area().divide(1e6).getInfo()
-                    pop_density = pop_total / area_km2 if pop_total and area_km2 else None
-
-                    results["metrics"]["population"] = {
-                        "value": pop_density,
-                        "total_in_buffer": pop_total,
-                        "buffer_area_km2": area_km2,
-                        "unit": "people/km2",
-                        "description": "Population Density",
-                        "quality": "good" if pop_density is not None else "unavailable"
-                    }
-                else:
-                    results["metrics"]["population"] = {
-                        "value": None,
-                        "quality": "unavailable",
-                        "error": "No WorldPop data available"
-                    }
+                pop_data = data.get("population", {})
+
+                # Get total population in buffer
+                pop_total = self._safe_get_value(pop_data, DATASETS["worldpop"]["band"])
+
+                # Calculate density (people per km2)
+                area_km2 = data.get(AREA_KEY)
+                if not isinstance(area_km2, (int, float)):
+                    area_km2 = None
+                pop_density = pop_total / area_km2 if pop_total and area_km2 else None
+
+                results["metrics"]["population"] = {
+                    "value": pop_density,
+                    "total_in_buffer": pop_total,
+                    "buffer_area_km2": area_km2,
+                    "unit": "people/km2",
+                    "description": "Population Density",
+                    "quality": "good" if pop_density is not None else "unavailable"
+                }
 
             except Exception as e:
                 results["metrics"]["population"] = {
@@ -84,15 +184,9 @@ class EcosystemPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query Nighttime Lights from VIIRS
         if "nightlights" in metrics:
             try:
-                viirs_collection = ee.ImageCollection(DATASETS["viirs_dnb"]["id"]) \
-                    .filter(date_filter) \
-                    .filterBounds(region)
-
-                viirs_image = viirs_collection.mean()
-                viirs_data = self._reduce_region(viirs_image, region, scale=500)
+                viirs_data = data.get("nightlights", {})
 
                 radiance = self._safe_get_value(
                     viirs_data,
@@ -114,11 +208,9 @@ class EcosystemPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query Human Modification Index
         if "human_modification" in metrics:
             try:
-                ghm = ee.ImageCollection(DATASETS["human_modification"]["id"]).first()
-                ghm_data = self._reduce_region(ghm, region, scale=1000)
+                ghm_data = data.get("human_modification", {})
 
                 hm_value = self._safe_get_value(
                     ghm_data,
@@ -140,24 +232,18 @@ class EcosystemPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Query Elevation from SRTM
         if "elevation" in metrics:
             try:
-                srtm = ee.Image(DATASETS["srtm"]["id"])
-                elev_data = self._reduce_region(srtm, region, scale=30)
+                elev_data = data.get("elevation", {})
 
                 elevation = self._safe_get_value(
                     elev_data,
                     DATASETS["srtm"]["band"]
                 )
 
-                # Also get min/max for terrain analysis
-                elev_stats = srtm.reduceRegion(
-                    reducer=ee.Reducer.minMax(),
-                    geometry=region,
-                    scale=30,
-                    maxPixels=1e9
-                ).getInfo()
+                elev_stats = data.get("elevation_range", {})
+                if "error" in elev_stats:
+                    raise RuntimeError(elev_stats["error"])
 
                 elev_min = elev_stats.get("elevation_min")
                 elev_max = elev_stats.get("elevation_max")
@@ -180,23 +266,10 @@ class EcosystemPillar(BasePillar):
                     "error": str(e)
                 }
 
-        # Calculate Distance to Water
         if "distance_to_water" in metrics:
-            try:
-                # Use JRC water occurrence > 50% as "water"
-                jrc_water = ee.Image(DATASETS["jrc_water"]["id"]) \
-                    .select(DATASETS["jrc_water"]["bands"]["occurrence"])
-
-                water_mask = jrc_water.gt(50)
-
-                # Calculate distance to nearest water pixel
-                distance = water_mask.Not().cumulativeCost(
-                    source=water_mask,
-                    maxDistance=50000
-                )
-
-                dist_data = self._reduce_region(distance, region, scale=100)
+            dist_data = data.get("water_distance", {})
 
+            if "error" not in dist_data:
                 dist_value = self._safe_get_value(dist_data, "occurrence")
 
                 results["metrics"]["distance_to_water"] = {
@@ -205,13 +278,11 @@ class EcosystemPillar(BasePillar):
                     "description": "Distance to Nearest Permanent Water",
                     "quality": "good" if dist_value is not None else "moderate"
                 }
-
-            except Exception as e:
+            else:
                 # Fallback: check if there's water in the region
-                try:
-                    jrc_water = ee.Image(DATASETS["jrc_water"]["id"]) \
-                        .select(DATASETS["jrc_water"]["bands"]["occurrence"])
-                    water_data = self._reduce_region(jrc_water, region, scale=30)
+                water_data = data.get("water_occurrence", {})
+
+                if "error" not in water_data:
                     occurrence = self._safe_get_value(water_data, "occurrence")
 
                     results["metrics"]["distance_to_water"] = {
@@ -221,14 +292,14 @@ class EcosystemPillar(BasePillar):
                         "description": "Distance to Water (simplified)",
                         "quality": "moderate"
                     }
-                except Exception:
+                else:
                     results["metrics"]["distance_to_water"] = {
                         "value": None,
                         "quality": "unavailable",
-                        "error": str(e)
+                        "error": dist_data["error"]
                     }
 
-        results["data_date"] = date_range[1]
+        results["data_date"] = self.get_data_date(date_range)
         return results
 
     def _interpret_nightlights(self, value: float) -> str:
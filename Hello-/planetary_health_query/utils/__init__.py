@@ -5,6 +5,12 @@ This package provides:
 - Scoring calculations using PHI Technical Framework methodology
 - Data quality assessment and DQS calculation
 - Query result caching
+- Persistent single-file result store
+- Spatially-indexed per-metric caching
+- Vectorized (NumPy) scoring for batches of sites
+- Precompiled scoring plans per ecosystem type and query mode
+- Raster (per-pixel) scoring as Earth Engine image expressions
+- Local polygon geometry (ellipsoidal area, centroid, bbox)
 """
 
 # Normalization functions
@@ -22,6 +28,7 @@ from .normalization import (
 
 # Scoring functions
 from .scoring import (
+    metric_value,
     normalize_metric,
     calculate_category_score,
     calculate_pillar_score,
@@ -33,6 +40,16 @@ from .scoring import (
     get_metric_score_breakdown
 )
 
+# Scoring plans
+from .scoring_plan import (
+    MetricPlan,
+    ScoringPlan,
+    build_scoring_plan,
+    get_scoring_plan,
+    get_metric_plan,
+    reload_scoring_plans
+)
+
 # Quality assessment functions
 from .quality import (
     assess_data_quality,
@@ -46,8 +63,38 @@ from .quality import (
     get_dqs_recommendation
 )
 
+# Vectorized scoring
+from .vector_scoring import (
+    compile_metrics,
+    normalize_matrix,
+    score_matrix,
+    metrics_to_matrix
+)
+
+# Raster scoring
+from .ee_scoring import (
+    PHI_BAND,
+    ECOSYSTEM_BAND,
+    normalize_image,
+    detect_ecosystem_image,
+    score_image
+)
+
+# Polygon geometry
+from .geometry import PolygonGeometry, polygon_geometry, ring_area_m2
+
 # Caching
-from .cache import QueryCache
+from .cache import QueryCache, LRUCache
+from .result_store import ResultStore, configure_result_store, get_result_store
+
+# Spatial cache
+from .spatial_cache import (
+    SpatialMetricCache,
+    get_metric_cache,
+    quadkey,
+    grid_key,
+    level_for_resolution
+)
 
 __all__ = [
     # Normalization
@@ -62,6 +109,7 @@ __all__ = [
     "normalize_value",
 
     # Scoring
+    "metric_value",
     "normalize_metric",
     "calculate_category_score",
     "calculate_pillar_score",
@@ -72,6 +120,32 @@ __all__ = [
     "get_detailed_scores",
     "get_metric_score_breakdown",
 
+    # Scoring plans
+    "MetricPlan",
+    "ScoringPlan",
+    "build_scoring_plan",
+    "get_scoring_plan",
+    "get_metric_plan",
+    "reload_scoring_plans",
+
+    # Vectorized scoring
+    "compile_metrics",
+    "normalize_matrix",
+    "score_matrix",
+    "metrics_to_matrix",
+
+    # Raster scoring
+    "PHI_BAND",
+    "ECOSYSTEM_BAND",
+    "normalize_image",
+    "detect_ecosystem_image",
+    "score_image",
+
+    # Polygon geometry
+    "PolygonGeometry",
+    "polygon_geometry",
+    "ring_area_m2",
+
     # Quality
     "assess_data_quality",
     "assess_data_completeness",
@@ -84,5 +158,16 @@ __all__ = [
     "get_dqs_recommendation",
 
     # Cache
-    "QueryCache"
+    "QueryCache",
+    "LRUCache",
+    "ResultStore",
+    "configure_result_store",
+    "get_result_store",
+
+    # Spatial cache
+    "SpatialMetricCache",
+    "get_metric_cache",
+    "quadkey",
+    "grid_key",
+    "level_for_resolution"
 ]
@@ -1,19 +1,225 @@
 """
 Query Caching Module.
-Provides in-memory and optional disk caching for query results.
+Provides in-memory and optional persistent caching for query results.
 """
 
-import json
 import hashlib
+import json
+import sys
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Hashable, List, Optional
+
+from ..core.config import QUERY_CACHE_MAX_BYTES
+from .result_store import ResultStore
+
+# Number of independently locked shards in an LRUCache
+DEFAULT_STRIPES = 16
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory footprint of a cached value in bytes.
+
+    Uses the length of its compact JSON encoding, which tracks the size of
+    the nested dicts/lists query results are made of.
+    """
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class _Stripe:
+    """One shard of an LRUCache: an ordered dict and its lock."""
+
+    __slots__ = ("lock", "entries", "bytes")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (value, size, expires_at); oldest first
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.bytes = 0
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with TTLs and a byte budget.
+
+    get, set and eviction are O(1): each shard keeps its entries in an
+    OrderedDict in access order. Keys are spread over independently locked
+    shards, so concurrent callers rarely contend; recency is tracked per
+    shard, which approximates global LRU order.
+
+    Usage:
+        cache = LRUCache(max_entries=10000, max_bytes=64 * 1024 ** 2)
+        cache.set("key", value, ttl=3600)
+        cache.get("key")
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        stripes: int = DEFAULT_STRIPES
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries (None = unbounded)
+            max_bytes: Maximum approximate bytes (None = unbounded)
+            stripes: Number of locked shards
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        self._stripe_entries = None if max_entries is None else max(1, max_entries // stripes)
+        self._stripe_bytes = None if max_bytes is None else max(1, max_bytes // stripes)
+
+        self._counter_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _count(self, hits: int = 0, misses: int = 0, evictions: int = 0, expirations: int = 0):
+        with self._counter_lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+            self._expirations += expirations
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a live value and mark it most recently used.
+
+        Args:
+            key: Cache key
+            default: Returned on a miss
+
+        Returns:
+            Cached value (not copied) or default
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    stripe.entries.move_to_end(key)
+                    hit = True
+                else:
+                    del stripe.entries[key]
+                    stripe.bytes -= size
+                    hit = None
+            else:
+                hit = False
+
+        if hit:
+            self._count(hits=1)
+            return value
+        self._count(misses=1, expirations=1 if hit is None else 0)
+        return default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+        expires_at: Optional[float] = None
+    ):
+        """
+        Store a value, evicting least recently used entries if over budget.
+
+        Args:
+            key: Cache key
+            value: Value to cache (stored by reference)
+            ttl: Time-to-live in seconds (None = no expiry)
+            size: Approximate size in bytes; estimated if None
+            expires_at: Absolute expiry timestamp (overrides ttl)
+        """
+        if size is None:
+            size = estimate_size(value)
+        if expires_at is None and ttl is not None:
+            expires_at = time.time() + ttl
+
+        stripe = self._stripe(key)
+        evicted = 0
+        with stripe.lock:
+            old = stripe.entries.pop(key, None)
+            if old is not None:
+                stripe.bytes -= old[1]
+            stripe.entries[key] = (value, size, expires_at)
+            stripe.bytes += size
+
+            while len(stripe.entries) > 1 and (
+                (self._stripe_entries is not None and len(stripe.entries) > self._stripe_entries)
+                or (self._stripe_bytes is not None and stripe.bytes > self._stripe_bytes)
+            ):
+                _, (_, old_size, _) = stripe.entries.popitem(last=False)
+                stripe.bytes -= old_size
+                evicted += 1
+
+        if evicted:
+            self._count(evictions=evicted)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry. Returns True if it existed."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.pop(key, None)
+            if entry is not None:
+                stripe.bytes -= entry[1]
+        return entry is not None
+
+    def clear(self):
+        """Remove all entries."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.bytes = 0
+
+    def keys(self) -> List[Hashable]:
+        """Snapshot of current keys (including not yet purged expired ones)."""
+        keys = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                keys.extend(stripe.entries)
+        return keys
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    @property
+    def bytes(self) -> int:
+        """Approximate bytes held."""
+        return sum(stripe.bytes for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters and occupancy."""
+        with self._counter_lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 3) if total else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
 
 
 class QueryCache:
     """
-    Simple query result cache with TTL support.
+    Query result cache with TTL support.
 
     Usage:
         cache = QueryCache(ttl_seconds=3600)
@@ -27,7 +233,9 @@ class QueryCache:
         self,
         ttl_seconds: int = 3600,
         max_size: int = 1000,
-        cache_dir: Optional[Path] = None
+        cache_dir: Optional[Path] = None,
+        store: Optional[ResultStore] = None,
+        max_bytes: Optional[int] = QUERY_CACHE_MAX_BYTES
     ):
         """
         Initialize cache.
@@ -35,16 +243,19 @@ class QueryCache:
         Args:
             ttl_seconds: Time-to-live in seconds
             max_size: Maximum number of cached entries
-            cache_dir: Optional directory for disk caching
+            cache_dir: Optional directory for disk caching; entries are kept
+                       in a single SQLite file (query_cache.sqlite3) there
+            store: Optional shared ResultStore (takes precedence over cache_dir)
+            max_bytes: Approximate in-memory byte budget (None = unbounded)
         """
         self.ttl = ttl_seconds
         self.max_size = max_size
         self.cache_dir = cache_dir
-        self._memory_cache: Dict[str, Dict] = {}
-        self._access_times: Dict[str, float] = {}
+        self._memory_cache = LRUCache(max_entries=max_size, max_bytes=max_bytes)
 
-        if cache_dir:
-            cache_dir.mkdir(parents=True, exist_ok=True)
+        if store is None and cache_dir:
+            store = ResultStore(Path(cache_dir) / "query_cache.sqlite3")
+        self.store = store
 
     def _make_key(
         self,
@@ -60,7 +271,7 @@ class QueryCache:
         lon_round = round(lon, 3)
 
         key_data = f"{lat_round}:{lon_round}:{mode}:{temporal}:{buffer_radius}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return "query:" + hashlib.md5(key_data.encode()).hexdigest()
 
     def get(
         self,
@@ -86,32 +297,22 @@ class QueryCache:
         key = self._make_key(lat, lon, mode, temporal, buffer_radius)
 
         # Check memory cache
-        if key in self._memory_cache:
-            entry = self._memory_cache[key]
-            if time.time() - entry["timestamp"] < self.ttl:
-                self._access_times[key] = time.time()
+        entry = self._memory_cache.get(key)
+        if entry is not None:
+            return entry["data"]
+
+        # Check persistent store
+        if self.store:
+            try:
+                entry = self.store.get(key)
+            except Exception:
+                entry = None
+            if entry is not None:
+                # Promote to memory cache
+                self._memory_cache.set(
+                    key, entry, expires_at=entry["timestamp"] + self.ttl
+                )
                 return entry["data"]
-            else:
-                # Expired
-                del self._memory_cache[key]
-                del self._access_times[key]
-
-        # Check disk cache
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{key}.json"
-            if cache_file.exists():
-                try:
-                    with open(cache_file, "r") as f:
-                        entry = json.load(f)
-                    if time.time() - entry["timestamp"] < self.ttl:
-                        # Promote to memory cache
-                        self._memory_cache[key] = entry
-                        self._access_times[key] = time.time()
-                        return entry["data"]
-                    else:
-                        cache_file.unlink()  # Remove expired
-                except Exception:
-                    pass
 
         return None
 
@@ -145,52 +346,31 @@ class QueryCache:
             "data": data
         }
 
-        # Evict if cache is full
-        if len(self._memory_cache) >= self.max_size:
-            self._evict_oldest()
+        # Store in memory (evicts least recently used entries if full)
+        self._memory_cache.set(key, entry, ttl=self.ttl)
 
-        # Store in memory
-        self._memory_cache[key] = entry
-        self._access_times[key] = time.time()
-
-        # Store on disk if configured
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{key}.json"
+        # Store persistently if configured
+        if self.store:
             try:
-                with open(cache_file, "w") as f:
-                    json.dump(entry, f)
+                self.store.set(key, entry, ttl=self.ttl)
             except Exception:
                 pass
 
     def clear(self):
         """Clear all cached entries."""
         self._memory_cache.clear()
-        self._access_times.clear()
-
-        if self.cache_dir:
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    cache_file.unlink()
-                except Exception:
-                    pass
-
-    def _evict_oldest(self):
-        """Evict the least recently accessed entry."""
-        if not self._access_times:
-            return
-
-        oldest_key = min(self._access_times, key=self._access_times.get)
 
-        if oldest_key in self._memory_cache:
-            del self._memory_cache[oldest_key]
-        if oldest_key in self._access_times:
-            del self._access_times[oldest_key]
+        if self.store:
+            self.store.clear(prefix="query:")
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        memory = self._memory_cache.stats()
         return {
-            "entries": len(self._memory_cache),
+            "entries": memory["entries"],
             "max_size": self.max_size,
             "ttl_seconds": self.ttl,
-            "disk_enabled": self.cache_dir is not None
+            "memory": memory,
+            "disk_enabled": self.store is not None,
+            "disk": self.store.stats() if self.store else None
         }
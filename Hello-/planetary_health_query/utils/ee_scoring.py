@@ -0,0 +1,273 @@
+"""
+Raster PHI Scoring Module.
+
+Earth Engine counterpart of scoring.py: PHI_METRIC_PARAMS normalizers are
+translated into ee.Image expressions, so a whole region is scored per
+pixel in one server-side graph instead of one point query per location.
+
+The expressions mirror utils/normalization.py:
+- linear / inverse_linear: clamp to [v_min, v_max], rescale to 0-100
+- sigmoid / inverse_sigmoid: 100 / (1 + exp(-k_scaled * (V - V_mid)))
+- gaussian: 100 * exp(-(V - V_opt)^2 / (2 * sigma^2)), V clamped
+- centered: 100 * (1 - |V| / |V_max|)
+
+Pillar bands are weighted means of the available metric scores (masked
+pixels are left out, like missing metrics), and the PHI band applies the
+ecosystem-adaptive weights of the ecosystem detected at each pixel.
+
+Usage:
+    images = {"ndvi": ndvi_image, "aod": aod_image}
+    scored = score_image(images)
+    scored.bandNames()  # ["phi", "A_atmospheric", ..., "ecosystem"]
+"""
+
+from typing import Dict, List, Optional
+
+import ee
+
+from .scoring_plan import CATEGORIES, get_scoring_plan
+from ..core.config import PHI_METRIC_PARAMS, LANDCOVER_TO_ECOSYSTEM, ECOSYSTEM_CATEGORY_WEIGHTS
+
+# Band holding the per-pixel overall score
+PHI_BAND = "phi"
+
+# Band holding the index of the detected ecosystem type (see ecosystem_types())
+ECOSYSTEM_BAND = "ecosystem"
+
+# Heatmap palette, matching get_score_color() from Critical to Excellent
+PHI_PALETTE = ["#c0392b", "#e74c3c", "#f39c12", "#2ecc71", "#27ae60"]
+
+
+def _linear(value: ee.Image, params: Dict) -> ee.Image:
+    v_min = params.get("v_min", 0)
+    v_max = params.get("v_max", 100)
+    if v_max == v_min:
+        return value.multiply(0).add(50)
+    return value.clamp(v_min, v_max).subtract(v_min).divide(v_max - v_min).multiply(100)
+
+
+def _inverse_linear(value: ee.Image, params: Dict) -> ee.Image:
+    v_min = params.get("v_min", 0)
+    v_max = params.get("v_max", 100)
+    if v_max == v_min:
+        return value.multiply(0).add(50)
+    return ee.Image.constant(v_max).subtract(value.clamp(v_min, v_max)) \
+        .divide(v_max - v_min) \
+        .multiply(100)
+
+
+def _sigmoid(value: ee.Image, params: Dict) -> ee.Image:
+    v_min = params.get("v_min", 0)
+    v_max = params.get("v_max", 100)
+    k = params.get("k", 0.5)
+    v_mid = params.get("v_mid")
+    if v_mid is None:
+        v_mid = (v_min + v_max) / 2
+
+    # Scale k based on the range to maintain consistent steepness
+    range_val = v_max - v_min
+    k_scaled = k * (10 / range_val) if range_val > 0 else k
+
+    exponent = value.subtract(v_mid).multiply(-k_scaled)
+    return ee.Image.constant(100).divide(exponent.exp().add(1))
+
+
+def _inverse_sigmoid(value: ee.Image, params: Dict) -> ee.Image:
+    return ee.Image.constant(100).subtract(_sigmoid(value, params))
+
+
+def _gaussian(value: ee.Image, params: Dict) -> ee.Image:
+    v_min = params.get("v_min", 0)
+    v_max = params.get("v_max", 100)
+    v_opt = params.get("v_opt", (v_min + v_max) / 2)
+    sigma = params.get("sigma", (v_max - v_min) / 4)
+
+    clamped = value.clamp(v_min, v_max)
+    if sigma == 0:
+        return clamped.eq(v_opt).multiply(100)
+    return clamped.subtract(v_opt).pow(2).divide(-2 * sigma ** 2).exp().multiply(100)
+
+
+def _centered(value: ee.Image, params: Dict) -> ee.Image:
+    v_max = params.get("v_max", 100)
+    if v_max == 0:
+        return value.eq(0).multiply(100)
+    return ee.Image.constant(1).subtract(value.abs().divide(abs(v_max))).multiply(100)
+
+
+_NORMALIZERS = {
+    "linear": _linear,
+    "inverse_linear": _inverse_linear,
+    "sigmoid": _sigmoid,
+    "inverse_sigmoid": _inverse_sigmoid,
+    "gaussian": _gaussian,
+    "centered": _centered,
+}
+
+
+def normalize_image(metric_name: str, image: ee.Image) -> Optional[ee.Image]:
+    """
+    Normalize a single-band metric image to 0-100 scores.
+
+    Args:
+        metric_name: Name of the metric (e.g., "ndvi", "aod")
+        image: Raw metric values
+
+    Returns:
+        Score image named after the metric, or None if not configured
+    """
+    params = PHI_METRIC_PARAMS.get(metric_name)
+    if not params:
+        return None
+
+    normalizer = _NORMALIZERS.get(params.get("norm_type", "linear"), _linear)
+    return normalizer(ee.Image(image), params).clamp(0, 100).toFloat().rename(metric_name)
+
+
+def _weighted_mean(scores: List[ee.Image], weights: List) -> ee.Image:
+    """
+    Per-pixel weighted mean that skips masked scores.
+
+    Weights are numbers or weight images. Pixels where no score is
+    available stay masked.
+    """
+    weighted_sum = ee.Image.constant(0)
+    total_weight = ee.Image.constant(0)
+    for score, weight in zip(scores, weights):
+        present = score.mask().gt(0).unmask(0, False)
+        weighted_sum = weighted_sum.add(score.unmask(0, False).multiply(weight))
+        total_weight = total_weight.add(present.multiply(weight))
+    return weighted_sum.divide(total_weight).updateMask(total_weight.gt(0))
+
+
+def ecosystem_types() -> List[str]:
+    """Ecosystem types in ECOSYSTEM_BAND index order."""
+    return list(ECOSYSTEM_CATEGORY_WEIGHTS)
+
+
+def detect_ecosystem_image(
+    land_cover: Optional[ee.Image] = None,
+    tree_cover: Optional[ee.Image] = None,
+    human_modification: Optional[ee.Image] = None
+) -> ee.Image:
+    """
+    Per-pixel version of GEEQueryEngine.detect_ecosystem_type().
+
+    Args:
+        land_cover: WorldCover classes
+        tree_cover: Tree cover percentage (0-100)
+        human_modification: Human modification index (0-1)
+
+    Returns:
+        Image of ecosystem type indices (see ecosystem_types())
+    """
+    types = ecosystem_types()
+    index = {name: position for position, name in enumerate(types)}
+
+    # Fallback heuristics where land cover is unavailable (later rules win,
+    # so they are applied in reverse order of precedence)
+    fallback = ee.Image.constant(index["default"])
+    if human_modification is not None:
+        fallback = fallback \
+            .where(human_modification.gt(0.3), index["agricultural"]) \
+            .where(human_modification.gt(0.5), index["urban_green"])
+    if tree_cover is not None:
+        fallback = fallback \
+            .where(tree_cover.gt(10), index["grassland_savanna"]) \
+            .where(tree_cover.gt(50), index["tropical_forest"])
+
+    if land_cover is None:
+        return fallback.toInt().rename(ECOSYSTEM_BAND)
+
+    classes = list(LANDCOVER_TO_ECOSYSTEM)
+    ecosystem = land_cover.remap(
+        classes,
+        [index[LANDCOVER_TO_ECOSYSTEM[c]] for c in classes],
+        index["default"]
+    )
+    if tree_cover is not None:
+        ecosystem = ecosystem.where(
+            ecosystem.eq(index["tropical_forest"]).And(tree_cover.lt(25)),
+            index["grassland_savanna"]
+        )
+    if human_modification is not None:
+        ecosystem = ecosystem.where(
+            ecosystem.eq(index["default"]).And(human_modification.gt(0.6)),
+            index["urban_green"]
+        )
+    return ecosystem.unmask(fallback, False).toInt().rename(ECOSYSTEM_BAND)
+
+
+def score_image(
+    metric_images: Dict[str, ee.Image],
+    ecosystem_type: Optional[str] = None,
+    mode: str = "comprehensive"
+) -> ee.Image:
+    """
+    Score metric images into PHI, pillar and ecosystem bands.
+
+    Args:
+        metric_images: Single-band raw metric images keyed by metric name
+        ecosystem_type: Weight every pixel for this ecosystem type. None
+                        detects the ecosystem per pixel from land_cover,
+                        tree_cover and human_modification.
+        mode: Query mode ("simple" or "comprehensive"), for pillar names
+
+    Returns:
+        ee.Image with bands PHI_BAND, one per pillar (e.g. "A_atmospheric")
+        and ECOSYSTEM_BAND
+    """
+    plan = get_scoring_plan(ecosystem_type or "default", mode)
+    scores = {}
+    for name, image in metric_images.items():
+        score = normalize_image(name, image)
+        if score is not None:
+            scores[name] = score
+
+    pillar_bands = []
+    pillars = []
+    for category_id in CATEGORIES:
+        members = [
+            name for name in scores
+            if plan.metrics[name].weight > 0
+            and plan.metrics[name].category in (None, category_id)
+        ]
+        if not members:
+            continue
+        pillar_bands.append(category_id)
+        pillars.append(_weighted_mean(
+            [scores[name] for name in members],
+            [plan.metrics[name].weight for name in members]
+        ))
+
+    types = ecosystem_types()
+    if ecosystem_type is not None:
+        position = types.index(ecosystem_type if ecosystem_type in types else "default")
+        ecosystem = ee.Image.constant(position).toInt().rename(ECOSYSTEM_BAND)
+        weights = [plan.weight_vector[CATEGORIES.index(c)] for c in pillar_bands]
+    else:
+        ecosystem = detect_ecosystem_image(
+            metric_images.get("land_cover"),
+            metric_images.get("tree_cover"),
+            metric_images.get("human_modification")
+        )
+        weights = [
+            ecosystem.remap(
+                list(range(len(types))),
+                [get_scoring_plan(t).weight_vector[CATEGORIES.index(c)] for t in types]
+            )
+            for c in pillar_bands
+        ]
+
+    if pillars:
+        phi = _weighted_mean(pillars, weights)
+    else:
+        phi = ee.Image.constant(0).updateMask(ee.Image.constant(0))
+
+    bands = [phi.toFloat().rename(PHI_BAND)]
+    bands += [
+        image.toFloat().rename(plan.pillar_keys.get(category_id, category_id))
+        for category_id, image in zip(pillar_bands, pillars)
+    ]
+    bands.append(ecosystem)
+    return ee.Image.cat(bands)
@@ -0,0 +1,744 @@
+"""
+Local Polygon Geometry.
+
+Area, centroid and bounding box of query parcels, computed in Python so
+polygon queries need no Earth Engine round trips for them. A
+PolygonGeometry is built once per query and shared by every pillar.
+
+Parcels are vertex lists or GeoJSON Polygons/MultiPolygons with holes.
+Input is validated and repaired where the intent is unambiguous:
+duplicate, collinear and spike vertices are removed, rings are oriented
+(exteriors counter-clockwise, holes clockwise), and degenerate holes and
+holes that cross or lie outside their exterior, or overlap another hole,
+are dropped. Self-intersecting rings and overlapping MultiPolygon parts
+are rejected, since there is no single correct way to untangle them.
+
+Area is computed on the WGS84 ellipsoid: latitudes are mapped to
+authalic latitudes, which preserve area exactly, and each ring's
+spherical excess is summed edge by edge on the authalic sphere. This
+agrees with geodesic (Karney) areas to about 0.02% for a one-degree
+cell, and much more closely for parcel-sized polygons.
+
+Earth Engine gets simplified copies (Douglas-Peucker at half the
+reduction scale, at most MAX_EE_VERTICES vertices), so detailed parcels
+do not inflate request size or reduce cost. Simplified polygons are
+re-checked and simplified less where that would make them invalid.
+Areas always use the full geometry.
+
+Usage:
+    geometry = polygon_geometry(points)
+    geometry.area_ha          # 12.4
+    geometry.centroid         # {"lat": 28.61, "lng": 77.21}
+    region = geometry.to_ee(scale=1000)
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import ee
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+
+_E2 = WGS84_F * (2 - WGS84_F)
+_E = math.sqrt(_E2)
+
+M2_PER_HA = 10000
+ACRES_PER_HA = 2.47105
+
+# Meters per degree of latitude, and of longitude at the equator
+M_PER_DEG_LAT = 110574.0
+M_PER_DEG_LNG = 111320.0
+
+# Vertices accepted per query, and sent to Earth Engine per geometry
+MAX_INPUT_VERTICES = 50000
+MAX_EE_VERTICES = 2000
+
+# Simplification tolerances tried (halving each time) before a polygon
+# whose simplified rings are invalid is sent unsimplified
+SIMPLIFY_ATTEMPTS = 4
+
+# Sine of the angle below which three vertices count as collinear
+COLLINEAR_SIN = 1e-9
+
+Ring = List[Tuple[float, float]]
+
+
+def _q(sin_lat: float) -> float:
+    """Authalic q(phi) of Snyder, Map Projections (1987), eq. 3-12."""
+    e_sin = _E * sin_lat
+    return (1 - _E2) * (
+        sin_lat / (1 - e_sin * e_sin)
+        - math.log((1 - e_sin) / (1 + e_sin)) / (2 * _E)
+    )
+
+
+_Q_POLE = _q(1.0)
+
+# Radius of the sphere with the ellipsoid's surface area
+AUTHALIC_RADIUS = WGS84_A * math.sqrt(_Q_POLE / 2)
+
+
+def authalic_latitude(lat: float) -> float:
+    """Authalic latitude (radians) of a geodetic latitude in degrees."""
+    ratio = _q(math.sin(math.radians(lat))) / _Q_POLE
+    return math.asin(max(-1.0, min(1.0, ratio)))
+
+
+def _unwrap(lngs: List[float]) -> List[float]:
+    """Make consecutive longitudes differ by at most 180 degrees."""
+    unwrapped = [lngs[0]]
+    for lng in lngs[1:]:
+        delta = (lng - unwrapped[-1] + 180) % 360 - 180
+        unwrapped.append(unwrapped[-1] + delta)
+    return unwrapped
+
+
+def _wrap(lng: float) -> float:
+    """Bring an unwrapped longitude back into [-180, 180]."""
+    if -180 <= lng <= 180:
+        return lng
+    return (lng + 180) % 360 - 180
+
+
+def _open(ring: Ring) -> Ring:
+    """Drop the closing vertex of a closed ring."""
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        return ring[:-1]
+    return ring
+
+
+def ring_area_m2(ring: Ring) -> float:
+    """
+    Ellipsoidal area of a ring of (lng, lat) vertices in square meters.
+
+    Args:
+        ring: Vertices in degrees; the ring may be open or closed, and in
+              either orientation. It must not contain a pole.
+
+    Returns:
+        Area in square meters
+    """
+    ring = _open(ring)
+    if len(ring) < 3:
+        return 0.0
+
+    excess = 0.0
+    previous_lng, previous_lat = ring[-1]
+    previous_t = math.tan(authalic_latitude(previous_lat) / 2)
+    for lng, lat in ring:
+        t = math.tan(authalic_latitude(lat) / 2)
+        delta = math.radians((lng - previous_lng + 180) % 360 - 180)
+        excess += 2 * math.atan2(math.tan(delta / 2) * (previous_t + t), 1 + previous_t * t)
+        previous_lng, previous_t = lng, t
+    return abs(excess) * AUTHALIC_RADIUS ** 2
+
+
+def ring_centroid(ring: Ring) -> Tuple[float, float]:
+    """
+    Area-weighted centroid (lng, lat) of a ring.
+
+    Computed in a local equirectangular projection, which is accurate for
+    parcel-sized polygons; degenerate rings use the vertex mean.
+    """
+    ring = _open(ring)
+    lngs = _unwrap([lng for lng, _ in ring])
+    lats = [lat for _, lat in ring]
+    n = len(ring)
+    scale = math.cos(math.radians(sum(lats) / n))
+
+    # Relative to the first vertex, to keep the cross products precise
+    origin_lng, origin_lat = lngs[0], lats[0]
+    area2 = cx = cy = 0.0
+    for i in range(n):
+        j = (i + 1) % n
+        x0, y0 = (lngs[i] - origin_lng) * scale, lats[i] - origin_lat
+        x1, y1 = (lngs[j] - origin_lng) * scale, lats[j] - origin_lat
+        cross = x0 * y1 - x1 * y0
+        area2 += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+
+    if abs(area2) < 1e-18 or scale == 0:
+        return _wrap(sum(lngs) / n), sum(lats) / n
+    return (
+        _wrap(origin_lng + cx / (3 * area2) / scale),
+        origin_lat + cy / (3 * area2)
+    )
+
+
+def _cross(a, b, c) -> float:
+    """z of (b - a) x (c - a); positive when a, b, c turn left."""
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _signed_area(ring: Ring) -> float:
+    """Planar signed area (positive = counter-clockwise)."""
+    x0, y0 = ring[0]
+    total = 0.0
+    for i in range(len(ring)):
+        (ax, ay), (bx, by) = ring[i], ring[(i + 1) % len(ring)]
+        total += (ax - x0) * (by - y0) - (bx - x0) * (ay - y0)
+    return total / 2
+
+
+def _within(a, b, p) -> bool:
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def _segments_intersect(a, b, c, d) -> bool:
+    """Closed segment intersection test (touching counts)."""
+    d1, d2 = _cross(c, d, a), _cross(c, d, b)
+    d3, d4 = _cross(a, b, c), _cross(a, b, d)
+    if ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4)):
+        return True
+    return (
+        (d1 == 0 and _within(c, d, a)) or (d2 == 0 and _within(c, d, b))
+        or (d3 == 0 and _within(a, b, c)) or (d4 == 0 and _within(a, b, d))
+    )
+
+
+def _self_intersection(ring: Ring) -> Optional[int]:
+    """
+    Index of an edge where a ring crosses or touches itself, or None.
+
+    Edges are swept by their west end, so only edges with overlapping
+    longitude ranges are compared.
+    """
+    n = len(ring)
+    edges = [(ring[i], ring[(i + 1) % n]) for i in range(n)]
+    order = sorted(range(n), key=lambda i: min(edges[i][0][0], edges[i][1][0]))
+
+    active: List[int] = []
+    for i in order:
+        a, b = edges[i]
+        west = min(a[0], b[0])
+        active = [j for j in active if max(edges[j][0][0], edges[j][1][0]) >= west]
+        for j in active:
+            # Neighbouring edges share a vertex
+            if abs(i - j) in (1, n - 1):
+                continue
+            if _segments_intersect(a, b, *edges[j]):
+                return min(i, j)
+        active.append(i)
+    return None
+
+
+def _point_in_ring(point: Tuple[float, float], ring: Ring) -> bool:
+    """Even-odd ray casting test."""
+    x, y = point
+    inside = False
+    for i in range(len(ring)):
+        (ax, ay), (bx, by) = ring[i], ring[(i + 1) % len(ring)]
+        if (ay > y) != (by > y) and x < ax + (y - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+    return inside
+
+
+def _bbox_overlap(first: Ring, second: Ring) -> bool:
+    """Whether the bounding boxes of two rings overlap (touching counts)."""
+    return (
+        min(x for x, _ in first) <= max(x for x, _ in second)
+        and min(x for x, _ in second) <= max(x for x, _ in first)
+        and min(y for _, y in first) <= max(y for _, y in second)
+        and min(y for _, y in second) <= max(y for _, y in first)
+    )
+
+
+def _rings_touch(first: Ring, second: Ring) -> bool:
+    """
+    Whether an edge of one ring crosses or touches an edge of the other.
+
+    Swept by west end like _self_intersection, comparing only edges of
+    different rings.
+    """
+    if not _bbox_overlap(first, second):
+        return False
+    edges = [
+        (owner, (ring[i], ring[(i + 1) % len(ring)]))
+        for owner, ring in enumerate((first, second))
+        for i in range(len(ring))
+    ]
+    edges.sort(key=lambda item: min(item[1][0][0], item[1][1][0]))
+
+    active: List[Tuple[int, Tuple]] = []
+    for owner, (a, b) in edges:
+        west = min(a[0], b[0])
+        active = [item for item in active if max(item[1][0][0], item[1][1][0]) >= west]
+        for other, edge in active:
+            if other != owner and _segments_intersect(a, b, *edge):
+                return True
+        active.append((owner, (a, b)))
+    return False
+
+
+def _in_polygon(point: Tuple[float, float], rings: List[Ring]) -> bool:
+    """Whether a point is inside a polygon's exterior and none of its holes."""
+    return _point_in_ring(point, rings[0]) and not any(
+        _point_in_ring(point, hole) for hole in rings[1:]
+    )
+
+
+def _hole_problem(hole: Ring, rings: List[Ring]) -> Optional[str]:
+    """
+    Why a hole does not fit its polygon, or None if it does.
+
+    Args:
+        hole: Open ring
+        rings: The polygon's exterior, then the holes already accepted
+    """
+    if _rings_touch(hole, rings[0]):
+        return "crossing its exterior"
+    if not _point_in_ring(hole[0], rings[0]):
+        return "outside its exterior"
+    for other in rings[1:]:
+        if _rings_touch(hole, other) or _point_in_ring(hole[0], other) or _point_in_ring(other[0], hole):
+            return "overlapping another hole"
+    return None
+
+
+def _polygons_overlap(first: List[Ring], second: List[Ring]) -> bool:
+    """
+    Whether two polygons (exterior first, then holes) share any point.
+
+    A polygon may sit inside a hole of the other, but not touch its rings.
+    """
+    if not _bbox_overlap(first[0], second[0]):
+        return False
+    if any(_rings_touch(second[0], ring) for ring in first):
+        return True
+    if any(_rings_touch(first[0], ring) for ring in second[1:]):
+        return True
+    return _in_polygon(second[0][0], first) or _in_polygon(first[0][0], second)
+
+
+def _clean_ring(ring: Ring) -> Tuple[Ring, int]:
+    """Remove duplicate, collinear and spike vertices; return (ring, removed)."""
+    cleaned = list(ring)
+    changed = True
+    while changed and len(cleaned) >= 3:
+        changed = False
+        for i in range(len(cleaned)):
+            previous, vertex = cleaned[i - 1], cleaned[i]
+            following = cleaned[(i + 1) % len(cleaned)]
+            span = math.dist(previous, vertex) * math.dist(vertex, following)
+            if span == 0 or abs(_cross(previous, vertex, following)) <= COLLINEAR_SIN * span:
+                del cleaned[i]
+                changed = True
+                break
+    if len(cleaned) < 3:
+        return [], len(ring)
+    return cleaned, len(ring) - len(cleaned)
+
+
+def simplify_ring(ring: Ring, tolerance: float) -> List[int]:
+    """
+    Douglas-Peucker simplification of a closed ring.
+
+    Args:
+        ring: Open ring of planar (x, y) vertices
+        tolerance: Maximum deviation, in the same units
+
+    Returns:
+        Indices of the kept vertices, in order (fewer than 3 if the ring
+        collapses)
+    """
+    n = len(ring)
+    if tolerance <= 0 or n <= 3:
+        return list(range(n))
+
+    # Split the ring at the vertex farthest from the first one
+    far = max(range(n), key=lambda i: math.dist(ring[0], ring[i]))
+    keep = {0, far}
+    stack = [(0, far), (far, n)]
+    while stack:
+        start, end = stack.pop()
+        a, b = ring[start], ring[end % n]
+        length = math.dist(a, b)
+        best, best_distance = None, tolerance
+        for i in range(start + 1, end):
+            if length == 0:
+                distance = math.dist(a, ring[i])
+            else:
+                distance = abs(_cross(a, b, ring[i])) / length
+            if distance > best_distance:
+                best, best_distance = i, distance
+        if best is not None:
+            keep.add(best)
+            stack.extend([(start, best), (best, end)])
+    return sorted(keep)
+
+
+def _simplify_polygon(rings: List[Ring], planar: List[Ring], tolerance: float) -> List[Ring]:
+    """
+    Simplify the rings of one polygon, keeping it valid.
+
+    Args:
+        rings: Exterior and holes as (lng, lat) vertices
+        planar: The same rings projected to meters
+        tolerance: Douglas-Peucker tolerance in meters
+
+    Returns:
+        Simplified rings, or the rings unchanged if no tolerance tried
+        gives a valid polygon
+    """
+    for _ in range(SIMPLIFY_ATTEMPTS):
+        kept: List[Ring] = []
+        kept_planar: List[Ring] = []
+        for index, ring in enumerate(rings):
+            indices = simplify_ring(planar[index], tolerance)
+            if len(indices) < 3:
+                if index > 0:
+                    continue
+                indices = list(range(len(ring)))
+            simple = [planar[index][i] for i in indices]
+            if _self_intersection(simple) is not None:
+                break
+            if index > 0 and _hole_problem(simple, kept_planar):
+                break
+            kept.append([ring[i] for i in indices])
+            kept_planar.append(simple)
+        else:
+            return kept
+        tolerance /= 2
+    return rings
+
+
+def validate_points(points: List[Dict[str, float]], min_points: int = 3):
+    """
+    Check polygon vertices given as dicts with 'lat' and 'lng' keys.
+
+    Raises:
+        ValueError: If there are too few points or a coordinate is invalid
+    """
+    if len(points) < min_points:
+        raise ValueError(f"Expected at least {min_points} points for polygon, got {len(points)}")
+
+    for i, pt in enumerate(points):
+        lat = pt.get('lat')
+        lng = pt.get('lng')
+        if lat is None or lng is None:
+            raise ValueError(f"Point {i} missing lat or lng")
+        if not -90 <= lat <= 90:
+            raise ValueError(f"Point {i}: Latitude must be between -90 and 90, got {lat}")
+        if not -180 <= lng <= 180:
+            raise ValueError(f"Point {i}: Longitude must be between -180 and 180, got {lng}")
+
+
+def parse_geojson(geojson: Dict[str, Any]) -> List[List[Ring]]:
+    """
+    Read the rings of a GeoJSON Polygon or MultiPolygon.
+
+    Args:
+        geojson: Geometry object, or a Feature holding one
+
+    Returns:
+        Polygons, each a list of (lng, lat) rings with the exterior first
+
+    Raises:
+        ValueError: If the object is not a (Multi)Polygon or a position is
+                    invalid
+    """
+    if geojson.get("type") == "Feature":
+        geojson = geojson.get("geometry") or {}
+
+    kind = geojson.get("type")
+    if kind not in ("Polygon", "MultiPolygon"):
+        raise ValueError(f"Expected a GeoJSON Polygon or MultiPolygon, got {kind}")
+    coordinates = geojson.get("coordinates")
+    if not isinstance(coordinates, list) or not coordinates:
+        raise ValueError(f"{kind} has no coordinates")
+
+    polygons = []
+    for p, rings in enumerate([coordinates] if kind == "Polygon" else coordinates):
+        if not isinstance(rings, list) or not rings:
+            raise ValueError(f"Polygon {p} has no rings")
+        parsed = []
+        for r, ring in enumerate(rings):
+            if not isinstance(ring, list):
+                raise ValueError(f"Polygon {p} ring {r} is not a list of positions")
+            vertices = []
+            for v, position in enumerate(ring):
+                try:
+                    lng, lat = float(position[0]), float(position[1])
+                except (TypeError, ValueError, IndexError):
+                    raise ValueError(f"Polygon {p} ring {r} vertex {v} is not a [lng, lat] position")
+                if not -90 <= lat <= 90:
+                    raise ValueError(f"Polygon {p} ring {r} vertex {v}: Latitude must be between -90 and 90, got {lat}")
+                if not -180 <= lng <= 180:
+                    raise ValueError(f"Polygon {p} ring {r} vertex {v}: Longitude must be between -180 and 180, got {lng}")
+                vertices.append((lng, lat))
+            parsed.append(vertices)
+        polygons.append(parsed)
+    return polygons
+
+
+class PolygonGeometry:
+    """
+    Geometry context of one polygon query, shared by all pillars.
+
+    Attributes:
+        points: Vertices as given (dicts with 'lat' and 'lng'), or None
+                for GeoJSON input
+        polygons: Repaired polygons, each a list of open (lng, lat) rings,
+                  exterior (counter-clockwise) first, then holes
+        type: "Polygon" or "MultiPolygon"
+        area_m2: Ellipsoidal area in square meters, holes excluded
+        centroid: {"lat", "lng"} of the area-weighted centroid
+        bbox: (west, south, east, north); west > east across the antimeridian
+        repairs: What was repaired in the input, for the result
+    """
+
+    def __init__(self, region: Union[List[Dict[str, float]], Dict[str, Any]]):
+        """
+        Args:
+            region: At least 3 vertex dicts with 'lat' and 'lng' keys, or a
+                    GeoJSON Polygon/MultiPolygon (geometry or Feature)
+
+        Raises:
+            ValueError: If the input is invalid or cannot be repaired
+        """
+        if isinstance(region, dict):
+            self.points = None
+            polygons = parse_geojson(region)
+        else:
+            validate_points(region)
+            self.points = region
+            polygons = [[[(pt['lng'], pt['lat']) for pt in region]]]
+
+        vertex_count = sum(len(ring) for rings in polygons for ring in rings)
+        if vertex_count > MAX_INPUT_VERTICES:
+            raise ValueError(f"Geometry has {vertex_count} vertices, the limit is {MAX_INPUT_VERTICES}")
+        if not polygons[0][0]:
+            raise ValueError("Polygon 0 ring 0 has no vertices")
+
+        # Longitudes are handled unwrapped around the first vertex, so
+        # parcels across the antimeridian stay contiguous
+        self._origin_lng = polygons[0][0][0][0]
+        self.repairs: List[str] = []
+        self.polygons = [self._repair(p, rings) for p, rings in enumerate(polygons)]
+        self._check_parts()
+        self.type = "MultiPolygon" if len(self.polygons) > 1 else "Polygon"
+
+        # Holes count negatively in both the area and the centroid
+        self.area_m2 = 0.0
+        moment_lng = moment_lat = 0.0
+        for rings in self.polygons:
+            for index, ring in enumerate(rings):
+                area = ring_area_m2(ring) * (1 if index == 0 else -1)
+                lng, lat = ring_centroid(ring)
+                self.area_m2 += area
+                moment_lng += area * self._local(lng)
+                moment_lat += area * lat
+        self.centroid = {
+            "lat": moment_lat / self.area_m2,
+            "lng": _wrap(moment_lng / self.area_m2)
+        }
+
+        lngs = [self._local(lng) for rings in self.polygons for lng, _ in rings[0]]
+        lats = [lat for rings in self.polygons for _, lat in rings[0]]
+        self.bbox = (_wrap(min(lngs)), min(lats), _wrap(max(lngs)), max(lats))
+
+        self._tolerances: Dict[Optional[float], float] = {}
+        self._ee_geometries: Dict[float, ee.Geometry] = {}
+
+    def _local(self, lng: float) -> float:
+        """Longitude unwrapped to within 180 degrees of the first vertex."""
+        return self._origin_lng + (lng - self._origin_lng + 180) % 360 - 180
+
+    def _repair(self, p: int, rings: List[Ring]) -> List[Ring]:
+        """Clean, check and orient the rings of one polygon."""
+        kept: List[Ring] = []
+        for r, ring in enumerate(rings):
+            label = "Polygon" if self.points is not None else f"Polygon {p} ring {r}"
+            planar, removed = _clean_ring([(self._local(lng), lat) for lng, lat in _open(ring)])
+            if not planar:
+                if r == 0:
+                    raise ValueError(f"{label} has fewer than 3 distinct, non-collinear vertices")
+                self.repairs.append(f"{label}: dropped degenerate hole")
+                continue
+            if removed:
+                self.repairs.append(f"{label}: removed {removed} duplicate or collinear vertices")
+
+            crossing = _self_intersection(planar)
+            if crossing is not None:
+                raise ValueError(f"{label} is self-intersecting at edge {crossing}")
+
+            # Exteriors counter-clockwise, holes clockwise (RFC 7946); vertex
+            # lists have no prescribed order, so only GeoJSON is reported
+            if (_signed_area(planar) > 0) != (r == 0):
+                planar.reverse()
+                if self.points is None:
+                    self.repairs.append(f"{label}: reversed ring orientation")
+
+            if r > 0:
+                problem = _hole_problem(planar, kept)
+                if problem:
+                    self.repairs.append(f"{label}: dropped hole {problem}")
+                    continue
+            kept.append(planar)
+
+        return [[(_wrap(lng), lat) for lng, lat in ring] for ring in kept]
+
+    def _check_parts(self):
+        """Reject MultiPolygon parts that overlap, touch or contain each other."""
+        parts = [
+            [[(self._local(lng), lat) for lng, lat in ring] for ring in rings]
+            for rings in self.polygons
+        ]
+        # Swept by west edge, so only parts with overlapping longitudes
+        # are compared
+        bounds = [
+            (min(x for x, _ in rings[0]), max(x for x, _ in rings[0]))
+            for rings in parts
+        ]
+        active: List[int] = []
+        for q in sorted(range(len(parts)), key=lambda i: bounds[i][0]):
+            active = [p for p in active if bounds[p][1] >= bounds[q][0]]
+            for p in active:
+                if _polygons_overlap(parts[p], parts[q]):
+                    first, second = sorted((p, q))
+                    raise ValueError(f"Polygon {second} overlaps polygon {first}")
+            active.append(q)
+
+    @property
+    def area_ha(self) -> float:
+        return self.area_m2 / M2_PER_HA
+
+    @property
+    def area_km2(self) -> float:
+        return self.area_m2 / 1e6
+
+    @property
+    def area_acres(self) -> float:
+        return self.area_ha * ACRES_PER_HA
+
+    @property
+    def vertex_count(self) -> int:
+        return sum(len(ring) for rings in self.polygons for ring in rings)
+
+    def simplified(self, tolerance: float) -> List[List[Ring]]:
+        """
+        Polygons simplified to a tolerance in meters.
+
+        Exteriors that would collapse (parcels smaller than the tolerance)
+        are kept whole; holes that would collapse are dropped. A polygon
+        whose simplified rings self-intersect or whose holes no longer fit
+        is retried at half the tolerance, and kept unsimplified after
+        SIMPLIFY_ATTEMPTS tries.
+        """
+        if tolerance <= 0:
+            return self.polygons
+
+        lat0 = self.centroid["lat"]
+        x_scale = M_PER_DEG_LNG * math.cos(math.radians(lat0))
+        polygons = []
+        for rings in self.polygons:
+            planar = [
+                [
+                    ((self._local(lng) - self._origin_lng) * x_scale, (lat - lat0) * M_PER_DEG_LAT)
+                    for lng, lat in ring
+                ]
+                for ring in rings
+            ]
+            polygons.append(_simplify_polygon(rings, planar, tolerance))
+        return polygons
+
+    def tolerance(self, scale: Optional[float] = None) -> float:
+        """
+        Simplification tolerance in meters for a reduction scale.
+
+        Half a pixel, doubled until the geometry has at most
+        MAX_EE_VERTICES vertices.
+        """
+        if scale in self._tolerances:
+            return self._tolerances[scale]
+
+        tolerance = scale / 2 if scale else 0.0
+        if self.vertex_count > MAX_EE_VERTICES:
+            # Beyond the parcel's extent every ring collapses, so larger
+            # tolerances cannot remove more vertices
+            west, south, east, north = self.bbox
+            extent = max(
+                (east - west) % 360 * M_PER_DEG_LNG * math.cos(math.radians(self.centroid["lat"])),
+                (north - south) * M_PER_DEG_LAT
+            )
+            tolerance = max(tolerance, 1.0)
+            while (
+                tolerance < extent
+                and sum(len(r) for rings in self.simplified(tolerance) for r in rings) > MAX_EE_VERTICES
+            ):
+                tolerance *= 2
+        self._tolerances[scale] = tolerance
+        return tolerance
+
+    def to_ee(self, scale: Optional[float] = None) -> ee.Geometry:
+        """
+        The parcel as an ee.Geometry, simplified for a reduction scale.
+
+        Args:
+            scale: Reduction scale in meters; None keeps full detail (up to
+                   MAX_EE_VERTICES)
+
+        Returns:
+            Un-evaluated geometry, built once per tolerance
+        """
+        tolerance = self.tolerance(scale)
+        geometry = self._ee_geometries.get(tolerance)
+        if geometry is None:
+            coordinates = _closed(self.simplified(tolerance))
+            if self.type == "Polygon":
+                geometry = ee.Geometry.Polygon(coordinates[0])
+            else:
+                geometry = ee.Geometry.MultiPolygon(coordinates)
+            self._ee_geometries[tolerance] = geometry
+        return geometry
+
+    def centroid_point(self) -> ee.Geometry:
+        """The centroid as an ee.Geometry.Point."""
+        return ee.Geometry.Point([self.centroid["lng"], self.centroid["lat"]])
+
+    def as_geojson(self) -> Dict[str, Any]:
+        """The repaired, full-detail geometry as GeoJSON."""
+        coordinates = _closed(self.polygons)
+        if self.type == "Polygon":
+            return {"type": "Polygon", "coordinates": coordinates[0]}
+        return {"type": "MultiPolygon", "coordinates": coordinates}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-ready geometry section of a polygon result."""
+        west, south, east, north = self.bbox
+        info = {
+            "type": self.type,
+            "points": self.points,
+            "centroid": dict(self.centroid),
+            "bbox": {"west": west, "south": south, "east": east, "north": north},
+            "area_m2": self.area_m2,
+            "area_ha": self.area_ha,
+            "area_acres": self.area_acres,
+            "polygons": len(self.polygons),
+            "holes": sum(len(rings) - 1 for rings in self.polygons),
+            "vertices": self.vertex_count
+        }
+        if self.repairs:
+            info["repairs"] = list(self.repairs)
+        return info
+
+
+def _closed(polygons: List[List[Ring]]) -> List[List[List[List[float]]]]:
+    """GeoJSON coordinates (closed rings of [lng, lat]) of polygons."""
+    return [
+        [[[lng, lat] for lng, lat in ring] + [[ring[0][0], ring[0][1]]] for ring in rings]
+        for rings in polygons
+    ]
+
+
+def polygon_geometry(
+    region: Union[List[Dict[str, float]], Dict[str, Any]],
+    geometry: Optional[PolygonGeometry] = None
+) -> PolygonGeometry:
+    """Return the shared geometry context, building it if not given."""
+    if geometry is not None:
+        return geometry
+    return PolygonGeometry(region)
@@ -7,6 +7,7 @@ with criticality-weighted availability assessment.
 """
 
 from typing import Dict, Any, Optional, List
+from .scoring_plan import get_scoring_plan
 from ..core.config import METRIC_METADATA, PHI_METRIC_PARAMS, CRITICALITY_WEIGHTS, DQS_THRESHOLDS
 
 
@@ -215,15 +216,9 @@ def calculate_dqs(
     weighted_sum = 0.0
     total_weight = 0.0
 
-    for metric_name, params in PHI_METRIC_PARAMS.items():
-        # Get criticality weight
-        criticality = params.get("criticality", "supporting")
-        weight = CRITICALITY_WEIGHTS.get(criticality, 0.4)
-
-        # Skip zero-weight informational metrics
-        if params.get("weight", 0) == 0:
-            continue
-
+    # Criticality weights of scored metrics (zero-weight informational
+    # metrics are already left out of the compiled plan)
+    for metric_name, weight in get_scoring_plan().dqs_weights:
         # Determine availability score
         is_available = metrics_availability.get(metric_name, False)
         quality = data_quality_flags.get(metric_name, "unavailable")
@@ -395,10 +390,9 @@ def get_missing_critical_metrics(pillars: Dict[str, Any]) -> List[str]:
                 available_metrics.add(metric_name)
 
     # Check for missing critical metrics
-    for metric_name, params in PHI_METRIC_PARAMS.items():
-        if params.get("criticality") == "critical":
-            if metric_name not in available_metrics:
-                missing_critical.append(metric_name)
+    for metric_name in get_scoring_plan().critical_metrics:
+        if metric_name not in available_metrics:
+            missing_critical.append(metric_name)
 
     return missing_critical
 
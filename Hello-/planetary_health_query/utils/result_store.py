@@ -0,0 +1,492 @@
+"""
+Persistent Result Store.
+
+A single-file SQLite key/value store used as the disk layer of QueryCache
+and the spatial metric cache, so warm restarts serve hot locations without
+re-querying Earth Engine.
+
+- One file, WAL journal: several processes (e.g. uvicorn workers) can
+  read and write the same store concurrently
+- Indexed expiry column; expired rows are purged in bulk
+- Byte-size cap with least-recently-used eviction. Reads do not write:
+  recency is only refreshed for entries last touched more than
+  access_slack seconds ago, and those updates are batched in memory
+  and flushed in one transaction
+- Payloads compressed with zlib (or zstd if `zstandard` is installed)
+- Optional background compaction thread
+
+Usage:
+    store = ResultStore("cache/results.sqlite3", max_bytes=256 * 1024 ** 2)
+    store.set("key", {"value": 1}, ttl=3600)
+    store.get("key")
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from ..core.config import (
+    RESULT_STORE_PATH,
+    RESULT_STORE_MAX_BYTES,
+    RESULT_STORE_COMPACT_INTERVAL,
+    RESULT_STORE_COMPRESS_MIN_BYTES,
+    RESULT_STORE_ACCESS_SLACK
+)
+
+# Evict down to this fraction of max_bytes, so a full store does not
+# evict on every write
+EVICT_TARGET_RATIO = 0.9
+
+# Check the size cap after this many writes
+SIZE_CHECK_INTERVAL = 100
+
+# Flush pending recency updates once this many have accumulated
+ACCESS_FLUSH_BATCH = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries(expires_at);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries(accessed_at);
+"""
+
+
+class ResultStore:
+    """
+    Thread- and process-safe persistent key/value store with TTL.
+
+    Values must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = RESULT_STORE_MAX_BYTES,
+        compression: Optional[str] = "zlib",
+        compress_min_bytes: int = RESULT_STORE_COMPRESS_MIN_BYTES,
+        access_slack: float = RESULT_STORE_ACCESS_SLACK
+    ):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: SQLite file path
+            max_bytes: Cap on total stored payload bytes
+            compression: "zlib", "zstd" or None
+            compress_min_bytes: Payloads smaller than this are stored raw
+            access_slack: Seconds within which a read does not refresh
+                an entry's recency
+        """
+        if compression not in (None, "zlib", "zstd"):
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.access_slack = access_slack
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        # key -> last read time, not yet written to accessed_at
+        self._pending_access: Dict[str, float] = {}
+        self._compactor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _encode(self, value: Any) -> Tuple[bytes, str]:
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        if self.compression is None or len(raw) < self.compress_min_bytes:
+            return raw, "raw"
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(raw), "zstd"
+        return zlib.compress(raw, 6), "zlib"
+
+    @staticmethod
+    def _decode(blob: bytes, codec: str) -> Any:
+        if codec == "zlib":
+            blob = zlib.decompress(blob)
+        elif codec == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd payload but zstandard is not installed")
+            blob = zstandard.ZstdDecompressor().decompress(blob)
+        return json.loads(blob)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value if present and not expired.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Stored value or None
+        """
+        entry = self.get_many([key]).get(key)
+        return entry[0] if entry else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """
+        Get several entries in one query.
+
+        Args:
+            keys: Entry keys
+
+        Returns:
+            Dict of key to (value, expires_at) for live entries only
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        now = time.time()
+        conn = self._connect()
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(
+            f"SELECT key, value, codec, expires_at, accessed_at FROM entries "
+            f"WHERE key IN ({placeholders}) "
+            f"AND (expires_at IS NULL OR expires_at > ?)",
+            (*keys, now)
+        ).fetchall()
+
+        found = {}
+        touched = []
+        for key, blob, codec, expires_at, accessed_at in rows:
+            try:
+                found[key] = (self._decode(blob, codec), expires_at)
+            except Exception:
+                continue
+            if accessed_at < now - self.access_slack:
+                touched.append(key)
+
+        with self._lock:
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+            for key in touched:
+                self._pending_access[key] = now
+            flush = len(self._pending_access) >= ACCESS_FLUSH_BATCH
+        if flush:
+            self.flush_access()
+        return found
+
+    def flush_access(self) -> int:
+        """
+        Write batched recency updates from reads.
+
+        Returns:
+            Number of entries updated
+        """
+        with self._lock:
+            pending, self._pending_access = self._pending_access, {}
+        if not pending:
+            return 0
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in pending.items()]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(pending)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Entry key
+            value: JSON-serializable value
+            ttl: Time-to-live in seconds; None never expires
+        """
+        self.set_many([(key, value, ttl)])
+
+    def set_many(self, items: Iterable[Tuple[str, Any, Optional[float]]]):
+        """
+        Store several values in one transaction.
+
+        Args:
+            items: (key, value, ttl) tuples
+        """
+        now = time.time()
+        rows = []
+        for key, value, ttl in items:
+            blob, codec = self._encode(value)
+            expires_at = None if ttl is None else now + ttl
+            rows.append((key, blob, codec, len(blob), expires_at, now))
+        if not rows:
+            return
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(key, value, codec, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            before = self._writes
+            self._writes += len(rows)
+            check = before // SIZE_CHECK_INTERVAL != self._writes // SIZE_CHECK_INTERVAL
+        if check:
+            self.enforce_size()
+
+    def delete(self, key: str):
+        """Remove an entry."""
+        self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: Optional[str] = None):
+        """
+        Remove all entries, or only those whose key starts with prefix.
+
+        Args:
+            prefix: Optional key prefix (e.g. "query:")
+        """
+        if prefix is None:
+            self._connect().execute("DELETE FROM entries")
+        else:
+            self._connect().execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix)
+            )
+
+    def purge_expired(self) -> int:
+        """
+        Remove expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),)
+        )
+        with self._lock:
+            self._expirations += cursor.rowcount
+        return cursor.rowcount
+
+    def total_bytes(self) -> int:
+        """Total stored payload bytes."""
+        row = self._connect().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return row[0]
+
+    def enforce_size(self) -> int:
+        """
+        Evict least recently used entries while over max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        self.flush_access()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                conn.execute("COMMIT")
+                return 0
+
+            excess = total - int(self.max_bytes * EVICT_TARGET_RATIO)
+            victims: List[str] = []
+            freed = 0
+            for key, size in conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at"
+            ):
+                victims.append(key)
+                freed += size
+                if freed >= excess:
+                    break
+
+            conn.executemany(
+                "DELETE FROM entries WHERE key = ?",
+                [(key,) for key in victims]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self._evictions += len(victims)
+        return len(victims)
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Purge expired entries, enforce the size cap and checkpoint the WAL.
+
+        Returns:
+            Dict with counts of expired and evicted entries
+        """
+        expired = self.purge_expired()
+        evicted = self.enforce_size()
+        self._connect().execute("PRAGMA wal_checkpoint(PASSIVE)")
+        return {"expired": expired, "evicted": evicted}
+
+    def start_compaction(self, interval: float = RESULT_STORE_COMPACT_INTERVAL):
+        """
+        Compact periodically on a daemon thread.
+
+        Args:
+            interval: Seconds between compactions
+        """
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Result store compaction failed: {e}")
+
+        self._compactor = threading.Thread(
+            target=run, name="result-store-compactor", daemon=True
+        )
+        self._compactor.start()
+
+    def stop_compaction(self):
+        """Stop the background compaction thread."""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout=5)
+            self._compactor = None
+
+    def close(self):
+        """Stop compaction, flush recency updates and close this thread's connection."""
+        self.stop_compaction()
+        self.flush_access()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        row = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "entries": row[0],
+                "bytes": row[1],
+                "max_bytes": self.max_bytes,
+                "compression": self.compression,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
+
+
+# Process-wide store shared by the metric cache
+_result_store: Optional[ResultStore] = None
+_result_store_configured = False
+_result_store_lock = threading.Lock()
+
+
+def configure_result_store(
+    path: Optional[Union[str, Path]],
+    compaction: bool = True,
+    **kwargs
+) -> Optional[ResultStore]:
+    """
+    Set the process-wide result store.
+
+    Call before the first query; caches created earlier keep their store.
+
+    Args:
+        path: SQLite file path, or None to disable the disk layer
+        compaction: If True, start background compaction
+        **kwargs: Any other ResultStore argument
+
+    Returns:
+        The store, or None if disabled
+    """
+    with _result_store_lock:
+        return _replace_store(path, compaction, **kwargs)
+
+
+def _replace_store(path, compaction: bool, **kwargs) -> Optional[ResultStore]:
+    """Swap the process-wide store; caller holds _result_store_lock."""
+    global _result_store, _result_store_configured
+
+    if _result_store is not None:
+        _result_store.stop_compaction()
+    _result_store = ResultStore(path, **kwargs) if path else None
+    _result_store_configured = True
+    if _result_store is not None and compaction:
+        _result_store.start_compaction()
+    return _result_store
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """
+    Get the process-wide result store.
+
+    Defaults to RESULT_STORE_PATH (env PHQ_RESULT_STORE) when not
+    configured; returns None if no path is set.
+    """
+    if not _result_store_configured:
+        with _result_store_lock:
+            if not _result_store_configured:
+                _replace_store(RESULT_STORE_PATH, compaction=True)
+    return _result_store
@@ -12,21 +12,31 @@ This module implements:
 import math
 from typing import Dict, Any, Optional, Tuple
 
-from .normalization import (
-    linear_normalize,
-    inverse_linear_normalize,
-    sigmoid_normalize,
-    inverse_sigmoid_normalize,
-    gaussian_normalize,
-    centered_normalize
-)
-from ..core.config import (
-    PHI_METRIC_PARAMS,
-    ECOSYSTEM_CATEGORY_WEIGHTS,
-    CRITICALITY_WEIGHTS,
-    PHI_ESV_CONSTANTS,
-    PILLAR_CONFIG
-)
+from .scoring_plan import get_metric_plan, get_scoring_plan
+from ..core.config import PHI_METRIC_PARAMS, PHI_ESV_CONSTANTS, METRIC_UNIT_SCALES
+
+
+def metric_value(metric_name: str, metric_data: Any) -> Optional[float]:
+    """
+    Get a metric's raw value in the units its scoring parameters use.
+
+    Metrics from external sources may carry other units (Open-Meteo soil
+    moisture is in percent); METRIC_UNIT_SCALES converts those.
+
+    Args:
+        metric_name: Name of the metric
+        metric_data: Metric dict from a pillar, or a bare value
+
+    Returns:
+        Value in scoring units, or None
+    """
+    if not isinstance(metric_data, dict):
+        return metric_data
+    value = metric_data.get("value")
+    scale = METRIC_UNIT_SCALES.get((metric_name, metric_data.get("unit")))
+    if value is None or scale is None:
+        return value
+    return value * scale
 
 
 def normalize_metric(metric_name: str, value: float) -> Optional[float]:
@@ -50,41 +60,11 @@ def normalize_metric(metric_name: str, value: float) -> Optional[float]:
     if value is None:
         return None
 
-    params = PHI_METRIC_PARAMS.get(metric_name)
-    if not params:
+    metric = get_metric_plan(metric_name)
+    if metric is None:
         return None
 
-    norm_type = params.get("norm_type", "linear")
-    v_min = params.get("v_min", 0)
-    v_max = params.get("v_max", 100)
-
-    if norm_type == "linear":
-        return linear_normalize(value, v_min, v_max)
-
-    elif norm_type == "inverse_linear":
-        return inverse_linear_normalize(value, v_min, v_max)
-
-    elif norm_type == "sigmoid":
-        k = params.get("k", 0.5)
-        v_mid = params.get("v_mid")
-        return sigmoid_normalize(value, v_min, v_max, k, v_mid)
-
-    elif norm_type == "inverse_sigmoid":
-        k = params.get("k", 0.5)
-        v_mid = params.get("v_mid")
-        return inverse_sigmoid_normalize(value, v_min, v_max, k, v_mid)
-
-    elif norm_type == "gaussian":
-        v_opt = params.get("v_opt", (v_min + v_max) / 2)
-        sigma = params.get("sigma", (v_max - v_min) / 4)
-        return gaussian_normalize(value, v_opt, sigma, v_min, v_max)
-
-    elif norm_type == "centered":
-        return centered_normalize(value, v_max)
-
-    else:
-        # Default to linear
-        return linear_normalize(value, v_min, v_max)
+    return metric.normalize(value)
 
 
 def calculate_category_score(
@@ -116,33 +96,29 @@ def calculate_category_score(
 
     for metric_name, metric_data in metrics.items():
         # Get raw value
-        if isinstance(metric_data, dict):
-            value = metric_data.get("value")
-        else:
-            value = metric_data
+        value = metric_value(metric_name, metric_data)
 
         if value is None:
             continue
 
         # Check if metric belongs to this category
-        params = PHI_METRIC_PARAMS.get(metric_name)
-        if not params:
+        metric = get_metric_plan(metric_name)
+        if metric is None:
             continue
 
         # Allow metrics that match the category or have no category specified
-        metric_category = params.get("category")
-        if metric_category and metric_category != category_id:
+        if metric.category and metric.category != category_id:
             continue
 
         # Normalize the value
-        score = normalize_metric(metric_name, value)
+        score = metric.normalize(value)
         if score is None:
             continue
 
         metric_scores[metric_name] = round(score, 2)
 
         # Apply weight (skip zero-weight informational metrics)
-        weight = params.get("weight", 0.25)
+        weight = metric.weight
         if weight > 0:
             weighted_sum += score * weight
             total_weight += weight
@@ -195,14 +171,8 @@ def calculate_overall_score(
     if not pillar_scores:
         return None
 
-    # Get ecosystem-specific weights
-    ecosystem_config = ECOSYSTEM_CATEGORY_WEIGHTS.get(
-        ecosystem_type,
-        ECOSYSTEM_CATEGORY_WEIGHTS["default"]
-    )
-
-    # Extract just the weights (not the description)
-    weights = {k: v for k, v in ecosystem_config.items() if k in ["A", "B", "C", "D", "E"]}
+    # Ecosystem-specific weights, precompiled per ecosystem type
+    weights = get_scoring_plan(ecosystem_type).weights
 
     weighted_sum = 0.0
     total_weight = 0.0
@@ -363,11 +333,7 @@ def get_detailed_scores(
     esv_multiplier = calculate_phi_esv_multiplier(overall) if overall else None
 
     # Get the weights used
-    ecosystem_config = ECOSYSTEM_CATEGORY_WEIGHTS.get(
-        ecosystem_type,
-        ECOSYSTEM_CATEGORY_WEIGHTS["default"]
-    )
-    weights_used = {k: v for k, v in ecosystem_config.items() if k in ["A", "B", "C", "D", "E"]}
+    weights_used = dict(get_scoring_plan(ecosystem_type).weights)
 
     return {
         "overall_score": overall,
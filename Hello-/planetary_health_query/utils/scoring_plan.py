@@ -0,0 +1,283 @@
+"""
+Precompiled Scoring Plans.
+
+The scoring configuration in core/config.py (PHI_METRIC_PARAMS,
+ECOSYSTEM_CATEGORY_WEIGHTS, CRITICALITY_WEIGHTS, PILLAR_CONFIG) only
+changes on deploy, yet every query used to re-read it: dict lookups per
+metric, a norm_type string dispatch per value and weight dictionaries
+rebuilt per summary. A scoring plan is that configuration compiled once
+per (ecosystem type, query mode):
+
+- flattened pillar weights in category order
+- metric -> pillar maps for the mode's metrics
+- per-metric normalizer closures with their parameters bound
+- DQS criticality weights and the list of critical metrics
+
+Plans are immutable and built at import. After editing the configuration
+call reload_scoring_plans() to swap in new plans without a restart.
+reload_config=True compiles from a fresh copy of core/config.py instead;
+the imported config module is left untouched, so only scoring picks up
+the file's new values.
+
+Usage:
+    plan = get_scoring_plan("tropical_forest", "comprehensive")
+    plan.weights          # {"A": 0.10, "B": 0.25, ...}
+    plan.metrics["ndvi"].normalize(0.62)
+"""
+
+import importlib.util
+import threading
+from functools import partial
+from types import MappingProxyType
+from types import ModuleType
+from typing import Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from .normalization import (
+    linear_normalize,
+    inverse_linear_normalize,
+    sigmoid_normalize,
+    inverse_sigmoid_normalize,
+    gaussian_normalize,
+    centered_normalize
+)
+from ..core import config
+
+# Category (pillar) ids in weight vector order
+CATEGORIES = ("A", "B", "C", "D", "E")
+
+MODES = ("simple", "comprehensive")
+
+# Configuration tables compiled into plans
+PLAN_SOURCES = (
+    "PHI_METRIC_PARAMS",
+    "ECOSYSTEM_CATEGORY_WEIGHTS",
+    "CRITICALITY_WEIGHTS",
+    "PILLAR_CONFIG"
+)
+
+
+class MetricPlan(NamedTuple):
+    """Compiled scoring parameters for one metric."""
+    name: str
+    category: Optional[str]
+    weight: float
+    criticality: str
+    criticality_weight: float
+    normalize: Callable[[float], float]
+    params: Mapping[str, object]
+
+
+class ScoringPlan(NamedTuple):
+    """Compiled scoring configuration for one ecosystem type and mode."""
+    ecosystem_type: str
+    mode: str
+    weights: Mapping[str, float]
+    weight_vector: Tuple[float, ...]
+    pillar_keys: Mapping[str, str]
+    metric_pillars: Mapping[str, int]
+    metric_pillar_keys: Mapping[str, str]
+    metrics: Mapping[str, MetricPlan]
+    dqs_weights: Tuple[Tuple[str, float], ...]
+    critical_metrics: Tuple[str, ...]
+
+
+def _compile_normalizer(params: Dict) -> Callable[[float], float]:
+    """Bind a metric's parameters to its normalization function."""
+    norm_type = params.get("norm_type", "linear")
+    v_min = params.get("v_min", 0)
+    v_max = params.get("v_max", 100)
+
+    if norm_type == "inverse_linear":
+        return partial(inverse_linear_normalize, v_min=v_min, v_max=v_max)
+    elif norm_type == "sigmoid":
+        return partial(
+            sigmoid_normalize, v_min=v_min, v_max=v_max,
+            k=params.get("k", 0.5), v_mid=params.get("v_mid")
+        )
+    elif norm_type == "inverse_sigmoid":
+        return partial(
+            inverse_sigmoid_normalize, v_min=v_min, v_max=v_max,
+            k=params.get("k", 0.5), v_mid=params.get("v_mid")
+        )
+    elif norm_type == "gaussian":
+        return partial(
+            gaussian_normalize,
+            v_opt=params.get("v_opt", (v_min + v_max) / 2),
+            sigma=params.get("sigma", (v_max - v_min) / 4),
+            v_min=v_min,
+            v_max=v_max
+        )
+    elif norm_type == "centered":
+        return partial(centered_normalize, v_max=v_max)
+    else:
+        # linear, and the default for unknown types
+        return partial(linear_normalize, v_min=v_min, v_max=v_max)
+
+
+def _compile_metrics(source: ModuleType = config) -> Dict[str, MetricPlan]:
+    """Compile every configured metric (shared by all plans)."""
+    metrics = {}
+    for name, params in source.PHI_METRIC_PARAMS.items():
+        if not params:
+            continue
+        criticality = params.get("criticality", "supporting")
+        metrics[name] = MetricPlan(
+            name=name,
+            category=params.get("category"),
+            weight=params.get("weight", 0.25),
+            criticality=criticality,
+            criticality_weight=source.CRITICALITY_WEIGHTS.get(criticality, 0.4),
+            normalize=_compile_normalizer(params),
+            params=MappingProxyType(dict(params))
+        )
+    return metrics
+
+
+def build_scoring_plan(
+    ecosystem_type: str,
+    mode: str,
+    metrics: Optional[Dict[str, MetricPlan]] = None,
+    source: ModuleType = config
+) -> ScoringPlan:
+    """
+    Compile the scoring plan for one ecosystem type and query mode.
+
+    Args:
+        ecosystem_type: Key of ECOSYSTEM_CATEGORY_WEIGHTS (unknown types use "default")
+        mode: "simple" or "comprehensive"
+        metrics: Precompiled metric plans (compiled from source if None)
+        source: Configuration module to compile from
+
+    Returns:
+        The immutable plan
+    """
+    if metrics is None:
+        metrics = _compile_metrics(source)
+
+    ecosystem_config = source.ECOSYSTEM_CATEGORY_WEIGHTS.get(
+        ecosystem_type,
+        source.ECOSYSTEM_CATEGORY_WEIGHTS["default"]
+    )
+    weights = {k: v for k, v in ecosystem_config.items() if k in CATEGORIES}
+
+    pillar_keys = {}
+    metric_pillars = {}
+    metric_pillar_keys = {}
+    for position, pillar_id in enumerate(CATEGORIES):
+        pillar_config = source.PILLAR_CONFIG.get(pillar_id)
+        if not pillar_config:
+            continue
+        pillar_key = f"{pillar_id}_{pillar_config['name'].lower()}"
+        pillar_keys[pillar_id] = pillar_key
+        for metric_name in pillar_config.get(f"{mode}_metrics", []):
+            metric_pillars[metric_name] = position
+        # Every metric the pillar can return, whatever the mode
+        for metric_name in pillar_config.get("comprehensive_metrics", []):
+            metric_pillar_keys.setdefault(metric_name, pillar_key)
+
+    # DQS walks configured metrics in config order, skipping zero-weight ones
+    dqs_weights = tuple(
+        (name, metric.criticality_weight)
+        for name, metric in metrics.items()
+        if metric.params.get("weight", 0) != 0
+    )
+    critical_metrics = tuple(
+        name for name, metric in metrics.items()
+        if metric.params.get("criticality") == "critical"
+    )
+
+    return ScoringPlan(
+        ecosystem_type=ecosystem_type,
+        mode=mode,
+        weights=MappingProxyType(weights),
+        weight_vector=tuple(weights.get(pillar_id, 0.20) for pillar_id in CATEGORIES),
+        pillar_keys=MappingProxyType(pillar_keys),
+        metric_pillars=MappingProxyType(metric_pillars),
+        metric_pillar_keys=MappingProxyType(metric_pillar_keys),
+        metrics=MappingProxyType(metrics),
+        dqs_weights=dqs_weights,
+        critical_metrics=critical_metrics
+    )
+
+
+class _CompiledPlans(NamedTuple):
+    plans: Dict[Tuple[str, str], ScoringPlan]
+    metrics: Mapping[str, MetricPlan]
+
+
+def _build_plans(source: ModuleType = config) -> _CompiledPlans:
+    metrics = MappingProxyType(_compile_metrics(source))
+    plans = {
+        (ecosystem_type, mode): build_scoring_plan(ecosystem_type, mode, metrics, source)
+        for ecosystem_type in source.ECOSYSTEM_CATEGORY_WEIGHTS
+        for mode in MODES
+    }
+    return _CompiledPlans(plans, metrics)
+
+
+def _load_config_file() -> ModuleType:
+    """Execute core/config.py into a new module object outside sys.modules."""
+    spec = importlib.util.spec_from_file_location(f"{config.__name__}_reloaded", config.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    missing = [name for name in PLAN_SOURCES if not hasattr(module, name)]
+    if missing:
+        raise ValueError(f"config is missing {', '.join(missing)}")
+    return module
+
+
+_reload_lock = threading.Lock()
+# Plans and metric plans are swapped together in one assignment on
+# reload, so readers never need the lock and never see a mixed state
+_compiled = _build_plans()
+
+
+def get_scoring_plan(ecosystem_type: str = "default", mode: str = "comprehensive") -> ScoringPlan:
+    """
+    Get the compiled plan for an ecosystem type and query mode.
+
+    Unknown ecosystem types use the "default" weights and unknown modes
+    the comprehensive metric set, as the scalar functions do.
+    """
+    plans = _compiled.plans
+    plan = plans.get((ecosystem_type, mode))
+    if plan is None:
+        if mode not in MODES:
+            mode = "comprehensive"
+        plan = plans.get((ecosystem_type, mode)) or plans[("default", mode)]
+    return plan
+
+
+def get_metric_plan(metric_name: str) -> Optional[MetricPlan]:
+    """Get a metric's compiled parameters, or None if it is not configured."""
+    return _compiled.metrics.get(metric_name)
+
+
+def reload_scoring_plans(reload_config: bool = False) -> int:
+    """
+    Recompile all scoring plans from the configuration.
+
+    The new plans are built completely before being swapped in, so a
+    failed reload leaves the current plans serving. Blocking; call it
+    from a worker thread in async code.
+
+    Args:
+        reload_config: Compile from a fresh copy of core/config.py
+            instead of the imported module. The imported module and
+            its tables are not modified.
+
+    Returns:
+        Number of plans compiled
+    """
+    global _compiled
+
+    with _reload_lock:
+        source = _load_config_file() if reload_config else config
+        compiled = _build_plans(source)
+        _compiled = compiled
+
+        # The vectorized path compiles from the metric plans separately
+        from .vector_scoring import compile_metrics
+        compile_metrics.cache_clear()
+
+        return len(compiled.plans)
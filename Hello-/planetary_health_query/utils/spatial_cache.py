@@ -0,0 +1,501 @@
+"""
+Spatially-Indexed Metric Cache.
+
+Caches individual metric values on a hierarchical quadkey grid (Web
+Mercator tiles, as used by Bing/Google maps). Each metric is stored in the
+cell whose size matches the native resolution of its source datasets, so a
+1 km MODIS AOD value is shared by every query inside that 1 km cell, and a
+~100 km MOD08_M3 value by every query in the region.
+
+A metric is always stored and looked up at its own fixed level, so each
+lookup is a single key per metric.
+
+Entries live as long as their datasets' update cadence allows: static
+rasters (SRTM, JRC water, Hansen) never expire, daily products expire
+after hours, and annual/monthly products are keyed to their period
+instead of the exact query window.
+
+With a ResultStore attached, entries are also written to disk and memory
+misses fall through to it, so cached metrics survive restarts and are
+shared between worker processes.
+
+Usage:
+    cache = SpatialMetricCache()
+    hits = cache.get_metrics(lat, lon, ["aod", "aqi"], date_range, 500)
+    cache.set_metrics(lat, lon, {"aod": {...}}, date_range, 500)
+"""
+
+import copy
+import math
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import (
+    DATASETS,
+    METRIC_DATASETS,
+    METRIC_DEPENDENCIES,
+    SPATIAL_CACHE_MIN_CELL_M,
+    METRIC_CACHE_TTL_SECONDS,
+    METRIC_CACHE_MAX_ENTRIES,
+    METRIC_CACHE_MAX_BYTES,
+    CADENCE_CACHE_TTL_SECONDS
+)
+from .cache import LRUCache
+from .result_store import ResultStore, get_result_store
+
+# Key prefix for metric entries in a shared ResultStore
+STORE_PREFIX = "metric:"
+
+# Equatorial circumference in meters (Web Mercator)
+EARTH_CIRCUMFERENCE_M = 40075016.686
+
+# Web Mercator latitude limit
+MAX_MERCATOR_LAT = 85.05112878
+
+MAX_LEVEL = 23
+
+
+def level_for_resolution(resolution_m: float) -> int:
+    """
+    Get the coarsest grid level whose cells are no larger than resolution_m.
+
+    Args:
+        resolution_m: Target cell size in meters (at the equator)
+
+    Returns:
+        Quadkey level (1-23)
+    """
+    level = math.ceil(math.log2(EARTH_CIRCUMFERENCE_M / max(resolution_m, 1)))
+    return max(1, min(MAX_LEVEL, level))
+
+
+def quadkey(lat: float, lon: float, level: int) -> str:
+    """
+    Get the quadkey of the grid cell containing a point.
+
+    Each character selects one of four children, so a cell's ancestors
+    are the prefixes of its quadkey.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        level: Grid level (number of characters)
+
+    Returns:
+        Quadkey string
+    """
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    sin_lat = math.sin(math.radians(lat))
+
+    x = (lon + 180) / 360
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+
+    n = 1 << level
+    tile_x = min(n - 1, max(0, int(x * n)))
+    tile_y = min(n - 1, max(0, int(y * n)))
+
+    digits = []
+    for i in range(level, 0, -1):
+        mask = 1 << (i - 1)
+        digit = 0
+        if tile_x & mask:
+            digit += 1
+        if tile_y & mask:
+            digit += 2
+        digits.append(str(digit))
+    return "".join(digits)
+
+
+def grid_key(lat: float, lon: float, resolution_m: float) -> str:
+    """Get the quadkey of the cell of a given size containing a point."""
+    return quadkey(lat, lon, level_for_resolution(resolution_m))
+
+
+def metric_resolution(metric: str, min_cell_m: float = SPATIAL_CACHE_MIN_CELL_M) -> float:
+    """
+    Get the cache cell size for a metric.
+
+    Uses the finest native resolution among the metric's source datasets,
+    but never finer than min_cell_m.
+
+    Args:
+        metric: Metric name
+        min_cell_m: Smallest allowed cell size in meters
+
+    Returns:
+        Cell size in meters
+    """
+    resolutions = [
+        DATASETS[dataset]["resolution"]
+        for dataset in METRIC_DATASETS.get(metric, [])
+        if dataset in DATASETS
+    ]
+    finest = min(resolutions) if resolutions else min_cell_m
+    return max(finest, min_cell_m)
+
+
+def dataset_cadence(dataset: str) -> Optional[str]:
+    """Get a dataset's update cadence ("cadence", else "temporal")."""
+    info = DATASETS.get(dataset, {})
+    return info.get("cadence", info.get("temporal"))
+
+
+def metric_cache_policy(
+    metric: str,
+    default_ttl: Optional[int] = METRIC_CACHE_TTL_SECONDS
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Get the cadence and TTL used to cache a metric.
+
+    A metric derived from several datasets follows the one that changes
+    most often.
+
+    Args:
+        metric: Metric name
+        default_ttl: TTL for metrics with no known cadence
+
+    Returns:
+        (cadence, ttl_seconds); ttl_seconds is None for permanent entries
+    """
+    policy = (None, default_ttl)
+    shortest = float("inf")
+
+    for dataset in METRIC_DATASETS.get(metric, []):
+        cadence = dataset_cadence(dataset)
+        if cadence not in CADENCE_CACHE_TTL_SECONDS:
+            return (None, default_ttl)
+        ttl = CADENCE_CACHE_TTL_SECONDS[cadence]
+        span = float("inf") if ttl is None else ttl
+        if policy[0] is None or span < shortest:
+            policy = (cadence, ttl)
+            shortest = span
+
+    return policy
+
+
+def cache_period(cadence: Optional[str], date_range: Tuple[str, str]) -> str:
+    """
+    Get the part of a cache key that depends on the query window.
+
+    Annual and monthly values are composites over the whole window, so
+    their key holds the window length as well as the end year or month:
+    a shifted "latest" window reuses them, a 5-year window does not.
+
+    Args:
+        cadence: Dataset cadence from metric_cache_policy()
+        date_range: (start_date, end_date) in YYYY-MM-DD format
+
+    Returns:
+        "static", the year or month with the window length in days,
+        or the full window
+    """
+    if cadence == "static":
+        return "static"
+    if cadence in ("annual", "monthly"):
+        start, end = (date.fromisoformat(d) for d in date_range)
+        period = date_range[1][:4] if cadence == "annual" else date_range[1][:7]
+        return f"{period}/{(end - start).days}d"
+    return f"{date_range[0]}_{date_range[1]}"
+
+
+def expand_dependencies(metrics: Iterable[str], known: Iterable[str] = ()) -> List[str]:
+    """
+    Add the inputs of derived metrics, recursively.
+
+    Args:
+        metrics: Metric names
+        known: Metrics whose values are already available; they are not
+               added as inputs (nor are their own inputs)
+
+    Returns:
+        Metric names including every dependency (no duplicates)
+    """
+    known = set(known)
+    expanded = []
+    pending = list(metrics)
+    while pending:
+        metric = pending.pop(0)
+        if metric in expanded:
+            continue
+        expanded.append(metric)
+        pending.extend(
+            dependency for dependency in METRIC_DEPENDENCIES.get(metric, [])
+            if dependency not in known
+        )
+    return expanded
+
+
+class SpatialMetricCache:
+    """
+    Thread-safe cache of metric values on a quadkey grid.
+
+    Entries are keyed by metric, buffer radius, cache period and cell, and
+    expire according to the metric's dataset cadence.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = METRIC_CACHE_TTL_SECONDS,
+        max_entries: int = METRIC_CACHE_MAX_ENTRIES,
+        min_cell_m: float = SPATIAL_CACHE_MIN_CELL_M,
+        store: Optional[ResultStore] = None,
+        max_bytes: Optional[int] = METRIC_CACHE_MAX_BYTES
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: TTL for metrics with no known dataset cadence
+            max_entries: Maximum number of in-memory metric values
+            min_cell_m: Smallest cell size in meters
+            store: Optional persistent second-level store
+            max_bytes: Approximate in-memory byte budget
+        """
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.min_cell_m = min_cell_m
+        self.store = store
+        self._memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self._levels = {
+            metric: level_for_resolution(metric_resolution(metric, min_cell_m))
+            for metric in METRIC_DATASETS
+        }
+        self._policies = {
+            metric: metric_cache_policy(metric, ttl_seconds)
+            for metric in METRIC_DATASETS
+        }
+        self._hits = 0
+        self._misses = 0
+
+    def level_for(self, metric: str) -> int:
+        """Get the grid level a metric is stored at."""
+        level = self._levels.get(metric)
+        if level is None:
+            level = level_for_resolution(self.min_cell_m)
+        return level
+
+    def policy_for(self, metric: str) -> Tuple[Optional[str], Optional[int]]:
+        """Get the (cadence, ttl_seconds) a metric is cached with."""
+        return self._policies.get(metric, (None, self.ttl))
+
+    def cell_for(self, metric: str, lat: float, lon: float) -> str:
+        """Get the quadkey of the cell a metric is stored in for a point."""
+        return quadkey(lat, lon, self.level_for(metric))
+
+    def _key_prefix(
+        self,
+        metric: str,
+        date_range: Tuple[str, str],
+        buffer_radius: int
+    ) -> str:
+        cadence, _ = self.policy_for(metric)
+        return f"{metric}|{buffer_radius}|{cache_period(cadence, date_range)}"
+
+    def get(
+        self,
+        metric: str,
+        lat: float,
+        lon: float,
+        date_range: Tuple[str, str],
+        buffer_radius: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached metric value from the point's cell.
+
+        Args:
+            metric: Metric name
+            lat: Latitude
+            lon: Longitude
+            date_range: (start_date, end_date) of the query
+            buffer_radius: Buffer radius in meters
+
+        Returns:
+            Copy of the cached metric dict, or None
+        """
+        return self.get_metrics(lat, lon, [metric], date_range, buffer_radius).get(metric)
+
+    def _cell_key(
+        self,
+        metric: str,
+        lat: float,
+        lon: float,
+        date_range: Tuple[str, str],
+        buffer_radius: int
+    ) -> str:
+        """Key of the metric's cell containing the point."""
+        prefix = self._key_prefix(metric, date_range, buffer_radius)
+        return f"{prefix}|{self.cell_for(metric, lat, lon)}"
+
+    def set(
+        self,
+        metric: str,
+        lat: float,
+        lon: float,
+        date_range: Tuple[str, str],
+        buffer_radius: int,
+        value: Dict[str, Any]
+    ):
+        """
+        Cache a metric value for the point's cell.
+
+        Args:
+            metric: Metric name
+            lat: Latitude
+            lon: Longitude
+            date_range: (start_date, end_date) of the query
+            buffer_radius: Buffer radius in meters
+            value: Metric dict as produced by a pillar
+        """
+        self.set_many(lat, lon, [(metric, value)], date_range, buffer_radius)
+
+    def set_many(
+        self,
+        lat: float,
+        lon: float,
+        items: List[Tuple[str, Dict[str, Any]]],
+        date_range: Tuple[str, str],
+        buffer_radius: int
+    ):
+        """
+        Cache several metric values for a point, writing the store once.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            items: (metric, value) pairs
+            date_range: (start_date, end_date) of the query
+            buffer_radius: Buffer radius in meters
+        """
+        rows = []
+        for metric, value in items:
+            _, ttl = self.policy_for(metric)
+            key = self._cell_key(metric, lat, lon, date_range, buffer_radius)
+            rows.append((key, copy.deepcopy(value), ttl))
+
+        for key, value, ttl in rows:
+            self._memory.set(key, value, ttl=ttl)
+
+        if self.store is not None and rows:
+            try:
+                self.store.set_many(
+                    (STORE_PREFIX + key, value, ttl) for key, value, ttl in rows
+                )
+            except Exception as e:
+                print(f"Metric cache store write failed: {e}")
+
+    def get_metrics(
+        self,
+        lat: float,
+        lon: float,
+        metrics: List[str],
+        date_range: Tuple[str, str],
+        buffer_radius: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get every cached metric of a list.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            metrics: Metric names
+            date_range: (start_date, end_date) of the query
+            buffer_radius: Buffer radius in meters
+
+        Returns:
+            Dict of metric name to cached metric dict (hits only)
+        """
+        lookups = {
+            metric: self._cell_key(metric, lat, lon, date_range, buffer_radius)
+            for metric in metrics
+        }
+        hits = {}
+        for metric, key in lookups.items():
+            value = self._memory.get(key)
+            if value is not None:
+                hits[metric] = copy.deepcopy(value)
+
+        # Fall through to the persistent store in one query
+        missing = [metric for metric in lookups if metric not in hits]
+        if missing and self.store is not None:
+            try:
+                found = self.store.get_many(
+                    STORE_PREFIX + lookups[metric] for metric in missing
+                )
+            except Exception:
+                found = {}
+
+            for metric in missing:
+                key = lookups[metric]
+                if STORE_PREFIX + key not in found:
+                    continue
+                value, expires_at = found[STORE_PREFIX + key]
+                self._memory.set(key, value, expires_at=expires_at)
+                hits[metric] = copy.deepcopy(value)
+
+        with self._lock:
+            self._hits += len(hits)
+            self._misses += len(metrics) - len(hits)
+        return hits
+
+    def set_metrics(
+        self,
+        lat: float,
+        lon: float,
+        metrics: Dict[str, Dict[str, Any]],
+        date_range: Tuple[str, str],
+        buffer_radius: int
+    ):
+        """
+        Cache pillar metrics, skipping ones that failed.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            metrics: Dict of metric name to metric dict
+            date_range: (start_date, end_date) of the query
+            buffer_radius: Buffer radius in meters
+        """
+        items = [
+            (metric, value)
+            for metric, value in metrics.items()
+            if isinstance(value, dict) and "error" not in value
+        ]
+        self.set_many(lat, lon, items, date_range, buffer_radius)
+
+    def clear(self):
+        """Clear all cached entries, including the persistent store."""
+        self._memory.clear()
+        if self.store is not None:
+            self.store.clear(prefix=STORE_PREFIX)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 3) if total else 0.0,
+                "memory": self._memory.stats(),
+                "disk_enabled": self.store is not None
+            }
+
+
+# Process-wide cache shared by registry engines
+_metric_cache: Optional[SpatialMetricCache] = None
+_metric_cache_lock = threading.Lock()
+
+
+def get_metric_cache() -> SpatialMetricCache:
+    """Get the process-wide spatial metric cache."""
+    global _metric_cache
+    if _metric_cache is None:
+        with _metric_cache_lock:
+            if _metric_cache is None:
+                _metric_cache = SpatialMetricCache(store=get_result_store())
+    return _metric_cache
@@ -0,0 +1,421 @@
+"""
+Vectorized PHI Scoring Module.
+
+NumPy counterpart of scoring.py for batch workloads (multi-site batches,
+history re-scoring, grid maps). The compiled metric plans are turned into
+parameter arrays grouped by normalization type, and a whole
+(sites x metrics) matrix is scored in one pass. Missing metrics are NaN.
+
+Results match the scalar functions exactly:
+- metric scores: round(normalize_metric(...), 2)
+- category scores: calculate_category_score(...)[0]
+- pillar scores: calculate_pillar_score(...)
+- overall score: calculate_overall_score(pillar_scores, ecosystem_type)
+
+Weighted sums are accumulated metric by metric in the scalar order, so
+they round identically. np.exp can differ from math.exp in the last bit;
+the few values that land within float noise of a rounding tie are
+recomputed with the scalar path.
+
+Usage:
+    metrics = ["aod", "ndvi", "lst"]
+    values = np.array([[0.3, 0.6, 28.0], [np.nan, 0.2, 40.0]])
+    result = score_matrix(values, metrics, ecosystem_types="default")
+    result["overall_score"]  # shape (2,)
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .scoring import (
+    normalize_metric,
+    calculate_category_score,
+    metric_value,
+)
+from .scoring_plan import get_metric_plan, get_scoring_plan
+from ..core.config import PHI_METRIC_PARAMS
+
+# Category (pillar) ids in score column order
+CATEGORIES = ("A", "B", "C", "D", "E")
+
+# Rows scored per chunk; small enough for the temporaries to stay in cache
+DEFAULT_CHUNK_SIZE = 8192
+
+# Distance from a rounding tie (in units of the last kept digit) below
+# which a value is recomputed with the scalar path
+TIE_TOLERANCE = 1e-6
+
+
+class CompiledMetrics(NamedTuple):
+    """PHI_METRIC_PARAMS compiled for a fixed list of metric columns."""
+    metrics: Tuple[str, ...]
+    # norm_type -> (column indices, {parameter: (len(indices), 1) array})
+    groups: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]]
+    # (metrics,) weight of each metric; 0 for unconfigured metrics
+    weights: np.ndarray
+    # (metrics, categories) True where a metric counts toward a category
+    membership: np.ndarray
+
+
+@lru_cache(maxsize=128)
+def compile_metrics(metrics: Tuple[str, ...]) -> CompiledMetrics:
+    """
+    Compile normalization parameters for a list of metric columns.
+
+    Derived parameters (sigmoid steepness, gaussian defaults) are computed
+    here exactly as normalize_metric computes them per call.
+
+    Args:
+        metrics: Metric names, in column order
+
+    Returns:
+        CompiledMetrics (cached per metric tuple)
+    """
+    columns: Dict[str, List[int]] = {}
+    params: Dict[str, Dict[str, List[float]]] = {}
+    weights = np.zeros(len(metrics))
+    membership = np.zeros((len(metrics), len(CATEGORIES)), dtype=bool)
+
+    for index, metric in enumerate(metrics):
+        metric_plan = get_metric_plan(metric)
+        if metric_plan is None:
+            continue
+        config = metric_plan.params
+
+        norm_type = config.get("norm_type", "linear")
+        if norm_type not in _NORMALIZERS:
+            norm_type = "linear"
+        v_min = config.get("v_min", 0)
+        v_max = config.get("v_max", 100)
+
+        if norm_type in ("sigmoid", "inverse_sigmoid"):
+            range_val = v_max - v_min
+            k = config.get("k", 0.5)
+            v_mid = config.get("v_mid")
+            values = {
+                "k_scaled": k * (10 / range_val) if range_val > 0 else k,
+                "v_mid": (v_min + v_max) / 2 if v_mid is None else v_mid
+            }
+        elif norm_type == "gaussian":
+            sigma = config.get("sigma", (v_max - v_min) / 4)
+            values = {
+                "v_min": v_min,
+                "v_max": v_max,
+                "v_opt": config.get("v_opt", (v_min + v_max) / 2),
+                "sigma": sigma,
+                "denominator": 2 * sigma ** 2
+            }
+        elif norm_type == "centered":
+            values = {"v_max": v_max}
+        else:
+            values = {"v_min": v_min, "v_max": v_max, "span": v_max - v_min}
+
+        columns.setdefault(norm_type, []).append(index)
+        group = params.setdefault(norm_type, {})
+        for name, value in values.items():
+            group.setdefault(name, []).append(value)
+
+        weights[index] = config.get("weight", 0.25)
+        category = config.get("category")
+        for position, category_id in enumerate(CATEGORIES):
+            membership[index, position] = not category or category == category_id
+
+    groups = {
+        norm_type: (
+            np.array(indices, dtype=np.intp),
+            {
+                name: np.array(values, dtype=float)[:, None]
+                for name, values in params[norm_type].items()
+            }
+        )
+        for norm_type, indices in columns.items()
+    }
+    return CompiledMetrics(tuple(metrics), groups, weights, membership)
+
+
+def _linear(values: np.ndarray, p: Dict[str, np.ndarray]) -> np.ndarray:
+    clamped = np.maximum(p["v_min"], np.minimum(p["v_max"], values))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.clip((clamped - p["v_min"]) / p["span"] * 100, 0.0, 100.0)
+    return np.where(p["span"] == 0, 50.0, scores)
+
+
+def _inverse_linear(values: np.ndarray, p: Dict[str, np.ndarray]) -> np.ndarray:
+    clamped = np.maximum(p["v_min"], np.minimum(p["v_max"], values))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.clip((p["v_max"] - clamped) / p["span"] * 100, 0.0, 100.0)
+    return np.where(p["span"] == 0, 50.0, scores)
+
+
+def _sigmoid(values: np.ndarray, p: Dict[str, np.ndarray]) -> np.ndarray:
+    exponent = -p["k_scaled"] * (values - p["v_mid"])
+    with np.errstate(over="ignore"):
+        scores = np.clip(100 / (1 + np.exp(exponent)), 0.0, 100.0)
+    scores = np.where(exponent > 700, 0.0, scores)
+    return np.where(exponent < -700, 100.0, scores)
+
+
+def _inverse_sigmoid(values: np.ndarray, p: Dict[str, np.ndarray]) -> np.ndarray:
+    return 100.0 - _sigmoid(values, p)
+
+
+def _gaussian(values: np.ndarray, p: Dict[str, np.ndarray]) -> np.ndarray:
+    clamped = np.maximum(p["v_min"], np.minimum(p["v_max"], values))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = -((clamped - p["v_opt"]) ** 2) / p["denominator"]
+        scores = np.clip(100 * np.exp(exponent), 0.0, 100.0)
+    return np.where(p["sigma"] == 0, np.where(clamped == p["v_opt"], 100.0, 0.0), scores)
+
+
+def _centered(values: np.ndarray, p: Dict[str, np.ndarray]) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.clip(100 * (1 - np.abs(values) / np.abs(p["v_max"])), 0.0, 100.0)
+    return np.where(p["v_max"] == 0, np.where(values == 0, 100.0, 0.0), scores)
+
+
+_NORMALIZERS = {
+    "linear": _linear,
+    "inverse_linear": _inverse_linear,
+    "sigmoid": _sigmoid,
+    "inverse_sigmoid": _inverse_sigmoid,
+    "gaussian": _gaussian,
+    "centered": _centered,
+}
+
+
+def _normalize_columns(columns: np.ndarray, compiled: CompiledMetrics) -> np.ndarray:
+    """Normalize a (metrics, sites) array; rows are contiguous per metric."""
+    scores = np.full(columns.shape, np.nan)
+    for norm_type, (indices, params) in compiled.groups.items():
+        block = columns[indices]
+        normalized = _NORMALIZERS[norm_type](block, params)
+        scores[indices] = np.where(np.isnan(block), np.nan, normalized)
+    return scores
+
+
+def normalize_matrix(values: np.ndarray, metrics: Sequence[str]) -> np.ndarray:
+    """
+    Normalize a (sites x metrics) matrix of raw values to 0-100 scores.
+
+    Args:
+        values: Raw values, NaN where missing
+        metrics: Metric name of each column
+
+    Returns:
+        Unrounded scores; NaN for missing values and unconfigured metrics
+    """
+    compiled = compile_metrics(tuple(metrics))
+    columns = np.ascontiguousarray(np.asarray(values, dtype=float).T)
+    return _normalize_columns(columns, compiled).T
+
+
+def _round(
+    values: np.ndarray,
+    ndigits: int,
+    exact: Optional[Callable[[Tuple[int, ...]], Optional[float]]] = None
+) -> np.ndarray:
+    """
+    np.round, made to agree with Python's round().
+
+    The two can only disagree for values within float noise of a rounding
+    tie. Those are rounded by Python, or replaced by exact(index) when
+    the value itself may be off by an ulp.
+    """
+    factor = 10 ** ndigits
+    scaled = values * factor
+    rounded = np.rint(scaled)
+
+    # Distance from the nearest integer; ties sit at one half
+    np.subtract(scaled, rounded, out=scaled)
+    np.abs(scaled, out=scaled)
+    with np.errstate(invalid="ignore"):
+        ties = scaled > 0.5 - TIE_TOLERANCE
+
+    rounded /= factor  # same steps as np.round(values, ndigits)
+    if not ties.any():
+        return rounded
+
+    for index in zip(*np.nonzero(ties)):
+        if exact is None:
+            rounded[index] = round(float(values[index]), ndigits)
+        else:
+            value = exact(index)
+            rounded[index] = np.nan if value is None else value
+    return rounded
+
+
+def _category_scores(scores: np.ndarray, compiled: CompiledMetrics) -> np.ndarray:
+    """
+    Weighted category means as a (categories, sites) array.
+
+    Accumulated metric by metric in column order, like the scalar path.
+    """
+    sites = scores.shape[1]
+    result = np.full((len(CATEGORIES), sites), np.nan)
+    missing = np.isnan(scores)
+    filled = np.where(missing, 0.0, scores)
+    present = (~missing).astype(float)
+
+    for position in range(len(CATEGORIES)):
+        weighted_sum = np.zeros(sites)
+        total_weight = np.zeros(sites)
+        for column in np.nonzero(compiled.membership[:, position])[0]:
+            weight = compiled.weights[column]
+            if weight <= 0:
+                continue
+            # Missing metrics contribute exactly 0.0 to both sums
+            weighted_sum += filled[column] * weight
+            total_weight += present[column] * weight
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[position] = np.where(total_weight > 0, weighted_sum / total_weight, np.nan)
+    return result
+
+
+def _ecosystem_weights(ecosystem_types: Union[str, Sequence[str]], sites: int) -> np.ndarray:
+    """(categories, sites) weights for each site's ecosystem type (sites may be 1)."""
+    def weights_for(ecosystem_type: str) -> List[float]:
+        return list(get_scoring_plan(ecosystem_type).weight_vector)
+
+    if isinstance(ecosystem_types, str):
+        return np.array([weights_for(ecosystem_types)]).T
+    if sites == 0:
+        return np.zeros((len(CATEGORIES), 0))
+
+    types, inverse = np.unique(np.asarray(ecosystem_types, dtype=str), return_inverse=True)
+    table = np.array([weights_for(t) for t in types])
+    return np.ascontiguousarray(table[inverse.reshape(sites)].T)
+
+
+def _overall_scores(pillar_scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Ecosystem-weighted overall score, accumulated pillar by pillar."""
+    sites = pillar_scores.shape[1]
+    weighted_sum = np.zeros(sites)
+    total_weight = np.zeros(sites)
+
+    for position in range(len(CATEGORIES)):
+        score = pillar_scores[position]
+        weight = weights[position]
+        present = ~np.isnan(score)
+        weighted_sum += np.where(present, score * weight, 0.0)
+        total_weight += np.where(present, weight, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total_weight > 0, weighted_sum / total_weight, np.nan)
+
+
+def _score_chunk(
+    values: np.ndarray,
+    compiled: CompiledMetrics,
+    ecosystem_weights: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Score a chunk of rows; works on (metrics, sites) arrays internally."""
+    metrics = compiled.metrics
+    columns = np.ascontiguousarray(values.T)
+    raw = _normalize_columns(columns, compiled)
+
+    def exact_metric(index: Tuple[int, int]) -> Optional[float]:
+        column, row = index
+        return round(normalize_metric(metrics[column], float(columns[column, row])), 2)
+
+    def exact_category(index: Tuple[int, int]) -> Optional[float]:
+        position, row = index
+        row_metrics = {
+            metric: float(columns[column, row])
+            for column, metric in enumerate(metrics)
+            if not np.isnan(columns[column, row])
+        }
+        return calculate_category_score(CATEGORIES[position], row_metrics)[0]
+
+    # Values near a rounding tie are recomputed with the scalar path
+    metric_scores = _round(raw, 2, exact_metric)
+    category_scores = _round(_category_scores(raw, compiled), 2, exact_category)
+    pillar_scores = np.rint(category_scores)
+    overall = _round(_overall_scores(pillar_scores, ecosystem_weights), 2)
+
+    return {
+        "metric_scores": metric_scores.T,
+        "category_scores": category_scores.T,
+        "pillar_scores": pillar_scores.T,
+        "overall_score": overall
+    }
+
+
+def score_matrix(
+    values: np.ndarray,
+    metrics: Sequence[str],
+    ecosystem_types: Union[str, Sequence[str]] = "default",
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, np.ndarray]:
+    """
+    Score many sites at once.
+
+    Args:
+        values: (sites, metrics) raw values, NaN where missing
+        metrics: Metric name of each column
+        ecosystem_types: One ecosystem type for all sites, or one per site
+        chunk_size: Rows scored per pass (bounds memory use)
+
+    Returns:
+        Dict of arrays (NaN where the scalar path returns None):
+        - metric_scores: (sites, metrics) normalized scores, 2 decimals
+        - category_scores: (sites, 5) weighted category scores, 2 decimals
+        - pillar_scores: (sites, 5) whole-number pillar scores
+        - overall_score: (sites,) ecosystem-weighted PHI from pillar scores
+        - categories: the category id of each score column
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2 or values.shape[1] != len(metrics):
+        raise ValueError(f"Expected a (sites, {len(metrics)}) matrix, got {values.shape}")
+
+    compiled = compile_metrics(tuple(metrics))
+    rows = values.shape[0]
+    weights = _ecosystem_weights(ecosystem_types, rows)
+
+    result = {
+        # Column-major, so each chunk's columns are copied contiguously
+        "metric_scores": np.empty((rows, len(metrics)), order="F"),
+        "category_scores": np.empty((rows, len(CATEGORIES)), order="F"),
+        "pillar_scores": np.empty((rows, len(CATEGORIES)), order="F"),
+        "overall_score": np.empty(rows)
+    }
+    for start in range(0, rows, chunk_size):
+        stop = min(start + chunk_size, rows)
+        chunk_weights = weights if weights.shape[1] == 1 else weights[:, start:stop]
+        for key, scores in _score_chunk(values[start:stop], compiled, chunk_weights).items():
+            result[key][start:stop] = scores
+
+    result["categories"] = CATEGORIES
+    return result
+
+
+def metrics_to_matrix(
+    sites: Sequence[Dict[str, Dict]],
+    metrics: Optional[Sequence[str]] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Build a value matrix from query results' pillar dicts.
+
+    Args:
+        sites: One {"A_atmospheric": {"metrics": {...}}, ...} dict per site
+        metrics: Columns to extract (default: every configured metric)
+
+    Returns:
+        (values, metrics) with NaN for missing values
+    """
+    metrics = list(metrics or PHI_METRIC_PARAMS)
+    column = {metric: index for index, metric in enumerate(metrics)}
+    values = np.full((len(sites), len(metrics)), np.nan)
+
+    for row, pillars in enumerate(sites):
+        for pillar_data in pillars.values():
+            for metric, metric_data in pillar_data.get("metrics", {}).items():
+                index = column.get(metric)
+                if index is None:
+                    continue
+                value = metric_value(metric, metric_data)
+                if value is not None:
+                    values[row, index] = value
+    return values, metrics